@@ -0,0 +1,45 @@
+"""Add llm_response_cache table
+
+Revision ID: 20260201_llm_response_cache
+Revises: 20260127_h7_full
+Create Date: 2026-02-01 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = '20260201_llm_response_cache'
+down_revision = '20260127_h7_full'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create persistent tier of the LLM response cache."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'llm_response_cache' not in inspector.get_table_names():
+        op.create_table(
+            'llm_response_cache',
+            sa.Column('cache_key', sa.String(64), primary_key=True),
+            sa.Column('provider', sa.String(50), nullable=False),
+            sa.Column('model', sa.String(255), nullable=True),
+            sa.Column('response', JSONB(), nullable=False),
+            sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column('last_accessed_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index('ix_llm_response_cache_last_accessed_at', 'llm_response_cache', ['last_accessed_at'])
+        op.create_index('ix_llm_response_cache_expires_at', 'llm_response_cache', ['expires_at'])
+
+
+def downgrade():
+    """Drop llm_response_cache table."""
+    op.drop_index('ix_llm_response_cache_expires_at', table_name='llm_response_cache')
+    op.drop_index('ix_llm_response_cache_last_accessed_at', table_name='llm_response_cache')
+    op.drop_table('llm_response_cache')
@@ -0,0 +1,40 @@
+"""Add embedding_cache table
+
+Revision ID: 20260203_embedding_cache
+Revises: 20260201_llm_response_cache
+Create Date: 2026-02-03 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20260203_embedding_cache'
+down_revision = '20260201_llm_response_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create persistent tier of the embedding cache."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'embedding_cache' not in inspector.get_table_names():
+        op.create_table(
+            'embedding_cache',
+            sa.Column('cache_key', sa.String(64), primary_key=True),
+            sa.Column('model', sa.String(255), nullable=False),
+            sa.Column('dimensions', sa.Integer(), nullable=False),
+            sa.Column('vector', sa.LargeBinary(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column('last_accessed_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+        op.create_index('ix_embedding_cache_last_accessed_at', 'embedding_cache', ['last_accessed_at'])
+
+
+def downgrade():
+    """Drop embedding_cache table."""
+    op.drop_index('ix_embedding_cache_last_accessed_at', table_name='embedding_cache')
+    op.drop_table('embedding_cache')
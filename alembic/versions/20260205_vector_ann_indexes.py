@@ -0,0 +1,48 @@
+"""Add HNSW cosine indexes on pgvector embedding columns
+
+Revision ID: 20260205_vector_ann_indexes
+Revises: 20260203_embedding_cache
+Create Date: 2026-02-05 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20260205_vector_ann_indexes'
+down_revision = '20260203_embedding_cache'
+branch_labels = None
+depends_on = None
+
+
+# (table, index name) - names must match backend.services.vector_index_service
+INDEXES = [
+    ('documents', 'ix_documents_embedding_hnsw'),
+    ('application_documents', 'ix_application_documents_embedding_hnsw'),
+]
+
+
+def upgrade():
+    """Build HNSW (vector_cosine_ops) indexes without blocking writes."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for table, index_name in INDEXES:
+            if table not in tables:
+                continue
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON {table} USING hnsw (embedding vector_cosine_ops) "
+                f"WITH (m = 16, ef_construction = 64)"
+            )
+
+
+def downgrade():
+    """Drop HNSW indexes."""
+    with op.get_context().autocommit_block():
+        for _, index_name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
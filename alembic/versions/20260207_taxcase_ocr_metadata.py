@@ -0,0 +1,40 @@
+"""Add ocr_metadata to tax_case_documents
+
+Revision ID: 20260207_taxcase_ocr_metadata
+Revises: 20260205_vector_ann_indexes
+Create Date: 2026-02-07 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '20260207_taxcase_ocr_metadata'
+down_revision = '20260205_vector_ann_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """OCR languages, orientation and timings per uploaded document."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'tax_case_documents' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('tax_case_documents')]
+    if 'ocr_metadata' not in columns:
+        op.add_column('tax_case_documents', sa.Column('ocr_metadata', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'tax_case_documents' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('tax_case_documents')]
+    if 'ocr_metadata' in columns:
+        op.drop_column('tax_case_documents', 'ocr_metadata')
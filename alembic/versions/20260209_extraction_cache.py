@@ -0,0 +1,47 @@
+"""Add extraction_cache table
+
+Revision ID: 20260209_extraction_cache
+Revises: 20260207_taxcase_ocr_metadata
+Create Date: 2026-02-09 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20260209_extraction_cache'
+down_revision = '20260207_taxcase_ocr_metadata'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create persistent tier of the extraction cache."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'extraction_cache' not in inspector.get_table_names():
+        op.create_table(
+            'extraction_cache',
+            sa.Column('cache_key', sa.String(64), primary_key=True),
+            sa.Column('file_sha256', sa.String(64), nullable=False),
+            sa.Column('extractor', sa.String(255), nullable=False),
+            sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+            sa.Column('text', sa.Text(), nullable=False),
+            sa.Column('extraction_metadata', postgresql.JSONB(), nullable=True),
+            sa.Column('extraction_seconds', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column('last_accessed_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+        op.create_index('ix_extraction_cache_file_sha256', 'extraction_cache', ['file_sha256'])
+        op.create_index('ix_extraction_cache_last_accessed_at', 'extraction_cache', ['last_accessed_at'])
+
+
+def downgrade():
+    """Drop extraction_cache table."""
+    op.drop_index('ix_extraction_cache_last_accessed_at', table_name='extraction_cache')
+    op.drop_index('ix_extraction_cache_file_sha256', table_name='extraction_cache')
+    op.drop_table('extraction_cache')
@@ -0,0 +1,62 @@
+"""Add background_jobs table
+
+Revision ID: 20260211_background_jobs
+Revises: 20260209_extraction_cache
+Create Date: 2026-02-11 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20260211_background_jobs'
+down_revision = '20260209_extraction_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the persisted background job queue."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'background_jobs' not in inspector.get_table_names():
+        op.create_table(
+            'background_jobs',
+            sa.Column('id', sa.String(36), primary_key=True),
+            sa.Column('kind', sa.String(100), nullable=False),
+            sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+            sa.Column('user_id', sa.String(36), nullable=True),
+            sa.Column('idempotency_key', sa.String(255), nullable=True),
+            sa.Column('payload', postgresql.JSONB(), nullable=False),
+            sa.Column('checkpoint', postgresql.JSONB(), nullable=True),
+            sa.Column('result', postgresql.JSONB(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('progress', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('progress_message', sa.String(500), nullable=True),
+            sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+            sa.Column('run_after', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+        op.create_index('ix_background_jobs_kind', 'background_jobs', ['kind'])
+        op.create_index('ix_background_jobs_user_id', 'background_jobs', ['user_id'])
+        op.create_index('ix_background_jobs_status_run_after', 'background_jobs', ['status', 'run_after'])
+        op.create_index(
+            'ix_background_jobs_idempotency', 'background_jobs',
+            ['kind', 'user_id', 'idempotency_key'], unique=True,
+        )
+
+
+def downgrade():
+    """Drop background_jobs table."""
+    op.drop_index('ix_background_jobs_idempotency', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_status_run_after', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_user_id', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_kind', table_name='background_jobs')
+    op.drop_table('background_jobs')
@@ -0,0 +1,40 @@
+"""Add extraction_seconds to tax_case_extracted_data
+
+Revision ID: 20260213_taxcase_latency
+Revises: 20260211_background_jobs
+Create Date: 2026-02-13 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '20260213_taxcase_latency'
+down_revision = '20260211_background_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """LLM extraction latency of the document each field came from."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'tax_case_extracted_data' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('tax_case_extracted_data')]
+    if 'extraction_seconds' not in columns:
+        op.add_column('tax_case_extracted_data', sa.Column('extraction_seconds', sa.Float(), nullable=True))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'tax_case_extracted_data' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('tax_case_extracted_data')]
+    if 'extraction_seconds' in columns:
+        op.drop_column('tax_case_extracted_data', 'extraction_seconds')
@@ -0,0 +1,199 @@
+"""Add media_blobs and move inline LifeChronicle photos to the blob store
+
+Revision ID: 20260215_lc_blob_store
+Revises: 20260213_taxcase_latency
+Create Date: 2026-02-15 10:00:00.000000
+
+Inline photos are moved into media_blobs (Postgres large objects) when the
+blob store backend is postgres (the default). With MEDIA_STORAGE_BACKEND=local
+they stay inline: copying them to the uploads directory here would lose them on
+hosts without a volume. POST /api/lifechronicle/migrate-photos moves them later.
+
+Self-contained on purpose (only settings are imported) - migrations must not
+depend on app services that keep changing after this revision.
+"""
+import base64
+import binascii
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from backend.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '20260215_lc_blob_store'
+down_revision = '20260213_taxcase_latency'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger(f"alembic.runtime.migration.{revision}")
+
+PHOTO_NAMESPACE = 'lifechronicle'
+URL_PREFIX = '/uploads/'
+DATA_URL = re.compile(r"^data:(?P<content_type>[\w.+-]+/[\w.+-]+)?(?:;[^,]*)?;base64,", re.IGNORECASE)
+BLOB_URL = re.compile(
+    r"^/uploads/(?P<namespace>[a-z0-9_-]+)/[0-9a-f]{2}/(?P<sha256>[0-9a-f]{64})(?P<ext>\.[a-z0-9]{1,8})?$"
+)
+
+entries = sa.table(
+    'lifechronicle_entries',
+    sa.column('id', postgresql.UUID(as_uuid=True)),
+    sa.column('photo_urls', postgresql.ARRAY(sa.String())),
+    sa.column('entry_metadata', postgresql.JSONB()),
+)
+
+
+def _decode_data_url(url):
+    match = DATA_URL.match(url or '')
+    if not match:
+        return None
+    try:
+        data = base64.b64decode(url[match.end():], validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    return data, (match['content_type'] or 'application/octet-stream').lower()
+
+
+def _extension(content_type, filename):
+    ext = os.path.splitext(filename or '')[1].lower()
+    if not ext and content_type:
+        ext = mimetypes.guess_extension(content_type) or ''
+    if ext == '.jpeg':
+        ext = '.jpg'
+    return ext if re.fullmatch(r"\.[a-z0-9]{1,8}", ext) else ''
+
+
+def _put(conn, data, content_type, filename):
+    """Store bytes as a large object (once per hash) -> (url, size)."""
+    sha256 = hashlib.sha256(data).hexdigest()
+    ext = _extension(content_type, filename)
+    conn.execute(sa.text("""
+        INSERT INTO media_blobs (sha256, content_type, size_bytes, oid, created_at)
+        SELECT :sha256, :content_type, :size_bytes, lo_from_bytea(0, :data), now()
+        WHERE NOT EXISTS (SELECT 1 FROM media_blobs WHERE sha256 = :sha256)
+    """), {"sha256": sha256, "content_type": content_type, "size_bytes": len(data), "data": data})
+    return f"{URL_PREFIX}{PHOTO_NAMESPACE}/{sha256[:2]}/{sha256}{ext}", len(data)
+
+
+def _externalize(conn, photo_urls, entry_metadata):
+    """Same rewrite as lifechronicle_db_service.externalize_photos at this revision."""
+    metadata = dict(entry_metadata or {})
+    inline = metadata.pop('photos_base64', None) or []
+    if inline:
+        sources = [(p.get('data_url'), p.get('filename')) for p in inline]
+    else:
+        sources = [(url, None) for url in photo_urls or []]
+
+    urls, photos = [], []
+    for url, filename in sources:
+        decoded = _decode_data_url(url)
+        if decoded is None:
+            if not inline:
+                urls.append(url)
+            continue
+        data, content_type = decoded
+        blob_url, size = _put(conn, data, content_type, filename)
+        urls.append(blob_url)
+        photos.append({"filename": filename, "url": blob_url, "size_bytes": size})
+
+    if photos and not metadata.get('photos'):
+        metadata['photos'] = photos
+    return urls, metadata, len(photos)
+
+
+def upgrade():
+    """Create media_blobs, then rewrite base64 photo rows to blob URLs (Postgres backend only)."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'media_blobs' not in inspector.get_table_names():
+        op.create_table(
+            'media_blobs',
+            sa.Column('sha256', sa.String(64), primary_key=True),
+            sa.Column('content_type', sa.String(100), nullable=False),
+            sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+            sa.Column('oid', sa.BigInteger(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+
+    if 'lifechronicle_entries' not in inspector.get_table_names():
+        return
+
+    if settings.MEDIA_STORAGE_BACKEND.lower() != 'postgres':
+        logger.info(f"MEDIA_STORAGE_BACKEND={settings.MEDIA_STORAGE_BACKEND} - leaving inline LifeChronicle photos in place")
+        return
+
+    # Ids first - each matching row can hold megabytes of base64
+    entry_ids = [row[0] for row in conn.execute(sa.text("""
+        SELECT id FROM lifechronicle_entries
+        WHERE entry_metadata ? 'photos_base64'
+           OR EXISTS (SELECT 1 FROM unnest(photo_urls) AS url WHERE url LIKE 'data:%')
+    """))]
+
+    moved = 0
+    for entry_id in entry_ids:
+        row = conn.execute(
+            sa.select(entries.c.photo_urls, entries.c.entry_metadata).where(entries.c.id == entry_id)
+        ).first()
+        photo_urls, entry_metadata, count = _externalize(conn, row.photo_urls, row.entry_metadata)
+        conn.execute(
+            entries.update()
+            .where(entries.c.id == entry_id)
+            .values(photo_urls=photo_urls, entry_metadata=entry_metadata)
+        )
+        moved += count
+
+    if entry_ids:
+        logger.info(f"Moved {moved} photos of {len(entry_ids)} LifeChronicle entries to media_blobs")
+
+
+def downgrade():
+    """Inline media_blobs photos as base64 data URLs again, then drop media_blobs."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'media_blobs' not in inspector.get_table_names():
+        return
+
+    if 'lifechronicle_entries' in inspector.get_table_names():
+        rows = conn.execute(sa.text("""
+            SELECT id FROM lifechronicle_entries
+            WHERE EXISTS (SELECT 1 FROM unnest(photo_urls) AS url WHERE url LIKE :prefix)
+        """), {"prefix": f"{URL_PREFIX}{PHOTO_NAMESPACE}/%"})
+        for (entry_id,) in list(rows):
+            row = conn.execute(
+                sa.select(entries.c.photo_urls, entries.c.entry_metadata).where(entries.c.id == entry_id)
+            ).first()
+            photo_urls, inline = [], []
+            for url in row.photo_urls or []:
+                match = BLOB_URL.match(url)
+                blob = conn.execute(
+                    sa.text("SELECT content_type, lo_get(oid) FROM media_blobs WHERE sha256 = :sha256"),
+                    {"sha256": match['sha256']}
+                ).first() if match else None
+                if blob is None:
+                    # Local-backend file or unknown URL - keep as is
+                    photo_urls.append(url)
+                    continue
+                data = bytes(blob[1])
+                data_url = f"data:{blob[0]};base64,{base64.b64encode(data).decode('utf-8')}"
+                photo_urls.append(data_url)
+                inline.append({"filename": None, "data_url": data_url, "size_bytes": len(data)})
+            entry_metadata = dict(row.entry_metadata or {})
+            if inline:
+                entry_metadata["photos_base64"] = inline
+            conn.execute(
+                entries.update()
+                .where(entries.c.id == entry_id)
+                .values(photo_urls=photo_urls, entry_metadata=entry_metadata)
+            )
+
+    conn.execute(sa.text("SELECT lo_unlink(oid) FROM media_blobs"))
+    op.drop_table('media_blobs')
@@ -0,0 +1,241 @@
+"""Add document_chunks and move chunk rows out of documents
+
+Revision ID: 20260217_document_chunks
+Revises: 20260215_lc_blob_store
+Create Date: 2026-02-17 10:00:00.000000
+
+"""
+import json
+import logging
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision = '20260217_document_chunks'
+down_revision = '20260215_lc_blob_store'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger(f"alembic.runtime.migration.{revision}")
+
+# Metadata keys of the old chunk-as-document layout (now columns of document_chunks)
+CHUNK_KEYS = ('is_chunk', 'chunk_index', 'total_chunks', 'parent_id', 'start_position', 'original_word_count')
+
+INSERT_CHUNK = sa.text("""
+    INSERT INTO document_chunks
+        (id, document_id, user_id, project_id, document_type, ordinal,
+         start_offset, end_offset, token_count, content, embedding, created_at)
+    VALUES
+        (:id, :document_id, :user_id, :project_id, CAST(:document_type AS documenttype), :ordinal,
+         :start_offset, :end_offset, :token_count, :content, CAST(:embedding AS vector), :created_at)
+""")
+
+
+def _merge_chunks(chunks):
+    """Rebuild the full text from overlapping chunks [(start word offset, text)]."""
+    words = []
+    for start, text in chunks:
+        chunk_words = text.split()
+        if start is None or start > len(words):
+            words.extend(chunk_words)
+        else:
+            words[start:] = chunk_words
+    return ' '.join(words)
+
+
+def _chunk_rows(parent, chunks):
+    """document_chunks rows for a parent (id, user_id, project_id, type, created_at) and its [(start, text, embedding)] chunks."""
+    rows = []
+    offset = 0
+    for ordinal, (start, text, embedding) in enumerate(chunks):
+        start = offset if start is None else start
+        token_count = len(text.split())
+        rows.append({
+            'id': str(uuid.uuid4()),
+            'document_id': str(parent.id),
+            'user_id': str(parent.user_id),
+            'project_id': _str_or_none(parent.project_id),
+            'document_type': parent.type,
+            'ordinal': ordinal,
+            'start_offset': start,
+            'end_offset': start + token_count,
+            'token_count': token_count,
+            'content': text,
+            'embedding': embedding,
+            'created_at': parent.created_at,
+        })
+        offset = start + token_count
+    return rows
+
+
+def _str_or_none(value):
+    # Raw text() parameters: pass UUIDs as strings, Postgres casts them
+    return str(value) if value is not None else None
+
+
+def _clean_metadata(metadata, **updates):
+    metadata = {key: value for key, value in (metadata or {}).items() if key not in CHUNK_KEYS}
+    metadata.update(updates)
+    return json.dumps(metadata)
+
+
+def upgrade():
+    """Create document_chunks, backfill it from chunk rows in documents, index it."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'document_chunks' not in inspector.get_table_names():
+        op.create_table(
+            'document_chunks',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('document_id', postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('user_id', postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('project_id', postgresql.UUID(as_uuid=True),
+                      sa.ForeignKey('projects.id', ondelete='CASCADE'), nullable=True),
+            sa.Column('document_type', postgresql.ENUM(name='documenttype', create_type=False), nullable=False),
+            sa.Column('ordinal', sa.Integer(), nullable=False),
+            sa.Column('start_offset', sa.Integer(), nullable=False),
+            sa.Column('end_offset', sa.Integer(), nullable=False),
+            sa.Column('token_count', sa.Integer(), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('embedding', Vector(384), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.UniqueConstraint('document_id', 'ordinal', name='uq_document_chunks_document_ordinal'),
+        )
+        op.create_index('ix_document_chunks_document_id', 'document_chunks', ['document_id'])
+        op.create_index('ix_document_chunks_user_project', 'document_chunks', ['user_id', 'project_id'])
+
+    columns = "id, user_id, project_id, type, filename, content, doc_metadata, embedding::text AS embedding, created_at"
+    moved_rows = 0
+
+    # 1. VectorService layout: parent row holds chunk 0 (content overwritten), chunks 1..n are
+    #    extra documents rows pointing back via doc_metadata.parent_id
+    parents = conn.execute(sa.text(f"""
+        SELECT {columns} FROM documents
+        WHERE doc_metadata->>'is_chunk' = 'true' AND NOT doc_metadata ? 'parent_id'
+    """)).fetchall()
+    for parent in parents:
+        children = conn.execute(sa.text(f"""
+            SELECT {columns} FROM documents
+            WHERE doc_metadata->>'parent_id' = :parent_id
+            ORDER BY (doc_metadata->>'chunk_index')::int
+        """), {'parent_id': str(parent.id)}).fetchall()
+
+        chunks = [(0, parent.content, parent.embedding)] + [
+            (child.doc_metadata.get('start_position'), child.content, child.embedding) for child in children
+        ]
+        rows = _chunk_rows(parent, chunks)
+        conn.execute(INSERT_CHUNK, rows)
+
+        metadata = parent.doc_metadata or {}
+        conn.execute(sa.text("""
+            UPDATE documents SET content = :content, doc_metadata = CAST(:metadata AS jsonb), embedding = NULL
+            WHERE id = :id
+        """), {
+            'id': str(parent.id),
+            'content': _merge_chunks([(start, text) for start, text, _ in chunks]),
+            'metadata': _clean_metadata(
+                metadata,
+                chunk_count=len(rows),
+                word_count=metadata.get('original_word_count'),
+            ),
+        })
+        if children:
+            conn.execute(sa.text("DELETE FROM documents WHERE id = ANY(CAST(:ids AS uuid[]))"),
+                         {'ids': [str(child.id) for child in children]})
+            moved_rows += len(children)
+
+    # 2. CV showcase layout: one documents row per chunk ("<doc id>_chunk_<n>"), no parent row
+    cv_rows = conn.execute(sa.text(f"""
+        SELECT {columns} FROM documents
+        WHERE type::text IN ('CV_SHOWCASE', 'cv_showcase')
+          AND doc_metadata ? 'original_doc_id' AND doc_metadata ? 'chunk_index'
+        ORDER BY user_id, project_id, doc_metadata->>'original_doc_id', (doc_metadata->>'chunk_index')::int
+    """)).fetchall()
+    groups = {}
+    for row in cv_rows:
+        groups.setdefault((row.user_id, row.project_id, row.doc_metadata['original_doc_id']), []).append(row)
+
+    for (user_id, project_id, original_doc_id), rows in groups.items():
+        first = rows[0]
+        chunks = [(row.doc_metadata.get('start_position'), row.content, row.embedding) for row in rows]
+        parent_id = str(uuid.uuid4())
+        conn.execute(sa.text("""
+            INSERT INTO documents (id, user_id, project_id, type, filename, content, doc_metadata, created_at, updated_at)
+            VALUES (:id, :user_id, :project_id, CAST(:type AS documenttype), :filename, :content, CAST(:metadata AS jsonb), :created_at, :updated_at)
+        """), {
+            'id': parent_id,
+            'user_id': str(user_id),
+            'project_id': _str_or_none(project_id),
+            'type': first.type,
+            'filename': original_doc_id,
+            'content': _merge_chunks([(start, text) for start, text, _ in chunks]),
+            'metadata': _clean_metadata(first.doc_metadata, chunk_count=len(rows)),
+            'created_at': first.created_at,
+            'updated_at': datetime.utcnow(),
+        })
+        parent = SimpleNamespace(id=parent_id, user_id=user_id, project_id=project_id,
+                                 type=first.type, created_at=first.created_at)
+        conn.execute(INSERT_CHUNK, _chunk_rows(parent, chunks))
+        conn.execute(sa.text("DELETE FROM documents WHERE id = ANY(CAST(:ids AS uuid[]))"),
+                     {'ids': [str(row.id) for row in rows]})
+        moved_rows += len(rows)
+
+    # 3. Everything else with an embedding: single-chunk documents (and orphaned chunk rows)
+    singles = conn.execute(sa.text(f"""
+        SELECT {columns} FROM documents
+        WHERE embedding IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM document_chunks c WHERE c.document_id = documents.id)
+    """)).fetchall()
+    for document in singles:
+        conn.execute(INSERT_CHUNK, _chunk_rows(document, [(0, document.content, document.embedding)]))
+        conn.execute(sa.text("""
+            UPDATE documents SET doc_metadata = CAST(:metadata AS jsonb), embedding = NULL WHERE id = :id
+        """), {'id': str(document.id), 'metadata': _clean_metadata(document.doc_metadata, chunk_count=1)})
+
+    logger.info(f"document_chunks backfill: {len(parents)} chunked documents, {len(groups)} CV showcase documents, "
+                f"{len(singles)} single-chunk documents ({moved_rows} chunk rows removed from documents)")
+
+    # ANN index on the chunk table; the one on documents.embedding has nothing left to index
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_embedding_hnsw "
+            "ON document_chunks USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_embedding_hnsw")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_embedding_ivfflat")
+
+
+def downgrade():
+    """Copy each document's first chunk embedding back to documents.embedding, drop document_chunks.
+
+    Documents keep their full content; the old chunk-per-row layout is not recreated.
+    """
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'document_chunks' not in inspector.get_table_names():
+        return
+
+    conn.execute(sa.text("""
+        UPDATE documents d SET embedding = c.embedding
+        FROM document_chunks c
+        WHERE c.document_id = d.id AND c.ordinal = 0
+    """))
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_embedding_hnsw")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_embedding_hnsw "
+            "ON documents USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+    op.drop_table('document_chunks')
@@ -9,6 +9,7 @@ from backend.auth.dependencies import require_admin
 from backend.database import get_async_session
 from backend.models.user import User
 from backend.schemas.user import UserRead, UserCreate, UserUpdate
+from backend.services.job_queue import job_queue, JobContext
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -86,3 +87,56 @@ async def get_system_stats(
         "admin_users": admin_users,
         "regular_users": total_users - admin_users,
     }
+
+
+@router.get("/extraction-cache/stats")
+async def get_extraction_cache_stats(
+    admin: User = Depends(require_admin),
+):
+    """
+    Extraction cache statistics (Admin only).
+
+    Hit rate, bytes and extraction seconds saved per upload endpoint.
+    """
+    from backend.services.extraction_cache import extraction_cache
+
+    return extraction_cache.get_stats()
+
+
+@router.get("/embedding-models/stats")
+async def get_embedding_model_stats(
+    admin: User = Depends(require_admin),
+):
+    """
+    Embedding model registry statistics (Admin only).
+
+    Loaded models with load time, parameter memory and RSS growth per model.
+    """
+    from backend.services.embedding_registry import embedding_registry
+
+    return embedding_registry.get_stats()
+
+
+@router.post("/elasticsearch/migrate-embeddings", status_code=status.HTTP_202_ACCEPTED)
+async def migrate_elasticsearch_embeddings(
+    admin: User = Depends(require_admin),
+):
+    """
+    Re-embed the Elasticsearch CV index with the configured embedding provider (Admin only).
+
+    Needed after changing ELASTICSEARCH_EMBEDDING_PROVIDER/_MODEL: the index is
+    re-created with the new dense_vector dims as a background job.
+    Poll GET /jobs/{job_id} for progress.
+    """
+    job = await job_queue.enqueue(
+        "elasticsearch.migrate_embeddings", {}, user_id=str(admin.id), max_attempts=1
+    )
+    return {"job_id": job["id"], "status": job["status"], "status_url": job["status_url"]}
+
+
+@job_queue.handler("elasticsearch.migrate_embeddings")
+async def migrate_embeddings_job(job: JobContext, payload: dict) -> dict:
+    """Run a queued CV index re-embedding; the job result is the migration summary."""
+    from backend.services.elasticsearch_service import ElasticsearchService
+
+    return await ElasticsearchService().migrate_cv_embeddings(job)
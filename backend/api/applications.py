@@ -4,9 +4,9 @@
 All endpoints use a fixed demo UUID for testing.
 TODO: Re-enable authentication before production!
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, UploadFile, File, Form
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 from sqlalchemy import func, desc, text
 from typing import List, Optional
 from datetime import datetime
@@ -16,7 +16,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-from backend.database import get_db
+from backend.config import settings
+from backend.database import get_db, SessionLocal
 from backend.models.application import (
     Application,
     ApplicationDocument,
@@ -42,9 +43,14 @@ from backend.schemas.application import (
     UpdateFolderAttributesRequest
 )
 from backend.services.application_service import DocumentParser, guess_doc_type, classify_document_with_llm, extract_application_info
-from backend.services.vector_service import VectorService
+from backend.services.vector_service import VectorService, vector_service as shared_vector_service
+from backend.services.vector_index_service import vector_index_service
+from backend.services.rank_fusion import reciprocal_rank_fusion
 from backend.services.llm_gateway import llm_gateway
 from backend.services.application_elasticsearch_service import application_es_service
+from backend.services.sse import sse_event, sse_response
+from backend.services.job_queue import job_queue, JobContext, PermanentJobError
+from backend.services.upload_ingestion import UploadError, UploadIngestion, UploadTooLargeError
 
 router = APIRouter()
 
@@ -140,7 +146,7 @@ async def test_elasticsearch_status():
 
     if es_connected:
         try:
-            es_ping = application_es_service.es.ping()
+            es_ping = await application_es_service.es.ping()
         except:
             pass
 
@@ -413,7 +419,7 @@ async def delete_application(
 
     # Delete from Elasticsearch first
     try:
-        deleted_count = application_es_service.delete_by_application(application_id)
+        deleted_count = await application_es_service.delete_by_application(application_id)
         logger.info(f"Deleted {deleted_count} documents from Elasticsearch for application {application_id}")
     except Exception as e:
         logger.error(f"Failed to delete from Elasticsearch: {e}")
@@ -506,8 +512,8 @@ async def move_document(
     # Update Elasticsearch if indexed
     if document.indexed:
         try:
-            application_es_service.delete_document(document_id)
-            application_es_service.index_document(
+            await application_es_service.delete_document(document_id)
+            await application_es_service.index_document(
                 document_id=document.id,
                 application_id=request.target_application_id,
                 user_id=str(user.id),
@@ -560,7 +566,7 @@ async def delete_document(
 
     # Delete from Elasticsearch
     try:
-        application_es_service.delete_document(document_id)
+        await application_es_service.delete_document(document_id)
         logger.info(f"Deleted document {document_id} from Elasticsearch")
     except Exception as e:
         logger.error(f"Failed to delete from Elasticsearch: {e}")
@@ -576,168 +582,243 @@ async def delete_document(
     }
 
 
-@router.post("/upload/directory")
-async def upload_application_directory(
-    files: List[UploadFile] = File(...),
-    company_name: str = Form(None),  # Optional - will be extracted if not provided
-    position: str = Form(None),  # Optional - will be extracted if not provided
-    user: User = Depends(get_demo_user),
-    db: Session = Depends(get_db)
-):
-    """Upload multiple application documents (supports directory upload and multiple files)
-
-    Company name and position can be:
-    - Provided manually (override)
-    - Auto-extracted from documents using LLM
-    """
-    if not files:
-        raise HTTPException(status_code=400, detail="No files provided")
-
-    parser = DocumentParser()
-
-    # Phase 1: Parse all documents first (to extract company/position if needed)
-    parsed_files = []
-    all_text = []
-
-    for uploaded_file in files:
-        try:
-            file_data = await uploaded_file.read()
-            filename = uploaded_file.filename
-
-            if not filename or filename.endswith('/') or len(file_data) == 0:
-                continue
-
-            display_filename = filename.split('/')[-1] if '/' in filename else filename
-            extracted_text = await parser.parse_file(display_filename, file_data)
-
-            parsed_files.append({
-                "filename": filename,
-                "display_filename": display_filename,
-                "data": file_data,
-                "text": extracted_text
-            })
-
-            # Collect text for LLM extraction
-            if extracted_text:
-                all_text.append(extracted_text[:1000])  # First 1000 chars of each doc
-
-        except Exception as e:
-            logger.error(f"Failed to parse {uploaded_file.filename}: {e}")
-            continue
-
-    # Phase 2: Extract company/position if not provided manually
-    if not company_name or not position:
-        combined_text = "\n\n".join(all_text[:3])  # Use first 3 documents
-        extracted_info = extract_application_info(combined_text)
-
-        # Use extracted values if manual values not provided
-        final_company = company_name if company_name else extracted_info.get("company_name")
-        final_position = position if position else extracted_info.get("position")
+def _multipart_files_body(**fields: str) -> dict:
+    """OpenAPI request body for endpoints that stream multipart/form-data themselves"""
+    properties = {"files": {"type": "array", "items": {"type": "string", "format": "binary"}}}
+    properties.update({name: {"type": "string", "description": description} for name, description in fields.items()})
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {"type": "object", "properties": properties, "required": ["files"]}
+                }
+            }
+        }
+    }
 
-        logger.info(f"Extracted: Company={final_company}, Position={final_position}")
-    else:
-        final_company = company_name
-        final_position = position
 
-    if not final_company:
-        raise HTTPException(
-            status_code=400,
-            detail="Could not extract company name. Please provide it manually."
+class _DocumentBatchWriter:
+    """Writes parsed upload documents of one application in batches (one DB commit + one ES bulk request each)"""
+
+    def __init__(self, db: Session, user: User, application: Application, vector_service: VectorService):
+        self.db = db
+        self.user = user
+        self.application = application
+        self.vector_service = vector_service
+        self.batch_size = settings.UPLOAD_INGEST_BATCH_SIZE
+        self.pending = []
+        self.processed_files = []
+        self.errors = []
+
+    async def add(self, parsed_file: dict, doc_type: str):
+        self.pending.append((parsed_file, doc_type))
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+
+        # Embed the batch (one forward pass per batch)
+        embeddings = await self.vector_service.generate_embeddings(
+            [parsed_file["text"] or "" for parsed_file, _ in batch]
         )
 
-    # Phase 3: Create application entry
-    application = Application(
-        user_id=user.id,
-        company_name=final_company,
-        position=final_position,
-        status="uploaded",
-        upload_path=f"{len(files)} files uploaded"
-    )
-    db.add(application)
-    db.commit()
-    db.refresh(application)
-
-    vector_service = VectorService()
-
-    processed_files = []
-    errors = []
-
-    try:
-        # Phase 4: Process already-parsed files
-        for parsed_file in parsed_files:
+        es_documents = []
+        for idx, (parsed_file, doc_type) in enumerate(batch):
+            filename = parsed_file["filename"]
             try:
-                filename = parsed_file["filename"]
                 display_filename = parsed_file["display_filename"]
                 extracted_text = parsed_file["text"]
-
-                # Determine document type
-                doc_type = guess_doc_type(filename)
-
-                # Generate embedding
-                embedding = vector_service.generate_embedding(extracted_text)
+                embedding = embeddings[idx].tolist() if embeddings is not None else None
 
                 # Save document
                 document = ApplicationDocument(
-                    application_id=application.id,
+                    application_id=self.application.id,
                     filename=display_filename,
                     file_path=filename,  # Keep full path for reference
                     doc_type=doc_type,
                     content=extracted_text,
                     embedding=embedding
                 )
-                db.add(document)
-                db.flush()  # Get document ID before Elasticsearch indexing
-
-                # Index in Elasticsearch for hybrid search
-                try:
-                    application_es_service.index_document(
-                        document_id=document.id,
-                        application_id=application.id,
-                        user_id=str(user.id),
-                        company_name=final_company,
-                        position=final_position,
-                        filename=display_filename,
-                        file_path=filename,
-                        doc_type=doc_type,
-                        content=extracted_text or "",
-                        created_at=document.created_at.isoformat() if document.created_at else datetime.utcnow().isoformat()
-                    )
-                except Exception as es_error:
-                    logger.error(f"Elasticsearch indexing failed for {display_filename}: {es_error}")
-                    # Continue anyway - Elasticsearch is optional enhancement
-
-                processed_files.append({
+                self.db.add(document)
+                self.db.flush()  # Get document ID before Elasticsearch indexing
+
+                es_documents.append(application_es_service.build_document(
+                    document_id=document.id,
+                    application_id=self.application.id,
+                    user_id=str(self.user.id),
+                    company_name=self.application.company_name,
+                    position=self.application.position,
+                    filename=display_filename,
+                    file_path=filename,
+                    doc_type=doc_type,
+                    content=extracted_text or "",
+                    created_at=datetime.utcnow().isoformat()
+                ))
+
+                self.processed_files.append({
                     "filename": display_filename,
                     "type": doc_type,
                     "chars": len(extracted_text) if extracted_text else 0
                 })
 
             except Exception as e:
-                errors.append({"filename": filename, "error": str(e)})
+                self.errors.append({"filename": filename, "error": str(e)})
 
-        db.commit()
+        self.db.commit()
+
+        # Index in Elasticsearch for hybrid search (optional enhancement - failures are logged)
+        if es_documents:
+            await application_es_service.index_documents(es_documents)
 
+
+async def _discard_application(db: Session, application: Application):
+    """Remove an application created by an upload that failed half-way (DB + Elasticsearch)"""
+    db.rollback()
+    try:
+        await application_es_service.delete_by_application(application.id)
     except Exception as e:
-        db.rollback()
-        db.delete(application)
+        logger.error(f"Failed to delete from Elasticsearch: {e}")
+    db.delete(application)
+    db.commit()
+
+
+@router.post("/upload/directory", openapi_extra=_multipart_files_body(
+    company_name="Optional - extracted from the documents if not provided",
+    position="Optional - extracted from the documents if not provided",
+))
+async def upload_application_directory(
+    request: Request,
+    user: User = Depends(get_demo_user),
+    db: Session = Depends(get_db)
+):
+    """Upload multiple application documents (supports directory upload and multiple files)
+
+    Company name and position can be:
+    - Provided manually (override) via the company_name/position form fields
+    - Auto-extracted from the first parsed documents using LLM
+
+    The multipart body is streamed: files are spooled to disk, parsed by a bounded
+    worker pool and written to DB/Elasticsearch in batches, so memory does not grow
+    with the upload size. Files larger than MAX_UPLOAD_SIZE abort the upload (413).
+    Send company_name/position before the files so documents are indexed with them.
+    """
+    parser = DocumentParser()
+    vector_service = shared_vector_service
+
+    writer = None
+    buffered = []  # Parsed files waiting for the application to exist (text only)
+    sample_text = []
+    errors = []
+
+    async def create_application(fields: dict) -> _DocumentBatchWriter:
+        company_name = fields.get("company_name") or None
+        position = fields.get("position") or None
+
+        # Extract company/position if not provided manually
+        if not company_name or not position:
+            combined_text = "\n\n".join(sample_text[:3])  # Use first 3 documents
+            extracted_info = await extract_application_info(combined_text)
+            final_company = company_name if company_name else extracted_info.get("company_name")
+            final_position = position if position else extracted_info.get("position")
+            logger.info(f"Extracted: Company={final_company}, Position={final_position}")
+        else:
+            final_company = company_name
+            final_position = position
+
+        if not final_company:
+            raise HTTPException(
+                status_code=400,
+                detail="Could not extract company name. Please provide it manually."
+            )
+
+        application = Application(
+            user_id=user.id,
+            company_name=final_company,
+            position=final_position,
+            status="uploaded",
+            upload_path="streaming upload"
+        )
+        db.add(application)
         db.commit()
+        db.refresh(application)
+        return _DocumentBatchWriter(db, user, application, vector_service)
+
+    try:
+        async with UploadIngestion(request, parser.parse_file) as ingestion:
+            async for parsed_file in ingestion:
+                if parsed_file.get("error"):
+                    errors.append({"filename": parsed_file["filename"], "error": parsed_file["error"]})
+                    continue
+
+                if writer is not None:
+                    await writer.add(parsed_file, guess_doc_type(parsed_file["filename"]))
+                    continue
+
+                buffered.append(parsed_file)
+                if parsed_file["text"]:
+                    sample_text.append(parsed_file["text"][:1000])  # First 1000 chars of each doc
+
+                # Create the application as soon as company/position are known or can be extracted
+                manual = ingestion.fields.get("company_name") and ingestion.fields.get("position")
+                if manual or len(sample_text) >= 3:
+                    writer = await create_application(ingestion.fields)
+                    for buffered_file in buffered:
+                        await writer.add(buffered_file, guess_doc_type(buffered_file["filename"]))
+                    buffered = []
+
+            if writer is None:
+                if not buffered:
+                    raise HTTPException(status_code=400, detail="No files provided")
+                writer = await create_application(ingestion.fields)
+                for buffered_file in buffered:
+                    await writer.add(buffered_file, guess_doc_type(buffered_file["filename"]))
+
+            await writer.flush()
+            fields = ingestion.fields
+            total_uploaded = ingestion.stats["files"]
+
+    except HTTPException:
+        if writer is not None:
+            await _discard_application(db, writer.application)
+        raise
+    except UploadTooLargeError as e:
+        if writer is not None:
+            await _discard_application(db, writer.application)
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        if writer is not None:
+            await _discard_application(db, writer.application)
         raise HTTPException(status_code=400, detail=f"File processing failed: {str(e)}")
 
+    application = writer.application
+    company_name = fields.get("company_name") or None
+    position = fields.get("position") or None
+
+    # Overrides sent after the first files still win (like a rename)
+    application.company_name = company_name or application.company_name
+    application.position = position or application.position
+    application.upload_path = f"{total_uploaded} files uploaded"
+    db.commit()
+
     return {
         "success": True,
         "application_id": application.id,
-        "company_name": final_company,
-        "position": final_position,
-        "processed_files": processed_files,
-        "total_files": len(processed_files),
-        "errors": errors,
+        "company_name": application.company_name,
+        "position": application.position,
+        "processed_files": writer.processed_files,
+        "total_files": len(writer.processed_files),
+        "errors": errors + writer.errors,
         "extracted": not (company_name and position)  # True if auto-extracted
     }
 
 
-@router.post("/upload/batch")
+@router.post("/upload/batch", openapi_extra=_multipart_files_body())
 async def upload_batch_applications(
-    files: List[UploadFile] = File(...),
+    request: Request,
     user: User = Depends(get_demo_user),
     db: Session = Depends(get_db)
 ):
@@ -753,173 +834,133 @@ async def upload_batch_applications(
       │   └── Anschreiben.docx
 
     Each first-level subdirectory becomes a separate application.
+
+    The multipart body is streamed like /upload/directory: each application is
+    created once its first documents are parsed, and documents are written to
+    DB/Elasticsearch in batches as they arrive.
     """
-    if not files:
-        raise HTTPException(status_code=400, detail="No files provided")
+    parser = DocumentParser()
+    vector_service = shared_vector_service
 
-    # Group files by company (first-level directory)
+    # Per company (first-level directory): writer once the application exists,
+    # parsed files waiting for it, sample text for position extraction
     companies = {}
-    for uploaded_file in files:
-        filename = uploaded_file.filename
-
-        # Skip empty files or directory markers
-        if not filename or filename.endswith('/'):
-            continue
-
-        # Extract company name from path (first directory level)
-        parts = filename.split('/')
-        if len(parts) < 2:
-            # File in root - skip or use filename as company
-            continue
-
-        company_name = parts[0]  # First directory = company name
+    total_errors = []
 
-        if company_name not in companies:
-            companies[company_name] = []
+    async def create_application(company_name: str, state: dict):
+        # Extract position from documents
+        position = None
+        if state["sample_text"]:
+            combined_text = "\n\n".join(state["sample_text"][:3])
+            extracted_info = await extract_application_info(combined_text)
+            position = extracted_info.get("position")
+            logger.info(f"Extracted position for {company_name}: {position}")
 
-        companies[company_name].append(uploaded_file)
+        application = Application(
+            user_id=user.id,
+            company_name=company_name,
+            position=position,
+            status="uploaded",
+            upload_path="batch upload"
+        )
+        db.add(application)
+        db.commit()
+        db.refresh(application)
+        state["writer"] = _DocumentBatchWriter(db, user, application, vector_service)
 
-    if not companies:
-        raise HTTPException(status_code=400, detail="No valid company directories found")
+        buffered, state["buffered"] = state["buffered"], []
+        for parsed_file in buffered:
+            await add_document(state["writer"], parsed_file)
 
-    parser = DocumentParser()
-    vector_service = VectorService()
+    async def add_document(writer: _DocumentBatchWriter, parsed_file: dict):
+        # Determine document type using LLM classification
+        doc_type = await classify_document_with_llm(parsed_file["text"], parsed_file["display_filename"])
+        logger.info(f"Classified {parsed_file['display_filename']} as: {doc_type}")
+        await writer.add(parsed_file, doc_type)
 
-    results = []
-    total_applications = 0
-    total_files_processed = 0
-    total_errors = []
-
-    # Process each company separately
-    for company_name, company_files in companies.items():
+    async def guarded(company_name: str, state: dict, step):
+        # A failing company is skipped, the others continue
         try:
-            # Phase 1: Parse all files for this company
-            parsed_files = []
-            all_text = []
-
-            for uploaded_file in company_files:
-                try:
-                    await uploaded_file.seek(0)
-                    file_data = await uploaded_file.read()
-                    filename = uploaded_file.filename
-
-                    if len(file_data) == 0:
-                        continue
-
-                    display_filename = filename.split('/')[-1] if '/' in filename else filename
-                    extracted_text = await parser.parse_file(display_filename, file_data)
+            await step
+        except Exception as e:
+            total_errors.append({"company": company_name, "error": str(e)})
+            state["failed"] = True
+            db.rollback()
 
-                    parsed_files.append({
-                        "filename": filename,
-                        "display_filename": display_filename,
-                        "data": file_data,
-                        "text": extracted_text
-                    })
+    try:
+        async with UploadIngestion(request, parser.parse_file) as ingestion:
+            async for parsed_file in ingestion:
+                # Extract company name from path (first directory level) - files in root are skipped
+                parts = parsed_file["filename"].split('/')
+                if len(parts) < 2:
+                    continue
 
-                    if extracted_text:
-                        all_text.append(extracted_text[:1000])
+                company_name = parts[0]
+                state = companies.setdefault(company_name, {
+                    "writer": None, "buffered": [], "sample_text": [], "files": 0, "failed": False
+                })
+                state["files"] += 1
+                if state["failed"]:
+                    continue
 
-                except Exception as e:
-                    logger.error(f"Failed to parse {uploaded_file.filename}: {e}")
+                if parsed_file.get("error"):
+                    total_errors.append({"filename": parsed_file["filename"], "error": parsed_file["error"]})
                     continue
 
-            # Phase 2: Extract position from documents
-            position = None
-            if all_text:
-                combined_text = "\n\n".join(all_text[:3])
-                extracted_info = extract_application_info(combined_text)
-                position = extracted_info.get("position")
-                logger.info(f"Extracted position for {company_name}: {position}")
-
-            # Phase 3: Create application entry
-            application = Application(
-                user_id=user.id,
-                company_name=company_name,
-                position=position,
-                status="uploaded",
-                upload_path=f"{len(company_files)} files from batch upload"
-            )
-            db.add(application)
-            db.commit()
-            db.refresh(application)
-
-            processed_files = []
-            errors = []
-
-            # Phase 4: Process already-parsed files
-            for parsed_file in parsed_files:
-                try:
-                    filename = parsed_file["filename"]
-                    display_filename = parsed_file["display_filename"]
-                    extracted_text = parsed_file["text"]
-
-                    # Determine document type using LLM classification
-                    doc_type = classify_document_with_llm(extracted_text, display_filename)
-                    logger.info(f"Classified {display_filename} as: {doc_type}")
-                    embedding = vector_service.generate_embedding(extracted_text)
-
-                    # Save document
-                    document = ApplicationDocument(
-                        application_id=application.id,
-                        filename=display_filename,
-                        file_path=filename,
-                        doc_type=doc_type,
-                        content=extracted_text,
-                        embedding=embedding
-                    )
-                    db.add(document)
-                    db.flush()  # Get document ID
-
-                    # Index in Elasticsearch
-                    try:
-                        application_es_service.index_document(
-                            document_id=document.id,
-                            application_id=application.id,
-                            user_id=str(user.id),
-                            company_name=company_name,
-                            position=position,  # Extracted position
-                            filename=display_filename,
-                            file_path=filename,
-                            doc_type=doc_type,
-                            content=extracted_text or "",
-                            created_at=document.created_at.isoformat() if document.created_at else datetime.utcnow().isoformat()
-                        )
-                    except Exception as es_error:
-                        logger.error(f"Elasticsearch indexing failed: {es_error}")
+                if state["writer"] is not None:
+                    await guarded(company_name, state, add_document(state["writer"], parsed_file))
+                    continue
 
-                    processed_files.append({
-                        "filename": display_filename,
-                        "type": doc_type,
-                        "chars": len(extracted_text) if extracted_text else 0
-                    })
+                state["buffered"].append(parsed_file)
+                if parsed_file["text"]:
+                    state["sample_text"].append(parsed_file["text"][:1000])
+                if len(state["sample_text"]) >= 3:
+                    await guarded(company_name, state, create_application(company_name, state))
 
-                except Exception as e:
-                    errors.append({"filename": filename, "error": str(e)})
+            for company_name, state in companies.items():
+                if state["failed"]:
+                    continue
+                if state["writer"] is None:
+                    if not state["buffered"]:
+                        continue
+                    await guarded(company_name, state, create_application(company_name, state))
+                if state["writer"] is not None and not state["failed"]:
+                    await guarded(company_name, state, state["writer"].flush())
+
+    except UploadTooLargeError as e:
+        for state in companies.values():
+            if state["writer"] is not None:
+                await _discard_application(db, state["writer"].application)
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-            db.commit()
+    if not companies:
+        raise HTTPException(status_code=400, detail="No valid company directories found")
 
-            results.append({
-                "company_name": company_name,
-                "position": position,  # Include extracted position
-                "application_id": application.id,
-                "processed_files": processed_files,
-                "total_files": len(processed_files),
-                "errors": errors
-            })
+    results = []
+    for company_name, state in companies.items():
+        writer = state["writer"]
+        if writer is None or state["failed"]:
+            continue
 
-            total_applications += 1
-            total_files_processed += len(processed_files)
-            total_errors.extend(errors)
+        writer.application.upload_path = f"{state['files']} files from batch upload"
+        db.commit()
 
-        except Exception as e:
-            total_errors.append({"company": company_name, "error": str(e)})
-            db.rollback()
-            continue
+        results.append({
+            "company_name": company_name,
+            "position": writer.application.position,  # Include extracted position
+            "application_id": writer.application.id,
+            "processed_files": writer.processed_files,
+            "total_files": len(writer.processed_files),
+            "errors": writer.errors
+        })
+        total_errors.extend(writer.errors)
 
     return {
         "success": True,
-        "total_applications": total_applications,
-        "total_files": total_files_processed,
+        "total_applications": len(results),
+        "total_files": sum(result["total_files"] for result in results),
         "applications": results,
         "errors": total_errors
     }
@@ -1103,17 +1144,17 @@ async def index_document_manually(
         }
 
     try:
-        doc_type = classify_document_with_llm(
+        doc_type = await classify_document_with_llm(
             document.content[:1500] if document.content else "",
             document.filename
         )
         logger.info(f"Classified {document.filename} as: {doc_type}")
 
-        vector_service = VectorService()
-        embedding = vector_service.generate_embedding(document.content or "")
+        vector_service = shared_vector_service
+        embedding = await vector_service.agenerate_embedding(document.content or "")
 
         try:
-            application_es_service.index_document(
+            await application_es_service.index_document(
                 document_id=document.id,
                 application_id=document.application_id,
                 user_id=str(user.id),
@@ -1564,13 +1605,17 @@ async def update_folder_attributes(
     return folder
 
 
-@router.post("/folders/{folder_id}/index-all")
+@router.post("/folders/{folder_id}/index-all", status_code=202)
 async def index_folder_recursively(
     folder_id: int,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     user: User = Depends(get_demo_user),
     db: Session = Depends(get_db)
 ):
-    """Index all documents in folder and subfolders recursively"""
+    """Index all documents in folder and subfolders recursively (background job)
+
+    Returns 202 with the job id; poll GET /jobs/{job_id} for progress and counts.
+    """
     # Get folder
     folder = db.query(ApplicationFolder).filter(
         ApplicationFolder.id == folder_id
@@ -1588,53 +1633,92 @@ async def index_folder_recursively(
     if not app:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    # Collect all folder IDs recursively
-    folder_ids = []
+    job = await job_queue.enqueue(
+        "applications.index_folder",
+        {"folder_id": folder.id, "application_id": app.id},
+        user_id=str(user.id),
+        idempotency_key=idempotency_key,
+    )
 
-    def collect_folder_ids(f):
-        folder_ids.append(f.id)
-        children = db.query(ApplicationFolder).filter(
-            ApplicationFolder.parent_id == f.id
-        ).all()
-        for child in children:
-            collect_folder_ids(child)
+    return {
+        "success": True,
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": job["status_url"]
+    }
 
-    collect_folder_ids(folder)
 
-    # Get all documents in these folders
-    documents = db.query(ApplicationDocument).filter(
-        ApplicationDocument.folder_id.in_(folder_ids)
-    ).all()
+@job_queue.handler("applications.index_folder")
+async def index_folder_job(job: JobContext, payload: dict) -> dict:
+    """Embed and index (pgvector + Elasticsearch) all documents below a folder"""
+    with SessionLocal() as db:
+        folder = db.query(ApplicationFolder).filter(ApplicationFolder.id == payload["folder_id"]).first()
+        app = db.query(Application).filter(Application.id == payload["application_id"]).first()
+        if not folder or not app:
+            raise PermanentJobError("Folder or application no longer exists")
 
-    # Index each document
-    vector_service = VectorService()
-    indexed_count = 0
-    failed_count = 0
+        # Collect all folder IDs recursively
+        folder_ids = []
 
-    for doc in documents:
-        try:
-            if doc.content:
-                # Generate embedding
-                embedding = await vector_service.generate_embedding(doc.content)
-                doc.embedding = embedding
-
-                # Index in Elasticsearch
-                application_es_service.index_document(
-                    document_id=doc.id,
-                    filename=doc.filename,
-                    content=doc.content,
-                    company_name=app.company_name,
-                    position=app.position or "",
-                    user_id=str(user.id)
-                )
+        def collect_folder_ids(f):
+            folder_ids.append(f.id)
+            children = db.query(ApplicationFolder).filter(
+                ApplicationFolder.parent_id == f.id
+            ).all()
+            for child in children:
+                collect_folder_ids(child)
+
+        collect_folder_ids(folder)
 
+        # Get all documents in these folders
+        documents = db.query(ApplicationDocument).filter(
+            ApplicationDocument.folder_id.in_(folder_ids)
+        ).all()
+        await job.progress(0.1, f"Embedding {len(documents)} documents from {len(folder_ids)} folders")
+
+        # Index each document
+        vector_service = shared_vector_service
+        indexed_count = 0
+        failed_count = 0
+
+        # Embed all documents with content in batches (one forward pass per batch)
+        docs_with_content = [doc for doc in documents if doc.content]
+        embeddings = await vector_service.generate_embeddings([doc.content for doc in docs_with_content])
+        embedding_by_doc = {
+            doc.id: embeddings[idx].tolist()
+            for idx, doc in enumerate(docs_with_content)
+        } if embeddings is not None else {}
+        await job.progress(0.7, "Indexing in Elasticsearch")
+
+        es_documents = []
+        for doc in docs_with_content:
+            doc.embedding = embedding_by_doc.get(doc.id)
+            es_documents.append(application_es_service.build_document(
+                document_id=doc.id,
+                application_id=app.id,
+                user_id=str(app.user_id),
+                company_name=app.company_name,
+                position=app.position or "",
+                filename=doc.filename,
+                file_path=doc.file_path or doc.filename,
+                doc_type=doc.doc_type or guess_doc_type(doc.filename),
+                content=doc.content,
+                created_at=doc.created_at.isoformat() if doc.created_at else datetime.utcnow().isoformat()
+            ))
+
+        # Index in Elasticsearch (one bulk request, per-item errors)
+        bulk_result = await application_es_service.index_documents(es_documents)
+        failed_ids = {error.get("id") for error in bulk_result["errors"]}
+
+        for doc in docs_with_content:
+            if bulk_result["succeeded"] == 0 or str(doc.id) in failed_ids:
+                logger.error(f"Failed to index document {doc.id}")
+                failed_count += 1
+            else:
                 doc.indexed = True
                 indexed_count += 1
-        except Exception as e:
-            logger.error(f"Failed to index document {doc.id}: {e}")
-            failed_count += 1
 
-    db.commit()
+        db.commit()
 
     return {
         "success": True,
@@ -1690,13 +1774,63 @@ async def get_all_bewerbungen(
     return {"bewerbungen": result}
 
 
-@router.post("/chat/message", response_model=ChatMessageResponse)
-async def send_chat_message(
-    request: ChatMessageRequest,
-    user: User = Depends(get_demo_user),
-    db: Session = Depends(get_db)
-):
-    """Send chat message and get response with RAG"""
+def _vector_search_application_documents(
+    db: Session,
+    user_id,
+    query_embedding: Optional[List[float]],
+    limit: int = 10,
+    distance_threshold: float = 0.7,
+) -> List[dict]:
+    """pgvector top-k over the user's application documents.
+
+    Runs as one ORDER BY embedding <=> query LIMIT k (served by the HNSW index).
+    Full content and embeddings are deferred - only a 500 char snippet is transferred.
+
+    Returns:
+        Documents ordered by cosine similarity (best first)
+    """
+    if not query_embedding:
+        return []
+
+    distance = ApplicationDocument.embedding.cosine_distance(query_embedding)
+    vector_index_service.apply_search_params_sync(db)
+    rows = (
+        db.query(
+            ApplicationDocument,
+            Application.company_name,
+            func.left(ApplicationDocument.content, 500).label("snippet"),
+            distance.label("distance"),
+        )
+        .join(Application)
+        .options(defer(ApplicationDocument.content), defer(ApplicationDocument.embedding))
+        .filter(
+            Application.user_id == user_id,
+            ApplicationDocument.embedding.isnot(None),
+            distance < distance_threshold,
+        )
+        .order_by(distance)
+        .limit(limit)
+        .all()
+    )
+
+    return [
+        {
+            "id": doc.id,
+            "filename": doc.filename,
+            "similarity": 1.0 - float(dist),
+            "content": snippet or "",
+            "company": company_name or "",
+        }
+        for doc, company_name, snippet, dist in rows
+    ]
+
+
+async def _prepare_chat_prompt(request: ChatMessageRequest, user: User, db: Session):
+    """Store the user message, run hybrid retrieval and build the LLM prompt.
+
+    Returns:
+        Tuple of (full_prompt, relevant_docs, action_taken)
+    """
     user_message = ApplicationChatMessage(
         user_id=user.id,
         role="user",
@@ -1710,54 +1844,43 @@ async def send_chat_message(
     # HYBRID SEARCH: Combine Elasticsearch (keyword) + pgvector (semantic)
 
     # 1. Elasticsearch: Full-text search with fuzzy matching
-    es_results = application_es_service.search(
+    es_results = await application_es_service.search(
         query=request.message,
         user_id=str(user.id),
         limit=10
     )
-    es_doc_ids = {r["document_id"]: r["score"] for r in es_results}
-
-    # 2. pgvector: Semantic similarity search
-    vector_service = VectorService()
-    query_embedding = await vector_service.generate_embedding(request.message)
 
-    documents = db.query(ApplicationDocument).join(Application).filter(
-        Application.user_id == user.id
-    ).all()
+    # 2. pgvector: Semantic top-k search (HNSW index, content deferred)
+    vector_service = shared_vector_service
+    query_embedding = await vector_service.agenerate_embedding(request.message)
+    vector_results = _vector_search_application_documents(db, user.id, query_embedding, limit=10)
+
+    # 3. Combine results with Reciprocal Rank Fusion (documents found by both rank higher)
+    candidates = {doc["id"]: doc for doc in vector_results}
+    for hit in es_results:
+        doc_id = int(hit["document_id"])
+        if doc_id in candidates:
+            candidates[doc_id]["es_score"] = hit["score"]
+        else:
+            candidates[doc_id] = {
+                "id": doc_id,
+                "filename": hit["filename"],
+                "similarity": None,
+                "content": (hit["content"] or "")[:500],
+                "company": hit["company_name"] or "",
+                "es_score": hit["score"],
+            }
 
-    vector_results = {}
-    for doc in documents:
-        if doc.embedding:
-            similarity = vector_service.cosine_similarity(query_embedding, doc.embedding)
-            if similarity > 0.3:
-                vector_results[doc.id] = {
-                    "id": doc.id,
-                    "filename": doc.filename,
-                    "similarity": similarity,
-                    "content": doc.content[:500] if doc.content else "",
-                    "company": doc.application.company_name if doc.application else ""
-                }
+    fused = reciprocal_rank_fusion([
+        [int(hit["document_id"]) for hit in es_results],
+        [doc["id"] for doc in vector_results],
+    ])
 
-    # 3. Combine results (Hybrid Ranking)
-    # Documents found by both get higher score
-    all_doc_ids = set(es_doc_ids.keys()) | set(vector_results.keys())
     relevant_docs = []
-
-    for doc_id in all_doc_ids:
-        es_score = es_doc_ids.get(doc_id, 0) / 10.0  # Normalize ES score
-        vector_score = vector_results.get(doc_id, {}).get("similarity", 0)
-
-        # Hybrid score: Weighted combination
-        hybrid_score = (0.6 * vector_score) + (0.4 * es_score)
-
-        if doc_id in vector_results:
-            doc_info = vector_results[doc_id]
-            doc_info["hybrid_score"] = hybrid_score
-            doc_info["es_score"] = es_score
-            relevant_docs.append(doc_info)
-
-    relevant_docs.sort(key=lambda x: x.get("hybrid_score", 0), reverse=True)
-    relevant_docs = relevant_docs[:5]
+    for doc_id, rrf_score in fused[:5]:
+        doc_info = candidates[doc_id]
+        doc_info["hybrid_score"] = rrf_score
+        relevant_docs.append(doc_info)
 
     applications = db.query(Application).filter(Application.user_id == user.id).all()
     app_summary = "\n".join([
@@ -1770,7 +1893,7 @@ async def send_chat_message(
         context_parts.append(f"=== Bewerbungen ===\n{app_summary}")
     if relevant_docs:
         docs_text = "\n\n".join([
-            f"Dokument: {doc['filename']} (Relevanz: {doc['similarity']:.2f})\n{doc['content']}"
+            f"Dokument: {doc['filename']} (Relevanz: {doc['hybrid_score']:.3f})\n{doc['content']}"
             for doc in relevant_docs
         ])
         context_parts.append(f"=== Relevante Dokumente ===\n{docs_text}")
@@ -1780,15 +1903,27 @@ async def send_chat_message(
     system_prompt = """Du bist ein intelligenter Assistent für Bewerbungsmanagement.
 Beantworte Fragen zu Bewerbungen und Dokumenten präzise auf Deutsch."""
 
-    full_prompt = f"Kontext:\n{context}\n\nFrage: {request.message}\n\nAntwort:"
+    full_prompt = f"{system_prompt}\n\nKontext:\n{context}\n\nFrage: {request.message}\n\nAntwort:"
+
+    return full_prompt, relevant_docs, action_taken
+
+
+@router.post("/chat/message", response_model=ChatMessageResponse)
+async def send_chat_message(
+    request: ChatMessageRequest,
+    user: User = Depends(get_demo_user),
+    db: Session = Depends(get_db)
+):
+    """Send chat message and get response with RAG"""
+    full_prompt, relevant_docs, action_taken = await _prepare_chat_prompt(request, user, db)
 
-    response_text = await llm_gateway.generate(
-        message=full_prompt,
-        system_prompt=system_prompt,
-        llm_type=request.provider,
+    llm_result = await llm_gateway.agenerate(
+        prompt=full_prompt,
+        provider=request.provider,
         temperature=0.7,
         max_tokens=1500
     )
+    response_text = llm_result.get("response", "")
 
     assistant_message = ApplicationChatMessage(
         user_id=user.id,
@@ -1805,6 +1940,51 @@ Beantworte Fragen zu Bewerbungen und Dokumenten präzise auf Deutsch."""
     )
 
 
+@router.post("/chat/message/stream")
+async def stream_chat_message(
+    request: ChatMessageRequest,
+    user: User = Depends(get_demo_user),
+    db: Session = Depends(get_db)
+):
+    """Streaming variant of /chat/message (Server-Sent-Events).
+
+    Emits the retrieved documents as the first ``sources`` event, then ``token``
+    events and a final ``done`` event. The assistant message is stored once the
+    answer is complete.
+    """
+    full_prompt, relevant_docs, action_taken = await _prepare_chat_prompt(request, user, db)
+    user_id = user.id
+
+    async def events():
+        yield sse_event("sources", {"context_used": relevant_docs, "action_taken": action_taken})
+        parts = []
+        try:
+            async for token in llm_gateway.astream(
+                prompt=full_prompt,
+                provider=request.provider,
+                temperature=0.7,
+                max_tokens=1500
+            ):
+                parts.append(token)
+                yield sse_event("token", {"text": token})
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            yield sse_event("error", {"detail": f"Chat failed: {str(e)}"})
+            return
+
+        # The request-scoped session is already released while streaming
+        with SessionLocal() as stream_db:
+            stream_db.add(ApplicationChatMessage(
+                user_id=user_id,
+                role="assistant",
+                content="".join(parts)
+            ))
+            stream_db.commit()
+        yield sse_event("done", {"provider": request.provider})
+
+    return sse_response(events())
+
+
 async def _check_status_update(message: str, user_id, db: Session):
     """Check if message contains status update intent"""
     message_lower = message.lower()
@@ -1923,11 +2103,12 @@ async def generate_report(
 
                 prompt = f"Firma: {app.company_name}\nPosition: {app.position}\nDokumente: {doc_text}\n\n{custom_col.prompt}"
 
-                value = await llm_gateway.generate(
-                    message=prompt,
-                    llm_type=request.provider,
+                llm_result = await llm_gateway.agenerate(
+                    prompt=prompt,
+                    provider=request.provider,
                     max_tokens=150
                 )
+                value = llm_result.get("response", "")
 
                 if custom_col.type == "number":
                     nums = re.findall(r'\d+', value)
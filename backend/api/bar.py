@@ -434,6 +434,7 @@ async def extract_menu_text(
     try:
         # Read file content
         content = await file.read()
+        from backend.services.extraction_cache import extraction_cache, ocr_settings, pdf_result
 
         # For images, use LLM vision to extract text
         # For now, use a simple approach: convert to base64 and use LLM
@@ -445,30 +446,56 @@ async def extract_menu_text(
             # Use LLM gateway to extract text from image
             from backend.services.llm_gateway import llm_gateway
             settings = db.query(BarSettings).first()
+            provider = settings.llm_provider if settings else "ollama"
+            model = settings.ollama_model if settings else "llama3.2-vision"
 
             prompt = f"""Extract all text content from this menu image.
 Return the menu items with their descriptions and prices in a clean, structured format.
 Format as a simple text list, one item per line."""
 
-            result = llm_gateway.generate_with_image(
-                prompt=prompt,
-                image_data=data_uri,
-                provider=settings.llm_provider if settings else "ollama",
-                model=settings.ollama_model if settings else "llama3.2-vision"
+            async def extract_image():
+                result = await llm_gateway.agenerate_with_image(
+                    prompt=prompt,
+                    image_data=data_uri,
+                    provider=provider,
+                    model=model
+                )
+                return result.get("text", ""), None
+
+            extracted_text, _, cache_hit = await extraction_cache.get_or_extract(
+                content, f"bar_menu.vision:{provider}:{model}", extract_image,
+                endpoint="bar.menus_extract", params={"prompt": prompt},
             )
-            extracted_text = result.get("text", "")
 
             return {
                 "success": True,
                 "extracted_text": extracted_text,
-                "menu_type": menu_type
+                "menu_type": menu_type,
+                "cache_hit": cache_hit
+            }
+        elif file.content_type == 'application/pdf' or (file.filename or '').lower().endswith('.pdf'):
+            # Text layer first, OCR only for image-only pages
+            from backend.services.pdf_extraction import pdf_extraction_engine
+
+            async def extract_pdf():
+                result = await pdf_extraction_engine.extract(content)
+                return pdf_result(result)
+
+            extracted_text, _, cache_hit = await extraction_cache.get_or_extract(
+                content, "pdf_extraction", extract_pdf,
+                endpoint="bar.menus_extract", params=ocr_settings(),
+            )
+
+            return {
+                "success": True,
+                "extracted_text": extracted_text,
+                "menu_type": menu_type,
+                "cache_hit": cache_hit
             }
         else:
-            # For PDF, we'd need a PDF parser library
-            # For now, return a placeholder
             raise HTTPException(
                 status_code=400,
-                detail="PDF extraction not yet implemented. Please use JPG or PNG images."
+                detail="Unsupported file type. Please use PDF, JPG or PNG."
             )
 
     except Exception as e:
@@ -542,7 +569,7 @@ async def create_menu(
         # Index to Elasticsearch for RAG chatbot
         try:
             # Delete all old menu documents first to avoid chatbot confusion
-            bar_es_service.delete_all_menus()
+            await bar_es_service.delete_all_menus()
 
             menu_dict = {
                 "id": menu.id,
@@ -552,7 +579,7 @@ async def create_menu(
                 "display_order": menu.display_order,
                 "created_at": menu.created_at.isoformat() if menu.created_at else None
             }
-            bar_es_service.index_menu(menu_dict)
+            await bar_es_service.index_menu(menu_dict)
         except Exception as es_error:
             # Log error but don't fail the entire request
             print(f"⚠️ Elasticsearch indexing failed (non-critical): {es_error}")
@@ -663,7 +690,7 @@ async def publish_featured_items(
 
         # Index in Elasticsearch for RAG chat
         try:
-            es_service = BarElasticsearchService()
+            es_service = bar_es_service
             # Convert SQLAlchemy model to dict for Elasticsearch
             bar_info_dict = {
                 "description": updated_bar.description,
@@ -677,7 +704,7 @@ async def publish_featured_items(
                 "opening_hours": updated_bar.opening_hours,
                 "featured_items": updated_bar.featured_items
             }
-            es_service.index_bar_info(bar_info_dict)
+            await es_service.index_bar_info(bar_info_dict)
         except Exception as es_error:
             # Log error but don't fail the entire request
             print(f"⚠️ Elasticsearch indexing failed (non-critical): {es_error}")
@@ -803,7 +830,7 @@ async def admin_create_team_member(
             "is_published": team_member.is_published,
             "created_at": team_member.created_at.isoformat() if team_member.created_at else None
         }
-        bar_es_service.index_team_member(team_dict)
+        await bar_es_service.index_team_member(team_dict)
 
     return team_member
 
@@ -829,7 +856,7 @@ async def admin_update_team_member(
         "is_published": team_member.is_published,
         "created_at": team_member.created_at.isoformat() if team_member.created_at else None
     }
-    bar_es_service.index_team_member(team_dict)
+    await bar_es_service.index_team_member(team_dict)
 
     return team_member
 
@@ -846,6 +873,6 @@ async def admin_delete_team_member(
         raise HTTPException(status_code=404, detail="Team member not found")
 
     # Delete from Elasticsearch
-    bar_es_service.delete_team_member(team_id)
+    await bar_es_service.delete_team_member(team_id)
 
     return None
@@ -8,6 +8,7 @@ from typing import List, Optional, Dict, Any
 from backend.services.bar_chat_service import bar_chat_service
 from backend.services.bar_elasticsearch_service import bar_es_service
 from backend.services.bar_service import BarService
+from backend.services.sse import sse_event, sse_response
 from backend.database import get_db
 from sqlalchemy.orm import Session
 import logging
@@ -73,6 +74,41 @@ async def send_message(chat_msg: ChatMessage, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/message/stream")
+async def stream_message(chat_msg: ChatMessage, db: Session = Depends(get_db)):
+    """
+    Streaming variant of ``/message`` (Server-Sent-Events)
+
+    Emits a ``sources`` event with the RAG context first, then ``token``
+    events as the LLM generates and a final ``done`` event.
+    """
+    settings = BarService.get_settings(db)
+    llm_provider = settings.llm_provider if settings else "ollama"
+
+    try:
+        context, tokens = await bar_chat_service.chat_stream(
+            message=chat_msg.message,
+            language=chat_msg.language,
+            llm_provider=llm_provider,
+            conversation_history=chat_msg.conversation_history
+        )
+    except Exception as e:
+        logger.error(f"❌ Chat error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        yield sse_event("sources", {"context_used": context})
+        try:
+            async for token in tokens:
+                yield sse_event("token", {"text": token})
+            yield sse_event("done", {"language": chat_msg.language, "llm_provider": llm_provider})
+        except Exception as e:
+            logger.error(f"❌ Chat stream error: {e}")
+            yield sse_event("error", {"detail": str(e)})
+
+    return sse_response(events())
+
+
 @router.post("/index/create")
 async def create_search_index():
     """
@@ -81,7 +117,7 @@ async def create_search_index():
     **Admin only** - Creates the search index with multilingual support
     """
     try:
-        success = bar_es_service.create_index()
+        success = await bar_es_service.create_index()
         if success:
             return {"message": "Index created successfully", "index": bar_es_service.index_name}
         else:
@@ -120,7 +156,7 @@ async def populate_search_index(db: Session = Depends(get_db)):
         }
 
         # Index data
-        success = bar_es_service.index_bar_info(bar_data)
+        success = await bar_es_service.index_bar_info(bar_data)
         if success:
             return {
                 "message": "Bar data indexed successfully",
@@ -151,7 +187,7 @@ async def get_index_status():
             )
 
         # Check if index exists
-        exists = bar_es_service.es.indices.exists(index=bar_es_service.index_name)
+        exists = await bar_es_service.es.indices.exists(index=bar_es_service.index_name)
 
         if not exists:
             return IndexStatus(
@@ -161,7 +197,7 @@ async def get_index_status():
             )
 
         # Get document count
-        count_response = bar_es_service.es.count(index=bar_es_service.index_name)
+        count_response = await bar_es_service.es.count(index=bar_es_service.index_name)
         doc_count = count_response.get("count", 0)
 
         return IndexStatus(
@@ -191,7 +227,7 @@ async def search_bar_info(query: str, language: str = "en", limit: int = 5):
     - **limit**: Maximum number of results
     """
     try:
-        results = bar_es_service.search(query, language, limit)
+        results = await bar_es_service.search(query, language, limit)
         return {
             "query": query,
             "language": language,
@@ -1,7 +1,7 @@
 """Chat API endpoints with RAG (Retrieval-Augmented Generation)."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from backend.auth.dependencies import current_active_user
@@ -10,93 +10,88 @@ from backend.models.user import User
 from backend.schemas.chat import ChatMessageRequest, ChatMessageResponse, DocumentSource
 from backend.services.vector_service import vector_service
 from backend.services.llm_gateway import LLMGateway
+from backend.services.sse import sse_event, sse_response
 
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 llm_gateway = LLMGateway()
 
 
-@router.post("/message", response_model=ChatMessageResponse)
-async def send_chat_message(
+async def _build_rag_prompt(
     request: ChatMessageRequest,
-    session: AsyncSession = Depends(get_async_session),
-    user: User = Depends(current_active_user),
-):
+    session: AsyncSession,
+    user: User,
+) -> Tuple[str, List[DocumentSource]]:
     """
-    Send a chat message with RAG (Retrieval-Augmented Generation).
+    Retrieve context for a chat message and build the RAG prompt.
 
-    Uses vector search to find relevant documents, then generates
-    a response using the LLM with the retrieved context.
+    Returns:
+        Tuple of (prompt, sources)
+    """
+    sources = []
 
-    **Two RAG modes:**
-    1. **Database RAG** (default): Searches user's stored documents in PostgreSQL
-    2. **In-Memory RAG** (CV Matcher): Pass documents directly in request body
+    # Mode 1: In-Memory RAG (bypasses database)
+    if request.documents:
+        print(f"📄 In-Memory RAG mode: {len(request.documents)} documents provided")
 
-    Perfect for CV Matcher: Ask questions about match results,
-    specific skills, requirements, etc.
-    """
-    try:
-        sources = []
-
-        # Mode 1: In-Memory RAG (bypasses database)
-        if request.documents:
-            print(f"📄 In-Memory RAG mode: {len(request.documents)} documents provided")
-
-            # Convert Pydantic models to dicts
-            docs_dict = [doc.dict() for doc in request.documents]
-
-            # Search in-memory documents
-            relevant_docs = vector_service.search_in_memory_documents(
-                query_text=request.message,
-                documents=docs_dict,
-                limit=request.context_limit or 3
-            )
-
-            if not relevant_docs:
-                context = "No relevant content found in provided documents."
-            else:
-                # Build context from in-memory docs with FULL content
-                context_parts = []
-                for idx, (doc, distance) in enumerate(relevant_docs, 1):
-                    # Use FULL content for better answers (no truncation)
-                    full_content = doc['content']
-                    context_parts.append(f"[Document {idx} - {doc['filename']}]:\n{full_content}")
-
-                    # Build sources list
-                    sources.append(DocumentSource(
-                        document_id=f"memory_{idx}",
-                        filename=doc['filename'],
-                        type=doc['type'],
-                        relevance_score=1.0 - distance
-                    ))
+        # Convert Pydantic models to dicts
+        docs_dict = [doc.dict() for doc in request.documents]
+
+        # Search in-memory documents
+        relevant_docs = await vector_service.search_in_memory_documents(
+            query_text=request.message,
+            documents=docs_dict,
+            limit=request.context_limit or 3
+        )
 
-                context = "\n\n---\n\n".join(context_parts)
+        if not relevant_docs:
+            context = "No relevant content found in provided documents."
+        else:
+            # Build context from in-memory docs with FULL content
+            context_parts = []
+            for idx, (doc, distance) in enumerate(relevant_docs, 1):
+                # Use FULL content for better answers (no truncation)
+                full_content = doc['content']
+                context_parts.append(f"[Document {idx} - {doc['filename']}]:\n{full_content}")
+
+                # Build sources list
+                sources.append(DocumentSource(
+                    document_id=f"memory_{idx}",
+                    filename=doc['filename'],
+                    type=doc['type'],
+                    relevance_score=1.0 - distance
+                ))
+
+            context = "\n\n---\n\n".join(context_parts)
+
+    # Mode 2: Database RAG (traditional flow)
+    else:
+        print(f"💾 Database RAG mode: searching user documents")
+
+        # Vector Search: the best-matching chunks (not truncated whole documents)
+        relevant_chunks = await vector_service.search_similar_chunks(
+            session=session,
+            query_text=request.message,
+            user_id=user.id,
+            project_id=request.project_id,
+            limit=request.context_limit or 3
+        )
 
-        # Mode 2: Database RAG (traditional flow)
+        if not relevant_chunks:
+            # No documents found - answer without context
+            context = "No relevant documents found in the database."
         else:
-            print(f"💾 Database RAG mode: searching user documents")
-
-            # Vector Search: Find relevant documents in database
-            relevant_docs = await vector_service.search_similar_documents(
-                session=session,
-                query_text=request.message,
-                user_id=user.id,
-                project_id=request.project_id,
-                limit=request.context_limit or 3
-            )
-
-            if not relevant_docs:
-                # No documents found - answer without context
-                context = "No relevant documents found in the database."
-            else:
-                # Build context from database documents
-                context_parts = []
-                for idx, (doc, distance) in enumerate(relevant_docs, 1):
-                    # Truncate long content
-                    content_preview = doc.content[:500] + "..." if len(doc.content) > 500 else doc.content
-                    context_parts.append(f"[Document {idx}]: {content_preview}")
-
-                    # Build sources list
+            # Build context from the matching chunks
+            context_parts = []
+            seen_documents = set()
+            for idx, (chunk, distance) in enumerate(relevant_chunks, 1):
+                doc = chunk.document
+                source = doc.filename or doc.url or "text document"
+                context_parts.append(f"[Document {idx} - {source}]:\n{chunk.content}")
+
+                # One source per document, scored by its best chunk (results are ordered)
+                if doc.id not in seen_documents:
+                    seen_documents.add(doc.id)
                     sources.append(DocumentSource(
                         document_id=str(doc.id),
                         filename=doc.filename,
@@ -104,12 +99,12 @@ async def send_chat_message(
                         relevance_score=1.0 - distance
                     ))
 
-                context = "\n\n".join(context_parts)
+            context = "\n\n---\n\n".join(context_parts)
 
-        # 3. Build RAG prompt (auf Deutsch für bessere Ergebnisse)
-        if request.system_context:
-            # Include custom context (e.g., match result summary)
-            rag_prompt = f"""System-Kontext:
+    # 3. Build RAG prompt (auf Deutsch für bessere Ergebnisse)
+    if request.system_context:
+        # Include custom context (e.g., match result summary)
+        rag_prompt = f"""System-Kontext:
 {request.system_context}
 
 Relevante Dokumente:
@@ -118,16 +113,41 @@ Relevante Dokumente:
 Benutzerfrage: {request.message}
 
 Beantworte die Frage auf Deutsch basierend auf dem System-Kontext und den relevanten Dokumenten. Sei präzise und hilfreich. Zitiere spezifische Details aus den Dokumenten."""
-        else:
-            rag_prompt = f"""Kontext aus Dokumenten:
+    else:
+        rag_prompt = f"""Kontext aus Dokumenten:
 {context}
 
 Benutzerfrage: {request.message}
 
 Beantworte die Frage auf Deutsch basierend auf dem obigen Kontext. Wenn der Kontext keine relevanten Informationen enthält, sage es deutlich."""
 
+    return rag_prompt, sources
+
+
+@router.post("/message", response_model=ChatMessageResponse)
+async def send_chat_message(
+    request: ChatMessageRequest,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+):
+    """
+    Send a chat message with RAG (Retrieval-Augmented Generation).
+
+    Uses vector search to find relevant documents, then generates
+    a response using the LLM with the retrieved context.
+
+    **Two RAG modes:**
+    1. **Database RAG** (default): Searches user's stored documents in PostgreSQL
+    2. **In-Memory RAG** (CV Matcher): Pass documents directly in request body
+
+    Perfect for CV Matcher: Ask questions about match results,
+    specific skills, requirements, etc.
+    """
+    try:
+        rag_prompt, sources = await _build_rag_prompt(request, session, user)
+
         # 4. LLM Generation
-        llm_response = llm_gateway.generate(
+        llm_response = await llm_gateway.agenerate(
             prompt=rag_prompt,
             provider=request.provider or "ollama",
             model=request.model,
@@ -148,3 +168,43 @@ Beantworte die Frage auf Deutsch basierend auf dem obigen Kontext. Wenn der Kont
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Chat message failed: {str(e)}"
         )
+
+
+@router.post("/message/stream")
+async def stream_chat_message(
+    request: ChatMessageRequest,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+):
+    """
+    Streaming variant of ``/chat/message`` (Server-Sent-Events).
+
+    Emits a ``sources`` event with the retrieved documents first, then one
+    ``token`` event per generated text chunk and a final ``done`` event.
+    """
+    try:
+        rag_prompt, sources = await _build_rag_prompt(request, session, user)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Chat message failed: {str(e)}"
+        )
+
+    provider = request.provider or "ollama"
+
+    async def events():
+        yield sse_event("sources", [source.model_dump() for source in sources])
+        try:
+            async for token in llm_gateway.astream(
+                prompt=rag_prompt,
+                provider=provider,
+                model=request.model,
+                temperature=request.temperature or 0.7,
+                max_tokens=request.max_tokens or 500,
+            ):
+                yield sse_event("token", {"text": token})
+            yield sse_event("done", {"provider": provider, "model": request.model})
+        except Exception as e:
+            yield sse_event("error", {"detail": f"Chat message failed: {str(e)}"})
+
+    return sse_response(events())
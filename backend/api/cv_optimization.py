@@ -6,6 +6,7 @@ import shutil
 import tempfile
 
 from backend.services.document_processor import document_processor
+from backend.services.extraction_cache import extraction_cache, ocr_settings, pdf_result
 
 
 router = APIRouter(prefix="/cv-optimization", tags=["cv-optimization"])
@@ -58,8 +59,15 @@ async def extract_cv_text(
                     content = f.read()
             elif file_type == 'pdf':
                 # PDF file
-                with open(temp_path, "rb") as f:
-                    content = document_processor.extract_from_pdf(f)
+                async def extract_pdf():
+                    with open(temp_path, "rb") as f:
+                        result = await document_processor.aextract_from_pdf(f)
+                    return pdf_result(result)
+
+                content, _, _ = await extraction_cache.get_or_extract(
+                    temp_path, "pdf_extraction", extract_pdf,
+                    endpoint="cv_optimization.extract_text", params=ocr_settings(),
+                )
             elif file_type == 'docx':
                 # DOCX file
                 with open(temp_path, "rb") as f:
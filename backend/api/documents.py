@@ -19,6 +19,7 @@ from backend.schemas.document import (
     DocumentTextRequest,
 )
 from backend.services.document_processor import document_processor
+from backend.services.extraction_cache import extraction_cache, ocr_settings, pdf_result
 from backend.services.vector_service import vector_service
 from backend.services.document_summary_service import document_summary_service
 from backend.config import settings
@@ -78,6 +79,7 @@ async def upload_document(
             shutil.copyfileobj(file.file, buffer)
 
         # Extract text
+        pdf_extraction = None
         if doc_type == DocumentType.TXT:
             # Plain text file - read directly
             with open(temp_path, "r", encoding="utf-8") as f:
@@ -86,7 +88,17 @@ async def upload_document(
             # Binary files (PDF, DOC, DOCX)
             with open(temp_path, "rb") as f:
                 if doc_type == DocumentType.PDF:
-                    content = document_processor.extract_from_pdf(f)
+                    # Text layer first, OCR only for image-only pages (cached by file hash)
+                    async def extract_pdf():
+                        result = await document_processor.aextract_from_pdf(f)
+                        return pdf_result(result)
+
+                    content, pdf_extraction, cache_hit = await extraction_cache.get_or_extract(
+                        temp_path, "pdf_extraction", extract_pdf,
+                        endpoint="documents.upload", params=ocr_settings(),
+                    )
+                    if pdf_extraction is not None:
+                        pdf_extraction["cache_hit"] = cache_hit
                 elif doc_type in (DocumentType.DOC, DocumentType.DOCX):
                     content = document_processor.extract_from_docx(f)
                 else:
@@ -102,7 +114,10 @@ async def upload_document(
             type=doc_type,
             filename=file.filename,
             content=content,
-            doc_metadata={"original_size": os.path.getsize(temp_path)}
+            doc_metadata={
+                "original_size": os.path.getsize(temp_path),
+                **({"pdf_extraction": pdf_extraction} if pdf_extraction else {}),
+            }
         )
 
         session.add(document)
@@ -3,10 +3,10 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 import fastapi
-from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
-from sqlalchemy import select, text
+from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Header
+from sqlalchemy import select, text, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from backend.database import get_async_session
+from backend.database import get_async_session, async_session_maker
 from backend.auth.dependencies import current_active_user
 from backend.models.user import User
 from backend.models.elasticsearch_showcase import UserElasticProfile, ElasticJobAnalysis
@@ -27,6 +27,8 @@ from backend.services.logstash_service import LogstashService
 from backend.services.demo_data_generator import DemoDataGenerator
 from backend.services.elasticsearch_vector_service import ElasticsearchVectorService
 from backend.services.rag_metrics_logger import get_rag_metrics_logger
+from backend.services.job_queue import job_queue, JobContext
+import asyncio
 import logging
 import json
 import re
@@ -291,7 +293,7 @@ Return EXACTLY this JSON format:
 
     try:
         logger.info(f"Extracting CV info with LLM ({provider})...")
-        response_dict = llm_gateway.generate(prompt=prompt, provider=provider, temperature=0.3)
+        response_dict = await llm_gateway.agenerate(prompt=prompt, provider=provider, temperature=0.3, cache=True)
         response = response_dict.get("response", "")
 
         # Extract JSON from response
@@ -418,7 +420,7 @@ Return ONLY valid JSON in this exact format:
 """
 
     try:
-        response_dict = llm_gateway.generate(prompt=prompt, provider=provider)
+        response_dict = await llm_gateway.agenerate(prompt=prompt, provider=provider)
         response = response_dict.get("response", "")
 
         # Extract JSON from response
@@ -491,299 +493,344 @@ Return ONLY valid JSON in this exact format:
 # Profile Endpoints
 # ============================================================================
 
-@router.post("/profile", response_model=UserProfileResponse)
+@router.post("/profile", status_code=202)
 async def create_or_update_profile(
     profile_data: UserProfileRequest,
     provider: str = Query("grok", description="LLM provider for skill extraction (ollama, grok, anthropic)"),
     skip_processing: bool = Query(False, description="Skip LLM processing and text deduplication (URLs still crawled)"),
-    db: AsyncSession = Depends(get_async_session),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     user: User = Depends(current_active_user),
 ):
     """
-    Create or update user profile with CV and documents.
+    Create or update user profile with CV and documents (background job).
 
-    This endpoint:
+    The import job:
     1. Stores CV, cover letter, and URLs in PostgreSQL
     2. Optionally extracts skills, experience, education using LLM (skip_processing=False)
     3. Crawls URLs for additional content (always performed)
     4. Optionally deduplicates text content (skip_processing=False)
     5. Indexes data in Elasticsearch for fast searching
 
+    Returns 202 with the job id; poll GET /jobs/{job_id} - the job result is the
+    profile (UserProfileResponse) including the import status fields.
+
     Args:
         skip_processing: If True, skips LLM analysis and text deduplication.
                         URLs are still crawled but content is not AI-processed.
     """
-    try:
-        # Store user_id early to avoid lazy loading after rollback
-        user_id = str(user.id)
+    job = await job_queue.enqueue(
+        "showcase.import_profile",
+        {
+            "user_id": str(user.id),
+            "profile": profile_data.model_dump(mode="json"),
+            "provider": provider,
+            "skip_processing": skip_processing,
+        },
+        user_id=str(user.id),
+        idempotency_key=idempotency_key,
+    )
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": job["status_url"],
+    }
 
-        # Initialize import status tracking
-        elasticsearch_indexed = False
-        pgvector_chunks = 0
-        homepage_crawled = False
-        linkedin_crawled = False
-
-        logger.info(f"🚀 Starting CV import for user {user_id} (skip_processing={skip_processing})")
-
-        # Conditionally extract CV info with LLM
-        if skip_processing:
-            logger.info(f"📋 Step 1/7: Skipping LLM extraction (raw import mode)")
-            skills = []
-            experience_years = None
-            education_level = None
-            job_titles = []
-        else:
-            logger.info(f"📋 Step 1/7: Extracting CV information with LLM provider: {provider}")
-            # Extract ALL information from CV using LLM (more accurate than regex)
-            cv_info = await extract_cv_info_with_llm(profile_data.cv_text, provider)
-            skills = cv_info.get("skills", [])
-            experience_years = cv_info.get("experience_years")
-            education_level = cv_info.get("education_level")
-            job_titles = cv_info.get("job_titles", [])
-
-        logger.info(f"📋 Step 2/7: Saving profile to database...")
-        # Check if profile exists
-        statement = select(UserElasticProfile).where(UserElasticProfile.user_id == user_id)
-        result = await db.execute(statement)
-        existing_profile = result.scalars().first()
-
-        if existing_profile:
-            # Update existing profile
-            existing_profile.cv_text = profile_data.cv_text
-            existing_profile.cover_letter_text = profile_data.cover_letter_text
-            existing_profile.homepage_url = profile_data.homepage_url
-            existing_profile.linkedin_url = profile_data.linkedin_url
-            existing_profile.skills_extracted = skills
-            existing_profile.experience_years = experience_years
-            existing_profile.education_level = education_level
-            existing_profile.job_titles = job_titles
-            existing_profile.updated_at = datetime.utcnow()
-
-            db.add(existing_profile)
-            await db.commit()
-            await db.refresh(existing_profile)
-            profile = existing_profile
-        else:
-            # Create new profile
-            new_profile = UserElasticProfile(
-                user_id=user_id,
-                cv_text=profile_data.cv_text,
-                cover_letter_text=profile_data.cover_letter_text,
-                homepage_url=profile_data.homepage_url,
-                linkedin_url=profile_data.linkedin_url,
-                skills_extracted=skills,
-                experience_years=experience_years,
-                education_level=education_level,
-                job_titles=job_titles,
-            )
-            db.add(new_profile)
-            await db.commit()
-            await db.refresh(new_profile)
-            profile = new_profile
-
-        logger.info(f"📋 Step 3/7: Deleting old vector data...")
-        # Delete existing vector data to avoid duplicates (pgvector only)
-        # Note: If this fails, we skip all pgvector operations to avoid session errors
-        pgvector_available = False
-        logger.info(f"Deleting existing vector data for user {user_id}")
-        try:
-            # Delete from pgvector (ChromaDB replacement)
-            if vector_service.is_available():
-                await vector_service.delete_collection(session=db, user_id=UUID(user_id), project_id=None)
-                logger.info(f"✅ Deleted existing pgvector data for user {user_id}")
-                pgvector_available = True  # Only set to True if delete succeeded
-        except Exception as e:
-            logger.warning(f"⚠️  Failed to delete pgvector data: {e}")
-            logger.warning(f"⚠️  Skipping all pgvector operations (session may be in error state)")
-            # Don't manipulate session - it causes greenlet_spawn errors
 
-        try:
-            # Delete from Elasticsearch
-            await es_service.delete_user_cv_data(user_id=user_id)
-            logger.info(f"✅ Deleted existing Elasticsearch data for user {user_id}")
-        except Exception as e:
-            logger.warning(f"⚠️  Failed to delete Elasticsearch data: {e}")
+@job_queue.handler("showcase.import_profile")
+async def import_profile_job(job: JobContext, payload: dict) -> dict:
+    """Run a queued profile import; the job result is the imported profile."""
+    profile_data = UserProfileRequest(**payload["profile"])
+    try:
+        async with async_session_maker() as db:
+            profile = await import_profile(
+                db, payload["user_id"], profile_data, payload["provider"], payload["skip_processing"], job
+            )
+            return UserProfileResponse.model_validate(profile).model_dump(mode="json")
+    except Exception as e:
+        logger.error(f"❌ Error creating/updating profile for user: {e}")
+        logger.error(f"Error type: {type(e).__name__}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise
 
-        logger.info(f"📋 Step 4/7: Crawling URLs (Homepage + LinkedIn)...")
-        # Crawl URLs and extract additional content
-        additional_content = ""
 
-        # Crawl Homepage URL
-        if profile_data.homepage_url:
-            try:
-                logger.info(f"Crawling homepage: {profile_data.homepage_url}")
-                homepage_content = await crawl_url(profile_data.homepage_url)
-                if homepage_content:
-                    additional_content += f"\n\n=== Homepage Content ({profile_data.homepage_url}) ===\n{homepage_content}\n"
-                    logger.info(f"✅ Successfully crawled homepage: {len(homepage_content)} chars")
-                    homepage_crawled = True
-            except Exception as e:
-                logger.warning(f"⚠️  Failed to crawl homepage: {e}")
+async def import_profile(
+    db: AsyncSession,
+    user_id: str,
+    profile_data: UserProfileRequest,
+    provider: str,
+    skip_processing: bool,
+    job: Optional[JobContext] = None,
+) -> UserElasticProfile:
+    """
+    Import CV, cover letter and crawled URLs into the profile, Elasticsearch and pgvector.
 
-        # Crawl LinkedIn URL
-        if profile_data.linkedin_url:
-            try:
-                logger.info(f"Crawling LinkedIn: {profile_data.linkedin_url}")
-                linkedin_content = await crawl_url(profile_data.linkedin_url)
-                if linkedin_content:
-                    additional_content += f"\n\n=== LinkedIn Profile ({profile_data.linkedin_url}) ===\n{linkedin_content}\n"
-                    logger.info(f"✅ Successfully crawled LinkedIn: {len(linkedin_content)} chars")
-                    linkedin_crawled = True
-            except Exception as e:
-                logger.warning(f"⚠️  Failed to crawl LinkedIn: {e}")
-
-        # Combine all content for indexing
-        full_cv_content = profile_data.cv_text
-        if profile_data.cover_letter_text:
-            full_cv_content += f"\n\n=== Cover Letter ===\n{profile_data.cover_letter_text}"
-        if additional_content:
-            full_cv_content += additional_content
-
-        # Deduplicate content to avoid redundant information (only if not skipping processing)
-        # (e.g., "Cognizant" appears in CV, Homepage, AND LinkedIn)
-        if skip_processing:
-            logger.info(f"Skipping deduplication (raw import mode) - content length: {len(full_cv_content)} chars")
-            full_cv_content_deduplicated = full_cv_content
-        else:
-            logger.info(f"Original content length: {len(full_cv_content)} chars")
-            full_cv_content_deduplicated = deduplicate_text_content(full_cv_content, similarity_threshold=0.75)
-            logger.info(f"Deduplicated content length: {len(full_cv_content_deduplicated)} chars")
-            logger.info(f"Removed {len(full_cv_content) - len(full_cv_content_deduplicated)} chars of duplicate content")
-
-        logger.info(f"📋 Step 5/7: Indexing in Elasticsearch...")
-        # Index in Elasticsearch FIRST (before profile update)
-        # This way, if profile update fails due to aborted transaction, Elasticsearch is already indexed
-        await es_service.index_cv_data(
+    Reports each of the 7 steps as job progress when run as a background job.
+    """
+    async def step(number: int, message: str):
+        logger.info(f"📋 Step {number}/7: {message}")
+        if job is not None:
+            await job.progress((number - 1) / 7, message)
+
+    # Initialize import status tracking
+    elasticsearch_indexed = False
+    pgvector_chunks = 0
+    homepage_crawled = False
+    linkedin_crawled = False
+
+    logger.info(f"🚀 Starting CV import for user {user_id} (skip_processing={skip_processing})")
+
+    # Conditionally extract CV info with LLM
+    if skip_processing:
+        await step(1, f"Skipping LLM extraction (raw import mode)")
+        skills = []
+        experience_years = None
+        education_level = None
+        job_titles = []
+    else:
+        await step(1, f"Extracting CV information with LLM provider: {provider}")
+        # Extract ALL information from CV using LLM (more accurate than regex)
+        cv_info = await extract_cv_info_with_llm(profile_data.cv_text, provider)
+        skills = cv_info.get("skills", [])
+        experience_years = cv_info.get("experience_years")
+        education_level = cv_info.get("education_level")
+        job_titles = cv_info.get("job_titles", [])
+
+    await step(2, f"Saving profile to database...")
+    # Check if profile exists
+    statement = select(UserElasticProfile).where(UserElasticProfile.user_id == user_id)
+    result = await db.execute(statement)
+    existing_profile = result.scalars().first()
+
+    if existing_profile:
+        # Update existing profile
+        existing_profile.cv_text = profile_data.cv_text
+        existing_profile.cover_letter_text = profile_data.cover_letter_text
+        existing_profile.homepage_url = profile_data.homepage_url
+        existing_profile.linkedin_url = profile_data.linkedin_url
+        existing_profile.skills_extracted = skills
+        existing_profile.experience_years = experience_years
+        existing_profile.education_level = education_level
+        existing_profile.job_titles = job_titles
+        existing_profile.updated_at = datetime.utcnow()
+
+        db.add(existing_profile)
+        await db.commit()
+        await db.refresh(existing_profile)
+        profile = existing_profile
+    else:
+        # Create new profile
+        new_profile = UserElasticProfile(
             user_id=user_id,
-            cv_text=full_cv_content_deduplicated,  # Deduplicated content (no redundant sentences)
-            skills=skills,
+            cv_text=profile_data.cv_text,
+            cover_letter_text=profile_data.cover_letter_text,
+            homepage_url=profile_data.homepage_url,
+            linkedin_url=profile_data.linkedin_url,
+            skills_extracted=skills,
             experience_years=experience_years,
             education_level=education_level,
             job_titles=job_titles,
-            homepage_url=profile_data.homepage_url,
-            linkedin_url=profile_data.linkedin_url
         )
-        logger.info(f"✅ Indexed CV in Elasticsearch for user {user_id}")
-        elasticsearch_indexed = True
-
-        logger.info(f"📋 Step 6/7: Updating profile with crawled content...")
-        # Update profile with full content (including crawled data)
-        # Note: If pgvector delete failed, transaction may be in aborted state
-        # In that case, skip the profile update (Elasticsearch is already indexed)
-        # (Profile already has basic CV data from initial creation)
-        session_aborted = False
+        db.add(new_profile)
+        await db.commit()
+        await db.refresh(new_profile)
+        profile = new_profile
+
+    await step(3, f"Deleting old vector data...")
+    # Delete existing vector data to avoid duplicates (pgvector only)
+    # Note: If this fails, we skip all pgvector operations to avoid session errors
+    pgvector_available = False
+    logger.info(f"Deleting existing vector data for user {user_id}")
+    try:
+        # Delete from pgvector (ChromaDB replacement)
+        if await vector_service.is_available():
+            await vector_service.delete_collection(session=db, user_id=UUID(user_id), project_id=None)
+            logger.info(f"✅ Deleted existing pgvector data for user {user_id}")
+            pgvector_available = True  # Only set to True if delete succeeded
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to delete pgvector data: {e}")
+        logger.warning(f"⚠️  Skipping all pgvector operations (session may be in error state)")
+        # Don't manipulate session - it causes greenlet_spawn errors
+
+    try:
+        # Delete from Elasticsearch
+        await es_service.delete_user_cv_data(user_id=user_id)
+        logger.info(f"✅ Deleted existing Elasticsearch data for user {user_id}")
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to delete Elasticsearch data: {e}")
+
+    await step(4, f"Crawling URLs (Homepage + LinkedIn)...")
+    # Crawl URLs and extract additional content
+    additional_content = ""
+
+    # Crawl Homepage URL
+    if profile_data.homepage_url:
         try:
-            profile.cv_text = full_cv_content_deduplicated
-            db.add(profile)
-            await db.commit()
-            await db.refresh(profile)
-            logger.info(f"✅ Updated profile cv_text with crawled content: {len(full_cv_content_deduplicated)} chars")
+            logger.info(f"Crawling homepage: {profile_data.homepage_url}")
+            homepage_content = await crawl_url(profile_data.homepage_url)
+            if homepage_content:
+                additional_content += f"\n\n=== Homepage Content ({profile_data.homepage_url}) ===\n{homepage_content}\n"
+                logger.info(f"✅ Successfully crawled homepage: {len(homepage_content)} chars")
+                homepage_crawled = True
         except Exception as e:
-            logger.warning(f"⚠️ Profile cv_text update failed (transaction aborted): {e}")
-            logger.warning(f"⚠️ Skipping profile update (Elasticsearch already indexed)")
-            # Rollback to clear aborted transaction state
-            await db.rollback()
-            session_aborted = True
-            # No more awaits after rollback - just continue to logging and return
+            logger.warning(f"⚠️  Failed to crawl homepage: {e}")
 
-        logger.info(f"📋 Step 7/7: Indexing in pgvector...")
-        # Index in pgvector (for fair comparison with Elasticsearch)
-        # Only if delete succeeded AND session not aborted (otherwise can't use db session)
-        if pgvector_available and not session_aborted:
-            try:
-                if vector_service.is_available():
-                    logger.info(f"📝 Preparing pgvector indexing for user {user_id}...")
-                    # Prepare document content with all CV information (deduplicated!)
-                    cv_content = f"""
+    # Crawl LinkedIn URL
+    if profile_data.linkedin_url:
+        try:
+            logger.info(f"Crawling LinkedIn: {profile_data.linkedin_url}")
+            linkedin_content = await crawl_url(profile_data.linkedin_url)
+            if linkedin_content:
+                additional_content += f"\n\n=== LinkedIn Profile ({profile_data.linkedin_url}) ===\n{linkedin_content}\n"
+                logger.info(f"✅ Successfully crawled LinkedIn: {len(linkedin_content)} chars")
+                linkedin_crawled = True
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to crawl LinkedIn: {e}")
+
+    # Combine all content for indexing
+    full_cv_content = profile_data.cv_text
+    if profile_data.cover_letter_text:
+        full_cv_content += f"\n\n=== Cover Letter ===\n{profile_data.cover_letter_text}"
+    if additional_content:
+        full_cv_content += additional_content
+
+    # Deduplicate content to avoid redundant information (only if not skipping processing)
+    # (e.g., "Cognizant" appears in CV, Homepage, AND LinkedIn)
+    if skip_processing:
+        logger.info(f"Skipping deduplication (raw import mode) - content length: {len(full_cv_content)} chars")
+        full_cv_content_deduplicated = full_cv_content
+    else:
+        logger.info(f"Original content length: {len(full_cv_content)} chars")
+        full_cv_content_deduplicated = deduplicate_text_content(full_cv_content, similarity_threshold=0.75)
+        logger.info(f"Deduplicated content length: {len(full_cv_content_deduplicated)} chars")
+        logger.info(f"Removed {len(full_cv_content) - len(full_cv_content_deduplicated)} chars of duplicate content")
+
+    await step(5, f"Indexing in Elasticsearch...")
+    # Index in Elasticsearch FIRST (before profile update)
+    # This way, if profile update fails due to aborted transaction, Elasticsearch is already indexed
+    await es_service.index_cv_data(
+        user_id=user_id,
+        cv_text=full_cv_content_deduplicated,  # Deduplicated content (no redundant sentences)
+        skills=skills,
+        experience_years=experience_years,
+        education_level=education_level,
+        job_titles=job_titles,
+        homepage_url=profile_data.homepage_url,
+        linkedin_url=profile_data.linkedin_url
+    )
+    logger.info(f"✅ Indexed CV in Elasticsearch for user {user_id}")
+    elasticsearch_indexed = True
+
+    await step(6, f"Updating profile with crawled content...")
+    # Update profile with full content (including crawled data)
+    # Note: If pgvector delete failed, transaction may be in aborted state
+    # In that case, skip the profile update (Elasticsearch is already indexed)
+    # (Profile already has basic CV data from initial creation)
+    session_aborted = False
+    try:
+        profile.cv_text = full_cv_content_deduplicated
+        db.add(profile)
+        await db.commit()
+        await db.refresh(profile)
+        logger.info(f"✅ Updated profile cv_text with crawled content: {len(full_cv_content_deduplicated)} chars")
+    except Exception as e:
+        logger.warning(f"⚠️ Profile cv_text update failed (transaction aborted): {e}")
+        logger.warning(f"⚠️ Skipping profile update (Elasticsearch already indexed)")
+        # Rollback to clear aborted transaction state
+        await db.rollback()
+        session_aborted = True
+        # No more awaits after rollback - just continue to logging and return
+
+    await step(7, f"Indexing in pgvector...")
+    # Index in pgvector (for fair comparison with Elasticsearch)
+    # Only if delete succeeded AND session not aborted (otherwise can't use db session)
+    if pgvector_available and not session_aborted:
+        try:
+            if await vector_service.is_available():
+                logger.info(f"📝 Preparing pgvector indexing for user {user_id}...")
+                # Prepare document content with all CV information (deduplicated!)
+                cv_content = f"""
 {full_cv_content_deduplicated}
 
 Skills: {', '.join(skills) if skills else 'N/A'}
 Experience: {experience_years if experience_years else 'N/A'} years
 Education: {education_level if education_level else 'N/A'}
 Job Titles: {', '.join(job_titles) if job_titles else 'N/A'}
-                    """.strip()
+                """.strip()
 
-                    # Add to pgvector with metadata
-                    metadata = {
-                        "type": "cv",
-                        "skills": ",".join(skills) if skills else "",
-                        "job_titles": ",".join(job_titles) if job_titles else "",
-                    }
-                    # Only add non-None values
-                    if experience_years is not None:
-                        metadata["experience_years"] = str(experience_years)
-                    if education_level is not None:
-                        metadata["education_level"] = education_level
-                    if profile_data.homepage_url:
-                        metadata["homepage_url"] = profile_data.homepage_url
-                    if profile_data.linkedin_url:
-                        metadata["linkedin_url"] = profile_data.linkedin_url
-
-                    logger.info(f"📦 Adding documents to pgvector (chunk_size=500)...")
-                    pgvector_chunks = await vector_service.add_documents(
-                        session=db,
-                        user_id=UUID(user_id),
-                        documents=[{
-                            "id": f"cv_{user_id}",
-                            "content": cv_content,
-                            "metadata": metadata
-                        }],
-                        project_id=None,  # Use global collection for elasticsearch showcase
-                        chunk_size=500
-                    )
-                    logger.info(f"✅ Indexed CV in pgvector: {pgvector_chunks} chunks added for user {user_id}")
-                else:
-                    logger.warning("⚠️  pgvector not available - skipping vector indexing")
-            except Exception as e:
-                logger.error(f"❌ pgvector add_documents failed (continuing anyway): {e}")
-                # Profile is already committed - just log the error and continue
-                # Don't fail the request if pgvector fails - Elasticsearch indexing succeeded
-        else:
-            if session_aborted:
-                logger.warning("⚠️  Skipping pgvector add_documents (session aborted after transaction error)")
+                # Add to pgvector with metadata
+                metadata = {
+                    "type": "cv",
+                    "skills": ",".join(skills) if skills else "",
+                    "job_titles": ",".join(job_titles) if job_titles else "",
+                }
+                # Only add non-None values
+                if experience_years is not None:
+                    metadata["experience_years"] = str(experience_years)
+                if education_level is not None:
+                    metadata["education_level"] = education_level
+                if profile_data.homepage_url:
+                    metadata["homepage_url"] = profile_data.homepage_url
+                if profile_data.linkedin_url:
+                    metadata["linkedin_url"] = profile_data.linkedin_url
+
+                logger.info(f"📦 Adding documents to pgvector (chunk_size=500)...")
+                pgvector_chunks = await vector_service.add_documents(
+                    session=db,
+                    user_id=UUID(user_id),
+                    documents=[{
+                        "id": f"cv_{user_id}",
+                        "content": cv_content,
+                        "metadata": metadata
+                    }],
+                    project_id=None,  # Use global collection for elasticsearch showcase
+                    chunk_size=500
+                )
+                logger.info(f"✅ Indexed CV in pgvector: {pgvector_chunks} chunks added for user {user_id}")
             else:
-                logger.warning("⚠️  Skipping pgvector add_documents (delete failed or unavailable)")
-
-        # Log success summary with important metrics
-        logger.info(f"✅ Profile import completed for user {user_id}")
-        logger.info(f"📊 Import Summary:")
-        logger.info(f"  - Skills extracted: {len(skills)}")
-        logger.info(f"  - Experience: {experience_years} years" if experience_years else "  - Experience: N/A")
-        logger.info(f"  - Education: {education_level}" if education_level else "  - Education: N/A")
-        logger.info(f"  - Job titles: {len(job_titles)}")
-        logger.info(f"  - CV content: {len(full_cv_content_deduplicated)} chars (deduplicated)")
-        logger.info(f"  - Elasticsearch: ✅ Indexed successfully")
-        if pgvector_chunks > 0:
-            logger.info(f"  - pgvector: ✅ Indexed {pgvector_chunks} chunks")
+                logger.warning("⚠️  pgvector not available - skipping vector indexing")
+        except Exception as e:
+            logger.error(f"❌ pgvector add_documents failed (continuing anyway): {e}")
+            # Profile is already committed - just log the error and continue
+            # Don't fail the request if pgvector fails - Elasticsearch indexing succeeded
+    else:
+        if session_aborted:
+            logger.warning("⚠️  Skipping pgvector add_documents (session aborted after transaction error)")
         else:
-            logger.info(f"  - pgvector: ⚠️ Skipped (session error or unavailable)")
-        logger.info(f"🎉 Import process completed successfully!")
-
-        # Re-query the profile to ensure it's attached to a valid session
-        # This prevents greenlet_spawn errors when FastAPI serializes the response
-        fresh_statement = select(UserElasticProfile).where(UserElasticProfile.user_id == user_id)
-        fresh_result = await db.execute(fresh_statement)
-        fresh_profile = fresh_result.scalars().first()
-
-        if not fresh_profile:
-            logger.error(f"❌ Failed to retrieve profile after import for user {user_id}")
-            raise HTTPException(status_code=500, detail="Profile import succeeded but failed to retrieve result")
-
-        # Add import status information to response
-        fresh_profile.elasticsearch_indexed = elasticsearch_indexed
-        fresh_profile.pgvector_chunks = pgvector_chunks
-        fresh_profile.homepage_crawled = homepage_crawled
-        fresh_profile.linkedin_crawled = linkedin_crawled
-
-        return fresh_profile
-
-    except Exception as e:
-        logger.error(f"❌ Error creating/updating profile for user: {e}")
-        logger.error(f"Error type: {type(e).__name__}")
-        logger.error(f"Error details: {str(e)}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+            logger.warning("⚠️  Skipping pgvector add_documents (delete failed or unavailable)")
+
+    # Log success summary with important metrics
+    logger.info(f"✅ Profile import completed for user {user_id}")
+    logger.info(f"📊 Import Summary:")
+    logger.info(f"  - Skills extracted: {len(skills)}")
+    logger.info(f"  - Experience: {experience_years} years" if experience_years else "  - Experience: N/A")
+    logger.info(f"  - Education: {education_level}" if education_level else "  - Education: N/A")
+    logger.info(f"  - Job titles: {len(job_titles)}")
+    logger.info(f"  - CV content: {len(full_cv_content_deduplicated)} chars (deduplicated)")
+    logger.info(f"  - Elasticsearch: ✅ Indexed successfully")
+    if pgvector_chunks > 0:
+        logger.info(f"  - pgvector: ✅ Indexed {pgvector_chunks} chunks")
+    else:
+        logger.info(f"  - pgvector: ⚠️ Skipped (session error or unavailable)")
+    logger.info(f"🎉 Import process completed successfully!")
+
+    # Re-query the profile to ensure it's attached to a valid session
+    # This prevents greenlet_spawn errors when FastAPI serializes the response
+    fresh_statement = select(UserElasticProfile).where(UserElasticProfile.user_id == user_id)
+    fresh_result = await db.execute(fresh_statement)
+    fresh_profile = fresh_result.scalars().first()
+
+    if not fresh_profile:
+        logger.error(f"❌ Failed to retrieve profile after import for user {user_id}")
+        raise RuntimeError("Profile import succeeded but failed to retrieve result")
+
+    # Add import status information to response
+    fresh_profile.elasticsearch_indexed = elasticsearch_indexed
+    fresh_profile.pgvector_chunks = pgvector_chunks
+    fresh_profile.homepage_crawled = homepage_crawled
+    fresh_profile.linkedin_crawled = linkedin_crawled
+
+    return fresh_profile
 
 
 @router.get("/profile", response_model=UserProfileResponse)
@@ -1171,7 +1218,7 @@ async def health_check():
     """Check Elasticsearch connection health."""
     try:
         # Try to ping Elasticsearch
-        health = es_service.client.cluster.health()
+        health = await es_service.client.cluster.health()
         return {
             "status": "healthy",
             "elasticsearch": {
@@ -1850,9 +1897,9 @@ async def generate_demo_data(
         index_name = f"cv_showcase_{user_id}"
 
         # Ensure index exists
-        if not es_service.client.indices.exists(index=index_name):
+        if not await es_service.client.indices.exists(index=index_name):
             logger.info(f"Creating index {index_name}")
-            es_service.client.indices.create(
+            await es_service.client.indices.create(
                 index=index_name,
                 body={
                     "mappings": {
@@ -1909,7 +1956,7 @@ async def generate_demo_data(
             }
 
             # Index document
-            es_service.client.index(
+            await es_service.client.index(
                 index=index_name,
                 id=f"demo_{i}",
                 body=doc
@@ -1920,7 +1967,7 @@ async def generate_demo_data(
                 logger.info(f"Indexed {profiles_created}/{count} demo profiles")
 
         # Refresh index to make data searchable
-        es_service.client.indices.refresh(index=index_name)
+        await es_service.client.indices.refresh(index=index_name)
 
         logger.info(f"Successfully generated {profiles_created} demo profiles")
 
@@ -2410,7 +2457,7 @@ async def run_chromadb_rag(query: str, user_id, llm: str, db: AsyncSession):
 
     try:
         # Retrieve from pgvector (vector similarity only)
-        if not vector_service.is_available():
+        if not await vector_service.is_available():
             # Return mock data if pgvector not available
             return {
                 "answer": "pgvector not available. Embedding model not loaded.",
@@ -2574,13 +2621,13 @@ async def generate_llm_answer(prompt: str, llm_provider: str) -> str:
     try:
         if llm_provider == "grok":
             # Use Grok API via LLMGateway
-            response = await llm_gateway.generate(
+            response = await llm_gateway.agenerate(
                 prompt=prompt,
                 provider="grok",
                 temperature=0.3,
                 max_tokens=200
             )
-            return response.get("content", "No answer generated.")
+            return response.get("response", "No answer generated.")
 
         elif llm_provider == "local":
             # Use Ollama on Railway (private network)
@@ -2624,7 +2671,7 @@ async def get_database_stats(
     try:
         stats = {
             "pgvector": {
-                "available": vector_service.is_available(),
+                "available": await vector_service.is_available(),
                 "count": 0
             },
             "elasticsearch": {
@@ -2635,15 +2682,16 @@ async def get_database_stats(
         }
 
         # Get pgvector count from Document table
-        if vector_service.is_available():
+        if await vector_service.is_available():
             try:
-                from backend.models.document import Document, DocumentType
-                # Count all CV_SHOWCASE documents
+                from backend.models.document import DocumentType
+                from backend.models.document_chunk import DocumentChunk
+                # Count CV_SHOWCASE chunks (comparable to the Elasticsearch chunk count)
                 result = await db.execute(
-                    select(Document).where(Document.type == DocumentType.CV_SHOWCASE)
+                    select(func.count()).select_from(DocumentChunk)
+                    .where(DocumentChunk.document_type == DocumentType.CV_SHOWCASE)
                 )
-                documents = result.scalars().all()
-                stats["pgvector"]["count"] = len(documents)
+                stats["pgvector"]["count"] = result.scalar_one()
             except Exception as e:
                 # Silently skip if CV_SHOWCASE enum not in database yet
                 if "CV_SHOWCASE" in str(e) and "enum" in str(e).lower():
@@ -2656,7 +2704,7 @@ async def get_database_stats(
         if es_service.is_available():
             try:
                 # Count documents in CV index (synchronous call)
-                result = es_service.client.count(index=es_service.cv_index)
+                result = await es_service.client.count(index=es_service.cv_index)
                 stats["elasticsearch"]["count"] = result.get("count", 0)
             except Exception as e:
                 logger.error(f"Failed to get Elasticsearch count: {e}")
@@ -2886,18 +2934,18 @@ async def recreate_elasticsearch_indices_public():
 
         # Delete existing indices
         deleted = []
-        if es_service.client.indices.exists(index=es_service.cv_index):
-            es_service.client.indices.delete(index=es_service.cv_index)
+        if await es_service.client.indices.exists(index=es_service.cv_index):
+            await es_service.client.indices.delete(index=es_service.cv_index)
             deleted.append(es_service.cv_index)
             logger.info(f"Deleted index: {es_service.cv_index}")
 
-        if es_service.client.indices.exists(index=es_service.job_index):
-            es_service.client.indices.delete(index=es_service.job_index)
+        if await es_service.client.indices.exists(index=es_service.job_index):
+            await es_service.client.indices.delete(index=es_service.job_index)
             deleted.append(es_service.job_index)
             logger.info(f"Deleted index: {es_service.job_index}")
 
         # Recreate indices with correct configuration
-        es_service._ensure_indices()
+        await es_service.ensure_indices()
         logger.info("Recreated indices with skill_analyzer")
 
         return {
@@ -2924,18 +2972,18 @@ async def recreate_elasticsearch_indices(
 
         # Delete existing indices
         deleted = []
-        if es_service.client.indices.exists(index=es_service.cv_index):
-            es_service.client.indices.delete(index=es_service.cv_index)
+        if await es_service.client.indices.exists(index=es_service.cv_index):
+            await es_service.client.indices.delete(index=es_service.cv_index)
             deleted.append(es_service.cv_index)
             logger.info(f"Deleted index: {es_service.cv_index}")
 
-        if es_service.client.indices.exists(index=es_service.job_index):
-            es_service.client.indices.delete(index=es_service.job_index)
+        if await es_service.client.indices.exists(index=es_service.job_index):
+            await es_service.client.indices.delete(index=es_service.job_index)
             deleted.append(es_service.job_index)
             logger.info(f"Deleted index: {es_service.job_index}")
 
         # Recreate indices with correct configuration
-        es_service._ensure_indices()
+        await es_service.ensure_indices()
         logger.info("Recreated indices with skill_analyzer")
 
         return {
@@ -2961,10 +3009,10 @@ async def debug_elasticsearch_index(
             return {"error": "Elasticsearch not available"}
 
         # Get index mapping
-        mapping = es_service.client.indices.get_mapping(index=es_service.cv_index)
+        mapping = await es_service.client.indices.get_mapping(index=es_service.cv_index)
 
         # Get a sample document for this user
-        search_result = es_service.client.search(
+        search_result = await es_service.client.search(
             index=es_service.cv_index,
             body={
                 "query": {
@@ -2982,7 +3030,7 @@ async def debug_elasticsearch_index(
                 sample_doc["cv_text"] = sample_doc["cv_text"][:500] + "... (truncated)"
 
         # Get count
-        count_result = es_service.client.count(
+        count_result = await es_service.client.count(
             index=es_service.cv_index,
             body={"query": {"term": {"user_id": str(current_user.id)}}}
         )
@@ -3030,26 +3078,31 @@ async def compare_query(
 
         logger.info(f"🔍 Comparing query across vector DBs: '{question}' (provider={provider} -> {llm_provider})")
 
-        # Step 1: Search pgvector
-        logger.info("📊 Searching pgvector...")
-        pgvector_start = time.time()
-        pgvector_chunks = await vector_service.query(
-            session=db,
-            user_id=current_user.id,
-            query_text=question,
-            n_results=3
-        )
-        pgvector_time = (time.time() - pgvector_start) * 1000
-
-        # Step 2: Search Elasticsearch
-        logger.info("🔍 Searching Elasticsearch...")
-        es_start = time.time()
-        es_chunks = await es_service.hybrid_search(
-            user_id=str(current_user.id),
-            query=question,
-            top_k=3
+        # Steps 1+2: Search pgvector and Elasticsearch concurrently
+        async def search_pgvector():
+            start = time.time()
+            chunks = await vector_service.query(
+                session=db,
+                user_id=current_user.id,
+                query_text=question,
+                n_results=3
+            )
+            return chunks, (time.time() - start) * 1000
+
+        async def search_elasticsearch():
+            start = time.time()
+            chunks = await es_service.hybrid_search(
+                user_id=str(current_user.id),
+                query=question,
+                top_k=3
+            )
+            return chunks, (time.time() - start) * 1000
+
+        logger.info("📊 Searching pgvector and Elasticsearch concurrently...")
+        (pgvector_chunks, pgvector_time), (es_chunks, es_time) = await asyncio.gather(
+            search_pgvector(), search_elasticsearch()
         )
-        es_time = (time.time() - es_start) * 1000
+        es_timings = es_chunks[0]["metadata"].get("timings_ms", {}) if es_chunks else {}
 
         # Step 3: Generate answer from pgvector chunks
         logger.info("🤖 Generating pgvector answer...")
@@ -3073,11 +3126,12 @@ Context:
 
 Answer:"""
 
-        pgvector_response = llm_gateway.generate(
+        pgvector_response = await llm_gateway.agenerate(
             prompt=pgvector_prompt,
             provider=llm_provider,
             temperature=0.3,
-            max_tokens=150  # Reduced from 500 for concise answers
+            max_tokens=150,  # Reduced from 500 for concise answers
+            cache=True  # Same question + context is judged repeatedly
         )
         pgvector_answer = pgvector_response.get('response', '')
 
@@ -3103,11 +3157,12 @@ Context:
 
 Answer:"""
 
-        es_response = llm_gateway.generate(
+        es_response = await llm_gateway.agenerate(
             prompt=es_prompt,
             provider=llm_provider,
             temperature=0.3,
-            max_tokens=150  # Reduced from 500 for concise answers
+            max_tokens=150,  # Reduced from 500 for concise answers
+            cache=True  # Same question + context is judged repeatedly
         )
         es_answer = es_response.get('response', '')
 
@@ -3150,11 +3205,12 @@ IMPORTANT:
 
 Only respond with valid JSON, no other text."""
 
-        evaluation_result = llm_gateway.generate(
+        evaluation_result = await llm_gateway.agenerate(
             prompt=evaluation_prompt,
             provider=llm_provider,
             temperature=0.1,
-            max_tokens=300
+            max_tokens=300,
+            cache=True
         )
         evaluation_response = evaluation_result.get('response', '')
 
@@ -3214,6 +3270,7 @@ Only respond with valid JSON, no other text."""
                 "answer": es_answer,
                 "chunks": es_chunks_formatted,
                 "retrieval_time_ms": es_time,
+                "timings_ms": es_timings,
                 "score": evaluation["elasticsearch_score"]
             },
             "evaluation": {
@@ -3229,7 +3286,7 @@ Only respond with valid JSON, no other text."""
         # Log to Elasticsearch for Kibana analytics
         try:
             metrics_logger = get_rag_metrics_logger()
-            metrics_logger.log_comparison(
+            await metrics_logger.log_comparison(
                 query_text=question,
                 pgvector_result=response_data["pgvector"],
                 elasticsearch_result=response_data["elasticsearch"],
@@ -3388,7 +3445,7 @@ async def get_elasticsearch_aggregations(current_user: User = Depends(current_ac
         index_name = f"cv_showcase_{user_id}"
 
         # Check if index exists
-        if not es_service.client.indices.exists(index=index_name):
+        if not await es_service.client.indices.exists(index=index_name):
             return {
                 "databases": [],
                 "programming_languages": [],
@@ -3436,7 +3493,7 @@ async def get_elasticsearch_aggregations(current_user: User = Depends(current_ac
         }
 
         # Execute aggregation query
-        response = es_service.client.search(index=index_name, **agg_query)
+        response = await es_service.client.search(index=index_name, **agg_query)
 
         # Format results
         return {
@@ -3488,7 +3545,7 @@ async def faceted_search(
         index_name = f"cv_showcase_{user_id}"
 
         # Check if index exists
-        if not es_service.client.indices.exists(index=index_name):
+        if not await es_service.client.indices.exists(index=index_name):
             return {
                 "results": [],
                 "total": 0,
@@ -3519,12 +3576,12 @@ async def faceted_search(
         # Build search query
         if query:
             # If there's a search query, use hybrid search
-            # Generate embedding for the query
-            embedding_response = requests.post(
-                "http://localhost:11434/api/embeddings",
-                json={"model": "nomic-embed-text", "prompt": query}
-            )
-            query_embedding = embedding_response.json()["embedding"]
+            # Generate embedding for the query (configured ES embedding provider, no blocking HTTP call)
+            try:
+                query_embedding = await es_service.embedding_provider.embed(query)
+            except Exception as embed_err:
+                logger.warning(f"Query embedding failed, faceted search runs BM25-only: {embed_err}")
+                query_embedding = None
 
             # Build hybrid search with filters
             search_query = {
@@ -3565,6 +3622,16 @@ async def faceted_search(
                     "rrf": {}
                 }
             }
+            index_dims = None
+            if query_embedding:
+                # kNN only if the provider's vectors fit the index's dense_vector field
+                mapping = await es_service.client.indices.get_mapping(index=index_name)
+                for index_mapping in mapping.values():
+                    embedding_field = index_mapping["mappings"].get("properties", {}).get("embedding", {})
+                    index_dims = embedding_field.get("dims") or index_dims
+            if not query_embedding or len(query_embedding) != index_dims:
+                search_query.pop("knn")
+                search_query.pop("rank")
         else:
             # If no search query, just filter
             search_query = {
@@ -3577,7 +3644,7 @@ async def faceted_search(
             }
 
         # Execute search
-        response = es_service.client.search(index=index_name, **search_query)
+        response = await es_service.client.search(index=index_name, **search_query)
 
         # Format results
         results = []
@@ -3623,7 +3690,7 @@ async def get_analytics_data(current_user: User = Depends(current_active_user)):
         index_name = f"cv_showcase_{user_id}"
 
         # Check if index exists
-        if not es_service.client.indices.exists(index=index_name):
+        if not await es_service.client.indices.exists(index=index_name):
             return {
                 "total_documents": 0,
                 "index_size_bytes": 0,
@@ -3636,7 +3703,7 @@ async def get_analytics_data(current_user: User = Depends(current_active_user)):
             }
 
         # Get index stats
-        stats = es_service.client.indices.stats(index=index_name)
+        stats = await es_service.client.indices.stats(index=index_name)
         total_docs = stats["indices"][index_name]["total"]["docs"]["count"]
         index_size = stats["indices"][index_name]["total"]["store"]["size_in_bytes"]
 
@@ -3646,7 +3713,7 @@ async def get_analytics_data(current_user: User = Depends(current_active_user)):
             "size": 1000,  # Adjust if needed
             "_source": ["content", "databases", "programming_languages", "companies", "skills", "certifications"]
         }
-        all_docs = es_service.client.search(index=index_name, **all_docs_query)
+        all_docs = await es_service.client.search(index=index_name, **all_docs_query)
 
         # Calculate average chunk size
         total_chars = sum(len(doc["_source"].get("content", "")) for doc in all_docs["hits"]["hits"])
@@ -3662,7 +3729,7 @@ async def get_analytics_data(current_user: User = Depends(current_active_user)):
         }
 
         # Get top skills aggregation
-        skills_agg = es_service.client.search(
+        skills_agg = await es_service.client.search(
             index=index_name,
             size=0,
             aggs={
@@ -3680,7 +3747,7 @@ async def get_analytics_data(current_user: User = Depends(current_active_user)):
         ]
 
         # Get database distribution
-        db_agg = es_service.client.search(
+        db_agg = await es_service.client.search(
             index=index_name,
             size=0,
             aggs={
@@ -3698,7 +3765,7 @@ async def get_analytics_data(current_user: User = Depends(current_active_user)):
         ]
 
         # Get programming language distribution
-        lang_agg = es_service.client.search(
+        lang_agg = await es_service.client.search(
             index=index_name,
             size=0,
             aggs={
@@ -3716,7 +3783,7 @@ async def get_analytics_data(current_user: User = Depends(current_active_user)):
         ]
 
         # Create timeline (company work periods) - simplified for now
-        company_agg = es_service.client.search(
+        company_agg = await es_service.client.search(
             index=index_name,
             size=0,
             aggs={
@@ -3763,10 +3830,10 @@ async def get_rag_analytics(current_user: User = Depends(current_active_user)):
 
         # Get aggregations from RAG metrics logger
         metrics_logger = get_rag_metrics_logger()
-        aggregations = metrics_logger.get_aggregations()
+        aggregations = await metrics_logger.get_aggregations()
 
         # Also get recent queries for the table
-        recent_queries_result = es_service.client.search(
+        recent_queries_result = await es_service.client.search(
             index="cv_rag_logs",
             size=20,
             sort=[{"timestamp": {"order": "desc"}}],
@@ -3789,7 +3856,7 @@ async def get_rag_analytics(current_user: User = Depends(current_active_user)):
         ]
 
         # Calculate total queries
-        count_result = es_service.client.count(index="cv_rag_logs")
+        count_result = await es_service.client.count(index="cv_rag_logs")
         total_queries = count_result["count"]
 
         return {
@@ -3827,7 +3894,7 @@ async def clear_analytics(current_user: User = Depends(current_active_user)):
     """
     try:
         # Delete all documents from cv_rag_logs index
-        result = es_service.client.delete_by_query(
+        result = await es_service.client.delete_by_query(
             index="cv_rag_logs",
             body={
                 "query": {
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
 from typing import List, Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,6 +12,7 @@ logger = logging.getLogger(__name__)
 from backend.database import get_db, get_async_session
 from backend.models.user import User
 from backend.models.h7form import H7FormData, GoodsPosition
+from backend.services.bulk_insert import bulk_insert, abulk_insert
 from backend.schemas.h7_full_form import (
     FullH7FormB2CSchema,
     FullH7FormC2CSchema,
@@ -24,6 +25,26 @@ from backend.auth.dependencies import current_active_user
 router = APIRouter(prefix="/h7-full", tags=["h7-full-forms"])
 
 
+def goods_position_rows(h7_form_id: int, positions) -> List[dict]:
+    """goods_positions rows for bulk_insert/abulk_insert."""
+    return [
+        {
+            "h7_form_id": h7_form_id,
+            "position_nr": pos_data.position_nr,
+            "warenbeschreibung": pos_data.warenbeschreibung,
+            "warenbeschreibung_es": pos_data.warenbeschreibung_es,
+            "anzahl": pos_data.anzahl,
+            "stueckpreis": pos_data.stueckpreis,
+            "gesamtwert": pos_data.gesamtwert,
+            "ursprungsland_iso": pos_data.ursprungsland_iso,
+            "zolltarifnummer": pos_data.zolltarifnummer,
+            "gewicht": pos_data.gewicht,
+            "zustand": pos_data.zustand,
+        }
+        for pos_data in positions
+    ]
+
+
 # ==================== Debug Endpoint ====================
 
 @router.get("/debug/table-structure")
@@ -164,32 +185,8 @@ async def save_h7_form_b2c_async(
 
         h7_form_id = result.scalar()
 
-        # Insert goods positions
-        for pos_data in form_data.goods_data.positions:
-            await db.execute(text("""
-                INSERT INTO goods_positions (
-                    id, h7_form_id, position_nr, warenbeschreibung, warenbeschreibung_es,
-                    anzahl, stueckpreis, gesamtwert, ursprungsland_iso, zolltarifnummer,
-                    gewicht, zustand
-                ) VALUES (
-                    :id, :h7_form_id, :position_nr, :warenbeschreibung, :warenbeschreibung_es,
-                    :anzahl, :stueckpreis, :gesamtwert, :ursprungsland_iso, :zolltarifnummer,
-                    :gewicht, :zustand
-                )
-            """), {
-                "id": str(uuid4()),
-                "h7_form_id": h7_form_id,
-                "position_nr": pos_data.position_nr,
-                "warenbeschreibung": pos_data.warenbeschreibung,
-                "warenbeschreibung_es": pos_data.warenbeschreibung_es,
-                "anzahl": pos_data.anzahl,
-                "stueckpreis": str(pos_data.stueckpreis),
-                "gesamtwert": str(pos_data.gesamtwert),
-                "ursprungsland_iso": pos_data.ursprungsland_iso,
-                "zolltarifnummer": pos_data.zolltarifnummer,
-                "gewicht": str(pos_data.gewicht) if pos_data.gewicht else None,
-                "zustand": pos_data.zustand
-            })
+        # Insert goods positions (one multi-row INSERT)
+        await abulk_insert(db, GoodsPosition, goods_position_rows(h7_form_id, form_data.goods_data.positions))
 
         await db.commit()
 
@@ -284,22 +281,8 @@ async def save_h7_form_b2c(
         db.add(h7_form)
         db.flush()  # Get h7_form.id without committing
 
-        # Create GoodsPosition records
-        for pos_data in form_data.goods_data.positions:
-            goods_pos = GoodsPosition(
-                h7_form_id=h7_form.id,
-                position_nr=pos_data.position_nr,
-                warenbeschreibung=pos_data.warenbeschreibung,
-                warenbeschreibung_es=pos_data.warenbeschreibung_es,
-                anzahl=pos_data.anzahl,
-                stueckpreis=pos_data.stueckpreis,
-                gesamtwert=pos_data.gesamtwert,
-                ursprungsland_iso=pos_data.ursprungsland_iso,
-                zolltarifnummer=pos_data.zolltarifnummer,
-                gewicht=pos_data.gewicht,
-                zustand=pos_data.zustand
-            )
-            db.add(goods_pos)
+        # Create GoodsPosition records (one multi-row INSERT)
+        bulk_insert(db, GoodsPosition, goods_position_rows(h7_form.id, form_data.goods_data.positions))
 
         db.commit()
         # Don't refresh - avoid psycopg2 type introspection issues
@@ -393,22 +376,8 @@ async def save_h7_form_c2c(
         db.add(h7_form)
         db.flush()  # Get h7_form.id without committing
 
-        # Create GoodsPosition records
-        for pos_data in form_data.goods_data.positions:
-            goods_pos = GoodsPosition(
-                h7_form_id=h7_form.id,
-                position_nr=pos_data.position_nr,
-                warenbeschreibung=pos_data.warenbeschreibung,
-                warenbeschreibung_es=pos_data.warenbeschreibung_es,
-                anzahl=pos_data.anzahl,
-                stueckpreis=pos_data.stueckpreis,
-                gesamtwert=pos_data.gesamtwert,
-                ursprungsland_iso=pos_data.ursprungsland_iso,
-                zolltarifnummer=pos_data.zolltarifnummer,
-                gewicht=pos_data.gewicht,
-                zustand=pos_data.zustand
-            )
-            db.add(goods_pos)
+        # Create GoodsPosition records (one multi-row INSERT)
+        bulk_insert(db, GoodsPosition, goods_position_rows(h7_form.id, form_data.goods_data.positions))
 
         db.commit()
         # Don't refresh - avoid psycopg2 type introspection issues
@@ -628,7 +628,7 @@ async def parse_document(
 
         if filename.endswith('.pdf'):
             import io
-            text = document_processor.extract_from_pdf(io.BytesIO(content))
+            text = (await document_processor.aextract_from_pdf(io.BytesIO(content)))["text"]
         elif filename.endswith('.docx') or filename.endswith('.doc'):
             import io
             text = document_processor.extract_from_docx(io.BytesIO(content))
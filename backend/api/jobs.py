@@ -0,0 +1,62 @@
+"""Background job status endpoints."""
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from backend.auth.dependencies import current_optional_user, require_admin
+from backend.models.user import User
+from backend.services.job_queue import job_queue
+
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Showcase demo user (taxcases, applications) - its jobs are polled without login
+DEMO_USER_ID = UUID("00000000-0000-0000-0000-000000000001")
+
+# Stripped unless the caller owns the job
+PRIVATE_FIELDS = ("result", "error")
+
+
+@router.get("/stats")
+async def get_job_stats(
+    admin: User = Depends(require_admin),
+):
+    """Job counts per kind and status, plus this process' worker counters (Admin only)."""
+    return await job_queue.get_stats()
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    user: Optional[User] = Depends(current_optional_user),
+):
+    """
+    Progress and result of a background job.
+
+    Poll the ``status_url`` returned by endpoints that answer ``202 Accepted``.
+    Jobs of the demo showcases (tax, applications) run without auth and are
+    readable with the job id alone. Jobs of a logged-in user return their
+    result and error only to that user (or an admin); other logged-in users
+    get 404, anonymous callers only the status and progress.
+    """
+    job = await job_queue.get(job_id, include_owner=True)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+
+    owner = job.pop("user_id")
+    if owner is None or owner == str(DEMO_USER_ID):
+        return job
+    if user is not None and (str(user.id) == owner or user.is_superuser):
+        return job
+    if user is not None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    for field in PRIVATE_FIELDS:
+        job[field] = None
+    return job
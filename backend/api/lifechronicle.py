@@ -1,9 +1,8 @@
 """LifeChronicle API endpoints with PostgreSQL backend."""
 from typing import List, Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 from datetime import date
-from pathlib import Path
-import os
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,8 +11,9 @@ from backend.auth.dependencies import current_active_user
 from backend.models.user import User
 from backend.models.lifechronicle import LifeChronicleEntry
 from backend.database import get_async_session
-from backend.services.lifechronicle_db_service import lifechronicle_db_service
-from backend.services.photo_metadata import extract_photo_metadata
+from backend.services.lifechronicle_db_service import lifechronicle_db_service, externalize_photos, PHOTO_NAMESPACE
+from backend.services.photo_metadata import extract_photo_metadata_from_bytes
+from backend.services.blob_store import blob_store, parse_data_url
 from backend.schemas.lifechronicle import (
     LifeChronicleEntryCreate,
     LifeChronicleEntryUpdate,
@@ -25,11 +25,7 @@ from backend.schemas.lifechronicle import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/lifechronicle", tags=["LifeChronicle"])
 
-# Photo upload configuration
-# Use relative path for local dev, /app/uploads for Railway production
-import os
-UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "./uploads/lifechronicle"))
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+# Photos are stored in the blob store (MEDIA_STORAGE_BACKEND) and served from /uploads
 
 
 @router.get("/health")
@@ -142,56 +138,18 @@ async def create_entry(
         if len(photos) > 5:
             raise HTTPException(status_code=400, detail="Maximum 5 photos allowed")
 
-        # Save photos to disk and extract metadata
+        # Store photos as content-addressed blobs - entries only keep the URLs
         photo_urls = []
         photo_metadata_list = []
-        photos_base64 = []  # Base64 fallback for Railway (no volume)
-
-        if photos:
-            import base64
-            for photo in photos:
-                # Read photo content ONCE
-                content = await photo.read()
-
-                # Generate unique filename
-                file_ext = os.path.splitext(photo.filename)[1]
-                unique_name = f"{uuid4()}{file_ext}"
-                file_path = UPLOAD_DIR / unique_name
-
-                # Try to save file to disk (works if volume mounted)
-                # TEMPORARILY DISABLED until RAILWAY_VOLUME_NAME is set
-                # try:
-                #     with open(file_path, "wb") as f:
-                #         f.write(content)
-                #
-                #     # Extract EXIF metadata from file
-                #     photo_metadata = extract_photo_metadata(file_path)
-                #     photo_metadata_list.append(photo_metadata)
-                #
-                #     # Store relative URL (for volume-based storage)
-                #     photo_urls.append(f"/uploads/lifechronicle/{unique_name}")
-                # except Exception as e:
-                #     logger.warning(f"Could not save photo to disk: {e}")
-
-                # For now: Skip file storage, use Base64 only
-                pass
-
-                # ALWAYS save as Base64 (fallback for Railway without volume)
-                # Detect content type
-                content_type = "image/jpeg"
-                if file_ext.lower() in ['.png']:
-                    content_type = "image/png"
-                elif file_ext.lower() in ['.heic', '.heif']:
-                    content_type = "image/heic"
-
-                # Create data URL
-                b64_data = base64.b64encode(content).decode('utf-8')
-                data_url = f"data:{content_type};base64,{b64_data}"
-                photos_base64.append({
-                    "filename": photo.filename,
-                    "data_url": data_url,
-                    "size_bytes": len(content)
-                })
+
+        for photo in photos:
+            content = await photo.read()
+            blob = await blob_store.aput(content, PHOTO_NAMESPACE, photo.content_type, photo.filename)
+            photo_metadata = await asyncio.to_thread(extract_photo_metadata_from_bytes, content, photo.filename)
+            photo_metadata["url"] = blob["url"]
+            photo_metadata_list.append(photo_metadata)
+            photo_urls.append(blob["url"])
+            del content
 
         # Create entry using Pydantic schema
         entry_data = LifeChronicleEntryCreate(
@@ -200,18 +158,12 @@ async def create_entry(
             original_text=text
         )
 
-        # Build entry_metadata with photo metadata AND base64 data
+        # Photo metadata (EXIF, GPS) - no image data
         entry_metadata = {}
         if photo_metadata_list:
             entry_metadata["photos"] = photo_metadata_list
-        if photos_base64:
-            entry_metadata["photos_base64"] = photos_base64  # Fallback for Railway
-
-        # TEMPORARY: Use Base64 data URLs (file storage disabled)
-        # TODO: Re-enable file storage when RAILWAY_VOLUME_NAME is set
-        if photos_base64:
-            photo_urls = [p["data_url"] for p in photos_base64]
-            logger.info(f"Using {len(photo_urls)} Base64 data URLs (file storage disabled)")
+        if photo_urls:
+            logger.info(f"Stored {len(photo_urls)} photos in {blob_store.name} blob store")
 
         entry = await lifechronicle_db_service.create_entry(
             db, user.id, entry_data, photo_urls, entry_metadata or None
@@ -323,7 +275,7 @@ Buchkapitel:"""
         from backend.services.llm_gateway import llm_gateway
 
         if provider == "grok":
-            result = llm_gateway.generate(
+            result = await llm_gateway.agenerate(
                 prompt=prompt,
                 provider="grok",
                 model="grok-4-1-fast",
@@ -331,7 +283,7 @@ Buchkapitel:"""
                 max_tokens=300
             )
         elif provider == "anthropic":
-            result = llm_gateway.generate(
+            result = await llm_gateway.agenerate(
                 prompt=prompt,
                 provider="anthropic",
                 model="claude-sonnet-3-5-20241022",
@@ -339,7 +291,7 @@ Buchkapitel:"""
                 max_tokens=300
             )
         else:  # ollama (default)
-            result = llm_gateway.generate(
+            result = await llm_gateway.agenerate(
                 prompt=prompt,
                 provider="ollama",
                 model="qwen2.5:3b",
@@ -401,7 +353,6 @@ async def export_pdf(
         from reportlab.lib import colors as rl_colors
         from fastapi.responses import Response
         import html
-        import base64
         from PIL import Image as PILImage
 
         # Timeline color palette (same as frontend)
@@ -478,30 +429,27 @@ async def export_pdf(
 
             elements.append(table)
 
-            # Add photos if available (Base64 Data URLs)
+            # Add photos if available (blob URLs, legacy Base64 data URLs)
             if entry.photo_urls:
                 photo_elements = []
                 for photo_url in entry.photo_urls[:3]:  # Max 3 photos per entry
                     try:
-                        if photo_url.startswith('data:image'):
-                            # Extract Base64 data from data URL
-                            # Format: data:image/jpeg;base64,/9j/4AAQ...
-                            header, base64_data = photo_url.split(',', 1)
-
-                            # Decode Base64 to bytes
-                            image_data = base64.b64decode(base64_data)
-
-                            # Create PIL Image from bytes
-                            pil_image = PILImage.open(BytesIO(image_data))
-
-                            # Save to temporary BytesIO for ReportLab
-                            img_buffer = BytesIO()
-                            pil_image.save(img_buffer, format='JPEG')
-                            img_buffer.seek(0)
-
-                            # Create ReportLab Image with max width 5cm
-                            rl_image = RLImage(img_buffer, width=5*cm, height=5*cm)
-                            photo_elements.append(rl_image)
+                        decoded = parse_data_url(photo_url)
+                        image_data = decoded[0] if decoded else await blob_store.aread(photo_url)
+                        if not image_data:
+                            continue
+
+                        # Create PIL Image from bytes
+                        pil_image = PILImage.open(BytesIO(image_data))
+
+                        # Save to temporary BytesIO for ReportLab
+                        img_buffer = BytesIO()
+                        pil_image.convert("RGB").save(img_buffer, format='JPEG')
+                        img_buffer.seek(0)
+
+                        # Create ReportLab Image with max width 5cm
+                        rl_image = RLImage(img_buffer, width=5*cm, height=5*cm)
+                        photo_elements.append(rl_image)
                     except Exception as e:
                         logger.warning(f"Failed to process photo for PDF: {e}")
                         continue
@@ -534,11 +482,10 @@ async def migrate_photos(
     user: User = Depends(current_active_user)
 ):
     """
-    Migrate old file-path photo entries to Base64 data URLs.
+    Move inline Base64 photos of the current user's entries into the blob store.
 
-    For entries with file paths in photo_urls (/uploads/...):
-    - If Base64 data exists in entry_metadata.photos_base64, use it
-    - Otherwise, clear the photo_urls
+    The 20260215_lc_blob_store migration does this for all users;
+    this endpoint re-runs it for entries written by older clients since.
 
     Args:
         db: Database session
@@ -550,57 +497,48 @@ async def migrate_photos(
     try:
         from sqlalchemy import select
 
-        # Get all user entries
+        # Load ids only - rows with inline photos can be megabytes each
         result = await db.execute(
-            select(LifeChronicleEntry)
+            select(LifeChronicleEntry.id)
             .where(LifeChronicleEntry.user_id == user.id)
         )
-        entries = result.scalars().all()
-
-        updated_count = 0
-        cleared_count = 0
-        skipped_count = 0
-
-        for entry in entries:
-            if not entry.photo_urls:
-                continue
-
-            # Check if any photo_urls are file paths
-            has_file_paths = any(url.startswith("/uploads") for url in entry.photo_urls)
-
-            if has_file_paths:
-                logger.info(f"Migrating entry: {entry.title} ({entry.id})")
-
-                # Check if Base64 data exists in metadata
-                metadata = entry.entry_metadata or {}
-                photos_base64 = metadata.get("photos_base64", [])
-
-                if photos_base64:
-                    # Extract Base64 data URLs
-                    base64_urls = [p["data_url"] for p in photos_base64]
-                    entry.photo_urls = base64_urls
-                    logger.info(f"  → Updated to Base64 ({len(base64_urls)} photos)")
-                    updated_count += 1
-                else:
-                    # No Base64 data available - clear photos
-                    entry.photo_urls = []
-                    logger.info(f"  → No Base64 data - cleared photos")
-                    cleared_count += 1
-            else:
-                skipped_count += 1
-
-        # Commit all changes
-        await db.commit()
+        entry_ids = list(result.scalars().all())
+
+        migrated_count = 0
+        photo_count = 0
+
+        def put(data: bytes, content_type: str, filename: Optional[str]):
+            return blob_store.put(data, PHOTO_NAMESPACE, content_type, filename)
+
+        for entry_id in entry_ids:
+            entry = await db.get(LifeChronicleEntry, entry_id)
+            metadata = entry.entry_metadata or {}
+            has_inline = "photos_base64" in metadata or any(
+                url.startswith("data:") for url in entry.photo_urls or []
+            )
+            if has_inline:
+                photo_urls, entry_metadata, moved = await asyncio.to_thread(
+                    externalize_photos, entry.photo_urls, metadata, put
+                )
+                entry.photo_urls = photo_urls
+                entry.entry_metadata = entry_metadata
+                await db.commit()
+                migrated_count += 1
+                photo_count += moved
+                logger.info(f"Moved {moved} photos of entry {entry.title} ({entry.id}) to the blob store")
+            # Drop the (possibly large) row before loading the next one
+            db.expunge(entry)
 
         return {
             "success": True,
             "message": "Photo migration complete",
-            "updated_to_base64": updated_count,
-            "cleared_no_data": cleared_count,
-            "already_base64": skipped_count,
-            "total_processed": updated_count + cleared_count
+            "entries_migrated": migrated_count,
+            "photos_moved": photo_count,
+            "storage_backend": blob_store.name,
+            "total_entries": len(entry_ids)
         }
 
     except Exception as e:
+        await db.rollback()
         logger.error(f"Migration failed: {e}")
         raise HTTPException(status_code=500, detail=f"Migration failed: {str(e)}")
@@ -5,6 +5,8 @@ from typing import Optional
 from backend.auth.dependencies import current_active_user
 from backend.models.user import User
 from backend.services.llm_gateway import llm_gateway
+from backend.services.llm_cache import llm_response_cache
+from backend.services.embedding_cache import embedding_cache
 from backend.schemas.llm import (
     LLMGenerateRequest,
     LLMGenerateResponse,
@@ -29,7 +31,7 @@ async def generate_text(
     Requires authentication.
     """
     try:
-        result = llm_gateway.generate(
+        result = await llm_gateway.agenerate(
             prompt=request.prompt,
             provider=request.provider,
             model=request.model,
@@ -87,7 +89,7 @@ async def create_embedding(
     Requires authentication.
     """
     try:
-        embedding = llm_gateway.embed(
+        embedding = await llm_gateway.aembed(
             text=request.text,
             model=request.model,
         )
@@ -103,3 +105,28 @@ async def create_embedding(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Embedding generation failed: {str(e)}",
         )
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    user: User = Depends(current_active_user),
+):
+    """
+    LLM response cache statistics (hits/misses per tier, hit rate, size).
+
+    Requires authentication.
+    """
+    return llm_response_cache.get_stats()
+
+
+@router.get("/embed/cache/stats")
+async def get_embedding_cache_stats(
+    user: User = Depends(current_active_user),
+):
+    """
+    Embedding cache statistics (hits/misses per tier, hit rate, memory usage).
+
+    Shared by pgvector (all-MiniLM-L6-v2) and Ollama (nomic-embed-text) embeddings.
+    Requires authentication.
+    """
+    return embedding_cache.get_stats()
@@ -4,6 +4,7 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Query
 from pydantic import BaseModel
 
 from backend.services.privategxt_service import privategxt_service
+from backend.services.sse import sse_event, sse_response
 
 
 router = APIRouter(prefix="/privategxt", tags=["PrivateGxT"])
@@ -120,6 +121,38 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
 
 
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streaming variant of ``/chat`` (Server-Sent-Events).
+
+    Emits a ``sources`` event first, then ``token`` events as the LLM
+    generates and a final ``done`` event.
+    """
+    try:
+        sources, tokens = await privategxt_service.chat_stream(
+            message=request.message,
+            provider=request.provider,
+            model=request.model,
+            temperature=request.temperature
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+
+    async def events():
+        yield sse_event("sources", sources)
+        try:
+            async for token in tokens:
+                yield sse_event("token", {"text": token})
+            yield sse_event("done", {"provider": request.provider, "model": request.model})
+        except Exception as e:
+            yield sse_event("error", {"detail": f"Chat failed: {str(e)}"})
+
+    return sse_response(events())
+
+
 @router.get("/chat/history")
 async def get_chat_history():
     """Get chat history."""
@@ -1,22 +1,26 @@
 """Tax Case Management API Endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
+import asyncio
 import os
+import tempfile
 import logging
 import json
 import io
+import time
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 
 logger = logging.getLogger(__name__)
 
-from backend.database import get_db
+from backend.config import settings
+from backend.database import get_db, SessionLocal
 from backend.models.taxcase import TaxCase, TaxCaseDocument, TaxCaseFolder, TaxCaseExtractedData
 from backend.models.user import User
 from backend.schemas.taxcase import (
@@ -24,6 +28,9 @@ from backend.schemas.taxcase import (
     DocumentResponse, ExtractedDataResponse, ExtractedDataBulkUpdate,
     AuthRegisterRequest, AuthLoginRequest, AuthResponse
 )
+from backend.services.blob_store import PostgresBlobStore, parse_blob_path
+from backend.services.bulk_insert import bulk_insert
+from backend.services.job_queue import job_queue, JobContext, PermanentJobError
 try:
     from backend.services.application_service import DocumentParser
 except ImportError:
@@ -31,6 +38,12 @@ except ImportError:
 
 router = APIRouter()
 
+# Uploads are kept in Postgres whatever MEDIA_STORAGE_BACKEND says: the processing job
+# must still find them after a container restart. The namespace is private (never
+# served from /uploads).
+TAX_UPLOAD_NAMESPACE = "taxcases"
+tax_upload_store = PostgresBlobStore()
+
 # TEMPORARY: Fixed demo user UUID (same as applications)
 DEMO_USER_ID = UUID("00000000-0000-0000-0000-000000000001")
 
@@ -151,9 +164,7 @@ async def get_tax_case(case_id: int, db: Session = Depends(get_db), user: User =
         TaxCaseExtractedData.tax_case_id == case.id
     ).all()
 
-    extracted_data = {}
-    for item in extracted_items:
-        extracted_data[item.field_name] = item.field_value
+    extracted_data = merge_extracted_fields(extracted_items)
 
     return TaxCaseDetailResponse(
         id=case.id,
@@ -168,16 +179,21 @@ async def get_tax_case(case_id: int, db: Session = Depends(get_db), user: User =
     )
 
 
-@router.post("/cases/{case_id}/upload")
+@router.post("/cases/{case_id}/upload", status_code=202)
 async def upload_documents(
     case_id: int,
     files: List[UploadFile] = File(...),
     use_local_llm: str = Form("true"),  # DSGVO mode by default
     ocr_engine: str = Form("tesseract"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     user: User = Depends(get_demo_user)
 ):
-    """Upload and process documents for a tax case"""
+    """Upload documents for a tax case - OCR and LLM extraction run as a background job
+
+    Returns 202 with the job id; poll GET /jobs/{job_id} for progress and the document ids.
+    Repeating the request with the same Idempotency-Key header returns the original job.
+    """
     prefer_local = use_local_llm.lower() == "true"
     ocr_mode = "PaddleOCR" if ocr_engine.lower() == "paddle" else "Tesseract OCR"
     logger.info(f"Upload mode: {'DSGVO (lokales LLM)' if prefer_local else 'Grok API'} mit {ocr_mode}")
@@ -189,74 +205,215 @@ async def upload_documents(
     if not case:
         raise HTTPException(status_code=404, detail="Tax case not found")
 
-    # Create uploads directory if it doesn't exist
-    upload_dir = f"/tmp/tax_uploads/{case_id}"
-    os.makedirs(upload_dir, exist_ok=True)
-
-    uploaded_docs = []
-
     try:
+        saved_files = []
         for file in files:
-            # Save file
-            file_path = os.path.join(upload_dir, file.filename)
-            with open(file_path, "wb") as f:
-                content = await file.read()
-                f.write(content)
-
-            # For MVP: Just extract text from PDF or use placeholder
-            doc_content = f"Document content from {file.filename}"
+            # Persist before enqueueing - the job may only run after a restart.
+            # Keyed by a generated id, so same-named uploads in one case stay separate.
+            content = await file.read()
+            blob = await tax_upload_store.aput(content, TAX_UPLOAD_NAMESPACE, file.content_type, file.filename)
+            saved_files.append({
+                "upload_id": uuid4().hex,
+                "filename": file.filename,
+                "blob_url": blob["url"],
+            })
+
+        job = await job_queue.enqueue(
+            "taxcase.process_documents",
+            {
+                "case_id": case.id,
+                "files": saved_files,
+                "prefer_local": prefer_local,
+                "ocr_engine": ocr_engine.lower(),
+            },
+            user_id=str(user.id),
+            idempotency_key=idempotency_key,
+        )
+    except Exception as e:
+        logger.error(f"Error uploading documents: {e}")
+        raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
-            # Try to parse with DocumentParser if available
-            if DocumentParser:
-                try:
-                    parser = DocumentParser()
-                    doc_content = parser.parse(file_path, ocr_engine=ocr_engine.lower())
-                    logger.info(f"{ocr_mode} extracted text from {file.filename}")
-                except Exception as parse_error:
-                    logger.warning(f"{ocr_mode} could not parse document {file.filename}: {parse_error}")
-                    # Use basic content
-                    doc_content = f"Uploaded: {file.filename} ({ocr_mode} nicht verfügbar)"
-            else:
-                doc_content = f"Uploaded: {file.filename}"
+    logger.info(f"Queued {len(files)} documents for case {case_id} (job {job['id']})")
 
-            # Create document record
-            doc = TaxCaseDocument(
-                tax_case_id=case.id,
-                filename=file.filename,
-                file_path=file_path,
-                doc_type="document",
-                content=doc_content,
-                validated=False
-            )
+    return {
+        "success": True,
+        "message": f"{len(files)} documents uploaded, processing in background",
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": job["status_url"]
+    }
 
-            db.add(doc)
-            db.flush()
 
-            # Extract data using LLM (always creates data, even if LLM fails)
-            await extract_data_from_document(case.id, doc.id, doc_content, db, prefer_local)
+@job_queue.handler("taxcase.process_documents")
+async def process_documents_job(job: JobContext, payload: dict) -> dict:
+    """OCR + LLM extraction for uploaded tax documents (resumable on retry)
 
-            uploaded_docs.append(doc.id)
+    Files are fanned out: OCR runs for up to TAXCASE_OCR_CONCURRENCY files at once and
+    LLM extraction up to the per-provider TAXCASE_LLM_CONCURRENCY_* limit. Results are
+    written in upload order (one commit per file), so document ids and the merged
+    field values do not depend on which extraction finished first. The checkpoint is
+    saved right after each commit, so a retry neither repeats nor skips a file.
+    """
+    case_id = payload["case_id"]
+    files = payload["files"]
+    ocr_engine = payload["ocr_engine"]
+    prefer_local = payload["prefer_local"]
+    # upload id -> document id of files finished by earlier attempts
+    done = job.checkpoint.setdefault("document_ids", {})
+
+    with SessionLocal() as db:
+        case = db.query(TaxCase).filter(TaxCase.id == case_id).first()
+        if not case:
+            raise PermanentJobError(f"Tax case {case_id} not found")
+
+        pending = [file for file in files if _upload_key(file) not in done]
+        parallel = settings.TAXCASE_PARALLEL_EXTRACTION
+        # Sequential mode: a single slot covers OCR and LLM of one file
+        file_slots = asyncio.Semaphore(len(pending) if parallel and pending else 1)
+        ocr_slots = asyncio.Semaphore(max(1, settings.TAXCASE_OCR_CONCURRENCY))
+
+        async def process(file: dict):
+            async with file_slots:
+                async with ocr_slots:
+                    doc_content, ocr_metadata = await parse_uploaded_file(file, ocr_engine)
+                async with _extraction_slot(prefer_local):
+                    fields, seconds = await llm_extract_fields(doc_content, prefer_local)
+            return doc_content, ocr_metadata, fields, seconds
+
+        tasks = [asyncio.create_task(process(file)) for file in pending]
+        try:
+            for saved, (file, task) in enumerate(zip(pending, tasks), start=1):
+                doc_content, ocr_metadata, fields, seconds = await task
+
+                doc = TaxCaseDocument(
+                    tax_case_id=case.id,
+                    filename=file["filename"],
+                    file_path=file.get("blob_url") or file["path"],
+                    doc_type="document",
+                    content=doc_content,
+                    ocr_metadata=ocr_metadata or None,
+                    validated=False
+                )
+                db.add(doc)
+                db.flush()
+
+                store_extracted_fields(db, case.id, doc.id, fields, seconds)
+                db.commit()
+                done[_upload_key(file)] = doc.id
+                await job.progress(
+                    (len(files) - len(pending) + saved) / len(files),
+                    f"Extracted {file['filename']} ({saved}/{len(pending)})"
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
 
         # Update case status
         case.status = "processing"
         db.commit()
 
-        logger.info(f"Uploaded {len(files)} documents to case {case_id}")
+    logger.info(f"Processed {len(files)} documents for case {case_id} ({'parallel' if parallel else 'sequential'})")
+    return {
+        "case_id": case_id,
+        "document_ids": [done[_upload_key(file)] for file in files if _upload_key(file) in done]
+    }
 
-        return {
-            "success": True,
-            "message": f"{len(files)} documents uploaded and processed",
-            "document_ids": uploaded_docs
-        }
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error uploading documents: {e}")
-        raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+def _upload_key(file: dict) -> str:
+    # Jobs queued before uploads went to the blob store only have a path
+    return file.get("upload_id") or file["path"]
 
-async def extract_data_from_document(case_id: int, doc_id: int, content: str, db: Session, prefer_local: bool = True):
-    """Extract structured data from document using LLM"""
 
+async def load_upload(file: dict) -> bytes:
+    """Bytes of a queued upload
+
+    Raises:
+        PermanentJobError: The upload is gone (retrying cannot bring it back)
+    """
+    if file.get("blob_url"):
+        content = await tax_upload_store.aread(file["blob_url"])
+    else:
+        try:
+            content = await asyncio.to_thread(_read_file, file["path"])
+        except FileNotFoundError:
+            content = None
+    if content is None:
+        raise PermanentJobError(f"Upload {file['filename']} is no longer available")
+    return content
+
+
+async def parse_uploaded_file(file: dict, ocr_engine: str):
+    """OCR/parse one queued upload -> (text, ocr_metadata)
+
+    Raises:
+        PermanentJobError: The upload is missing
+    """
+    ocr_mode = "PaddleOCR" if ocr_engine == "paddle" else "Tesseract OCR"
+    content = await load_upload(file)
+    if not DocumentParser:
+        return f"Uploaded: {file['filename']}", None
+
+    # The parser works on paths (extension decides the format) - spill to a temp file
+    fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(file["filename"])[1].lower())
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        doc_content, ocr_metadata = await parse_document_cached(
+            temp_path, content, ocr_engine, endpoint="taxcases.upload"
+        )
+    finally:
+        os.remove(temp_path)
+    logger.info(f"{ocr_mode} extracted text from {file['filename']}")
+    return doc_content, ocr_metadata
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def parse_document_cached(file_path: str, content: bytes, ocr_engine: str, endpoint: str):
+    """DocumentParser.aparse_with_info, cached by file hash + OCR settings -> (text, ocr_metadata)
+
+    Failed extractions come back as placeholder text and are not cached.
+    """
+    from backend.services.extraction_cache import extraction_cache, ocr_settings
+
+    parser = DocumentParser()
+
+    async def extract():
+        return await parser.aextract_with_info(file_path, ocr_engine=ocr_engine)
+
+    text, metadata, cache_hit = await extraction_cache.get_or_extract(
+        content, f"document_parser:{ocr_engine}", extract, endpoint=endpoint,
+        params={"extension": os.path.splitext(file_path)[1].lower(), **ocr_settings()},
+    )
+    if cache_hit and metadata is not None:
+        metadata["cache_hit"] = True
+    return text, metadata
+
+
+# Per-provider limits for extraction prompts (shared by all upload jobs in this process)
+_extraction_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _extraction_slot(prefer_local: bool) -> asyncio.Semaphore:
+    """Concurrency limiter for tax document extraction on the selected provider."""
+    provider = "ollama" if prefer_local else "grok"
+    semaphore = _extraction_semaphores.get(provider)
+    if semaphore is None:
+        limit = settings.TAXCASE_LLM_CONCURRENCY_OLLAMA if prefer_local else settings.TAXCASE_LLM_CONCURRENCY_GROK
+        semaphore = asyncio.Semaphore(max(1, limit))
+        _extraction_semaphores[provider] = semaphore
+    return semaphore
+
+
+async def llm_extract_fields(content: str, prefer_local: bool = True):
+    """Extract structured fields from document text using the LLM -> (fields, seconds)
+
+    Does not touch the database, so several documents can be extracted concurrently.
+    LLM failures are reported as fields (the document always gets data).
+    """
     # For MVP: Create sample extracted data
     llm_mode = "Lokales LLM (DSGVO)" if prefer_local else "Grok API"
     sample_data = {
@@ -266,6 +423,8 @@ async def extract_data_from_document(case_id: int, doc_id: int, content: str, db
         "hinweis": "Bitte bearbeiten Sie diese Felder und bestätigen Sie den Fall"
     }
 
+    seconds = None
+
     # Try to use LLM if available
     try:
         from backend.services.llm_gateway import llm_gateway
@@ -289,12 +448,16 @@ Falls Felder nicht gefunden werden, lass sie weg.
         # Use LLM to extract data with DSGVO preference
         provider = "ollama" if prefer_local else "grok"
         timeout = 240 if provider == "ollama" else 60  # 240 seconds for Ollama, 60 seconds for Grok
-        result_dict = llm_gateway.generate(
-            prompt=prompt,
-            provider=provider,
-            max_tokens=3000,
-            timeout=timeout
-        )
+        start = time.perf_counter()
+        try:
+            result_dict = await llm_gateway.agenerate(
+                prompt=prompt,
+                provider=provider,
+                max_tokens=3000,
+                timeout=timeout
+            )
+        finally:
+            seconds = round(time.perf_counter() - start, 3)
         result = result_dict.get("response", "")
 
         logger.info(f"LLM extraction mode: {llm_mode} using {provider}")
@@ -318,29 +481,57 @@ Falls Felder nicht gefunden werden, lass sie weg.
             logger.warning(f"JSON parsing failed: {parse_error}")
             sample_data["llm_response"] = result[:200]
 
-        logger.info(f"LLM extraction successful for document {doc_id}")
+        logger.info(f"LLM extraction successful ({seconds}s)")
 
     except Exception as e:
-        logger.warning(f"LLM extraction failed for document {doc_id}: {e}", exc_info=True)
+        logger.warning(f"LLM extraction failed: {e}", exc_info=True)
         # Continue with sample data - add error details
         sample_data["llm_fehler"] = f"{type(e).__name__}: {str(e)}"
 
-    # Store extracted data (either from LLM or sample)
-    for field_name, field_value in sample_data.items():
-        if field_value:
-            data_entry = TaxCaseExtractedData(
-                tax_case_id=case_id,
-                document_id=doc_id,
-                field_name=field_name,
-                field_value=str(field_value),
-                field_type="text",
-                confidence=0.5,
-                confirmed=False
-            )
-            db.add(data_entry)
+    return sample_data, seconds
+
+
+def store_extracted_fields(db: Session, case_id: int, doc_id: int, fields: Dict[str, Any], seconds: Optional[float] = None):
+    """Insert extracted fields of one document as TaxCaseExtractedData rows in one statement (no commit)"""
+    stored = bulk_insert(db, TaxCaseExtractedData, [
+        {
+            "tax_case_id": case_id,
+            "document_id": doc_id,
+            "field_name": field_name,
+            "field_value": str(field_value),
+            "field_type": "text",
+            "confidence": 0.5,
+            "extraction_seconds": seconds,
+            "confirmed": False,
+        }
+        for field_name, field_value in fields.items() if field_value
+    ])
+    logger.info(f"Stored {stored} fields for document {doc_id}")
 
-    db.flush()
-    logger.info(f"Stored {len(sample_data)} fields for document {doc_id}")
+
+async def extract_data_from_document(case_id: int, doc_id: int, content: str, db: Session, prefer_local: bool = True):
+    """Extract structured data from document using LLM"""
+    async with _extraction_slot(prefer_local):
+        fields, seconds = await llm_extract_fields(content, prefer_local)
+    store_extracted_fields(db, case_id, doc_id, fields, seconds)
+
+
+def merge_extracted_fields(items: List[TaxCaseExtractedData]) -> Dict[str, str]:
+    """Merge field rows of all documents into one value per field, independent of row order
+
+    Manually edited or added values win; otherwise the earliest uploaded document that
+    has the field wins (documents are created in upload order).
+    """
+    ordered = sorted(items, key=lambda item: (
+        not item.edited,
+        item.document_id is None,
+        item.document_id or 0,
+        item.id or 0,
+    ))
+    merged: Dict[str, str] = {}
+    for item in ordered:
+        merged.setdefault(item.field_name, item.field_value)
+    return merged
 
 
 @router.get("/cases/{case_id}/documents", response_model=List[DocumentResponse])
@@ -387,9 +578,14 @@ async def update_extracted_data(
 
     # Update each field
     for field_name, field_value in data_update.data.items():
+        # Same row merge_extracted_fields() shows for this field
         existing = db.query(TaxCaseExtractedData).filter(
             TaxCaseExtractedData.tax_case_id == case_id,
             TaxCaseExtractedData.field_name == field_name
+        ).order_by(
+            TaxCaseExtractedData.edited.desc(),
+            TaxCaseExtractedData.document_id.asc().nulls_last(),
+            TaxCaseExtractedData.id
         ).first()
 
         if existing:
@@ -520,8 +716,18 @@ async def download_document(doc_id: int, db: Session = Depends(get_db), user: Us
     if not case:
         raise HTTPException(status_code=403, detail="Access denied")
 
+    if doc.file_path and parse_blob_path(doc.file_path):
+        content = await tax_upload_store.aread(doc.file_path)
+        if content is None:
+            raise HTTPException(status_code=404, detail="File not found on server")
+        return StreamingResponse(
+            io.BytesIO(content),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f"attachment; filename={doc.filename}"}
+        )
+
     # Check if file exists
-    if not os.path.exists(doc.file_path):
+    if not doc.file_path or not os.path.exists(doc.file_path):
         raise HTTPException(status_code=404, detail="File not found on server")
 
     def file_iterator():
@@ -603,7 +809,7 @@ async def debug_check_services():
     # Check Ollama
     try:
         from backend.services.llm_gateway import llm_gateway
-        result = llm_gateway.generate(prompt="Test", provider="ollama", max_tokens=10, timeout=10)
+        result = await llm_gateway.agenerate(prompt="Test", provider="ollama", max_tokens=10, timeout=10)
         status["ollama"] = True
         status["ollama_response"] = result.get("response", "")[:50]
     except Exception as e:
@@ -621,6 +827,10 @@ async def debug_check_services():
     except Exception as e:
         status["errors"]["grok"] = str(e)
 
+    # OCR worker pool (queue depth, timeouts, busy time)
+    from backend.services.ocr_engine import ocr_engine
+    status["ocr_pool"] = ocr_engine.get_stats()
+
     return status
 
 
@@ -659,7 +869,7 @@ async def debug_test_llm(data: dict):
         provider = data.get("provider", "grok")
         prompt = data.get("prompt", "Extract the invoice number from this text: Invoice RE-2026-001")
 
-        result = llm_gateway.generate(
+        result = await llm_gateway.agenerate(
             prompt=prompt,
             provider=provider,
             max_tokens=200,
@@ -723,25 +933,23 @@ async def free_upload_and_preview(
             # Apply rotation correction if it's an image
             if file.filename.lower().endswith(('.jpg', '.jpeg', '.png', '.tiff', '.bmp')):
                 try:
-                    from backend.services.application_service import detect_and_correct_rotation, CV2_AVAILABLE
-                    import cv2
+                    from backend.services.application_service import CV2_AVAILABLE
+                    from backend.services.ocr_engine import ocr_engine
 
                     # Convert original to base64
                     with open(original_path, "rb") as f:
                         original_base64 = base64.b64encode(f.read()).decode('utf-8')
 
                     if CV2_AVAILABLE:
-                        # Apply rotation correction and get OCR qualities
-                        # Returns COLOR image (BGR format) + original quality + processed quality
-                        corrected_array, original_quality, processed_quality = detect_and_correct_rotation(original_path)
-
-                        # Save corrected image
+                        # Rotation correction, OCR qualities and OCR preview run in the OCR worker pool
                         corrected_path = os.path.join(upload_dir, file.filename)
-                        cv2.imwrite(corrected_path, corrected_array)
+                        corrected = await ocr_engine.correct_image(original_path, corrected_path)
+                        original_quality = corrected["original_quality"]
+                        processed_quality = corrected["processed_quality"]
+                        ocr_preview = corrected["ocr_preview"]
 
                         # Convert corrected to base64
-                        _, buffer = cv2.imencode('.jpg', corrected_array)
-                        processed_base64 = base64.b64encode(buffer).decode('utf-8')
+                        processed_base64 = base64.b64encode(corrected["jpeg"]).decode('utf-8')
 
                         # Check if quality is good enough (>= 90%)
                         quality_ok = processed_quality >= 90.0
@@ -749,20 +957,6 @@ async def free_upload_and_preview(
                         if not quality_ok:
                             quality_message = f"OCR-Qualität zu niedrig ({processed_quality:.1f}%). Bitte machen Sie ein normales, scharfes Foto der Rechnung."
 
-                        # Extract quick OCR preview (first 200 chars) for debugging
-                        ocr_preview = ""
-                        try:
-                            from PIL import Image as PILImage
-                            import pytesseract
-                            # Convert BGR to RGB for PIL
-                            corrected_rgb_pil = cv2.cvtColor(corrected_array, cv2.COLOR_BGR2RGB)
-                            pil_img = PILImage.fromarray(corrected_rgb_pil)
-                            european_langs = 'deu+eng+spa+fra+ita'
-                            preview_text = pytesseract.image_to_string(pil_img, lang=european_langs, config='--psm 1')
-                            ocr_preview = preview_text[:200].strip() if preview_text else ""
-                        except Exception as ocr_err:
-                            logger.warning(f"OCR preview failed: {ocr_err}")
-
                         processed_images.append({
                             "filename": file.filename,
                             "original_preview": f"data:image/jpeg;base64,{original_base64}",
@@ -773,7 +967,8 @@ async def free_upload_and_preview(
                             "ocr_quality": round(processed_quality, 1),  # Keep for backward compatibility
                             "quality_ok": quality_ok,
                             "quality_message": quality_message,
-                            "ocr_preview": ocr_preview
+                            "ocr_preview": ocr_preview,
+                            "orientation": corrected["orientation"]
                         })
                     else:
                         # No OpenCV, just save original
@@ -854,39 +1049,41 @@ async def free_upload_and_preview(
 
                 # Fallback: PDF is scanned/image-based - use OCR
                 try:
-                    from pdf2image import convert_from_path
-                    from backend.services.application_service import detect_and_correct_rotation, CV2_AVAILABLE
-                    import cv2
+                    from backend.services.application_service import CV2_AVAILABLE
+                    from backend.services.ocr_engine import ocr_engine
 
                     logger.info(f"Converting PDF to images for OCR: {file.filename}")
 
-                    # Convert PDF pages to images (300 DPI for good quality)
-                    pdf_images = convert_from_path(original_path, dpi=300)
-                    logger.info(f"PDF has {len(pdf_images)} page(s)")
+                    page_count = await ocr_engine.pdf_page_count(original_path)
+                    logger.info(f"PDF has {page_count} page(s)")
+
+                    # Pages are rasterised (300 DPI) and rotation-corrected in parallel in the OCR worker pool
+                    base_name = os.path.splitext(file.filename)[0]
+                    page_filenames = [f"{base_name}_Seite_{n}.jpg" for n in range(1, page_count + 1)]
+                    page_paths = [os.path.join(upload_dir, f"pdf_page_{n}_{file.filename}.jpg") for n in range(1, page_count + 1)]
+                    corrected_paths = [os.path.join(upload_dir, name) for name in page_filenames] if CV2_AVAILABLE else None
+                    page_results = await ocr_engine.preview_pdf_pages(original_path, page_paths, corrected_paths)
 
                     # Process each page
-                    for page_num, pdf_page_image in enumerate(pdf_images, start=1):
+                    for page_num, page_result in enumerate(page_results, start=1):
+                        page_filename = page_filenames[page_num - 1]
+                        page_path = page_paths[page_num - 1]
                         try:
-                            # Save PDF page as temporary image
-                            page_filename = f"{os.path.splitext(file.filename)[0]}_Seite_{page_num}.jpg"
-                            page_path = os.path.join(upload_dir, f"pdf_page_{page_num}_{file.filename}.jpg")
-                            pdf_page_image.save(page_path, 'JPEG', quality=95)
+                            if isinstance(page_result, BaseException):
+                                raise page_result
 
                             # Convert to base64 for preview
                             with open(page_path, "rb") as f:
                                 original_base64 = base64.b64encode(f.read()).decode('utf-8')
 
                             if CV2_AVAILABLE:
-                                # Apply rotation correction and get OCR qualities
-                                corrected_array, original_quality, processed_quality = detect_and_correct_rotation(page_path)
-
-                                # Save corrected image
-                                corrected_path = os.path.join(upload_dir, page_filename)
-                                cv2.imwrite(corrected_path, corrected_array)
+                                corrected_path = corrected_paths[page_num - 1]
+                                original_quality = page_result["original_quality"]
+                                processed_quality = page_result["processed_quality"]
+                                ocr_preview = page_result["ocr_preview"]
 
                                 # Convert corrected to base64
-                                _, buffer = cv2.imencode('.jpg', corrected_array)
-                                processed_base64 = base64.b64encode(buffer).decode('utf-8')
+                                processed_base64 = base64.b64encode(page_result["jpeg"]).decode('utf-8')
 
                                 # Check if quality is good enough (>= 90%)
                                 quality_ok = processed_quality >= 90.0
@@ -894,19 +1091,6 @@ async def free_upload_and_preview(
                                 if not quality_ok:
                                     quality_message = f"OCR-Qualität zu niedrig ({processed_quality:.1f}%). Bitte verwenden Sie ein besseres PDF."
 
-                                # Extract quick OCR preview
-                                ocr_preview = ""
-                                try:
-                                    from PIL import Image as PILImage
-                                    import pytesseract
-                                    corrected_rgb_pil = cv2.cvtColor(corrected_array, cv2.COLOR_BGR2RGB)
-                                    pil_img = PILImage.fromarray(corrected_rgb_pil)
-                                    european_langs = 'deu+eng+spa+fra+ita'
-                                    preview_text = pytesseract.image_to_string(pil_img, lang=european_langs, config='--psm 1')
-                                    ocr_preview = preview_text[:200].strip() if preview_text else ""
-                                except Exception as ocr_err:
-                                    logger.warning(f"OCR preview failed for PDF page {page_num}: {ocr_err}")
-
                                 processed_images.append({
                                     "filename": page_filename,
                                     "original_preview": f"data:image/jpeg;base64,{original_base64}",
@@ -918,6 +1102,7 @@ async def free_upload_and_preview(
                                     "quality_ok": quality_ok,
                                     "quality_message": quality_message,
                                     "ocr_preview": ocr_preview,
+                                    "orientation": page_result["orientation"],
                                     "source_pdf": file.filename,
                                     "page_number": page_num
                                 })
@@ -939,7 +1124,7 @@ async def free_upload_and_preview(
                             logger.error(f"Failed to process PDF page {page_num}: {page_err}")
                             # Add error entry for this page
                             processed_images.append({
-                                "filename": f"{os.path.splitext(file.filename)[0]}_Seite_{page_num}.jpg",
+                                "filename": page_filename,
                                 "ocr_quality": 0.0,
                                 "quality_ok": False,
                                 "quality_message": f"Fehler bei Seite {page_num}: {str(page_err)}",
@@ -1158,25 +1343,15 @@ async def free_extract(
                                     )
 
                                     if os.path.exists(pdf_path):
-                                        logger.info(f"Converted {filename} to PDF, now converting to images...")
-                                        # Convert PDF to images
-                                        from pdf2image import convert_from_path
-                                        images = convert_from_path(pdf_path, dpi=300)
-
-                                        # OCR on each page
-                                        extracted_texts = []
-                                        for idx, img in enumerate(images):
-                                            img_path = os.path.join(upload_dir, f"{filename}_page_{idx+1}.png")
-                                            img.save(img_path, 'PNG')
-
-                                            # OCR
-                                            import pytesseract
-                                            text = pytesseract.image_to_string(img, lang='deu+eng')
-                                            extracted_texts.append(text)
-                                            logger.info(f"OCR extracted {len(text)} chars from page {idx+1}")
-
-                                        doc_content = "\n\n--- PAGE BREAK ---\n\n".join(extracted_texts)
-                                        logger.info(f"Total OCR extraction: {len(doc_content)} chars from {len(images)} pages")
+                                        logger.info(f"Converted {filename} to PDF, now extracting pages...")
+                                        # Text layer first, OCR (in parallel) only for pages without one
+                                        from backend.services.pdf_extraction import pdf_extraction_engine
+                                        pdf_result = await pdf_extraction_engine.extract(
+                                            pdf_path, lang='deu+eng', separator="\n\n--- PAGE BREAK ---\n\n"
+                                        )
+
+                                        doc_content = pdf_result["text"]
+                                        logger.info(f"Total extraction: {len(doc_content)} chars from {pdf_result['page_count']} pages ({pdf_result['ocr_pages']} via OCR)")
                                     else:
                                         raise Exception("LibreOffice conversion failed")
 
@@ -1199,38 +1374,23 @@ async def free_extract(
                             logger.error(f"ODT extraction failed: {odt_err}")
                             doc_content = f"[Error extracting ODT: {str(odt_err)}]"
                     elif is_pdf:
-                        # PDF - try direct text extraction first
+                        # PDF - text layer first, OCR only for pages without one
                         logger.info(f"Extracting text from PDF: {filename}")
-                        try:
-                            from PyPDF2 import PdfReader
-                            pdf_reader = PdfReader(file_path)
-                            extracted_text = ""
-                            for page in pdf_reader.pages:
-                                page_text = page.extract_text()
-                                if page_text:
-                                    extracted_text += page_text + "\n"
-
-                            if len(extracted_text.strip()) > 50:
-                                doc_content = extracted_text
-                                logger.info(f"Extracted {len(doc_content)} characters from PDF {filename} (direct)")
-                            else:
-                                # Fallback to OCR
-                                doc_content = parser._parse_image_tesseract(
-                                    open(file_path, 'rb').read(),
-                                    file_path=None
-                                )
-                                logger.info(f"Extracted {len(doc_content)} characters from PDF {filename} (OCR)")
-                        except Exception as pdf_err:
-                            logger.warning(f"PDF direct extraction failed, using OCR: {pdf_err}")
-                            doc_content = parser._parse_image_tesseract(
-                                open(file_path, 'rb').read(),
-                                file_path=None
-                            )
+                        from backend.services.pdf_extraction import pdf_extraction_engine
+                        pdf_result = await pdf_extraction_engine.extract(file_path)
+                        doc_content = pdf_result["text"]
+                        logger.info(
+                            f"Extracted {len(doc_content)} characters from PDF {filename} "
+                            f"({pdf_result['ocr_pages']}/{pdf_result['page_count']} pages via OCR)"
+                        )
                     else:
                         # Image - use Tesseract (already rotated/corrected)
-                        doc_content = parser._parse_image_tesseract(
-                            open(file_path, 'rb').read(),
-                            file_path=None  # Skip rotation correction
+                        from backend.services.ocr_engine import ocr_engine
+                        with open(file_path, 'rb') as f:
+                            image_data = f.read()
+                        doc_content = await ocr_engine.ocr_image(
+                            image_data,
+                            correct_rotation=False  # Skip rotation correction
                         )
                         logger.info(f"Extracted {len(doc_content)} characters from image {filename}")
 
@@ -1315,7 +1475,7 @@ Bei mehreren Warenpositionen verwende position_2_*, position_3_* usw.
             logger.info(f"Sending to LLM: {len(combined_content)} chars of text")
             logger.info(f"Text preview: {combined_content[:500]}")
 
-            result_dict = llm_gateway.generate(prompt=prompt, provider=provider, max_tokens=4000, timeout=timeout)
+            result_dict = await llm_gateway.agenerate(prompt=prompt, provider=provider, max_tokens=4000, timeout=timeout)
             result = result_dict.get("response", "")
 
             logger.info(f"LLM extraction completed with {llm_mode}")
@@ -1351,17 +1511,17 @@ Bei mehreren Warenpositionen verwende position_2_*, position_3_* usw.
             extracted_data["dokument_vorschau"] = combined_content[:800]
 
         # Save to database
-        for field_name, field_value in extracted_data.items():
-            if field_value:
-                data_entry = TaxCaseExtractedData(
-                    tax_case_id=case_id,
-                    field_name=field_name,
-                    field_value=str(field_value),
-                    field_type="text",
-                    confidence=0.7,
-                    confirmed=False
-                )
-                db.add(data_entry)
+        bulk_insert(db, TaxCaseExtractedData, [
+            {
+                "tax_case_id": case_id,
+                "field_name": field_name,
+                "field_value": str(field_value),
+                "field_type": "text",
+                "confidence": 0.7,
+                "confirmed": False,
+            }
+            for field_name, field_value in extracted_data.items() if field_value
+        ])
 
         case.status = "validated"
         db.commit()
@@ -1436,10 +1596,12 @@ async def free_upload(
 
             # Extract text with OCR/DocumentParser
             doc_content = ""
+            ocr_metadata = None
             if DocumentParser:
                 try:
-                    parser = DocumentParser()
-                    doc_content = parser.parse(file_path, ocr_engine=ocr_engine.lower())
+                    doc_content, ocr_metadata = await parse_document_cached(
+                        file_path, content, ocr_engine.lower(), endpoint="taxcases.free_upload"
+                    )
                     logger.info(f"{ocr_mode} extracted {len(doc_content)} characters from {file.filename}")
                 except Exception as parse_error:
                     logger.warning(f"{ocr_mode} failed for {file.filename}: {parse_error}")
@@ -1454,6 +1616,7 @@ async def free_upload(
                 file_path=file_path,
                 doc_type="document",
                 content=doc_content,
+                ocr_metadata=ocr_metadata or None,
                 validated=False
             )
             db.add(doc)
@@ -1533,7 +1696,7 @@ Bei mehreren Warenpositionen verwende position_2_*, position_3_* usw.
             provider = "ollama" if prefer_local else "grok"
             # Ollama on Railway is CPU-only and very slow, needs long timeout
             timeout = 240 if provider == "ollama" else 60  # 240 seconds for Ollama, 60 seconds for Grok
-            result_dict = llm_gateway.generate(prompt=prompt, provider=provider, max_tokens=4000, timeout=timeout)
+            result_dict = await llm_gateway.agenerate(prompt=prompt, provider=provider, max_tokens=4000, timeout=timeout)
             result = result_dict.get("response", "")
 
             logger.info(f"LLM extraction completed with {llm_mode} using {provider}")
@@ -1575,17 +1738,17 @@ Bei mehreren Warenpositionen verwende position_2_*, position_3_* usw.
             extracted_data["hinweis"] = "Bitte Daten manuell überprüfen und ergänzen"
 
         # Save extracted data to database
-        for field_name, field_value in extracted_data.items():
-            if field_value:
-                data_entry = TaxCaseExtractedData(
-                    tax_case_id=case_id,
-                    field_name=field_name,
-                    field_value=str(field_value),
-                    field_type="text",
-                    confidence=0.7,
-                    confirmed=False
-                )
-                db.add(data_entry)
+        bulk_insert(db, TaxCaseExtractedData, [
+            {
+                "tax_case_id": case_id,
+                "field_name": field_name,
+                "field_value": str(field_value),
+                "field_type": "text",
+                "confidence": 0.7,
+                "confirmed": False,
+            }
+            for field_name, field_value in extracted_data.items() if field_value
+        ])
 
         # Mark case as validated
         new_case.status = "validated"
@@ -0,0 +1,89 @@
+"""Vector index management API endpoints (Admin only)."""
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from backend.auth.dependencies import require_admin
+from backend.models.user import User
+from backend.schemas.vector_index import VectorIndexBuildRequest, VectorIndexRecallRequest
+from backend.services.vector_index_service import vector_index_service
+
+
+router = APIRouter(prefix="/admin/vector-indexes", tags=["admin"])
+
+
+@router.get("")
+async def list_vector_indexes(
+    admin: User = Depends(require_admin),
+):
+    """List HNSW/IVFFlat indexes on the embedding columns (Admin only)."""
+    return await vector_index_service.list_indexes()
+
+
+@router.post("/build", status_code=status.HTTP_202_ACCEPTED)
+async def build_vector_index(
+    request: VectorIndexBuildRequest,
+    admin: User = Depends(require_admin),
+):
+    """
+    Start a background CREATE INDEX CONCURRENTLY (Admin only).
+
+    Poll /admin/vector-indexes/progress for build progress.
+    """
+    try:
+        return vector_index_service.start_build(
+            table=request.table,
+            method=request.method,
+            m=request.m,
+            ef_construction=request.ef_construction,
+            lists=request.lists,
+            rebuild=request.rebuild,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/progress")
+async def get_vector_index_progress(
+    admin: User = Depends(require_admin),
+):
+    """Progress of running index builds (Admin only)."""
+    return await vector_index_service.get_build_progress()
+
+
+@router.post("/recall")
+async def measure_vector_index_recall(
+    request: VectorIndexRecallRequest,
+    admin: User = Depends(require_admin),
+):
+    """
+    Measure ANN recall@k and latency against an exact sequential scan (Admin only).
+
+    Use to tune ef_search/probes before changing VECTOR_HNSW_EF_SEARCH / VECTOR_IVFFLAT_PROBES.
+    """
+    try:
+        return await vector_index_service.measure_recall(
+            table=request.table,
+            k=request.k,
+            sample_size=request.sample_size,
+            queries=request.queries,
+            ef_search=request.ef_search,
+            probes=request.probes,
+            user_id=request.user_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/{table}/{method}")
+async def drop_vector_index(
+    table: str,
+    method: str,
+    admin: User = Depends(require_admin),
+):
+    """Drop an ANN index (Admin only)."""
+    try:
+        dropped = await vector_index_service.drop_index(table, method)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not dropped:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Index not found")
+    return {"message": f"Dropped {vector_index_service.index_name(table, method)}"}
@@ -17,6 +17,7 @@ fastapi_users = FastAPIUsers[User, UUID](
 # Current user dependencies
 current_active_user = fastapi_users.current_user(active=True)
 current_superuser = fastapi_users.current_user(active=True, superuser=True)
+current_optional_user = fastapi_users.current_user(active=True, optional=True)
 
 
 async def require_admin(user: User = Depends(current_active_user)) -> User:
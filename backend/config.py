@@ -20,6 +20,91 @@ class Settings(BaseSettings):
     GROK_API_KEY: str = ""
     ANTHROPIC_API_KEY: str = ""
 
+    # LLM Gateway connection pools (per provider)
+    LLM_OLLAMA_MAX_CONCURRENCY: int = 2  # CPU-only Ollama box - more parallel requests only queue up
+    LLM_OLLAMA_EMBED_MAX_CONCURRENCY: int = 4
+    LLM_GROK_MAX_CONCURRENCY: int = 8
+    LLM_ANTHROPIC_MAX_CONCURRENCY: int = 8
+    LLM_OLLAMA_TIMEOUT: int = 120  # Default request timeouts in seconds (overridable per call)
+    LLM_GROK_TIMEOUT: int = 120
+    LLM_ANTHROPIC_TIMEOUT: int = 120
+    LLM_CONNECT_TIMEOUT: float = 10.0
+    LLM_KEEPALIVE_EXPIRY: float = 60.0
+
+    # LLM response cache (deterministic calls are cached by default)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 1000  # In-process LRU tier
+    LLM_CACHE_TTL_SECONDS: int = 604800  # 7 days
+    LLM_CACHE_DB_ENABLED: bool = True  # Postgres tier (llm_response_cache table)
+    LLM_CACHE_DB_MAX_ROWS: int = 50000
+
+    # Embeddings (sentence-transformers, pgvector)
+    EMBEDDING_BACKEND: str = "torch"  # torch (sentence-transformers) or onnx (int8 ONNX export, no torch import)
+    EMBEDDING_ONNX_DIR: str = "./models/onnx"  # Exports from `python -m backend.services.onnx_embedding export <model>`
+    EMBEDDING_ONNX_THREADS: int = 0  # onnxruntime intra-op threads (0 = one per core)
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_WORKERS: int = 1  # Dedicated encoder threads (torch releases the GIL during inference)
+    EMBEDDING_SERVER_URL: str = ""  # Shared sidecar, e.g. unix:///tmp/embedding.sock or http://127.0.0.1:8765 (empty = model in-process)
+    EMBEDDING_SERVER_BATCH_WINDOW_MS: float = 5.0  # Sidecar waits this long for more requests before running a batch
+    EMBEDDING_SERVER_MAX_BATCH: int = 256  # Texts per sidecar forward pass (requests are never split)
+    EMBEDDING_SERVER_TIMEOUT: float = 60.0
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_BYTES: int = 67108864  # 64MB in-process LRU tier (~43k MiniLM vectors)
+    EMBEDDING_CACHE_DB_ENABLED: bool = True  # Postgres tier (embedding_cache table)
+    EMBEDDING_CACHE_DB_MAX_ROWS: int = 500000
+
+    # pgvector ANN indexes (document_chunks.embedding, application_documents.embedding)
+    VECTOR_INDEX_METHOD: str = "hnsw"  # hnsw or ivfflat
+    VECTOR_HNSW_M: int = 16
+    VECTOR_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_HNSW_EF_SEARCH: int = 40  # Per-query candidate list (pgvector default: 40)
+    VECTOR_ITERATIVE_SCAN: str = "strict_order"  # pgvector >= 0.8: keep scanning until enough rows pass the tenant filter (off, strict_order, relaxed_order)
+    VECTOR_HNSW_EF_SEARCH_FILTERED: int = 200  # Candidate list floor on pgvector < 0.8 (no iterative scans; filter runs after the index scan)
+    VECTOR_IVFFLAT_LISTS: int = 100  # Rule of thumb: rows / 1000 (up to 1M rows)
+    VECTOR_IVFFLAT_PROBES: int = 10
+    VECTOR_INDEX_MAINTENANCE_WORK_MEM: str = "512MB"  # Graph must fit in memory for fast HNSW builds
+
+    # OCR worker pool (Tesseract runs in separate processes, never on the event loop)
+    OCR_WORKERS: int = 0  # 0 = one process per CPU core
+    OCR_MAX_QUEUE: int = 128  # Jobs allowed to wait for a free worker before new ones are rejected
+    OCR_JOB_TIMEOUT: float = 180.0  # Seconds per job (one image or one PDF page)
+    OCR_PDF_DPI: int = 300  # Rasterisation DPI for scanned PDF pages
+    OCR_OSD_MIN_CONFIDENCE: float = 10.0  # Tesseract OSD orientation confidence needed to skip the rotation search
+    OCR_LANGUAGE_DETECTION: bool = True  # Low-res pre-pass picks 1-3 languages instead of loading all 20 packs
+
+    # PDF extraction (text layer first, OCR only for pages without one)
+    PDF_MIN_TEXT_CHARS: int = 25  # Alphanumeric chars for a page's text layer to count as usable
+    PDF_OCR_TARGET_PIXELS: int = 3500  # Long side of a rasterised page (~300 DPI for A4)
+    PDF_OCR_MIN_DPI: int = 150
+    PDF_OCR_MAX_DPI: int = 400
+    PDF_OCR_WINDOW: int = 0  # OCR pages in flight per PDF (0 = two per OCR worker)
+
+    # Extraction cache (text/metadata of uploaded files, keyed by SHA-256 of the bytes)
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_MAX_BYTES: int = 67108864  # 64MB in-process LRU tier (extracted text)
+    EXTRACTION_CACHE_DB_ENABLED: bool = True  # Postgres tier (extraction_cache table)
+    EXTRACTION_CACHE_DB_MAX_ROWS: int = 20000
+
+    # Background jobs (queue persisted in Postgres, workers run in-process)
+    JOB_WORKERS: int = 2  # Jobs processed concurrently per backend process
+    JOB_POLL_INTERVAL: float = 5.0  # Seconds between queue polls when idle (enqueue wakes workers immediately)
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 10.0  # Backoff: base * 2^(attempt - 1), plus up to 25% jitter
+    JOB_RETRY_MAX_SECONDS: float = 600.0
+    JOB_TIMEOUT_SECONDS: float = 3600.0  # Per attempt
+    JOB_HEARTBEAT_SECONDS: float = 30.0
+    JOB_STALE_SECONDS: float = 300.0  # Running jobs without a heartbeat this long are requeued (crashed process)
+
+    # Bulk inserts (backend/services/bulk_insert.py)
+    BULK_INSERT_CHUNK_SIZE: int = 1000  # Rows per multi-row INSERT (also capped by Postgres' 32767 bind parameters)
+    BULK_INSERT_COPY_THRESHOLD: int = 500  # asyncpg: batches this large use COPY instead (0 = never)
+
+    # Tax case document processing (fan-out over the files of one upload)
+    TAXCASE_PARALLEL_EXTRACTION: bool = True  # False = one file at a time (OCR, then LLM)
+    TAXCASE_OCR_CONCURRENCY: int = 4  # Files OCR'd at once per upload job (pages still share the OCR worker pool)
+    TAXCASE_LLM_CONCURRENCY_OLLAMA: int = 2  # Concurrent extraction prompts per provider, on top of the gateway pools
+    TAXCASE_LLM_CONCURRENCY_GROK: int = 6
+
     # ChromaDB
     CHROMA_PERSIST_DIRECTORY: str = "./data/chroma_db"
 
@@ -29,6 +114,15 @@ class Settings(BaseSettings):
     ELASTICSEARCH_USER: str = "elastic"
     ELASTICSEARCH_PASSWORD: str = ""
     ELASTICSEARCH_USE_SSL: str = "false"
+    ELASTICSEARCH_VERIFY_CERTS: bool = False  # Railway ES uses a self-signed certificate
+    ELASTICSEARCH_MAX_CONNECTIONS: int = 25  # Pooled connections per node (shared by all services)
+    ELASTICSEARCH_REQUEST_TIMEOUT: float = 30.0
+    ELASTICSEARCH_MAX_RETRIES: int = 3
+    ELASTICSEARCH_BULK_CHUNK_SIZE: int = 500  # Actions per bulk request
+    ELASTICSEARCH_BULK_MAX_BYTES: int = 10485760  # 10MB per bulk request (embeddings make docs large)
+    ELASTICSEARCH_EMBEDDING_PROVIDER: str = "registry"  # registry (in-process model) or ollama (batched /api/embed)
+    ELASTICSEARCH_EMBEDDING_MODEL: str = ""  # Default per provider: all-MiniLM-L6-v2 / nomic-embed-text
+    ELASTICSEARCH_HYBRID_MODE: str = "parallel"  # parallel (concurrent legs, weighted merge) or rrf (one request, server-side RRF)
 
     # Railway
     PORT: int = 8000
@@ -43,6 +137,10 @@ class Settings(BaseSettings):
     # File Upload
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB in bytes
     UPLOAD_DIR: str = "./data/uploads"
+    MEDIA_STORAGE_BACKEND: str = "postgres"  # Photo blobs: postgres (large objects, survives redeploys) or local (needs a UPLOAD_DIR volume)
+    MEDIA_CACHE_MAX_AGE: int = 31536000  # Blob URLs are content hashes - cache for a year
+    UPLOAD_INGEST_WORKERS: int = 4  # Files parsed concurrently during streaming bulk uploads
+    UPLOAD_INGEST_BATCH_SIZE: int = 16  # Parsed documents per DB commit / Elasticsearch bulk request
 
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -3,17 +3,16 @@
 import backend.patch_passlib  # noqa: F401
 # Force restart to create bar_newsletter table
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import logging
-import os
-from pathlib import Path
 from backend.config import settings
 from backend.database import create_db_and_tables
 from backend.api.auth import auth_router, users_router
 from backend.api.admin import router as admin_router
+from backend.api.vector_indexes import router as vector_indexes_router
 from backend.api.llm import router as llm_router
 from backend.api.projects import router as projects_router
 from backend.api.documents import router as documents_router
@@ -37,6 +36,8 @@ from backend.api.taxcases import router as taxcases_router
 from backend.api.mvptaxspain import h7_router, admin_settings_router, mvp_auth_router
 from backend.api.h7_full import router as h7_full_router
 from backend.api.calendar import router as calendar_router
+from backend.api.jobs import router as jobs_router
+from backend.services.blob_store import BlobStaticFiles, MEDIA_ROOT, blob_store
 
 # Setup logging
 logging.basicConfig(level=settings.LOG_LEVEL)
@@ -61,11 +62,15 @@ async def lifespan(app: FastAPI):
     try:
         from backend.services.application_elasticsearch_service import application_es_service
 
+        from backend.services.elasticsearch_service import ElasticsearchService
+
         logger.info("Initializing Elasticsearch index for Application Tracker...")
-        if application_es_service.create_index():
+        if await application_es_service.create_index():
             logger.info("✅ Application Tracker Elasticsearch index ready")
         else:
             logger.warning("⚠️  Could not create Elasticsearch index (service may be unavailable)")
+
+        await ElasticsearchService().ensure_indices()
     except Exception as e:
         logger.warning(f"⚠️  Elasticsearch initialization failed (non-critical): {e}")
 
@@ -73,9 +78,27 @@ async def lifespan(app: FastAPI):
     # Call POST /api/applications/test/create-demo-user after deployment
     logger.info("⚠️  DEMO MODE: Call POST /api/applications/test/create-demo-user to create demo user")
 
+    # Background job workers (tax uploads, folder indexing, profile import)
+    from backend.services.job_queue import job_queue
+    job_queue.start()
+
+    # Load the default embedding model in a worker thread now instead of on the first search request
+    from backend.services.embedding_registry import embedding_registry
+    from backend.services.vector_service import VectorService
+    app.state.embedding_warmup = asyncio.create_task(embedding_registry.aget(VectorService.MODEL_NAME))
+
     yield
     # Shutdown
     logger.info("Shutting down General Backend...")
+    await job_queue.shutdown()  # Requeue interrupted jobs before their clients close
+    from backend.services.llm_gateway import LLMGateway
+    from backend.services.elasticsearch_client import close_es_client
+    from backend.services.ocr_engine import ocr_engine
+    from backend.services.embedding_client import RemoteEmbeddingEncoder
+    await LLMGateway.aclose()
+    await RemoteEmbeddingEncoder.aclose()
+    await close_es_client()
+    ocr_engine.shutdown()
 
 
 # Create FastAPI app
@@ -128,7 +151,9 @@ app.add_middleware(
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(admin_router)
+app.include_router(vector_indexes_router)
 app.include_router(llm_router)
+app.include_router(jobs_router)
 app.include_router(projects_router)
 app.include_router(documents_router)
 app.include_router(chat_router)
@@ -155,10 +180,11 @@ app.include_router(mvp_auth_router, prefix="/api", tags=["MVP Auth"])
 app.include_router(calendar_router, prefix="/api", tags=["Google Calendar"])
 
 # Mount static files for uploads (LifeChronicle photos, etc.)
-UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "./uploads"))
+# Range requests + content-hash ETags; Postgres-stored blobs are served from the same URLs
+UPLOAD_DIR = MEDIA_ROOT
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
-logger.info(f"Static files mounted: /uploads -> {UPLOAD_DIR}")
+app.mount("/uploads", BlobStaticFiles(directory=str(UPLOAD_DIR), store=blob_store), name="uploads")
+logger.info(f"Static files mounted: /uploads -> {UPLOAD_DIR} (blob store: {blob_store.name})")
 
 
 @app.get("/")
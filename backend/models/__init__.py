@@ -2,6 +2,7 @@
 from backend.models.user import User
 from backend.models.project import Project, ProjectType
 from backend.models.document import Document, DocumentType
+from backend.models.document_chunk import DocumentChunk
 from backend.models.chat import Chat, ChatRole
 from backend.models.match import Match
 from backend.models.lifechronicle import LifeChronicleEntry
@@ -10,12 +11,18 @@ from backend.models.bar import BarInfo, BarMenu, BarNews, BarReservation, BarNew
 from backend.models.application import Application, ApplicationDocument, ApplicationStatusHistory, ApplicationChatMessage
 from backend.models.taxcase import TaxCase, TaxCaseFolder, TaxCaseDocument, TaxCaseExtractedData
 from backend.models.h7form import H7FormData, AdminSettings, PasswordResetToken
+from backend.models.llm_cache import LLMResponseCacheEntry
+from backend.models.embedding_cache import EmbeddingCacheEntry
+from backend.models.extraction_cache import ExtractionCacheEntry
+from backend.models.job import BackgroundJob
+from backend.models.media_blob import MediaBlob
 
 __all__ = [
-    "User", "Project", "ProjectType", "Document", "DocumentType",
+    "User", "Project", "ProjectType", "Document", "DocumentType", "DocumentChunk",
     "Chat", "ChatRole", "Match", "LifeChronicleEntry", "JobApplication",
     "UserProfile", "BarInfo", "BarMenu", "BarNews", "BarReservation", "BarNewsletter",
     "Application", "ApplicationDocument", "ApplicationStatusHistory", "ApplicationChatMessage",
     "TaxCase", "TaxCaseFolder", "TaxCaseDocument", "TaxCaseExtractedData",
-    "H7FormData", "AdminSettings", "PasswordResetToken"
+    "H7FormData", "AdminSettings", "PasswordResetToken", "LLMResponseCacheEntry",
+    "EmbeddingCacheEntry", "ExtractionCacheEntry", "BackgroundJob", "MediaBlob"
 ]
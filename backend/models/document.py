@@ -34,7 +34,7 @@ class Document(Base):
     url: Mapped[str] = mapped_column(Text, nullable=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     doc_metadata: Mapped[dict] = mapped_column(JSONB, nullable=True, default=dict)
-    embedding: Mapped[Vector] = mapped_column(Vector(384), nullable=True)  # sentence-transformers default size
+    embedding: Mapped[Vector] = mapped_column(Vector(384), nullable=True)  # Legacy - embeddings live in document_chunks
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
@@ -43,6 +43,10 @@ class Document(Base):
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="documents")
     project: Mapped["Project"] = relationship("Project", back_populates="documents")
+    chunks: Mapped[list["DocumentChunk"]] = relationship(
+        "DocumentChunk", back_populates="document", cascade="all, delete-orphan",
+        passive_deletes=True, order_by="DocumentChunk.ordinal",
+    )
 
     def __repr__(self):
         return f"<Document {self.filename or self.url or 'text'} ({self.type})>"
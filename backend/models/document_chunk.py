@@ -0,0 +1,46 @@
+"""Document chunk model."""
+from sqlalchemy import Integer, Text, ForeignKey, DateTime, Index, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from datetime import datetime
+from uuid import uuid4
+from pgvector.sqlalchemy import Vector
+
+from backend.database import Base
+from backend.models.document import DocumentType
+
+
+class DocumentChunk(Base):
+    """
+    Embedded slice of a document (one row per chunk, parent row stays intact).
+
+    user_id, project_id and document_type are copied from the parent so vector
+    search filters on this table alone without joining ``documents``.
+    """
+
+    __tablename__ = "document_chunks"
+    __table_args__ = (
+        UniqueConstraint("document_id", "ordinal", name="uq_document_chunks_document_ordinal"),
+        Index("ix_document_chunks_user_project", "user_id", "project_id"),
+    )
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    document_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    project_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=True)
+    document_type: Mapped[DocumentType] = mapped_column(SQLEnum(DocumentType), nullable=False)
+    ordinal: Mapped[int] = mapped_column(Integer, nullable=False)  # 0-based position in the document
+    start_offset: Mapped[int] = mapped_column(Integer, nullable=False)  # Word offsets into the parent content
+    end_offset: Mapped[int] = mapped_column(Integer, nullable=False)
+    token_count: Mapped[int] = mapped_column(Integer, nullable=False)  # Whitespace-separated words
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    embedding: Mapped[Vector] = mapped_column(Vector(384), nullable=True)  # sentence-transformers default size
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    document: Mapped["Document"] = relationship("Document", back_populates="chunks")
+
+    def __repr__(self):
+        return f"<DocumentChunk {self.document_id}#{self.ordinal} ({self.token_count} words)>"
@@ -0,0 +1,22 @@
+"""Embedding cache model."""
+from sqlalchemy import String, Integer, DateTime, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from backend.database import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """Persistent tier of the embedding cache (SHA-256 of normalized text + model id)."""
+
+    __tablename__ = "embedding_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)  # SHA-256 hex
+    model: Mapped[str] = mapped_column(String(255), nullable=False)
+    dimensions: Mapped[int] = mapped_column(Integer, nullable=False)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # float32, little-endian
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    last_accessed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<EmbeddingCacheEntry {self.cache_key[:12]} ({self.model}, {self.dimensions}d)>"
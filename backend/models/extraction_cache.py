@@ -0,0 +1,27 @@
+"""Extraction cache model."""
+from sqlalchemy import String, Integer, BigInteger, Float, DateTime, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from backend.database import Base
+
+
+class ExtractionCacheEntry(Base):
+    """Persistent tier of the extraction cache (SHA-256 of file bytes + extractor + settings)."""
+
+    __tablename__ = "extraction_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)  # SHA-256 hex
+    file_sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    extractor: Mapped[str] = mapped_column(String(255), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)  # Size of the source file
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    extraction_metadata: Mapped[dict] = mapped_column(JSONB, nullable=True)
+    extraction_seconds: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    last_accessed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ExtractionCacheEntry {self.cache_key[:12]} ({self.extractor}, {self.size_bytes} bytes)>"
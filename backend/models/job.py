@@ -0,0 +1,41 @@
+"""Background job model."""
+from sqlalchemy import String, Integer, Float, DateTime, Text, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from backend.database import Base
+
+
+class BackgroundJob(Base):
+    """Persisted job of the in-process background job queue."""
+
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        # Same key from the same user for the same kind of job -> same job
+        Index("ix_background_jobs_idempotency", "kind", "user_id", "idempotency_key", unique=True),
+        # Claim query: next queued job that is due
+        Index("ix_background_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)  # UUID4
+    kind: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    user_id: Mapped[str] = mapped_column(String(36), nullable=True, index=True)
+    idempotency_key: Mapped[str] = mapped_column(String(255), nullable=True)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    checkpoint: Mapped[dict] = mapped_column(JSONB, nullable=True)  # Handler state kept across retries
+    result: Mapped[dict] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    progress: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)  # 0.0 - 1.0
+    progress_message: Mapped[str] = mapped_column(String(500), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+    run_after: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)  # Retry backoff
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)  # Heartbeat
+
+    def __repr__(self):
+        return f"<BackgroundJob {self.id} ({self.kind}, {self.status})>"
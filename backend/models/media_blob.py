@@ -0,0 +1,21 @@
+"""Media blob model (Postgres backend of the blob store)."""
+from sqlalchemy import String, BigInteger, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from backend.database import Base
+
+
+class MediaBlob(Base):
+    """Content-addressed media file stored as a Postgres large object."""
+
+    __tablename__ = "media_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)  # SHA-256 hex of the bytes
+    content_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    oid: Mapped[int] = mapped_column(BigInteger, nullable=False)  # pg_largeobject OID
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<MediaBlob {self.sha256[:12]} ({self.content_type}, {self.size_bytes} bytes)>"
@@ -64,6 +64,7 @@ class TaxCaseDocument(Base):
     file_path = Column(String(500), nullable=True)
     doc_type = Column(String(50), nullable=True)
     content = Column(Text, nullable=True)  # Extracted text content
+    ocr_metadata = Column(JSON, nullable=True)  # OCR languages, orientation and timings
     embedding = Column(Vector(384), nullable=True)
     validated = Column(Boolean, nullable=False, default=False, index=True)  # Status: Validiert
 
@@ -90,6 +91,7 @@ class TaxCaseExtractedData(Base):
     field_value = Column(Text, nullable=False)
     field_type = Column(String(50), nullable=True)  # text, number, date, email, phone, etc.
     confidence = Column(Float, nullable=True)  # Confidence score from LLM
+    extraction_seconds = Column(Float, nullable=True)  # LLM latency for the source document
 
     # User validation
     confirmed = Column(Boolean, nullable=False, default=False, index=True)
@@ -69,6 +69,7 @@ class DocumentResponse(BaseModel):
     folder_id: Optional[int]
     filename: str
     doc_type: Optional[str]
+    ocr_metadata: Optional[Dict[str, Any]] = None
     validated: bool
     created_at: datetime
 
@@ -98,6 +99,7 @@ class ExtractedDataResponse(BaseModel):
     field_value: str
     field_type: Optional[str]
     confidence: Optional[float]
+    extraction_seconds: Optional[float] = None
     confirmed: bool
     edited: bool
     original_value: Optional[str]
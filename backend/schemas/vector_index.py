@@ -0,0 +1,24 @@
+"""Vector index Pydantic schemas."""
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+
+class VectorIndexBuildRequest(BaseModel):
+    """Request schema for building a pgvector ANN index."""
+    table: str = Field(default="document_chunks", description="Table with an embedding column (document_chunks, application_documents)")
+    method: Optional[str] = Field(None, description="Index method (hnsw, ivfflat); defaults to VECTOR_INDEX_METHOD")
+    m: Optional[int] = Field(None, ge=2, le=100, description="HNSW max connections per layer")
+    ef_construction: Optional[int] = Field(None, ge=4, le=1000, description="HNSW build-time candidate list size")
+    lists: Optional[int] = Field(None, ge=1, le=32768, description="IVFFlat number of lists")
+    rebuild: bool = Field(default=False, description="Drop and rebuild an existing index")
+
+
+class VectorIndexRecallRequest(BaseModel):
+    """Request schema for measuring ANN recall against an exact scan."""
+    table: str = Field(default="document_chunks", description="Table with an embedding column (document_chunks, application_documents)")
+    k: int = Field(default=10, ge=1, le=100, description="Neighbours per query")
+    sample_size: int = Field(default=20, ge=1, le=500, description="Stored embeddings to use as queries")
+    queries: Optional[List[str]] = Field(None, description="Query texts (used instead of sampled embeddings)")
+    ef_search: Optional[int] = Field(None, ge=1, le=1000, description="HNSW candidate list size to evaluate")
+    probes: Optional[int] = Field(None, ge=1, le=32768, description="IVFFlat probes to evaluate")
+    user_id: Optional[str] = Field(None, description="Measure within this user's rows (default: each sampled row's owner)")
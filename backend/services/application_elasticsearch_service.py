@@ -3,8 +3,8 @@ Elasticsearch Service for Application Tracker
 Handles document indexing and hybrid search for job applications
 """
 from typing import List, Dict, Any, Optional
-from elasticsearch import Elasticsearch
-from backend.config import settings
+from backend.services.elasticsearch_client import get_es_client
+from backend.services.elasticsearch_bulk import bulk_write, index_action
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,33 +15,10 @@ class ApplicationElasticsearchService:
 
     def __init__(self):
         """Initialize Elasticsearch client"""
-        self.es = None
         self.index_name = "application_tracker_documents"
-        self._connect()
+        self.es = get_es_client()  # Shared AsyncElasticsearch (see elasticsearch_client)
 
-    def _connect(self):
-        """Connect to Elasticsearch"""
-        try:
-            # Build Elasticsearch URL
-            protocol = "https" if settings.ELASTICSEARCH_USE_SSL == "true" else "http"
-            es_url = f"{protocol}://{settings.ELASTICSEARCH_HOST}:{settings.ELASTICSEARCH_PORT}"
-
-            self.es = Elasticsearch(
-                [es_url],
-                basic_auth=(settings.ELASTICSEARCH_USER, settings.ELASTICSEARCH_PASSWORD) if settings.ELASTICSEARCH_PASSWORD else None,
-                verify_certs=False if settings.ELASTICSEARCH_USE_SSL == "true" else None,
-            )
-
-            # Test connection
-            if self.es.ping():
-                logger.info(f"✅ Application Tracker: Connected to Elasticsearch at {es_url}")
-            else:
-                logger.warning(f"⚠️ Application Tracker: Elasticsearch ping failed at {es_url}")
-        except Exception as e:
-            logger.error(f"❌ Application Tracker: Failed to connect to Elasticsearch: {e}")
-            self.es = None
-
-    def create_index(self):
+    async def create_index(self):
         """Create index for application documents with optimized search"""
         if not self.es:
             logger.error("Elasticsearch not connected")
@@ -83,18 +60,37 @@ class ApplicationElasticsearchService:
         }
 
         try:
-            if self.es.indices.exists(index=self.index_name):
+            if await self.es.indices.exists(index=self.index_name):
                 logger.info(f"Index {self.index_name} already exists")
                 return True
 
-            self.es.indices.create(index=self.index_name, body=mapping)
+            await self.es.indices.create(index=self.index_name, body=mapping)
             logger.info(f"✅ Created index: {self.index_name}")
             return True
         except Exception as e:
             logger.error(f"❌ Failed to create index: {e}")
             return False
 
-    def index_document(self, document_id: int, application_id: int, user_id: str,
+    @staticmethod
+    def build_document(document_id: int, application_id: int, user_id: str,
+                       company_name: str, position: Optional[str], filename: str,
+                       file_path: str, doc_type: str, content: str, created_at: str) -> Dict[str, Any]:
+        """Build the ES source document for an ApplicationDocument"""
+        return {
+            "document_id": document_id,
+            "application_id": application_id,
+            "user_id": str(user_id),
+            "company_name": company_name,
+            "position": position or "",
+            "filename": filename,
+            "file_path": file_path,
+            "doc_type": doc_type,
+            "content": content,
+            "created_at": created_at,
+            "indexed_at": "now"
+        }
+
+    async def index_document(self, document_id: int, application_id: int, user_id: str,
                       company_name: str, position: Optional[str], filename: str,
                       file_path: str, doc_type: str, content: str, created_at: str) -> bool:
         """Index a single application document"""
@@ -103,28 +99,41 @@ class ApplicationElasticsearchService:
             return False
 
         try:
-            doc = {
-                "document_id": document_id,
-                "application_id": application_id,
-                "user_id": str(user_id),
-                "company_name": company_name,
-                "position": position or "",
-                "filename": filename,
-                "file_path": file_path,
-                "doc_type": doc_type,
-                "content": content,
-                "created_at": created_at,
-                "indexed_at": "now"
-            }
-
-            self.es.index(index=self.index_name, id=document_id, document=doc)
+            doc = self.build_document(
+                document_id, application_id, user_id, company_name, position,
+                filename, file_path, doc_type, content, created_at
+            )
+            await self.es.index(index=self.index_name, id=document_id, document=doc)
             logger.debug(f"✅ Indexed document {document_id} for {company_name}")
             return True
         except Exception as e:
             logger.error(f"❌ Failed to index document {document_id}: {e}")
             return False
 
-    def search(self, query: str, user_id: str, company_filter: Optional[str] = None,
+    async def index_documents(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Index many application documents with the bulk API (one refresh at the end)
+
+        Args:
+            documents: Source documents from build_document()
+
+        Returns:
+            Bulk result with succeeded/failed counts and per-item errors
+        """
+        if not self.es:
+            logger.warning("Elasticsearch not connected, skipping indexing")
+            return {"succeeded": 0, "failed": len(documents), "errors": []}
+
+        try:
+            return await bulk_write(
+                (index_action(self.index_name, doc, doc["document_id"]) for doc in documents),
+                client=self.es
+            )
+        except Exception as e:
+            logger.error(f"❌ Bulk indexing of {len(documents)} documents failed: {e}")
+            return {"succeeded": 0, "failed": len(documents), "errors": [{"error": str(e)}]}
+
+    async def search(self, query: str, user_id: str, company_filter: Optional[str] = None,
               doc_type_filter: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Search application documents with filters
@@ -180,7 +189,7 @@ class ApplicationElasticsearchService:
                 }
             }
 
-            response = self.es.search(index=self.index_name, body=search_query)
+            response = await self.es.search(index=self.index_name, body=search_query)
 
             # Format results
             results = []
@@ -204,20 +213,20 @@ class ApplicationElasticsearchService:
             logger.error(f"❌ Elasticsearch search failed: {e}")
             return []
 
-    def delete_document(self, document_id: int) -> bool:
+    async def delete_document(self, document_id: int) -> bool:
         """Delete a document from the index"""
         if not self.es:
             return False
 
         try:
-            self.es.delete(index=self.index_name, id=document_id)
+            await self.es.delete(index=self.index_name, id=document_id)
             logger.debug(f"🗑️ Deleted document {document_id} from Elasticsearch")
             return True
         except Exception as e:
             logger.error(f"❌ Failed to delete document {document_id}: {e}")
             return False
 
-    def delete_by_application(self, application_id: int) -> int:
+    async def delete_by_application(self, application_id: int) -> int:
         """Delete all documents for an application"""
         if not self.es:
             return 0
@@ -228,7 +237,7 @@ class ApplicationElasticsearchService:
                     "term": {"application_id": application_id}
                 }
             }
-            response = self.es.delete_by_query(index=self.index_name, body=query)
+            response = await self.es.delete_by_query(index=self.index_name, body=query)
             deleted = response.get("deleted", 0)
             logger.info(f"🗑️ Deleted {deleted} documents for application {application_id}")
             return deleted
@@ -236,19 +245,19 @@ class ApplicationElasticsearchService:
             logger.error(f"❌ Failed to delete documents for application {application_id}: {e}")
             return 0
 
-    def health_check(self) -> Dict[str, Any]:
+    async def health_check(self) -> Dict[str, Any]:
         """Check Elasticsearch health and index stats"""
         if not self.es:
             return {"status": "disconnected", "error": "Not connected to Elasticsearch"}
 
         try:
-            cluster_health = self.es.cluster.health()
-            index_stats = self.es.indices.stats(index=self.index_name) if self.es.indices.exists(index=self.index_name) else {}
+            cluster_health = await self.es.cluster.health()
+            index_stats = await self.es.indices.stats(index=self.index_name) if await self.es.indices.exists(index=self.index_name) else {}
 
             return {
                 "status": "connected",
                 "cluster_status": cluster_health.get("status"),
-                "index_exists": self.es.indices.exists(index=self.index_name),
+                "index_exists": await self.es.indices.exists(index=self.index_name),
                 "document_count": index_stats.get("_all", {}).get("primaries", {}).get("docs", {}).get("count", 0)
             }
         except Exception as e:
@@ -3,9 +3,10 @@ import io
 import zipfile
 import numpy as np
 from typing import List, Tuple, Literal
-from PyPDF2 import PdfReader
 from docx import Document as DocxDocument
 
+from backend.services.extraction_cache import ExtractionFailed, pdf_result
+
 # Optional OCR imports
 try:
     from PIL import Image
@@ -41,6 +42,9 @@ except ImportError:
     ANTIWORD_AVAILABLE = False
 
 
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tiff', '.bmp')
+
+
 # Global PaddleOCR instances (singleton to avoid re-initialization error)
 _paddle_ocr_instance = None
 _paddle_structure_instance = None
@@ -113,6 +117,40 @@ def deskew_image(image: np.ndarray) -> Tuple[np.ndarray, float]:
     return deskewed, angle
 
 
+# Full language list used for quality measurement and orientation search
+EUROPEAN_LANGS = 'deu+eng+spa+fra+ita+pol+ces+nld+por+ron+hun+slk+slv+hrv+bul+ell+swe+dan+nor+fin'
+
+# OSD runs on a downscaled copy - orientation needs layout, not fine glyph detail
+OSD_MAX_SIDE = 2000
+# Projection-profile heuristic thumbnail size and the variance ratio that counts as decisive
+PROJECTION_MAX_SIDE = 800
+PROJECTION_MIN_RATIO = 1.5
+
+
+def _ocr_stats(image: np.ndarray, config: str = '--psm 1') -> Tuple[float, int]:
+    """
+    One Tesseract pass (image_to_data) → (average word confidence, alphanumeric char count).
+
+    The character count comes from the recognised words of the same pass, so no
+    separate image_to_string call is needed.
+    """
+    from PIL import Image as PILImage
+    pil_img = PILImage.fromarray(image)
+
+    data = pytesseract.image_to_data(pil_img, lang=EUROPEAN_LANGS, config=config, output_type=pytesseract.Output.DICT)
+
+    confidences = []
+    char_count = 0
+    for word, conf in zip(data['text'], data['conf']):
+        conf = float(conf)
+        if conf > 0:
+            confidences.append(conf)
+        char_count += sum(1 for c in (word or '') if c.isalnum())
+
+    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return avg_confidence, char_count
+
+
 def get_ocr_quality(image: np.ndarray) -> float:
     """
     Measure OCR quality considering BOTH confidence AND text amount.
@@ -136,27 +174,11 @@ def get_ocr_quality(image: np.ndarray) -> float:
         return 0.0
 
     try:
-        from PIL import Image as PILImage
-        pil_img = PILImage.fromarray(image)
-
-        # Use European languages for quality measurement (same as rotation detection)
-        european_langs = 'deu+eng+spa+fra+ita+pol+ces+nld+por+ron+hun+slk+slv+hrv+bul+ell+swe+dan+nor+fin'
-
-        # Get detailed OCR data with confidence scores
-        data = pytesseract.image_to_data(pil_img, lang=european_langs, output_type=pytesseract.Output.DICT)
+        avg_confidence, char_count = _ocr_stats(image)
 
-        # Calculate average confidence for all recognized words
-        confidences = [int(conf) for conf in data['conf'] if conf != '-1' and int(conf) > 0]
-
-        if len(confidences) == 0:
+        if avg_confidence == 0:
             return 0.0
 
-        avg_confidence = sum(confidences) / len(confidences)
-
-        # Get full text to count characters
-        text = pytesseract.image_to_string(pil_img, lang=european_langs, config='--psm 1')
-        char_count = len(''.join(c for c in text if c.isalnum()))
-
         # Expected minimum characters for a normal invoice: 200
         # If we have 200+ chars → full confidence score
         # If we have less → reduce quality proportionally
@@ -175,180 +197,356 @@ def get_ocr_quality(image: np.ndarray) -> float:
         return 0.0
 
 
-def detect_and_correct_rotation(image_path: str) -> Tuple[np.ndarray, float, float]:
+def rotate_quadrant(image: np.ndarray, angle: int) -> np.ndarray:
+    """Rotate an image clockwise by 0/90/180/270 degrees."""
+    if angle == 90:
+        return cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
+    if angle == 180:
+        return cv2.rotate(image, cv2.ROTATE_180)
+    if angle == 270:
+        return cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    return image
+
+
+def _downscale(image: np.ndarray, max_side: int) -> np.ndarray:
+    h, w = image.shape[:2]
+    scale = max_side / max(h, w)
+    if scale >= 1.0:
+        return image
+    return cv2.resize(image, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+
+
+def _osd_orientation(gray: np.ndarray) -> Tuple[int, float]:
+    """
+    Tesseract orientation and script detection (--psm 0) on a downscaled copy.
+
+    Returns:
+        (clockwise rotation that makes the page upright, orientation confidence)
+    """
+    from PIL import Image as PILImage
+
+    osd = pytesseract.image_to_osd(
+        PILImage.fromarray(_downscale(gray, OSD_MAX_SIDE)),
+        config='--psm 0',
+        output_type=pytesseract.Output.DICT,
+    )
+    return int(osd['rotate']) % 360, float(osd['orientation_conf'])
+
+
+def _projection_axis(gray: np.ndarray) -> Tuple[List[int], float]:
+    """
+    Cheap text-line direction estimate from projection profiles of a thumbnail.
+
+    Horizontal text lines make the row profile alternate (lines vs. gaps) much
+    more than the column profile. This separates {0°, 180°} from {90°, 270°} but
+    cannot tell upside-down from upright.
+
+    Returns:
+        (candidate rotations, variance ratio) - all four candidates if ambiguous
+    """
+    thumb = _downscale(gray, PROJECTION_MAX_SIDE)
+    binary = cv2.threshold(thumb, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1].astype(np.float64)
+
+    def dispersion(profile: np.ndarray) -> float:
+        mean = profile.mean()
+        return float(profile.var() / (mean * mean)) if mean > 0 else 0.0
+
+    rows = dispersion(binary.sum(axis=1))
+    cols = dispersion(binary.sum(axis=0))
+    if rows == 0 or cols == 0:
+        return [0, 90, 180, 270], 1.0
+
+    ratio = rows / cols
+    if ratio >= PROJECTION_MIN_RATIO:
+        return [0, 180], ratio
+    if ratio <= 1.0 / PROJECTION_MIN_RATIO:
+        return [90, 270], 1.0 / ratio
+    return [0, 90, 180, 270], max(ratio, 1.0 / ratio)
+
+
+def _search_rotations(gray: np.ndarray, candidates: List[int]) -> Tuple[int, float]:
+    """
+    Pick the best rotation by OCR'ing each candidate (one image_to_data pass each).
+
+    Score = character count weighted by confidence. The original orientation is
+    kept unless another rotation is at least 20% better.
+    """
+    scores = {}
+    for rot in candidates:
+        try:
+            avg_confidence, char_count = _ocr_stats(rotate_quadrant(gray, rot), config='--psm 3')
+            scores[rot] = char_count * (avg_confidence / 100.0)
+            print(f"Rotation {rot}°: {char_count} chars, {avg_confidence:.1f}% conf, score={scores[rot]:.1f}")
+        except Exception as e:
+            print(f"Rotation {rot}°: OCR failed ({e})")
+            scores[rot] = 0
+
+    best_angle = max(candidates, key=lambda rot: scores[rot])
+    best_score = scores[best_angle]
+
+    # Prefer original orientation unless another rotation is SIGNIFICANTLY better
+    original_score = scores.get(0, 0)
+    if original_score > 0 and best_angle != 0:
+        improvement = (best_score - original_score) / original_score
+        if improvement < 0.20:
+            print(f"⚠ Rotation {best_angle}° only {improvement*100:.1f}% better - keeping original (0°)")
+            return 0, original_score
+
+    return best_angle, best_score
+
+
+def detect_orientation(gray: np.ndarray) -> dict:
+    """
+    Find the clockwise 0/90/180/270° rotation that makes a page upright.
+
+    Stages (cheapest first):
+    1. Tesseract OSD (--psm 0) - accepted if its confidence ≥ OCR_OSD_MIN_CONFIDENCE
+    2. Projection profile narrows the candidates to {0°, 180°} or {90°, 270°}
+    3. OCR search over the remaining candidates (one pass each)
+
+    Returns:
+        Dict with angle, method (osd/search), confidence, candidates,
+        ocr_passes and seconds
+    """
+    import time
+    from backend.config import settings
+
+    start = time.perf_counter()
+    info = {"angle": 0, "method": "osd", "confidence": None, "candidates": [0, 90, 180, 270], "ocr_passes": 0}
+
+    try:
+        angle, confidence = _osd_orientation(gray)
+        info["confidence"] = round(confidence, 2)
+        if confidence >= settings.OCR_OSD_MIN_CONFIDENCE:
+            info["angle"] = angle
+            info["seconds"] = round(time.perf_counter() - start, 3)
+            print(f"✓ OSD orientation: rotate {angle}° (conf {confidence:.1f})")
+            return info
+        print(f"OSD confidence {confidence:.1f} too low → OCR search")
+    except Exception as e:
+        # Missing osd.traineddata or too little text for OSD
+        print(f"OSD failed ({e}) → OCR search")
+
+    candidates, ratio = _projection_axis(gray)
+    angle, score = _search_rotations(gray, candidates)
+    info.update(
+        angle=angle,
+        method="search",
+        candidates=candidates,
+        projection_ratio=round(ratio, 2),
+        ocr_passes=len(candidates),
+        seconds=round(time.perf_counter() - start, 3),
+    )
+    print(f"✓ Best rotation: {angle}° of {candidates} (score={score:.1f})")
+    return info
+
+
+def correct_orientation(image_path: str) -> Tuple[np.ndarray, float, float, dict]:
     """
     Automatic rotation correction for 0°/90°/180°/270° + deskewing.
 
-    Smart algorithm:
-    1. Test original image first - if quality ≥90%, skip rotation testing (performance optimization)
-    2. Otherwise test all rotations using OCR on grayscale
-    3. Apply best rotation to ORIGINAL COLOR image
-    4. Then deskewing for slight angle correction
-    5. Measures both original and final OCR quality (0-100%)
+    1. Measure original OCR quality - if ≥90%, the page is upright (no orientation stage)
+    2. Otherwise detect orientation (OSD first, OCR search only on low confidence)
+    3. Apply the rotation to the ORIGINAL COLOR image, then deskew
+    4. Measure final OCR quality (reused if the image did not change)
 
     Args:
         image_path: Path to the image file
 
     Returns:
-        Tuple of (corrected COLOR image as numpy array BGR, original OCR quality %, processed OCR quality %)
+        Tuple of (corrected COLOR image as numpy array BGR, original OCR quality %,
+        processed OCR quality %, orientation info dict: path taken and its cost)
     """
+    import time
+
+    start = time.perf_counter()
+
     if not CV2_AVAILABLE:
         # Fallback: Return PIL image as numpy array
         img = Image.open(image_path).convert('RGB')
-        return np.array(img), 0.0, 0.0
+        return np.array(img), 0.0, 0.0, {"method": "unavailable", "angle": 0}
 
     # Read ORIGINAL COLOR IMAGE
     img_color = cv2.imread(image_path)
     if img_color is None:
         # Fallback to PIL
         img = Image.open(image_path).convert('RGB')
-        return np.array(img), 0.0, 0.0
+        return np.array(img), 0.0, 0.0, {"method": "unavailable", "angle": 0}
 
     # Work with grayscale for rotation detection
     gray = cv2.cvtColor(img_color, cv2.COLOR_BGR2GRAY)
     gray = cv2.medianBlur(gray, 3)  # Reduce noise
 
-    original_img = gray
-
-    # STEP 1: Check ORIGINAL image quality FIRST (before any rotation testing)
+    # STEP 1: Check ORIGINAL image quality FIRST (before any orientation work)
     print("Step 1: Checking original image quality...")
     original_quality = get_ocr_quality(gray)
+    quality_passes = 1
     print(f"Original quality: {original_quality:.1f}%")
 
-    # EARLY EXIT: If original ≥90%, skip rotation testing entirely!
     # Quality ≥90% means BOTH high confidence AND enough text → correctly oriented
     if original_quality >= 90.0:
-        print(f"✓ Original quality {original_quality:.1f}% ≥90% → No rotation needed! (instant return)")
-        # Apply deskewing only
-        try:
-            deskewed_gray, skew_angle = deskew_image(gray)
-            print(f"Deskew angle: {skew_angle:.2f}°")
-            final_img_gray = deskewed_gray
-
-            # Apply same deskew to color
-            if abs(skew_angle) > 0.5:
-                (h, w) = gray.shape
-                center = (w // 2, h // 2)
-                M = cv2.getRotationMatrix2D(center, skew_angle, 1.0)
-                final_img_color = cv2.warpAffine(img_color, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
-            else:
-                final_img_color = img_color
-        except Exception as e:
-            print(f"Deskewing failed: {e}")
-            final_img_gray = gray
-            final_img_color = img_color
+        print(f"✓ Original quality {original_quality:.1f}% ≥90% → No rotation needed!")
+        info = {"method": "quality_ok", "angle": 0, "ocr_passes": 0}
+    else:
+        print(f"Original quality {original_quality:.1f}% <90% → Detecting orientation...")
+        info = detect_orientation(gray)
+
+    best_angle = info["angle"]
+    final_img_color = rotate_quadrant(img_color, best_angle)
+    final_img_gray = rotate_quadrant(gray, best_angle)
 
+    # Deskew (slight angle correction) grayscale, then the same on color
+    skew_angle = 0.0
+    try:
+        final_img_gray, skew_angle = deskew_image(final_img_gray)
+        print(f"Deskew angle: {skew_angle:.2f}°")
+        if abs(skew_angle) > 0.5:
+            (h, w) = final_img_color.shape[:2]
+            center = (w // 2, h // 2)
+            M = cv2.getRotationMatrix2D(center, skew_angle, 1.0)
+            final_img_color = cv2.warpAffine(final_img_color, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+    except Exception as e:
+        print(f"Deskew failed: {e}")
+
+    # Measure final OCR quality (on grayscale) - unchanged image, unchanged quality
+    if best_angle == 0 and skew_angle == 0.0:
+        processed_quality = original_quality
+    else:
         processed_quality = get_ocr_quality(final_img_gray)
-        return final_img_color, original_quality, processed_quality
-
-    # STEP 2: If quality <90%, test ALL 4 rotations to find best orientation
-    print(f"Original quality {original_quality:.1f}% <90% → Testing all 4 rotations...")
-
-    best_img = gray
-    best_score = -1
-    best_angle = 0
-    original_score = 0
-
-    for rot in [0, 90, 180, 270]:
-        # Rotate image
-        if rot == 0:
-            rotated = gray
-        elif rot == 90:
-            rotated = cv2.rotate(gray, cv2.ROTATE_90_CLOCKWISE)
-        elif rot == 180:
-            rotated = cv2.rotate(gray, cv2.ROTATE_180)
-        elif rot == 270:
-            rotated = cv2.rotate(gray, cv2.ROTATE_90_COUNTERCLOCKWISE)
-
-        # Calculate score: text length
-        score = 0
-
-        if TESSERACT_AVAILABLE:
-            try:
-                from PIL import Image as PILImage
-                pil_img = PILImage.fromarray(rotated)
-                # Use European languages for rotation detection (same as final OCR)
-                european_langs = 'deu+eng+spa+fra+ita+pol+ces+nld+por+ron+hun+slk+slv+hrv+bul+ell+swe+dan+nor+fin'
+        quality_passes += 1
+    print(f"Processed OCR Quality: {processed_quality:.1f}%")
 
-                # Get both text length AND confidence
-                data = pytesseract.image_to_data(pil_img, lang=european_langs, output_type=pytesseract.Output.DICT)
+    info["quality_passes"] = quality_passes
+    info["deskew_angle"] = round(skew_angle, 2)
+    info["total_seconds"] = round(time.perf_counter() - start, 3)
+    return final_img_color, original_quality, processed_quality, info
 
-                # Calculate average confidence for recognized words
-                confidences = [int(conf) for conf in data['conf'] if conf != '-1' and int(conf) > 0]
-                avg_confidence = sum(confidences) / len(confidences) if len(confidences) > 0 else 0
 
-                # Get text for character count
-                text = pytesseract.image_to_string(pil_img, lang=european_langs, config='--psm 1')
-                char_count = len(''.join(c for c in text if c.isalnum()))
+def detect_and_correct_rotation(image_path: str) -> Tuple[np.ndarray, float, float]:
+    """
+    Automatic rotation correction for 0°/90°/180°/270° + deskewing.
 
-                # Combined score: character count weighted by confidence
-                # High confidence + many chars = best score
-                score = char_count * (avg_confidence / 100.0)
+    Args:
+        image_path: Path to the image file
 
-                print(f"Rotation {rot}°: {char_count} chars, {avg_confidence:.1f}% conf, score={score:.1f}")
-            except Exception as e:
-                print(f"Rotation {rot}°: OCR failed ({e})")
-                score = 0
+    Returns:
+        Tuple of (corrected COLOR image as numpy array BGR, original OCR quality %, processed OCR quality %)
+    """
+    corrected, original_quality, processed_quality, _ = correct_orientation(image_path)
+    return corrected, original_quality, processed_quality
 
-        # Track scores for all rotations
-        if rot == 0:
-            original_score = score
 
-        if score > best_score:
-            best_score = score
-            best_img = rotated
-            best_angle = rot
+def ocr_image_tesseract(file_data: bytes, file_path: str = None) -> str:
+    """Extract text from image using Tesseract OCR with automatic rotation correction
 
-    # Prefer original orientation unless another rotation is SIGNIFICANTLY better
-    # Threshold: 20% better score needed to rotate
-    if original_score > 0 and best_angle != 0:
-        improvement = (best_score - original_score) / original_score
-        if improvement < 0.20:  # Less than 20% improvement
-            print(f"⚠ Rotation {best_angle}° only {improvement*100:.1f}% better - keeping original (0°)")
-            best_angle = 0
-            best_img = original_img
-            best_score = original_score
-
-    print(f"✓ Best rotation: {best_angle}° (score={best_score:.1f})")
-
-    # Apply the SAME rotation to the COLOR image
-    if best_angle == 0:
-        final_img_color = img_color
-    elif best_angle == 90:
-        final_img_color = cv2.rotate(img_color, cv2.ROTATE_90_CLOCKWISE)
-    elif best_angle == 180:
-        final_img_color = cv2.rotate(img_color, cv2.ROTATE_180)
-    elif best_angle == 270:
-        final_img_color = cv2.rotate(img_color, cv2.ROTATE_90_COUNTERCLOCKWISE)
-    else:
-        final_img_color = img_color
+    Module-level (not a DocumentParser method) so OCR worker processes can run it
+    without constructing a parser.
+    """
+    text, _ = ocr_image_tesseract_with_info(file_data, file_path)
+    return text
+
+
+def ocr_image_tesseract_with_info(file_data: bytes, file_path: str = None) -> Tuple[str, dict]:
+    """Like ocr_image_tesseract, also returning OCR metadata
+
+    Returns:
+        Tuple of (text, info dict with languages used, language pre-pass result and timings;
+        ``failed`` is set when the text is an error placeholder)
+    """
+    import time
+    from backend.config import settings
+
+    start = time.perf_counter()
+    info = {"engine": "tesseract", "languages": EUROPEAN_LANGS}
+
+    if not TESSERACT_AVAILABLE:
+        info["failed"] = True
+        return "[Tesseract OCR not available - Pillow/pytesseract not installed]", info
 
-    # Apply deskewing to the grayscale (for OCR quality measurement)
-    final_img_gray = best_img
     try:
-        deskewed_gray, skew_angle = deskew_image(best_img)
-        print(f"Deskew angle: {skew_angle:.2f}°")
-        final_img_gray = deskewed_gray
+        # Apply rotation correction if file_path is available and OpenCV is installed
+        if file_path and CV2_AVAILABLE:
+            try:
+                corrected_array, _, _, orientation = correct_orientation(file_path)
+                image = Image.fromarray(corrected_array)
+                info["orientation"] = orientation
+            except Exception as rot_err:
+                # If rotation correction fails, fall back to original image
+                print(f"Rotation correction failed, using original: {rot_err}")
+                image = Image.open(io.BytesIO(file_data))
+        else:
+            image = Image.open(io.BytesIO(file_data))
 
-        # Also apply same deskew to color image
-        if abs(skew_angle) > 0.5:
-            gray_for_color = cv2.cvtColor(final_img_color, cv2.COLOR_BGR2GRAY)
-            (h, w) = gray_for_color.shape
-            center = (w // 2, h // 2)
-            M = cv2.getRotationMatrix2D(center, skew_angle, 1.0)
-            final_img_color = cv2.warpAffine(final_img_color, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
-    except Exception as e:
-        print(f"Deskew failed: {e}")
+        # Two-stage mode: cheap pre-pass picks 1-3 languages for the full pass
+        langs = EUROPEAN_LANGS
+        if settings.OCR_LANGUAGE_DETECTION:
+            from backend.services.ocr_language import detect_page_languages
 
-    # Measure final OCR quality (on grayscale)
-    processed_quality = get_ocr_quality(final_img_gray)
-    print(f"Processed OCR Quality: {processed_quality:.1f}%")
+            detected, prepass = detect_page_languages(image)
+            info.update(prepass)
+            if detected:
+                langs = detected
+
+        ocr_start = time.perf_counter()
+        text = None
+        if langs != EUROPEAN_LANGS:
+            try:
+                from backend.services.ocr_language import image_to_string
+
+                text = image_to_string(image, lang=langs)
+                if len(text.strip()) < 20:
+                    # Detection was wrong or the page is sparse - redo with all languages
+                    print(f"OCR with {langs} found almost no text → retrying with all languages")
+                    text, langs = None, EUROPEAN_LANGS
+            except Exception as tess_err:
+                print(f"OCR with detected languages {langs} failed ({tess_err}) → all languages")
+                text, langs = None, EUROPEAN_LANGS
+
+        if text is None:
+            # Use all European languages for OCR (covers all EU invoices)
+            # Priority: German, English, Spanish, French, Italian, Polish, Czech, Dutch, Portuguese
+            try:
+                text = pytesseract.image_to_string(image, lang=EUROPEAN_LANGS)
+            except Exception as tess_err:
+                # Fallback: Try common languages if full list fails
+                try:
+                    langs = 'deu+eng+spa+fra+ita+pol+ces'
+                    text = pytesseract.image_to_string(image, lang=langs)
+                except:
+                    # Further fallback: Basic languages
+                    try:
+                        langs = 'deu+eng'
+                        text = pytesseract.image_to_string(image, lang=langs)
+                    except:
+                        # Last resort: No language specification
+                        try:
+                            langs = 'eng'
+                            text = pytesseract.image_to_string(image)
+                        except:
+                            info["failed"] = True
+                            return f"[Tesseract OCR not installed on system. Install tesseract-ocr package.]", info
+
+        info["languages"] = langs
+        info["ocr_seconds"] = round(time.perf_counter() - ocr_start, 3)
+        info["total_seconds"] = round(time.perf_counter() - start, 3)
 
-    return final_img_color, original_quality, processed_quality
+        if text.strip():
+            return f"[Tesseract OCR]\n{text.strip()}", info
+        else:
+            return "[Tesseract OCR: No text found in image]", info
+    except Exception as e:
+        info["failed"] = True
+        return f"[Tesseract OCR Error: {str(e)}]", info
 
 
 class DocumentParser:
-    """Parse documents and extract text"""
+    """Parse documents and extract text
+
+    Failures (missing tool, OCR error, timeout) raise ``ExtractionFailed`` inside
+    the parser. ``parse``, ``aparse``, ``aparse_with_info`` and ``parse_file``
+    return its placeholder text instead; ``aextract_with_info`` lets it propagate
+    so the extraction cache can skip failed results.
+    """
 
     def __init__(self):
         # Use singleton instances to avoid re-initialization errors
@@ -370,16 +568,73 @@ class DocumentParser:
             filename = file_path.split('/')[-1]
 
             # Check if it's an image
-            if filename.lower().endswith(('.jpg', '.jpeg', '.png', '.tiff', '.bmp')):
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
                 return self._parse_image(file_data, file_path, ocr_engine)
 
             # Use existing parse_file method
             import asyncio
             loop = asyncio.get_event_loop()
             return loop.run_until_complete(self.parse_file(filename, file_data))
+        except ExtractionFailed as e:
+            return e.text
         except Exception as e:
             return f"[Error parsing file: {str(e)}]"
 
+    async def aparse(self, file_path: str, ocr_engine: Literal['tesseract', 'paddle'] = 'tesseract') -> str:
+        """Async variant of parse() for request handlers - OCR runs in the OCR worker pool
+
+        Args:
+            file_path: Path to the file
+            ocr_engine: OCR engine to use ('tesseract' or 'paddle')
+        """
+        text, _ = await self.aparse_with_info(file_path, ocr_engine)
+        return text
+
+    async def aparse_with_info(self, file_path: str,
+                               ocr_engine: Literal['tesseract', 'paddle'] = 'tesseract') -> Tuple[str, dict]:
+        """Like aparse, also returning OCR metadata (empty dict if no OCR ran)"""
+        try:
+            return await self.aextract_with_info(file_path, ocr_engine)
+        except ExtractionFailed as e:
+            return e.text, e.metadata or {}
+
+    async def aextract_with_info(self, file_path: str,
+                                 ocr_engine: Literal['tesseract', 'paddle'] = 'tesseract') -> Tuple[str, dict]:
+        """Like aparse_with_info, but raises ExtractionFailed instead of returning a placeholder"""
+        import asyncio
+
+        try:
+            with open(file_path, 'rb') as f:
+                file_data = f.read()
+
+            filename = file_path.split('/')[-1]
+
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                if ocr_engine == 'paddle':
+                    # PaddleOCR singleton lives in this process - keep it off the event loop
+                    return await asyncio.to_thread(self._parse_image_paddle, file_path), {"engine": "paddle"}
+                return await self._ocr_image(file_data, file_path)
+
+            return await self._extract_file(filename, file_data), {}
+        except ExtractionFailed:
+            raise
+        except Exception as e:
+            raise ExtractionFailed(f"[Error parsing file: {str(e)}]", {})
+
+    async def _ocr_image(self, file_data: bytes, file_path: str = None) -> Tuple[str, dict]:
+        """Tesseract OCR with rotation correction via the OCR worker pool -> (text, OCR metadata)"""
+        from backend.services.ocr_engine import ocr_engine
+
+        if not TESSERACT_AVAILABLE:
+            raise ExtractionFailed("[Tesseract OCR not available - Pillow/pytesseract not installed]", {})
+        try:
+            text, info = await ocr_engine.ocr_image_with_info(file_data, file_path)
+        except Exception as e:
+            raise ExtractionFailed(f"[Tesseract OCR Error: {str(e)}]", {})
+        if info.get("failed"):
+            raise ExtractionFailed(text, info)
+        return text, info
+
     def _parse_image(self, file_data: bytes, file_path: str = None, ocr_engine: str = 'tesseract') -> str:
         """Extract text from image using OCR
 
@@ -394,57 +649,16 @@ class DocumentParser:
             return self._parse_image_tesseract(file_data, file_path)
 
     def _parse_image_tesseract(self, file_data: bytes, file_path: str = None) -> str:
-        """Extract text from image using Tesseract OCR with automatic rotation correction"""
-        if not TESSERACT_AVAILABLE:
-            return "[Tesseract OCR not available - Pillow/pytesseract not installed]"
-
-        try:
-            # Apply rotation correction if file_path is available and OpenCV is installed
-            if file_path and CV2_AVAILABLE:
-                try:
-                    corrected_array, _, _ = detect_and_correct_rotation(file_path)
-                    image = Image.fromarray(corrected_array)
-                except Exception as rot_err:
-                    # If rotation correction fails, fall back to original image
-                    print(f"Rotation correction failed, using original: {rot_err}")
-                    image = Image.open(io.BytesIO(file_data))
-            else:
-                image = Image.open(io.BytesIO(file_data))
-
-            # Use all European languages for OCR (covers all EU invoices)
-            # Priority: German, English, Spanish, French, Italian, Polish, Czech, Dutch, Portuguese
-            european_langs = 'deu+eng+spa+fra+ita+pol+ces+nld+por+ron+hun+slk+slv+hrv+bul+ell+swe+dan+nor+fin'
-            try:
-                text = pytesseract.image_to_string(image, lang=european_langs)
-            except Exception as tess_err:
-                # Fallback: Try common languages if full list fails
-                try:
-                    text = pytesseract.image_to_string(image, lang='deu+eng+spa+fra+ita+pol+ces')
-                except:
-                    # Further fallback: Basic languages
-                    try:
-                        text = pytesseract.image_to_string(image, lang='deu+eng')
-                    except:
-                        # Last resort: No language specification
-                        try:
-                            text = pytesseract.image_to_string(image)
-                        except:
-                            return f"[Tesseract OCR not installed on system. Install tesseract-ocr package.]"
-
-            if text.strip():
-                return f"[Tesseract OCR]\n{text.strip()}"
-            else:
-                return "[Tesseract OCR: No text found in image]"
-        except Exception as e:
-            return f"[Tesseract OCR Error: {str(e)}]"
+        """Extract text from image using Tesseract OCR with automatic rotation correction (blocking)"""
+        return ocr_image_tesseract(file_data, file_path)
 
     def _parse_image_paddle(self, file_path: str) -> str:
         """Extract text from image using PaddleOCR"""
         if not PADDLE_AVAILABLE:
-            return "[PaddleOCR not available - install paddleocr]"
+            raise ExtractionFailed("[PaddleOCR not available - install paddleocr]")
 
         if not self.paddle_ocr:
-            return "[PaddleOCR not initialized]"
+            raise ExtractionFailed("[PaddleOCR not initialized]")
 
         try:
             # PaddleOCR returns list of [bbox, (text, confidence)]
@@ -469,14 +683,21 @@ class DocumentParser:
                 return "[PaddleOCR: No text extracted]"
 
         except Exception as e:
-            return f"[PaddleOCR Error: {str(e)}]"
+            raise ExtractionFailed(f"[PaddleOCR Error: {str(e)}]")
 
     async def parse_file(self, filename: str, file_data: bytes) -> str:
-        """Parse file and return extracted text"""
+        """Parse file and return extracted text (error placeholder if parsing failed)"""
+        try:
+            return await self._extract_file(filename, file_data)
+        except ExtractionFailed as e:
+            return e.text
+
+    async def _extract_file(self, filename: str, file_data: bytes) -> str:
+        """Extracted text of a file; raises ExtractionFailed"""
         filename_lower = filename.lower()
 
         if filename_lower.endswith('.pdf'):
-            return self._parse_pdf(file_data)
+            return await self._parse_pdf(file_data)
         elif filename_lower.endswith('.docx'):
             return self._parse_docx(file_data)
         elif filename_lower.endswith('.odt'):
@@ -485,23 +706,25 @@ class DocumentParser:
             return self._parse_doc(file_data)
         elif filename_lower.endswith('.txt'):
             return self._parse_txt(file_data)
+        elif filename_lower.endswith(IMAGE_EXTENSIONS):
+            text, _ = await self._ocr_image(file_data)
+            return text
         else:
             try:
                 return file_data.decode('utf-8')
             except:
-                return f"[Unable to parse {filename}]"
+                raise ExtractionFailed(f"[Unable to parse {filename}]")
 
-    def _parse_pdf(self, file_data: bytes) -> str:
-        """Extract text from PDF"""
+    async def _parse_pdf(self, file_data: bytes) -> str:
+        """Extract text from PDF (text layer first, OCR for image-only pages)"""
         try:
-            pdf_file = io.BytesIO(file_data)
-            pdf_reader = PdfReader(pdf_file)
-            text = []
-            for page in pdf_reader.pages:
-                text.append(page.extract_text())
-            return "\n\n".join(text)
+            from backend.services.pdf_extraction import pdf_extraction_engine
+            text, _ = pdf_result(await pdf_extraction_engine.extract(file_data, separator="\n\n"))
+            return text
+        except ExtractionFailed:
+            raise
         except Exception as e:
-            return f"[Error parsing PDF: {str(e)}]"
+            raise ExtractionFailed(f"[Error parsing PDF: {str(e)}]")
 
     def _parse_docx(self, file_data: bytes) -> str:
         """Extract text from DOCX"""
@@ -514,7 +737,7 @@ class DocumentParser:
                     text.append(paragraph.text)
             return "\n\n".join(text)
         except Exception as e:
-            return f"[Error parsing DOCX: {str(e)}]"
+            raise ExtractionFailed(f"[Error parsing DOCX: {str(e)}]")
 
     def _parse_txt(self, file_data: bytes) -> str:
         """Extract text from TXT"""
@@ -526,12 +749,12 @@ class DocumentParser:
                     return file_data.decode(encoding)
                 except:
                     continue
-            return "[Unable to decode text file]"
+            raise ExtractionFailed("[Unable to decode text file]")
 
     def _parse_odt(self, file_data: bytes) -> str:
         """Extract text from ODT (OpenDocument Text)"""
         if not ODT_AVAILABLE:
-            return "[ODT support not available - install odfpy library]"
+            raise ExtractionFailed("[ODT support not available - install odfpy library]")
 
         try:
             odt_file = io.BytesIO(file_data)
@@ -545,7 +768,7 @@ class DocumentParser:
 
             return "\n\n".join(text_elements) if text_elements else "[No text found in ODT]"
         except Exception as e:
-            return f"[Error parsing ODT: {str(e)}]"
+            raise ExtractionFailed(f"[Error parsing ODT: {str(e)}]")
 
     def _parse_doc(self, file_data: bytes) -> str:
         """Extract text from DOC (legacy MS Word format)"""
@@ -571,17 +794,19 @@ class DocumentParser:
                 if result.returncode == 0 and result.stdout.strip():
                     return result.stdout.strip()
                 else:
-                    return "[DOC format not fully supported - please convert to DOCX or PDF]"
+                    raise ExtractionFailed("[DOC format not fully supported - please convert to DOCX or PDF]")
             except FileNotFoundError:
                 import os
                 os.unlink(tmp_path)
-                return "[DOC support requires 'antiword' tool - please install or convert to DOCX]"
+                raise ExtractionFailed("[DOC support requires 'antiword' tool - please install or convert to DOCX]")
             except subprocess.TimeoutExpired:
                 import os
                 os.unlink(tmp_path)
-                return "[DOC parsing timeout]"
+                raise ExtractionFailed("[DOC parsing timeout]")
+        except ExtractionFailed:
+            raise
         except Exception as e:
-            return f"[Error parsing DOC: {str(e)}]"
+            raise ExtractionFailed(f"[Error parsing DOC: {str(e)}]")
 
     async def extract_zip(self, zip_data: bytes) -> List[Tuple[str, str, bytes]]:
         """Extract files from ZIP and return list of (path, filename, content)"""
@@ -620,7 +845,7 @@ def guess_doc_type(file_path: str) -> str:
         return 'other'
 
 
-def classify_document_with_llm(document_text: str, filename: str) -> str:
+async def classify_document_with_llm(document_text: str, filename: str) -> str:
     """
     Classify document type using LLM content analysis
 
@@ -650,7 +875,7 @@ Dokumenteninhalt:
 Antworte NUR mit dem Kategorie-Namen (cv, cover_letter, job_description, oder other), keine Erklärungen."""
 
     try:
-        result = llm_gateway.generate(
+        result = await llm_gateway.agenerate(
             prompt=prompt,
             provider="ollama",
             temperature=0.1,
@@ -673,7 +898,7 @@ Antworte NUR mit dem Kategorie-Namen (cv, cover_letter, job_description, oder ot
         return guess_doc_type(filename)
 
 
-def extract_application_info(documents_text: str) -> dict:
+async def extract_application_info(documents_text: str) -> dict:
     """
     Extract company name and position from application documents using LLM
 
@@ -697,7 +922,7 @@ Antworte NUR im folgenden JSON-Format (keine zusätzlichen Erklärungen):
 """
 
     try:
-        result = llm_gateway.generate(
+        result = await llm_gateway.agenerate(
             prompt=prompt,
             provider="ollama",  # Fast local model for extraction
             temperature=0.1,  # Low temperature for consistent extraction
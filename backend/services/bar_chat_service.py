@@ -2,10 +2,11 @@
 RAG Chat Service for Bar Ca l'Elena
 Handles chat interactions with LLM (Ollama or Grok) and Elasticsearch RAG
 """
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 import httpx
 from backend.config import settings
 from backend.services.bar_elasticsearch_service import bar_es_service
+from backend.services.llm_gateway import llm_gateway
 import logging
 
 logger = logging.getLogger(__name__)
@@ -41,7 +42,7 @@ class BarChatService:
         """
         try:
             # Step 1: Get relevant context from Elasticsearch
-            context = bar_es_service.get_context_for_rag(message, language, limit=3)
+            context = await bar_es_service.get_context_for_rag(message, language, limit=3)
 
             # Step 2: Build system prompt with context
             system_prompt = self._build_system_prompt(language, context)
@@ -75,6 +76,43 @@ class BarChatService:
                 "error": str(e)
             }
 
+    async def chat_stream(
+        self,
+        message: str,
+        language: str = "en",
+        llm_provider: str = "ollama",
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Tuple[str, AsyncIterator[str]]:
+        """
+        Process chat message with RAG, streaming the LLM answer
+
+        Args:
+            message: User's message
+            language: Language code (ca, es, en, de, fr) - response language
+            llm_provider: "ollama" or "grok"
+            conversation_history: Previous messages for context
+
+        Returns:
+            Tuple of (context used, async iterator of text deltas)
+        """
+        context = await bar_es_service.get_context_for_rag(message, language, limit=3)
+        system_prompt = self._build_system_prompt(language, context)
+
+        messages = [{"role": "system", "content": system_prompt}]
+        if conversation_history:
+            messages.extend(conversation_history[-5:])  # Last 5 messages
+        messages.append({"role": "user", "content": message})
+
+        provider = "grok" if llm_provider == "grok" and self.grok_api_key else "ollama"
+        tokens = llm_gateway.astream(
+            provider=provider,
+            model=self.ollama_model if provider == "ollama" else None,
+            temperature=0.7,
+            timeout=30,
+            messages=messages,
+        )
+        return context, tokens
+
     def _build_system_prompt(self, language: str, context: str) -> str:
         """Build system prompt with RAG context"""
         prompts = {
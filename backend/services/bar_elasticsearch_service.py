@@ -3,8 +3,8 @@ Elasticsearch Service for Bar Ca l'Elena RAG Chatbot
 Handles vector indexing and semantic search for bar information
 """
 from typing import List, Dict, Any, Optional
-from elasticsearch import Elasticsearch
-from backend.config import settings
+from backend.services.elasticsearch_client import get_es_client
+from backend.services.elasticsearch_bulk import bulk_write, index_action
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,33 +15,10 @@ class BarElasticsearchService:
 
     def __init__(self):
         """Initialize Elasticsearch client"""
-        self.es = None
         self.index_name = "bar_ca_elena"
-        self._connect()
+        self.es = get_es_client()  # Shared AsyncElasticsearch (see elasticsearch_client)
 
-    def _connect(self):
-        """Connect to Elasticsearch"""
-        try:
-            # Build Elasticsearch URL
-            protocol = "https" if settings.ELASTICSEARCH_USE_SSL == "true" else "http"
-            es_url = f"{protocol}://{settings.ELASTICSEARCH_HOST}:{settings.ELASTICSEARCH_PORT}"
-
-            self.es = Elasticsearch(
-                [es_url],
-                basic_auth=(settings.ELASTICSEARCH_USER, settings.ELASTICSEARCH_PASSWORD) if settings.ELASTICSEARCH_PASSWORD else None,
-                verify_certs=False if settings.ELASTICSEARCH_USE_SSL == "true" else None,
-            )
-
-            # Test connection
-            if self.es.ping():
-                logger.info(f"✅ Connected to Elasticsearch at {es_url}")
-            else:
-                logger.warning(f"⚠️ Elasticsearch ping failed at {es_url}")
-        except Exception as e:
-            logger.error(f"❌ Failed to connect to Elasticsearch: {e}")
-            self.es = None
-
-    def create_index(self):
+    async def create_index(self):
         """Create index for bar data with multilingual support"""
         if not self.es:
             logger.error("Elasticsearch not connected")
@@ -109,113 +86,116 @@ class BarElasticsearchService:
 
         try:
             # Delete if exists
-            if self.es.indices.exists(index=self.index_name):
-                self.es.indices.delete(index=self.index_name)
+            if await self.es.indices.exists(index=self.index_name):
+                await self.es.indices.delete(index=self.index_name)
                 logger.info(f"🗑️ Deleted existing index: {self.index_name}")
 
             # Create new index
-            self.es.indices.create(index=self.index_name, body=mapping)
+            await self.es.indices.create(index=self.index_name, body=mapping)
             logger.info(f"✅ Created index: {self.index_name}")
             return True
         except Exception as e:
             logger.error(f"❌ Error creating index: {e}")
             return False
 
-    def index_bar_info(self, bar_info: Dict[str, Any]):
-        """Index bar general information in all languages"""
-        if not self.es:
-            return False
-
+    def _bar_info_docs(self, bar_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build bar info documents (description, opening hours, featured items, reviews) in all languages"""
         languages = ["ca", "es", "en", "de", "fr"]
-        indexed_count = 0
+        docs = []
 
-        try:
-            # Index description in all languages
-            if isinstance(bar_info.get("description"), dict):
-                for lang in languages:
-                    if lang in bar_info["description"]:
-                        doc = {
-                            "type": "bar_info",
-                            "language": lang,
-                            "title": f"Bar Ca l'Elena - {lang.upper()}",
-                            "content": bar_info["description"][lang],
-                            "metadata": {
-                                "address": bar_info.get("address"),
-                                "phone": bar_info.get("phone"),
-                                "cuisine": bar_info.get("cuisine"),
-                                "price_range": bar_info.get("price_range"),
-                                "rating": bar_info.get("rating"),
-                                "location_lat": bar_info.get("location_lat"),
-                                "location_lng": bar_info.get("location_lng")
-                            },
-                            "timestamp": "2026-01-10T00:00:00"
-                        }
-                        self.es.index(index=self.index_name, document=doc)
-                        indexed_count += 1
+        # Index description in all languages
+        if isinstance(bar_info.get("description"), dict):
+            for lang in languages:
+                if lang in bar_info["description"]:
+                    doc = {
+                        "type": "bar_info",
+                        "language": lang,
+                        "title": f"Bar Ca l'Elena - {lang.upper()}",
+                        "content": bar_info["description"][lang],
+                        "metadata": {
+                            "address": bar_info.get("address"),
+                            "phone": bar_info.get("phone"),
+                            "cuisine": bar_info.get("cuisine"),
+                            "price_range": bar_info.get("price_range"),
+                            "rating": bar_info.get("rating"),
+                            "location_lat": bar_info.get("location_lat"),
+                            "location_lng": bar_info.get("location_lng")
+                        },
+                        "timestamp": "2026-01-10T00:00:00"
+                    }
+                    docs.append(doc)
+
+        # Index opening hours
+        if bar_info.get("opening_hours"):
+            for lang in languages:
+                content_parts = []
+                for day, hours in bar_info["opening_hours"].items():
+                    content_parts.append(f"{day}: {hours}")
+
+                doc = {
+                    "type": "opening_hours",
+                    "language": lang,
+                    "title": f"Opening Hours - {lang.upper()}",
+                    "content": " | ".join(content_parts),
+                    "metadata": bar_info.get("opening_hours"),
+                    "timestamp": "2026-01-10T00:00:00"
+                }
+                docs.append(doc)
 
-            # Index opening hours
-            if bar_info.get("opening_hours"):
-                for lang in languages:
-                    content_parts = []
-                    for day, hours in bar_info["opening_hours"].items():
-                        content_parts.append(f"{day}: {hours}")
+        # Index featured items
+        if bar_info.get("featured_items"):
+            for item in bar_info["featured_items"]:
+                if isinstance(item.get("description"), dict):
+                    for lang in languages:
+                        if lang in item["description"]:
+                            doc = {
+                                "type": "featured_item",
+                                "language": lang,
+                                "title": item.get("name"),
+                                "content": item["description"][lang],
+                                "metadata": {"item_name": item.get("name")},
+                                "timestamp": "2026-01-10T00:00:00"
+                            }
+                            docs.append(doc)
 
+        # Index reviews
+        if bar_info.get("reviews"):
+            for review in bar_info["reviews"]:
+                # Reviews are typically in one language, index for all
+                for lang in languages:
                     doc = {
-                        "type": "opening_hours",
+                        "type": "review",
                         "language": lang,
-                        "title": f"Opening Hours - {lang.upper()}",
-                        "content": " | ".join(content_parts),
-                        "metadata": bar_info.get("opening_hours"),
+                        "title": f"Review by {review.get('author')}",
+                        "content": review.get("text", ""),
+                        "metadata": {
+                            "author": review.get("author"),
+                            "rating": review.get("rating")
+                        },
                         "timestamp": "2026-01-10T00:00:00"
                     }
-                    self.es.index(index=self.index_name, document=doc)
-                    indexed_count += 1
-
-            # Index featured items
-            if bar_info.get("featured_items"):
-                for item in bar_info["featured_items"]:
-                    if isinstance(item.get("description"), dict):
-                        for lang in languages:
-                            if lang in item["description"]:
-                                doc = {
-                                    "type": "featured_item",
-                                    "language": lang,
-                                    "title": item.get("name"),
-                                    "content": item["description"][lang],
-                                    "metadata": {"item_name": item.get("name")},
-                                    "timestamp": "2026-01-10T00:00:00"
-                                }
-                                self.es.index(index=self.index_name, document=doc)
-                                indexed_count += 1
+                    docs.append(doc)
 
-            # Index reviews
-            if bar_info.get("reviews"):
-                for review in bar_info["reviews"]:
-                    # Reviews are typically in one language, index for all
-                    for lang in languages:
-                        doc = {
-                            "type": "review",
-                            "language": lang,
-                            "title": f"Review by {review.get('author')}",
-                            "content": review.get("text", ""),
-                            "metadata": {
-                                "author": review.get("author"),
-                                "rating": review.get("rating")
-                            },
-                            "timestamp": "2026-01-10T00:00:00"
-                        }
-                        self.es.index(index=self.index_name, document=doc)
-                        indexed_count += 1
+        return docs
 
-            self.es.indices.refresh(index=self.index_name)
-            logger.info(f"✅ Indexed {indexed_count} documents for bar info")
-            return True
+    async def index_bar_info(self, bar_info: Dict[str, Any]):
+        """Index bar general information in all languages (one bulk request)"""
+        if not self.es:
+            return False
+
+        try:
+            docs = self._bar_info_docs(bar_info)
+            result = await bulk_write(
+                (index_action(self.index_name, doc) for doc in docs), client=self.es
+            )
+            logger.info(f"✅ Indexed {result['succeeded']} documents for bar info")
+            return result["failed"] == 0
 
         except Exception as e:
             logger.error(f"❌ Error indexing bar info: {e}")
             return False
 
-    def search(self, query: str, language: str = "en", limit: int = 5) -> List[Dict[str, Any]]:
+    async def search(self, query: str, language: str = "en", limit: int = 5) -> List[Dict[str, Any]]:
         """Search bar information in specific language"""
         if not self.es:
             return []
@@ -249,7 +229,7 @@ class BarElasticsearchService:
                 "_source": ["type", "title", "content", "language", "metadata"]
             }
 
-            response = self.es.search(index=self.index_name, body=search_body)
+            response = await self.es.search(index=self.index_name, body=search_body)
             results = []
 
             for hit in response["hits"]["hits"]:
@@ -268,9 +248,9 @@ class BarElasticsearchService:
             logger.error(f"❌ Error searching: {e}")
             return []
 
-    def get_context_for_rag(self, query: str, language: str = "en", limit: int = 3) -> str:
+    async def get_context_for_rag(self, query: str, language: str = "en", limit: int = 3) -> str:
         """Get formatted context for RAG chatbot"""
-        results = self.search(query, language, limit)
+        results = await self.search(query, language, limit)
 
         if not results:
             return ""
@@ -283,14 +263,34 @@ class BarElasticsearchService:
 
         return "\n".join(context_parts)
 
-    def index_team_member(self, team_member: Dict[str, Any]):
+    def _team_member_docs(self, team_member: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build team member documents in all languages"""
+        languages = ["ca", "es", "en", "de", "fr"]
+        docs = []
+
+        if isinstance(team_member.get("description"), dict):
+            for lang in languages:
+                if lang in team_member["description"]:
+                    docs.append({
+                        "type": "team_member",
+                        "language": lang,
+                        "title": f"Team: {team_member.get('name')}",
+                        "content": team_member["description"][lang],
+                        "metadata": {
+                            "team_member_id": team_member.get("id"),
+                            "name": team_member.get("name"),
+                            "display_order": team_member.get("display_order")
+                        },
+                        "timestamp": team_member.get("created_at", "2026-01-11T00:00:00")
+                    })
+
+        return docs
+
+    async def index_team_member(self, team_member: Dict[str, Any]):
         """Index a single team member in all languages"""
         if not self.es:
             return False
 
-        languages = ["ca", "es", "en", "de", "fr"]
-        indexed_count = 0
-
         try:
             # Only index if published
             if not team_member.get("is_published"):
@@ -298,36 +298,20 @@ class BarElasticsearchService:
                 return True
 
             # Delete existing documents for this team member
-            self._delete_team_member_documents(team_member.get("id"))
+            await self._delete_team_member_documents(team_member.get("id"))
 
-            # Index description in all languages
-            if isinstance(team_member.get("description"), dict):
-                for lang in languages:
-                    if lang in team_member["description"]:
-                        doc = {
-                            "type": "team_member",
-                            "language": lang,
-                            "title": f"Team: {team_member.get('name')}",
-                            "content": team_member["description"][lang],
-                            "metadata": {
-                                "team_member_id": team_member.get("id"),
-                                "name": team_member.get("name"),
-                                "display_order": team_member.get("display_order")
-                            },
-                            "timestamp": team_member.get("created_at", "2026-01-11T00:00:00")
-                        }
-                        self.es.index(index=self.index_name, document=doc)
-                        indexed_count += 1
-
-            self.es.indices.refresh(index=self.index_name)
-            logger.info(f"✅ Indexed {indexed_count} documents for team member: {team_member.get('name')}")
-            return True
+            result = await bulk_write(
+                (index_action(self.index_name, doc) for doc in self._team_member_docs(team_member)),
+                client=self.es
+            )
+            logger.info(f"✅ Indexed {result['succeeded']} documents for team member: {team_member.get('name')}")
+            return result["failed"] == 0
 
         except Exception as e:
             logger.error(f"❌ Error indexing team member: {e}")
             return False
 
-    def _delete_team_member_documents(self, team_member_id: int):
+    async def _delete_team_member_documents(self, team_member_id: int):
         """Delete all Elasticsearch documents for a specific team member"""
         if not self.es or not team_member_id:
             return
@@ -343,41 +327,80 @@ class BarElasticsearchService:
                     }
                 }
             }
-            self.es.delete_by_query(index=self.index_name, body=delete_query)
+            await self.es.delete_by_query(index=self.index_name, body=delete_query)
             logger.info(f"🗑️ Deleted team member documents for ID: {team_member_id}")
         except Exception as e:
             logger.error(f"❌ Error deleting team member documents: {e}")
 
-    def index_all_team_members(self, team_members: List[Dict[str, Any]]):
-        """Index all team members (bulk operation)"""
+    async def index_all_team_members(self, team_members: List[Dict[str, Any]]):
+        """Index all team members (one delete_by_query + one bulk request)"""
         if not self.es:
             return False
 
         try:
-            total_indexed = 0
-            for member in team_members:
-                if self.index_team_member(member):
-                    total_indexed += 1
+            published = [member for member in team_members if member.get("is_published")]
+            member_ids = [member.get("id") for member in team_members if member.get("id")]
+
+            if member_ids:
+                await self.es.delete_by_query(index=self.index_name, body={
+                    "query": {
+                        "bool": {
+                            "must": [
+                                {"term": {"type": "team_member"}},
+                                {"terms": {"metadata.team_member_id": member_ids}}
+                            ]
+                        }
+                    }
+                })
 
-            logger.info(f"✅ Indexed {total_indexed} team members total")
-            return True
+            result = await bulk_write(
+                (
+                    index_action(self.index_name, doc)
+                    for member in published
+                    for doc in self._team_member_docs(member)
+                ),
+                client=self.es
+            )
+
+            logger.info(f"✅ Indexed {len(published)} team members total ({result['succeeded']} documents)")
+            return result["failed"] == 0
 
         except Exception as e:
             logger.error(f"❌ Error bulk indexing team members: {e}")
             return False
 
-    def delete_team_member(self, team_member_id: int):
+    async def delete_team_member(self, team_member_id: int):
         """Delete a team member from Elasticsearch"""
-        self._delete_team_member_documents(team_member_id)
+        await self._delete_team_member_documents(team_member_id)
+
+    def _menu_docs(self, menu: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build menu documents in all languages"""
+        languages = ["ca", "es", "en", "de", "fr"]
+        docs = []
+
+        if isinstance(menu.get("content_translations"), dict):
+            for lang in languages:
+                if lang in menu["content_translations"]:
+                    docs.append({
+                        "type": "menu",
+                        "language": lang,
+                        "title": f"{menu.get('menu_type', 'Menu').title()} Menu",
+                        "content": menu["content_translations"][lang],
+                        "metadata": {
+                            "menu_id": menu.get("id"),
+                            "menu_type": menu.get("menu_type"),
+                            "display_order": menu.get("display_order")
+                        },
+                        "timestamp": menu.get("created_at", "2026-01-11T00:00:00")
+                    })
+
+        return docs
 
-    def index_menu(self, menu: Dict[str, Any]):
+    async def index_menu(self, menu: Dict[str, Any]):
         """Index a single menu in all languages"""
         if not self.es:
             return False
 
-        languages = ["ca", "es", "en", "de", "fr"]
-        indexed_count = 0
-
         try:
             # Only index if active
             if not menu.get("is_active"):
@@ -385,36 +408,42 @@ class BarElasticsearchService:
                 return True
 
             # Delete existing documents for this menu
-            self._delete_menu_documents(menu.get("id"))
+            await self._delete_menu_documents(menu.get("id"))
 
-            # Index content in all languages
-            if isinstance(menu.get("content_translations"), dict):
-                for lang in languages:
-                    if lang in menu["content_translations"]:
-                        doc = {
-                            "type": "menu",
-                            "language": lang,
-                            "title": f"{menu.get('menu_type', 'Menu').title()} Menu",
-                            "content": menu["content_translations"][lang],
-                            "metadata": {
-                                "menu_id": menu.get("id"),
-                                "menu_type": menu.get("menu_type"),
-                                "display_order": menu.get("display_order")
-                            },
-                            "timestamp": menu.get("created_at", "2026-01-11T00:00:00")
-                        }
-                        self.es.index(index=self.index_name, document=doc)
-                        indexed_count += 1
-
-            self.es.indices.refresh(index=self.index_name)
-            logger.info(f"✅ Indexed {indexed_count} documents for menu ID: {menu.get('id')}")
-            return True
+            result = await bulk_write(
+                (index_action(self.index_name, doc) for doc in self._menu_docs(menu)),
+                client=self.es
+            )
+            logger.info(f"✅ Indexed {result['succeeded']} documents for menu ID: {menu.get('id')}")
+            return result["failed"] == 0
 
         except Exception as e:
             logger.error(f"❌ Error indexing menu: {e}")
             return False
 
-    def _delete_menu_documents(self, menu_id: int):
+    async def index_menus(self, menus: List[Dict[str, Any]]):
+        """Replace all menu documents with the given (active) menus in one bulk request"""
+        if not self.es:
+            return False
+
+        try:
+            await self.delete_all_menus()
+            result = await bulk_write(
+                (
+                    index_action(self.index_name, doc)
+                    for menu in menus if menu.get("is_active")
+                    for doc in self._menu_docs(menu)
+                ),
+                client=self.es
+            )
+            logger.info(f"✅ Indexed {result['succeeded']} menu documents")
+            return result["failed"] == 0
+
+        except Exception as e:
+            logger.error(f"❌ Error bulk indexing menus: {e}")
+            return False
+
+    async def _delete_menu_documents(self, menu_id: int):
         """Delete all Elasticsearch documents for a specific menu"""
         if not self.es or not menu_id:
             return
@@ -430,16 +459,16 @@ class BarElasticsearchService:
                     }
                 }
             }
-            self.es.delete_by_query(index=self.index_name, body=delete_query)
+            await self.es.delete_by_query(index=self.index_name, body=delete_query)
             logger.info(f"🗑️ Deleted menu documents for ID: {menu_id}")
         except Exception as e:
             logger.error(f"❌ Error deleting menu documents: {e}")
 
-    def delete_menu(self, menu_id: int):
+    async def delete_menu(self, menu_id: int):
         """Delete a menu from Elasticsearch"""
-        self._delete_menu_documents(menu_id)
+        await self._delete_menu_documents(menu_id)
 
-    def delete_all_menus(self):
+    async def delete_all_menus(self):
         """Delete all menu documents from Elasticsearch to avoid chatbot confusion"""
         if not self.es:
             return
@@ -450,7 +479,7 @@ class BarElasticsearchService:
                     "term": {"type": "menu"}
                 }
             }
-            result = self.es.delete_by_query(index=self.index_name, body=delete_query)
+            result = await self.es.delete_by_query(index=self.index_name, body=delete_query)
             deleted_count = result.get("deleted", 0)
             logger.info(f"🗑️ Deleted {deleted_count} menu documents from Elasticsearch")
         except Exception as e:
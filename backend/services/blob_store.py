@@ -0,0 +1,472 @@
+"""Blob Store - content-addressed storage for uploaded media (LifeChronicle photos).
+
+Photos used to be inlined into rows as base64 data URLs (+33% size, stored
+twice), so every entry list query pulled megabytes of JSON out of Postgres.
+Blobs are now stored once, named by the SHA-256 of their bytes, and rows only
+keep the URL:
+
+    /uploads/{namespace}/{sha256[:2]}/{sha256}{ext}
+
+Backends (``MEDIA_STORAGE_BACKEND``):
+- ``postgres`` (default): Postgres large objects indexed by ``media_blobs``,
+  durable without a volume
+- ``local``: files below the ``/uploads`` directory (only durable on a volume)
+
+Both are served by ``BlobStaticFiles`` mounted at ``/uploads``: ETag is the
+content hash, Range requests return 206, and with the Postgres backend paths
+missing on disk are streamed from the large object instead. Blobs in
+``PRIVATE_NAMESPACES`` (e.g. tax case uploads) are stored the same way but
+never served from the mount. ``delete_unreferenced`` removes a blob once no
+row in ``BLOB_REFERENCES`` points at it any more.
+"""
+import asyncio
+import base64
+import binascii
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Same directory main.py mounts at /uploads
+MEDIA_ROOT = Path(os.getenv("UPLOAD_DIR", "./uploads"))
+URL_PREFIX = "/uploads/"
+
+# Bytes per read when streaming a blob
+CHUNK_SIZE = 256 * 1024
+
+# Stored like any other blob, but only readable through their owning API (access checks)
+PRIVATE_NAMESPACES = frozenset({"taxcases"})
+
+# Columns that hold blob URLs; a blob is only deleted while none of them match
+BLOB_REFERENCES = (
+    "SELECT 1 FROM lifechronicle_entries "
+    "WHERE EXISTS (SELECT 1 FROM unnest(photo_urls) AS url WHERE url LIKE :pattern) LIMIT 1",
+    "SELECT 1 FROM tax_case_documents WHERE file_path LIKE :pattern LIMIT 1",
+)
+
+_BLOB_PATH = re.compile(
+    r"^(?P<namespace>[a-z0-9_-]+)/(?P<prefix>[0-9a-f]{2})/(?P<sha256>[0-9a-f]{64})(?P<ext>\.[a-z0-9]{1,8})?$"
+)
+_DATA_URL = re.compile(r"^data:(?P<content_type>[\w.+-]+/[\w.+-]+)?(?:;[^,]*)?;base64,", re.IGNORECASE)
+
+
+def blob_path(namespace: str, sha256: str, ext: str = "") -> str:
+    """Relative path of a blob below the /uploads root."""
+    return f"{namespace}/{sha256[:2]}/{sha256}{ext}"
+
+
+def parse_blob_path(path: str) -> Optional[Dict[str, str]]:
+    """Split ``/uploads/ns/ab/<sha>.jpg`` (or the part after /uploads/) into its components."""
+    if path.startswith(URL_PREFIX):
+        path = path[len(URL_PREFIX):]
+    match = _BLOB_PATH.match(path.replace(os.sep, "/").lstrip("/"))
+    if not match or match["prefix"] != match["sha256"][:2]:
+        return None
+    return {"namespace": match["namespace"], "sha256": match["sha256"], "ext": match["ext"] or ""}
+
+
+def parse_data_url(url: str) -> Optional[Tuple[bytes, str]]:
+    """Decode a ``data:<type>;base64,...`` URL -> (bytes, content type), None if it is not one."""
+    match = _DATA_URL.match(url or "")
+    if not match:
+        return None
+    try:
+        data = base64.b64decode(url[match.end():], validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    return data, (match["content_type"] or "application/octet-stream").lower()
+
+
+def _extension(content_type: Optional[str], filename: Optional[str]) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    if not ext and content_type:
+        ext = mimetypes.guess_extension(content_type) or ""
+    if ext == ".jpeg":
+        ext = ".jpg"
+    return ext if re.fullmatch(r"\.[a-z0-9]{1,8}", ext) else ""
+
+
+def _content_type(content_type: Optional[str], ext: str) -> str:
+    if content_type and content_type != "application/octet-stream":
+        return content_type
+    return mimetypes.guess_type(f"blob{ext}")[0] or "application/octet-stream"
+
+
+class BlobStore:
+    """Put bytes, get a stable /uploads URL. Blocking methods; ``a*`` variants run in a thread."""
+
+    name = "base"
+
+    def put(
+        self,
+        data: bytes,
+        namespace: str,
+        content_type: Optional[str] = None,
+        filename: Optional[str] = None,
+        connection=None,
+    ) -> Dict[str, Any]:
+        """
+        Store a blob (idempotent - identical bytes are stored once).
+
+        Args:
+            data: File bytes
+            namespace: First path segment (e.g. ``lifechronicle``)
+            content_type: MIME type (guessed from filename if missing)
+            filename: Original filename, only used for the extension
+            connection: Optional SQLAlchemy connection (Postgres backend) to write
+                inside the caller's transaction, e.g. from a migration
+
+        Returns:
+            Dict with url, sha256, size_bytes and content_type
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        ext = _extension(content_type, filename)
+        content_type = _content_type(content_type, ext)
+        path = blob_path(namespace, sha256, ext)
+        self._write(path, sha256, data, content_type, connection)
+        return {
+            "url": URL_PREFIX + path,
+            "sha256": sha256,
+            "size_bytes": len(data),
+            "content_type": content_type,
+        }
+
+    def read(self, url: str, connection=None) -> Optional[bytes]:
+        """Bytes of a blob URL, None if unknown."""
+        blob = parse_blob_path(url)
+        if blob is None:
+            return None
+        return self._read(blob_path(blob["namespace"], blob["sha256"], blob["ext"]), blob["sha256"], connection)
+
+    def delete_unreferenced(self, url: str, connection=None) -> bool:
+        """
+        Delete a blob unless a row still points at it.
+
+        Blobs are content-addressed, so the same bytes may back several rows
+        (one photo in two entries). Call after the referencing row is gone.
+
+        Returns:
+            True if the blob was deleted
+        """
+        from sqlalchemy import text
+
+        blob = parse_blob_path(url)
+        if blob is None:
+            return False
+        path = blob_path(blob["namespace"], blob["sha256"], blob["ext"])
+        with self._connect(connection) as conn:
+            # Same lock as PostgresBlobStore._write, so a concurrent put of these bytes waits
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:sha256))"), {"sha256": blob["sha256"]})
+            pattern = self._reference_pattern(path, blob["sha256"])
+            for query in BLOB_REFERENCES:
+                if conn.execute(text(query), {"pattern": pattern}).first():
+                    return False
+            self._delete(path, blob["sha256"], conn)
+        return True
+
+    async def aput(self, data: bytes, namespace: str, content_type: Optional[str] = None,
+                   filename: Optional[str] = None) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.put, data, namespace, content_type, filename)
+
+    async def aread(self, url: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self.read, url)
+
+    async def adelete_unreferenced(self, url: str) -> bool:
+        return await asyncio.to_thread(self.delete_unreferenced, url)
+
+    @contextmanager
+    def _connect(self, connection=None):
+        if connection is not None:
+            yield connection
+            return
+        from backend.database import sync_engine
+
+        with sync_engine.begin() as conn:
+            yield conn
+
+    def _reference_pattern(self, path: str, sha256: str) -> str:
+        """LIKE pattern of the URLs that keep this blob alive."""
+        return URL_PREFIX + path
+
+    def _write(self, path: str, sha256: str, data: bytes, content_type: str, connection) -> None:
+        raise NotImplementedError
+
+    def _read(self, path: str, sha256: str, connection) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _delete(self, path: str, sha256: str, connection) -> None:
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files below MEDIA_ROOT (served directly by the /uploads mount)."""
+
+    name = "local"
+
+    def __init__(self, root: Union[str, Path] = MEDIA_ROOT):
+        self.root = Path(root)
+
+    def _write(self, path: str, sha256: str, data: bytes, content_type: str, connection) -> None:
+        target = self.root / path
+        if target.exists() and target.stat().st_size == len(data):
+            return  # Same content hash - already stored
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Write + rename so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=target.parent, prefix=".upload_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, target)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def _read(self, path: str, sha256: str, connection) -> Optional[bytes]:
+        try:
+            with open(self.root / path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _delete(self, path: str, sha256: str, connection) -> None:
+        try:
+            os.remove(self.root / path)
+        except FileNotFoundError:
+            pass
+
+
+class PostgresBlobStore(BlobStore):
+    """Blobs as Postgres large objects, one ``media_blobs`` row per content hash."""
+
+    name = "postgres"
+
+    def _reference_pattern(self, path: str, sha256: str) -> str:
+        # One large object per hash, shared by every namespace and extension
+        return f"%/{sha256}%"
+
+    def _write(self, path: str, sha256: str, data: bytes, content_type: str, connection) -> None:
+        from sqlalchemy import text
+
+        with self._connect(connection) as conn:
+            # Serialise writers of the same hash so no orphaned large object is created
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:sha256))"), {"sha256": sha256})
+            exists = conn.execute(
+                text("SELECT 1 FROM media_blobs WHERE sha256 = :sha256"), {"sha256": sha256}
+            ).first()
+            if exists:
+                return
+            conn.execute(text("""
+                INSERT INTO media_blobs (sha256, content_type, size_bytes, oid, created_at)
+                VALUES (:sha256, :content_type, :size_bytes, lo_from_bytea(0, :data), now())
+            """), {"sha256": sha256, "content_type": content_type, "size_bytes": len(data), "data": data})
+
+    def _read(self, path: str, sha256: str, connection) -> Optional[bytes]:
+        from sqlalchemy import text
+
+        with self._connect(connection) as conn:
+            row = conn.execute(text("""
+                SELECT lo_get(oid) FROM media_blobs WHERE sha256 = :sha256
+            """), {"sha256": sha256}).first()
+        return bytes(row[0]) if row else None
+
+    def _delete(self, path: str, sha256: str, connection) -> None:
+        from sqlalchemy import text
+
+        params = {"sha256": sha256}
+        connection.execute(text("SELECT lo_unlink(oid) FROM media_blobs WHERE sha256 = :sha256"), params)
+        connection.execute(text("DELETE FROM media_blobs WHERE sha256 = :sha256"), params)
+
+    def stat(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """content_type, size_bytes and created_at of a blob, None if unknown."""
+        from sqlalchemy import text
+
+        with self._connect() as conn:
+            row = conn.execute(text("""
+                SELECT content_type, size_bytes, created_at FROM media_blobs WHERE sha256 = :sha256
+            """), {"sha256": sha256}).mappings().first()
+        return dict(row) if row else None
+
+    def read_range(self, sha256: str, offset: int, length: int) -> bytes:
+        """``length`` bytes starting at ``offset`` (lo_get reads only that slice)."""
+        from sqlalchemy import text
+
+        with self._connect() as conn:
+            row = conn.execute(text("""
+                SELECT lo_get(oid, :offset, :length) FROM media_blobs WHERE sha256 = :sha256
+            """), {"sha256": sha256, "offset": offset, "length": length}).first()
+        return bytes(row[0]) if row else b""
+
+
+def get_blob_store(backend: Optional[str] = None) -> BlobStore:
+    """Blob store for MEDIA_STORAGE_BACKEND (postgres or local)."""
+    backend = (backend or settings.MEDIA_STORAGE_BACKEND).lower()
+    if backend == "postgres":
+        return PostgresBlobStore()
+    if backend != "local":
+        logger.warning(f"Unknown MEDIA_STORAGE_BACKEND '{backend}', using local files")
+    return LocalBlobStore()
+
+
+# ----------------------------------------------------------------------
+# /uploads mount
+# ----------------------------------------------------------------------
+
+_UNSATISFIABLE = object()
+
+
+def requested_range(request_headers, size: int, etag: str, last_modified: str):
+    """
+    Parse a single ``Range: bytes=...`` header.
+
+    Returns:
+        (start, end) inclusive, None to send the whole file (no/ignored Range,
+        stale If-Range, multiple ranges) or ``_UNSATISFIABLE``
+    """
+    value = request_headers.get("range")
+    if not value:
+        return None
+    if_range = request_headers.get("if-range")
+    if if_range and if_range not in (etag, last_modified):
+        return None
+
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                return _UNSATISFIABLE
+            start, end = max(0, size - suffix), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        return _UNSATISFIABLE
+    return start, min(end, size - 1)
+
+
+class BlobStaticFiles(StaticFiles):
+    """StaticFiles with Range support, content-hash ETags and the Postgres blob fallback."""
+
+    def __init__(self, *args, store: Optional[BlobStore] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.store = store
+
+    async def get_response(self, path: str, scope) -> Response:
+        blob = parse_blob_path(path)
+        if blob and blob["namespace"] in PRIVATE_NAMESPACES:
+            raise HTTPException(status_code=404)
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as e:
+            if e.status_code != 404 or not isinstance(self.store, PostgresBlobStore):
+                raise
+            info = await asyncio.to_thread(self.store.stat, blob["sha256"]) if blob else None
+            if info is None:
+                raise
+            return self._blob_response(blob["sha256"], info, scope)
+
+    def _cache_headers(self, sha256: Optional[str]) -> Dict[str, str]:
+        headers = {"accept-ranges": "bytes"}
+        if sha256:
+            headers["etag"] = f'"{sha256}"'
+            headers["cache-control"] = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable"
+        return headers
+
+    def _partial(self, scope, headers: Dict[str, str], size: int, chunks, media_type: str) -> Optional[Response]:
+        """206/416 response for a Range request, None to send the full body."""
+        request_headers = Headers(scope=scope)
+        if scope["method"] != "GET":
+            return None
+        byte_range = requested_range(request_headers, size, headers.get("etag", ""), headers.get("last-modified", ""))
+        if byte_range is None:
+            return None
+        if byte_range is _UNSATISFIABLE:
+            return Response(status_code=416, headers={"content-range": f"bytes */{size}"})
+        start, end = byte_range
+        partial_headers = dict(headers)
+        partial_headers["content-range"] = f"bytes {start}-{end}/{size}"
+        partial_headers["content-length"] = str(end - start + 1)
+        return StreamingResponse(chunks(start, end), status_code=206, headers=partial_headers, media_type=media_type)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        blob = parse_blob_path(os.path.relpath(full_path, self.directory)) if self.directory else None
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        for key, value in self._cache_headers(blob["sha256"] if blob else None).items():
+            response.headers[key] = value
+
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        if status_code != 200:
+            return response
+
+        async def chunks(start: int, end: int) -> AsyncIterator[bytes]:
+            async with await anyio.open_file(full_path, mode="rb") as f:
+                await f.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = await f.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+
+        headers = {key: value for key, value in response.headers.items()
+                   if key in ("etag", "last-modified", "cache-control", "accept-ranges")}
+        partial = self._partial(scope, headers, stat_result.st_size, chunks, response.media_type)
+        return partial or response
+
+    def _blob_response(self, sha256: str, info: Dict[str, Any], scope) -> Response:
+        """Serve a Postgres large object (full or ranged), streamed in CHUNK_SIZE reads."""
+        size = info["size_bytes"]
+        headers = self._cache_headers(sha256)
+        headers["last-modified"] = formatdate(info["created_at"].timestamp(), usegmt=True)
+
+        if self.is_not_modified(Headers(headers), Headers(scope=scope)):
+            return NotModifiedResponse(Headers(headers))
+
+        async def chunks(start: int, end: int) -> AsyncIterator[bytes]:
+            offset = start
+            while offset <= end:
+                length = min(CHUNK_SIZE, end - offset + 1)
+                chunk = await asyncio.to_thread(self.store.read_range, sha256, offset, length)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                yield chunk
+
+        partial = self._partial(scope, headers, size, chunks, info["content_type"])
+        if partial is not None:
+            return partial
+        headers["content-length"] = str(size)
+        if scope["method"] == "HEAD":
+            return Response(headers=headers, media_type=info["content_type"])
+        return StreamingResponse(chunks(0, size - 1), headers=headers, media_type=info["content_type"])
+
+
+# Global instance
+blob_store = get_blob_store()
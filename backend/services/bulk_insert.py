@@ -0,0 +1,138 @@
+"""Bulk Insert - write many rows of one table in a single round-trip.
+
+``db.add()`` per row (or one ``INSERT`` per loop iteration) costs a network
+round-trip per row. These helpers build one multi-row
+``INSERT ... VALUES (...), (...)`` per chunk instead, for sync and async
+sessions alike. On asyncpg, large batches can go through
+``COPY ... FROM STDIN`` (``copy_records_to_table``), which is faster still.
+
+Rows are plain dicts keyed by column name. Python-side column defaults
+(``default=uuid.uuid4``, ``default=False``) are filled in here because neither
+a multi-row VALUES list with missing keys nor COPY applies them; server
+defaults (``server_default=func.now()``) are left to Postgres.
+
+Usage:
+    bulk_insert(db, TaxCaseExtractedData, rows)           # sync Session
+    await abulk_insert(session, GoodsPosition, rows)       # AsyncSession
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import insert, Table
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Postgres caps bind parameters per statement at 32767
+MAX_BIND_PARAMS = 32767
+
+
+def _table(target) -> Table:
+    """Accept an ORM model class or a Core table."""
+    return target if isinstance(target, Table) else target.__table__
+
+
+def _python_default(column) -> Any:
+    default = column.default
+    if default.is_callable:
+        return default.arg(None)
+    return default.arg
+
+
+def prepare_rows(target, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalise rows to one shared set of keys.
+
+    Every row gets the union of keys of all rows; missing values are filled with
+    the column's Python-side default, or None. Columns nobody set and that only
+    have a server default are omitted, so Postgres fills them.
+    """
+    table = _table(target)
+    rows = [dict(row) for row in rows]
+    if not rows:
+        return rows
+
+    unknown = {key for row in rows for key in row} - set(table.columns.keys())
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {table.name}: {', '.join(sorted(unknown))}")
+
+    keys = {key for row in rows for key in row}
+    columns = [
+        column for column in table.columns
+        if column.key in keys or (column.default is not None and not column.default.is_sequence
+                                  and not column.default.is_clause_element)
+    ]
+    for row in rows:
+        for column in columns:
+            if column.key not in row:
+                row[column.key] = _python_default(column) if column.default is not None else None
+    return rows
+
+
+def _chunks(rows: List[Dict[str, Any]], chunk_size: int) -> Iterable[List[Dict[str, Any]]]:
+    columns = len(rows[0]) if rows else 1
+    size = max(1, min(chunk_size, MAX_BIND_PARAMS // max(1, columns)))
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def bulk_insert(db, target, rows: Iterable[Dict[str, Any]], chunk_size: int = None) -> int:
+    """
+    Insert rows with one multi-row INSERT per chunk (sync Session).
+
+    Runs inside the session's transaction; the caller commits.
+
+    Returns:
+        Number of rows inserted
+    """
+    table = _table(target)
+    rows = prepare_rows(table, rows)
+    for chunk in _chunks(rows, chunk_size or settings.BULK_INSERT_CHUNK_SIZE):
+        db.execute(insert(table).values(chunk))
+    return len(rows)
+
+
+async def _copy_records(db, table: Table, rows: List[Dict[str, Any]]) -> bool:
+    """COPY rows via asyncpg on the session's connection; False if the driver is not asyncpg."""
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    driver_connection = getattr(raw, "driver_connection", None)
+    if not hasattr(driver_connection, "copy_records_to_table"):
+        return False
+
+    columns: Sequence[str] = list(rows[0].keys())
+    await driver_connection.copy_records_to_table(
+        table.name,
+        records=[tuple(row[column] for column in columns) for row in rows],
+        columns=columns,
+        schema_name=table.schema,
+    )
+    return True
+
+
+async def abulk_insert(db, target, rows: Iterable[Dict[str, Any]], chunk_size: int = None) -> int:
+    """
+    Insert rows with one multi-row INSERT per chunk (AsyncSession).
+
+    Batches of at least BULK_INSERT_COPY_THRESHOLD rows use COPY on asyncpg
+    (values must then be native Python types - Decimal, UUID, datetime - not strings).
+    Runs inside the session's transaction; the caller commits.
+
+    Returns:
+        Number of rows inserted
+    """
+    table = _table(target)
+    rows = prepare_rows(table, rows)
+    if not rows:
+        return 0
+
+    threshold = settings.BULK_INSERT_COPY_THRESHOLD
+    if threshold and len(rows) >= threshold:
+        if await _copy_records(db, table, rows):
+            logger.debug(f"COPY {len(rows)} rows into {table.name}")
+            return len(rows)
+
+    for chunk in _chunks(rows, chunk_size or settings.BULK_INSERT_CHUNK_SIZE):
+        await db.execute(insert(table).values(chunk))
+    return len(rows)
@@ -1,12 +1,10 @@
 """Document Processing Service for PDFs, DOCX, and URLs."""
 from typing import Dict, BinaryIO
-import io
+import importlib.util
 
-try:
-    import PyPDF2
-    PYPDF2_AVAILABLE = True
-except ImportError:
-    PYPDF2_AVAILABLE = False
+# PDFs are read by pdf_extraction; only check that PyPDF2 is there
+PYPDF2_AVAILABLE = importlib.util.find_spec("PyPDF2") is not None
+if not PYPDF2_AVAILABLE:
     print("WARNING: PyPDF2 not installed - PDF processing disabled")
 
 try:
@@ -42,12 +40,27 @@ class DocumentProcessor:
         if not PYPDF2_AVAILABLE:
             raise RuntimeError("PyPDF2 not installed")
 
-        text = ""
-        reader = PyPDF2.PdfReader(file)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
+        from backend.services.pdf_extraction import pdf_extraction_engine
 
-        return text.strip()
+        return "\n".join(pdf_extraction_engine.iter_text_layer(file)).strip()
+
+    @staticmethod
+    async def aextract_from_pdf(file: BinaryIO) -> Dict:
+        """
+        Extract text from PDF file, OCR'ing pages that have no text layer.
+
+        Args:
+            file: Binary file object (from file upload)
+
+        Returns:
+            Dict with text, page_count, ocr_pages and per-page timings
+        """
+        if not PYPDF2_AVAILABLE:
+            raise RuntimeError("PyPDF2 not installed")
+
+        from backend.services.pdf_extraction import pdf_extraction_engine
+
+        return await pdf_extraction_engine.extract(file)
 
     @staticmethod
     def extract_from_docx(file: BinaryIO) -> str:
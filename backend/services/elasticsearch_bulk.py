@@ -0,0 +1,108 @@
+"""Bulk writes for Elasticsearch.
+
+Wraps ``helpers.async_streaming_bulk`` on the shared client: actions are sent
+in chunks bounded by count and bytes, failed items are reported individually
+instead of aborting the batch, and each touched index is refreshed once at
+the end.
+"""
+import logging
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Union
+
+from backend.config import settings
+from backend.services.elasticsearch_client import get_es_client
+
+logger = logging.getLogger(__name__)
+
+
+def index_action(index: str, document: Dict[str, Any], doc_id: Optional[Any] = None) -> Dict[str, Any]:
+    """Build a bulk ``index`` action."""
+    action = {"_op_type": "index", "_index": index, "_source": document}
+    if doc_id is not None:
+        action["_id"] = doc_id
+    return action
+
+
+def delete_action(index: str, doc_id: Any) -> Dict[str, Any]:
+    """Build a bulk ``delete`` action."""
+    return {"_op_type": "delete", "_index": index, "_id": doc_id}
+
+
+async def bulk_write(
+    actions: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    client=None,
+    chunk_size: Optional[int] = None,
+    max_chunk_bytes: Optional[int] = None,
+    refresh: bool = True,
+) -> Dict[str, Any]:
+    """
+    Send actions to Elasticsearch via the bulk API.
+
+    Args:
+        actions: Bulk actions (see index_action/delete_action), sync or async iterable
+        client: AsyncElasticsearch client (default: shared client)
+        chunk_size: Max actions per bulk request (default: ELASTICSEARCH_BULK_CHUNK_SIZE)
+        max_chunk_bytes: Max bytes per bulk request (default: ELASTICSEARCH_BULK_MAX_BYTES)
+        refresh: Refresh each touched index once after all chunks are sent
+
+    Returns:
+        Dict with succeeded/failed counts and per-item errors
+    """
+    client = client or get_es_client()
+    if client is None:
+        raise RuntimeError("Elasticsearch not available")
+
+    from elasticsearch.helpers import async_streaming_bulk
+
+    succeeded = 0
+    errors: List[Dict[str, Any]] = []
+    indices = set()
+
+    async def tracked():
+        # Record touched indices while streaming (actions may be a generator)
+        if hasattr(actions, "__aiter__"):
+            async for action in actions:
+                indices.add(action.get("_index"))
+                yield action
+        else:
+            for action in actions:
+                indices.add(action.get("_index"))
+                yield action
+
+    async for ok, item in async_streaming_bulk(
+        client,
+        tracked(),
+        chunk_size=chunk_size or settings.ELASTICSEARCH_BULK_CHUNK_SIZE,
+        max_chunk_bytes=max_chunk_bytes or settings.ELASTICSEARCH_BULK_MAX_BYTES,
+        raise_on_error=False,
+        raise_on_exception=False,
+        max_retries=settings.ELASTICSEARCH_MAX_RETRIES,
+    ):
+        if ok:
+            succeeded += 1
+            continue
+
+        op_type, result = next(iter(item.items()))
+        # Deleting a missing document is not an error worth reporting
+        if op_type == "delete" and result.get("status") == 404:
+            continue
+        errors.append({
+            "op": op_type,
+            "index": result.get("_index"),
+            "id": result.get("_id"),
+            "status": result.get("status"),
+            "error": result.get("error") or str(result.get("exception")),
+        })
+
+    indices.discard(None)
+    if refresh and indices:
+        try:
+            await client.indices.refresh(index=",".join(sorted(indices)))
+        except Exception as e:
+            logger.warning(f"Bulk refresh failed for {sorted(indices)}: {e}")
+
+    if errors:
+        logger.warning(f"⚠️ Bulk write: {succeeded} succeeded, {len(errors)} failed (first error: {errors[0]})")
+    else:
+        logger.info(f"✅ Bulk write: {succeeded} actions succeeded")
+
+    return {"succeeded": succeeded, "failed": len(errors), "errors": errors}
@@ -0,0 +1,84 @@
+"""Process-wide AsyncElasticsearch client.
+
+All Elasticsearch services share one client (and therefore one aiohttp
+connection pool), so ES latency never blocks the event loop and services
+do not each open their own connections.
+
+Sniffing is disabled: on Railway the node publishes internal addresses that
+are not reachable from the app container.
+"""
+import logging
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_initialized = False
+
+
+def es_url() -> str:
+    """Elasticsearch URL built from settings."""
+    scheme = "https" if settings.ELASTICSEARCH_USE_SSL.lower() == "true" else "http"
+    return f"{scheme}://{settings.ELASTICSEARCH_HOST}:{settings.ELASTICSEARCH_PORT}"
+
+
+def get_es_client():
+    """
+    Get the shared AsyncElasticsearch client (created on first use).
+
+    Creating the client does not connect; the pool opens on the first request.
+
+    Returns:
+        AsyncElasticsearch instance, or None if the async transport is unavailable
+    """
+    global _client, _client_initialized
+    if _client_initialized:
+        return _client
+
+    _client_initialized = True
+    try:
+        from elasticsearch import AsyncElasticsearch
+
+        use_ssl = settings.ELASTICSEARCH_USE_SSL.lower() == "true"
+        _client = AsyncElasticsearch(
+            hosts=[es_url()],
+            basic_auth=(settings.ELASTICSEARCH_USER, settings.ELASTICSEARCH_PASSWORD) if settings.ELASTICSEARCH_PASSWORD else None,
+            verify_certs=settings.ELASTICSEARCH_VERIFY_CERTS if use_ssl else False,
+            ssl_show_warn=False,
+            connections_per_node=settings.ELASTICSEARCH_MAX_CONNECTIONS,
+            request_timeout=settings.ELASTICSEARCH_REQUEST_TIMEOUT,
+            max_retries=settings.ELASTICSEARCH_MAX_RETRIES,
+            retry_on_timeout=True,
+            sniff_on_start=False,
+            sniff_before_requests=False,
+            sniff_on_node_failure=False,
+        )
+        logger.info(f"Elasticsearch client configured for {es_url()}")
+    except Exception as e:
+        logger.warning(f"⚠️  Elasticsearch client unavailable: {e}")
+        _client = None
+    return _client
+
+
+async def ping_es() -> bool:
+    """Check that Elasticsearch is reachable."""
+    client = get_es_client()
+    if client is None:
+        return False
+    try:
+        return bool(await client.ping())
+    except Exception:
+        return False
+
+
+async def close_es_client() -> None:
+    """Close the shared client's connection pool (application shutdown)."""
+    global _client, _client_initialized
+    if _client is not None:
+        try:
+            await _client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Elasticsearch client: {e}")
+    _client = None
+    _client_initialized = False
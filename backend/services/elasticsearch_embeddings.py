@@ -0,0 +1,105 @@
+"""Embedding providers for the Elasticsearch showcase index.
+
+CV chunks and hybrid-search queries used to be embedded one HTTP call at a
+time against Ollama's ``nomic-embed-text``, queueing behind text generation on
+the same CPU. The provider is now configurable:
+
+- ``registry`` (default): in-process model from the embedding registry via
+  ``VectorService`` - embedding cache, encoder pool or shared sidecar included.
+- ``ollama``: Ollama's batched ``/api/embed`` (array input, one request per batch).
+
+The ``embedding`` dense_vector field must match the provider's dimensions;
+``ElasticsearchService.migrate_cv_embeddings`` re-creates the index with the
+new mapping and re-embeds every chunk when the provider or model changes.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS = {
+    "registry": "all-MiniLM-L6-v2",
+    "ollama": "nomic-embed-text",
+}
+
+
+class EmbeddingProvider:
+    """Embeds texts for Elasticsearch kNN; vectors are plain float lists."""
+
+    name = "base"
+    _dimensions: Dict[str, int] = {}
+    _dimensions_lock: Optional[asyncio.Lock] = None
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or DEFAULT_MODELS[self.name]
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    async def embed(self, text: str) -> List[float]:
+        return (await self.embed_many([text]))[0]
+
+    async def dimensions(self) -> int:
+        """Vector width (probed once per provider/model and cached for the process)."""
+        key = f"{self.name}:{self.model}"
+        if key not in EmbeddingProvider._dimensions:
+            if EmbeddingProvider._dimensions_lock is None:
+                EmbeddingProvider._dimensions_lock = asyncio.Lock()
+            async with EmbeddingProvider._dimensions_lock:
+                if key not in EmbeddingProvider._dimensions:
+                    EmbeddingProvider._dimensions[key] = len(await self.embed("dimension probe"))
+        return EmbeddingProvider._dimensions[key]
+
+    def describe(self) -> Dict[str, str]:
+        return {"provider": self.name, "model": self.model}
+
+
+class RegistryEmbeddingProvider(EmbeddingProvider):
+    """In-process model shared through the embedding registry (no Ollama round-trip)."""
+
+    name = "registry"
+
+    def __init__(self, model: Optional[str] = None):
+        super().__init__(model)
+        from backend.services.vector_service import VectorService
+        self._vector_service = VectorService(self.model)
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        embeddings = await self._vector_service.generate_embeddings(texts)
+        if embeddings is None:
+            raise RuntimeError(f"Embedding model {self.model} is not available")
+        return embeddings.tolist()
+
+
+class OllamaEmbeddingProvider(EmbeddingProvider):
+    """Ollama ``/api/embed`` with array input (one request per batch, not per text)."""
+
+    name = "ollama"
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        from backend.services.llm_gateway import LLMGateway
+        return await LLMGateway().aembed_many(texts, model=self.model)
+
+
+PROVIDERS = {
+    RegistryEmbeddingProvider.name: RegistryEmbeddingProvider,
+    OllamaEmbeddingProvider.name: OllamaEmbeddingProvider,
+}
+
+
+def get_es_embedding_provider(name: Optional[str] = None, model: Optional[str] = None) -> EmbeddingProvider:
+    """
+    Provider configured by ELASTICSEARCH_EMBEDDING_PROVIDER / ELASTICSEARCH_EMBEDDING_MODEL.
+
+    Raises:
+        ValueError: Unknown provider name
+    """
+    name = (name or settings.ELASTICSEARCH_EMBEDDING_PROVIDER).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown Elasticsearch embedding provider: {name} (expected one of {sorted(PROVIDERS)})")
+    return PROVIDERS[name](model or settings.ELASTICSEARCH_EMBEDDING_MODEL or None)
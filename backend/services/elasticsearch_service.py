@@ -1,65 +1,43 @@
 """Elasticsearch Service for advanced search and comparison with ChromaDB."""
+import asyncio
 import logging
 import time
 from typing import Dict, Any, List, Optional
-from elasticsearch import Elasticsearch, AsyncElasticsearch
 from datetime import datetime
-import os
 from backend.services.llm_gateway import LLMGateway
+from backend.config import settings
+from backend.services.elasticsearch_client import get_es_client
+from backend.services.elasticsearch_bulk import bulk_write, index_action
+from backend.services.elasticsearch_embeddings import get_es_embedding_provider
+from backend.services.rank_fusion import RRF_K
 
 logger = logging.getLogger(__name__)
 
+# dense_vector width of each CV index, looked up once per process (reset by migrations)
+_index_embedding_dims: Dict[str, Optional[int]] = {}
+
 
 class ElasticsearchService:
     """Service for Elasticsearch operations and advanced search features."""
 
     def __init__(self):
-        """Initialize Elasticsearch client."""
-        self.client = None
+        """Attach to the shared AsyncElasticsearch client (see elasticsearch_client)."""
         self.cv_index = "elastic_showcase_cv"
         self.job_index = "elastic_showcase_jobs"
-        self.llm_gateway = LLMGateway()  # For generating embeddings
-
-        try:
-            # Get Elasticsearch connection details from environment
-            self.es_host = os.getenv("ELASTICSEARCH_HOST", "localhost")
-            self.es_port = int(os.getenv("ELASTICSEARCH_PORT", "9200"))
-            self.es_user = os.getenv("ELASTICSEARCH_USER", "elastic")
-            self.es_password = os.getenv("ELASTICSEARCH_PASSWORD", "")
-            self.es_use_ssl = os.getenv("ELASTICSEARCH_USE_SSL", "false").lower() == "true"
-
-            # Build Elasticsearch URL with proper scheme
-            scheme = "https" if self.es_use_ssl else "http"
-            es_url = f"{scheme}://{self.es_host}:{self.es_port}"
-
-            logger.info(f"Connecting to Elasticsearch at: {es_url}")
-
-            # Initialize Elasticsearch client
-            self.client = Elasticsearch(
-                hosts=[es_url],
-                basic_auth=(self.es_user, self.es_password) if self.es_password else None,
-                verify_certs=self.es_use_ssl,
-                ssl_show_warn=False,
-            )
-
-            # Initialize indices
-            self._ensure_indices()
-            logger.info("✅ ElasticsearchService initialized successfully")
-        except Exception as e:
-            logger.warning(f"⚠️  Elasticsearch not available: {e}")
+        self.llm_gateway = LLMGateway()
+        self.embedding_provider = get_es_embedding_provider()  # CV chunk + query embeddings (kNN)
+        self.client = get_es_client()
+        if self.client is None:
             logger.warning("Elasticsearch features will be disabled")
-            self.client = None
 
     def is_available(self) -> bool:
         """Check if Elasticsearch is available."""
         return self.client is not None
 
-    def _ensure_indices(self):
-        """Create indices if they don't exist with optimized mappings."""
-        if not self.is_available():
-            return
-        # CV Index - optimized for skills, experience, education
-        cv_mapping = {
+    @staticmethod
+    def _cv_mapping(dims: int) -> Dict[str, Any]:
+        """CV index mapping - optimized for skills, experience, education."""
+        return {
             "mappings": {
                 "properties": {
                     "user_id": {"type": "keyword"},
@@ -96,7 +74,7 @@ class ElasticsearchService:
                     "certifications": {"type": "keyword"},
                     "embedding": {
                         "type": "dense_vector",
-                        "dims": 768,
+                        "dims": dims,
                         "index": True,
                         "similarity": "cosine"
                     },
@@ -143,6 +121,16 @@ class ElasticsearchService:
             }
         }
 
+    async def ensure_indices(self):
+        """Create indices if they don't exist with optimized mappings."""
+        if not self.is_available():
+            return
+        try:
+            dims = await self.embedding_provider.dimensions()
+        except Exception as e:
+            logger.warning(f"Could not determine embedding dimensions ({e}) - skipping CV index creation")
+            dims = None
+
         # Job Index - optimized for job descriptions and requirements
         job_mapping = {
             "mappings": {
@@ -206,18 +194,167 @@ class ElasticsearchService:
         }
 
         try:
-            # Create CV index
-            if not self.client.indices.exists(index=self.cv_index):
-                self.client.indices.create(index=self.cv_index, body=cv_mapping)
-                logger.info(f"Created index: {self.cv_index}")
+            # Create CV index (versioned physical index behind the alias, so migrations can swap it)
+            if dims and not await self.client.indices.exists(index=self.cv_index):
+                physical = self._versioned_cv_index(dims)
+                body = {**self._cv_mapping(dims), "aliases": {self.cv_index: {}}}
+                await self.client.indices.create(index=physical, body=body)
+                logger.info(f"Created index: {physical} (alias {self.cv_index}, {dims} dims)")
+            elif dims:
+                await self._embeddings_compatible()  # Logs a migration hint on a dimension mismatch
 
             # Create Job index
-            if not self.client.indices.exists(index=self.job_index):
-                self.client.indices.create(index=self.job_index, body=job_mapping)
+            if not await self.client.indices.exists(index=self.job_index):
+                await self.client.indices.create(index=self.job_index, body=job_mapping)
                 logger.info(f"Created index: {self.job_index}")
         except Exception as e:
             logger.warning(f"Error creating indices (may already exist): {e}")
 
+    def _versioned_cv_index(self, dims: int) -> str:
+        """Physical index name behind the ``cv_index`` alias."""
+        return f"{self.cv_index}_{dims}d_{int(time.time())}"
+
+    async def _cv_index_dims(self) -> Optional[int]:
+        """dense_vector width of the CV index (cached per process)."""
+        if self.cv_index not in _index_embedding_dims:
+            try:
+                mapping = await self.client.indices.get_mapping(index=self.cv_index)
+                dims = None
+                for index_mapping in mapping.values():
+                    embedding = index_mapping["mappings"].get("properties", {}).get("embedding", {})
+                    dims = embedding.get("dims") or dims
+                _index_embedding_dims[self.cv_index] = dims
+            except Exception as e:
+                logger.warning(f"Could not read mapping of {self.cv_index}: {e}")
+                return None
+        return _index_embedding_dims[self.cv_index]
+
+    async def _embeddings_compatible(self) -> bool:
+        """
+        True if the provider's vectors fit the index's dense_vector field.
+
+        On a mismatch (provider/model changed, index not yet migrated) chunks are
+        indexed without embeddings and hybrid search runs BM25-only.
+        """
+        try:
+            provider_dims = await self.embedding_provider.dimensions()
+        except Exception as e:
+            logger.error(f"Embedding provider {self.embedding_provider.describe()} unavailable: {e}")
+            return False
+        index_dims = await self._cv_index_dims()
+        if index_dims is not None and index_dims != provider_dims:
+            logger.warning(
+                f"⚠️ {self.cv_index} stores {index_dims}-dim embeddings but {self.embedding_provider.describe()} "
+                f"produces {provider_dims} - kNN disabled until POST /admin/elasticsearch/migrate-embeddings runs"
+            )
+            return False
+        return True
+
+    async def migrate_cv_embeddings(self, job=None) -> Dict[str, Any]:
+        """
+        Re-create the CV index for the current embedding provider and re-embed all chunks.
+
+        dense_vector dims cannot change in place: chunks are copied into a new
+        versioned index with the new mapping (embeddings recomputed in batches),
+        then the ``cv_index`` alias is switched over and the old index deleted.
+        If any chunk fails to copy (or embedding raises), the new index is
+        deleted and the alias stays on the source. A pre-alias deployment (concrete index named ``cv_index``) is briefly
+        unavailable between deleting it and adding the alias.
+
+        Args:
+            job: Optional JobContext for progress reporting
+
+        Returns:
+            Dict with source/target index, dimensions and copied count
+
+        Raises:
+            RuntimeError: Elasticsearch unavailable or chunks failed to copy
+        """
+        if not self.is_available():
+            raise RuntimeError("Elasticsearch not available")
+        from elasticsearch.helpers import async_scan
+
+        dims = await self.embedding_provider.dimensions()
+        target = self._versioned_cv_index(dims)
+        await self.client.indices.create(index=target, body=self._cv_mapping(dims))
+
+        sources: List[str] = []
+        total = 0
+        if await self.client.indices.exists(index=self.cv_index):
+            sources = list((await self.client.indices.get(index=self.cv_index)).keys())
+            total = (await self.client.count(index=self.cv_index))["count"]
+        logger.info(f"Migrating {total} CV chunks from {sources} to {target} ({dims} dims)")
+
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        copied = 0
+
+        async def actions():
+            batch = []
+
+            async def flush():
+                nonlocal copied
+                texts = [hit["_source"].get("cv_text") or "" for hit in batch]
+                embeddings = await self.embedding_provider.embed_many(texts)
+                for hit, embedding in zip(batch, embeddings):
+                    doc = dict(hit["_source"])
+                    doc["embedding"] = embedding
+                    yield index_action(target, doc, hit["_id"])
+                copied += len(batch)
+                batch.clear()
+                if job is not None and total:
+                    await job.progress(copied / total, f"Re-embedded {copied}/{total} chunks")
+
+            if not sources:
+                return
+            async for hit in async_scan(self.client, index=self.cv_index, query={"query": {"match_all": {}}}):
+                hit["_source"].pop("embedding", None)
+                batch.append(hit)
+                if len(batch) >= batch_size:
+                    async for action in flush():
+                        yield action
+            if batch:
+                async for action in flush():
+                    yield action
+
+        try:
+            bulk_result = await bulk_write(actions(), client=self.client)
+            if bulk_result["failed"]:
+                raise RuntimeError(
+                    f"Failed to copy {bulk_result['failed']} CV chunks: {bulk_result['errors'][:3]}"
+                )
+        except Exception:
+            # Leave the alias on the complete source index; a retry starts a fresh target
+            await self.client.indices.delete(index=target, ignore_unavailable=True)
+            logger.error(f"CV embedding migration to {target} aborted, {self.cv_index} unchanged")
+            raise
+
+        # Point the alias at the new index (a concrete index with the alias name must go first)
+        if await self.client.indices.exists_alias(name=self.cv_index):
+            await self.client.indices.update_aliases(body={"actions": [
+                {"remove": {"index": "*", "alias": self.cv_index}},
+                {"add": {"index": target, "alias": self.cv_index}},
+            ]})
+        elif sources:
+            await self.client.indices.delete(index=self.cv_index)
+            await self.client.indices.put_alias(index=target, name=self.cv_index)
+        else:
+            await self.client.indices.put_alias(index=target, name=self.cv_index)
+        for index in sources:
+            if index != self.cv_index and await self.client.indices.exists(index=index):
+                await self.client.indices.delete(index=index)
+
+        _index_embedding_dims.pop(self.cv_index, None)
+        result = {
+            "source_indices": sources,
+            "target_index": target,
+            "alias": self.cv_index,
+            "dimensions": dims,
+            **self.embedding_provider.describe(),
+            "chunks_copied": bulk_result["succeeded"],
+        }
+        logger.info(f"✅ CV embedding migration finished: {result}")
+        return result
+
     def _extract_structured_fields(self, text: str) -> Dict[str, List[str]]:
         """Extract structured fields from CV text using keyword matching."""
         text_lower = text.lower()
@@ -328,7 +465,7 @@ class ElasticsearchService:
             # First, delete any existing chunks for this user
             delete_query = {"query": {"term": {"user_id": user_id}}}
             try:
-                self.client.delete_by_query(index=self.cv_index, body=delete_query)
+                await self.client.delete_by_query(index=self.cv_index, body=delete_query)
                 logger.info(f"Deleted existing CV chunks for user {user_id}")
             except Exception as del_err:
                 logger.warning(f"No existing chunks to delete for user {user_id}: {del_err}")
@@ -372,21 +509,22 @@ class ElasticsearchService:
                        f"languages={len(structured_fields['programming_languages'])}, "
                        f"companies={len(structured_fields['companies'])}")
 
-            # Index each chunk as a separate document
-            indexed_count = 0
+            # Index each chunk as a separate document (sent in one bulk request)
+            actions = []
             skills_str = " ".join(skills) if skills else ""
             job_titles_str = " ".join(job_titles) if job_titles else ""
 
-            for chunk in chunks:
-                # Generate embedding for this chunk using Ollama
+            # Embed all chunks in one batch (in-process model or one Ollama /api/embed call)
+            embeddings = [None] * len(chunks)
+            if await self._embeddings_compatible():
                 try:
-                    chunk_embedding = self.llm_gateway.embed(chunk["text"], model="nomic-embed-text")
-                    logger.info(f"Generated embedding for chunk {chunk['index']}, dims: {len(chunk_embedding)}")
+                    embeddings = await self.embedding_provider.embed_many([chunk["text"] for chunk in chunks])
+                    logger.info(f"Generated {len(embeddings)} chunk embeddings ({self.embedding_provider.describe()})")
                 except Exception as embed_err:
-                    logger.error(f"Failed to generate embedding for chunk {chunk['index']}: {embed_err}")
-                    # Continue without embedding rather than failing the entire indexing
-                    chunk_embedding = None
+                    # Continue without embeddings rather than failing the entire indexing
+                    logger.error(f"Failed to generate chunk embeddings: {embed_err}")
 
+            for chunk, chunk_embedding in zip(chunks, embeddings):
                 doc = {
                     "user_id": user_id,
                     "cv_text": chunk["text"],
@@ -411,18 +549,19 @@ class ElasticsearchService:
 
                 # Use user_id + chunk_index as document ID
                 doc_id = f"{user_id}_chunk_{chunk['index']}"
-                result = self.client.index(
-                    index=self.cv_index,
-                    id=doc_id,
-                    document=doc
-                )
-                indexed_count += 1
+                actions.append(index_action(self.cv_index, doc, doc_id))
+
+            bulk_result = await bulk_write(actions, client=self.client)
+            indexed_count = bulk_result["succeeded"]
+            if bulk_result["failed"]:
+                logger.error(f"Failed to index {bulk_result['failed']} CV chunks for user {user_id}: {bulk_result['errors'][:3]}")
 
             logger.info(f"Successfully indexed {indexed_count} CV chunks for user {user_id}")
             return {
                 "status": "success",
                 "result": "created",
                 "chunks_indexed": indexed_count,
+                "chunks_failed": bulk_result["failed"],
                 "id": user_id
             }
         except Exception as e:
@@ -498,7 +637,7 @@ class ElasticsearchService:
         }
 
         try:
-            result = self.client.search(index=self.cv_index, body=query)
+            result = await self.client.search(index=self.cv_index, body=query)
             search_time_ms = (time.time() - start_time) * 1000
 
             hits = result["hits"]["hits"]
@@ -565,7 +704,7 @@ class ElasticsearchService:
             }
 
             try:
-                result = self.client.search(index=self.cv_index, body=query)
+                result = await self.client.search(index=self.cv_index, body=query)
                 if result["hits"]["total"]["value"] > 0:
                     hit = result["hits"]["hits"][0]
                     fuzzy_results.append({
@@ -613,7 +752,7 @@ class ElasticsearchService:
             }
 
             try:
-                result = self.client.search(index=self.cv_index, body=query)
+                result = await self.client.search(index=self.cv_index, body=query)
                 if result["hits"]["total"]["value"] > 0:
                     hit = result["hits"]["hits"][0]
                     synonym_results.append({
@@ -665,7 +804,7 @@ class ElasticsearchService:
         }
 
         try:
-            result = self.client.search(index=self.cv_index, body=query)
+            result = await self.client.search(index=self.cv_index, body=query)
             return {
                 "skill_clusters": result["aggregations"]["skill_terms"]["buckets"],
                 "avg_experience": result["aggregations"]["avg_experience"]["value"],
@@ -714,7 +853,7 @@ class ElasticsearchService:
         }
 
         try:
-            result = self.client.search(index=self.cv_index, body=query)
+            result = await self.client.search(index=self.cv_index, body=query)
             return {
                 "total_matches": result["hits"]["total"]["value"],
                 "matches": [
@@ -765,7 +904,7 @@ class ElasticsearchService:
         }
 
         try:
-            result = self.client.search(index=self.cv_index, body=query)
+            result = await self.client.search(index=self.cv_index, body=query)
             return {
                 "total_matches": result["hits"]["total"]["value"],
                 "matches": [
@@ -854,7 +993,7 @@ class ElasticsearchService:
         }
 
         try:
-            result = self.client.search(index=self.cv_index, body=query)
+            result = await self.client.search(index=self.cv_index, body=query)
             aggs = result["aggregations"]
 
             return {
@@ -928,7 +1067,7 @@ class ElasticsearchService:
 
         try:
             # Use explain API
-            explanation = self.client.explain(
+            explanation = await self.client.explain(
                 index=self.cv_index,
                 id=user_id,
                 body=query
@@ -993,7 +1132,7 @@ class ElasticsearchService:
         }
 
         try:
-            result = self.client.search(index=self.cv_index, body=query)
+            result = await self.client.search(index=self.cv_index, body=query)
             suggestions = result.get("suggest", {}).get("skill_suggest", [])
 
             if suggestions:
@@ -1034,7 +1173,7 @@ class ElasticsearchService:
         }
 
         try:
-            result = self.client.search(index=indices, body=query)
+            result = await self.client.search(index=indices, body=query)
 
             return {
                 "total_matches": result["hits"]["total"]["value"],
@@ -1180,7 +1319,126 @@ class ElasticsearchService:
 
         return reranked[:top_k]
 
-    async def hybrid_search(self, query: str, user_id: str, top_k: int = 5) -> list:
+    # Fields returned by every hybrid search leg
+    HYBRID_SOURCE_FIELDS = ["cv_text", "skills", "experience_years", "job_titles", "user_id",
+                            "databases", "programming_languages", "companies", "certifications", "chunk_index"]
+
+    def _hybrid_bm25_query(self, expanded_query: str, user_id: str) -> Dict[str, Any]:
+        """BM25 leg - focused fields to reduce noise, using the expanded query."""
+        return {
+            "bool": {
+                "should": [
+                    # Focused on important structured fields only
+                    {
+                        "multi_match": {
+                            "query": expanded_query,  # Use expanded query for better semantic coverage
+                            "fields": [
+                                "skills^5",        # Increased from 3 to 5
+                                "databases^6",      # Increased from 4 to 6 - Highest for database names
+                                "programming_languages^5",  # Increased from 3 to 5
+                                "companies^3",      # Increased from 2 to 3
+                                "job_titles^3"     # Increased from 2 to 3
+                            ],
+                            "type": "best_fields",  # Best field wins (less noise than cross_fields)
+                            "fuzziness": "AUTO"
+                        }
+                    },
+                    # Secondary: cv_text for general context
+                    {
+                        "match": {
+                            "cv_text": {
+                                "query": expanded_query,  # Use expanded query
+                                "boost": 0.3  # Reduced from 0.5 to 0.3 to avoid overwhelming structured fields
+                            }
+                        }
+                    }
+                ],
+                "filter": [{"term": {"user_id": user_id}}]
+            }
+        }
+
+    def _hybrid_knn(self, query_embedding: List[float], user_id: str, k: int) -> Dict[str, Any]:
+        """Vector leg (kNN) - higher candidate pool for better recall."""
+        return {
+            "field": "embedding",
+            "query_vector": query_embedding,
+            "k": k,
+            "num_candidates": 150,  # Increased from 100 to 150 for better recall
+            "filter": [{"term": {"user_id": user_id}}]
+        }
+
+    @staticmethod
+    async def _timed(awaitable, timings: Dict[str, float], leg: str):
+        """Await and record the wall time of one search leg in milliseconds."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[leg] = round((time.perf_counter() - start) * 1000, 2)
+
+    @staticmethod
+    def _merge_weighted(vector_hits: list, bm25_hits: list) -> list:
+        """Merge kNN and BM25 hits with max-normalized scores (70% Vector + 30% BM25)."""
+        vector_results = {}
+        bm25_results = {}
+
+        # Normalize vector scores
+        max_vector_score = max([hit['_score'] for hit in vector_hits], default=1.0)
+        for hit in vector_hits:
+            normalized_score = hit['_score'] / max_vector_score if max_vector_score > 0 else 0
+            vector_results[hit['_id']] = {'score': normalized_score, 'doc': hit}
+
+        # Normalize BM25 scores
+        max_bm25_score = max([hit['_score'] for hit in bm25_hits], default=1.0)
+        for hit in bm25_hits:
+            normalized_score = hit['_score'] / max_bm25_score if max_bm25_score > 0 else 0
+            bm25_results[hit['_id']] = {'score': normalized_score, 'doc': hit}
+
+        # Combine with weights: 70% Vector + 30% BM25
+        VECTOR_WEIGHT = 0.7
+        BM25_WEIGHT = 0.3
+
+        combined_results = []
+        for doc_id in set(vector_results.keys()) | set(bm25_results.keys()):
+            vector_score = vector_results.get(doc_id, {}).get('score', 0.0)
+            bm25_score = bm25_results.get(doc_id, {}).get('score', 0.0)
+
+            # Get the document (prefer vector result if both exist)
+            doc = vector_results.get(doc_id, bm25_results.get(doc_id))['doc']
+
+            combined_results.append({
+                'score': (VECTOR_WEIGHT * vector_score) + (BM25_WEIGHT * bm25_score),
+                'vector_score': vector_score,
+                'bm25_score': bm25_score,
+                'doc': doc
+            })
+
+        logger.info(f"📊 Hybrid Search: Vector={len(vector_results)}, BM25={len(bm25_results)}")
+        logger.info(f"💡 Weights: {VECTOR_WEIGHT*100}% Vector + {BM25_WEIGHT*100}% BM25")
+        return sorted(combined_results, key=lambda x: x['score'], reverse=True)
+
+    @staticmethod
+    def _rrf_candidates(hits: list) -> list:
+        """Candidates from a server-side RRF response, scored 1/(k + rank) normalized to the top hit."""
+        candidates = []
+        for position, hit in enumerate(hits, start=1):
+            rank = hit.get('_rank') or position
+            candidates.append({'score': 1.0 / (RRF_K + rank), 'doc': hit})
+
+        top_score = candidates[0]['score'] if candidates else 1.0
+        for candidate in candidates:
+            candidate['score'] /= top_score
+            # RRF hits carry no _score; scale like kNN/BM25 so the /10 normalization yields 0-1
+            candidate['doc']['_score'] = candidate['score'] * 10
+        return candidates
+
+    async def _embed_query(self, query: str) -> Optional[List[float]]:
+        """Query vector for the kNN leg, or None if it would not fit the index."""
+        if not await self._embeddings_compatible():
+            return None
+        return await self.embedding_provider.embed(query)
+
+    async def hybrid_search(self, query: str, user_id: str, top_k: int = 5, mode: Optional[str] = None) -> list:
         """
         Optimized hybrid search with weighted Vector (70%) + BM25 (30%) combination.
 
@@ -1192,14 +1450,26 @@ class ElasticsearchService:
         5. Field boosting optimized for CV data
         6. Reduced BM25 noise through focused field selection
 
+        The query embedding and the BM25 leg run concurrently; the kNN leg starts as
+        soon as the embedding arrives. In ``rrf`` mode both legs are sent as a single
+        request and fused server-side with Reciprocal Rank Fusion.
+
         Args:
             query: Search query
             user_id: User ID to filter documents
             top_k: Number of top results to return (default 5 for better context)
+            mode: "parallel" (client-side weighted merge) or "rrf" (default: ELASTICSEARCH_HYBRID_MODE)
 
         Returns:
-            List of search results with text, source, and weighted combined score
+            List of search results with text, source, and weighted combined score.
+            Per-leg timings are in each result's metadata["timings_ms"].
         """
+        mode = mode or settings.ELASTICSEARCH_HYBRID_MODE
+        timings: Dict[str, float] = {}
+        total_start = time.perf_counter()
+        embed_task = None
+        bm25_task = None
+
         try:
             if not self.is_available():
                 logger.warning("Elasticsearch not available for hybrid search")
@@ -1207,12 +1477,29 @@ class ElasticsearchService:
 
             # Query Expansion: Enhance query with semantic synonyms for better retrieval
             expanded_query = self._expand_query(query)
-            logger.info(f"Original query: '{query}' | Expanded: '{expanded_query}'")
+            logger.info(f"Original query: '{query}' | Expanded: '{expanded_query}' | mode={mode}")
+            candidates_k = top_k * 5  # Get more candidates for merging
 
             # Generate query embedding for kNN search (use original query for embedding)
+            embed_task = asyncio.create_task(self._timed(
+                self._embed_query(query), timings, "embedding_ms"
+            ))
+
+            # BM25 leg does not need the embedding - start it right away
+            if mode != "rrf":
+                bm25_task = asyncio.create_task(self._timed(
+                    self.client.search(index=self.cv_index, body={
+                        "size": candidates_k,
+                        "query": self._hybrid_bm25_query(expanded_query, user_id),
+                        "_source": self.HYBRID_SOURCE_FIELDS
+                    }),
+                    timings, "bm25_ms"
+                ))
+
             try:
-                query_embedding = self.llm_gateway.embed(query, model="nomic-embed-text")
-                logger.info(f"Generated query embedding, dims: {len(query_embedding)}")
+                query_embedding = await embed_task
+                if query_embedding:
+                    logger.info(f"Generated query embedding, dims: {len(query_embedding)}")
             except Exception as embed_err:
                 logger.error(f"Failed to generate query embedding: {embed_err}")
                 # Fall back to BM25-only if embedding fails
@@ -1243,131 +1530,46 @@ class ElasticsearchService:
                             "filter": [{"term": {"user_id": user_id}}]
                         }
                     },
-                    "_source": ["cv_text", "skills", "experience_years", "job_titles", "user_id",
-                               "databases", "programming_languages", "companies", "certifications", "chunk_index"]
+                    "_source": self.HYBRID_SOURCE_FIELDS
                 }
-                response = self.client.search(index=self.cv_index, body=search_body)
+                response = await self._timed(
+                    self.client.search(index=self.cv_index, body=search_body), timings, "bm25_fallback_ms"
+                )
                 logger.info(f"📊 BM25-only returned {response['hits']['total']['value']} hits")
             else:
-                # OPTIMIZED HYBRID: 70% Vector + 30% BM25
-                # Strategy: Run both searches separately, then combine with weights
-
-                # Step 1: Vector Search (kNN) - Higher candidate pool for better recall
-                logger.info(f"🔍 Running Vector Search (70% weight)...")
-                vector_search = {
-                    "size": top_k * 5,  # Get more candidates for merging
-                    "knn": {
-                        "field": "embedding",
-                        "query_vector": query_embedding,
-                        "k": top_k * 5,
-                        "num_candidates": 150,  # Increased from 100 to 150 for better recall
-                        "filter": [{"term": {"user_id": user_id}}]
-                    },
-                    "_source": ["cv_text", "skills", "experience_years", "job_titles", "user_id",
-                               "databases", "programming_languages", "companies", "certifications", "chunk_index"]
-                }
-
-                # Step 2: BM25 Search - Focused fields to reduce noise, using expanded query
-                logger.info(f"🔍 Running BM25 Search (30% weight) with expanded query...")
-                bm25_search = {
-                    "size": top_k * 5,
-                    "query": {
-                        "bool": {
-                            "should": [
-                                # Focused on important structured fields only
-                                {
-                                    "multi_match": {
-                                        "query": expanded_query,  # Use expanded query for better semantic coverage
-                                        "fields": [
-                                            "skills^5",        # Increased from 3 to 5
-                                            "databases^6",      # Increased from 4 to 6 - Highest for database names
-                                            "programming_languages^5",  # Increased from 3 to 5
-                                            "companies^3",      # Increased from 2 to 3
-                                            "job_titles^3"     # Increased from 2 to 3
-                                        ],
-                                        "type": "best_fields",  # Best field wins (less noise than cross_fields)
-                                        "fuzziness": "AUTO"
-                                    }
-                                },
-                                # Secondary: cv_text for general context
-                                {
-                                    "match": {
-                                        "cv_text": {
-                                            "query": expanded_query,  # Use expanded query
-                                            "boost": 0.3  # Reduced from 0.5 to 0.3 to avoid overwhelming structured fields
-                                        }
-                                    }
-                                }
-                            ],
-                            "filter": [{"term": {"user_id": user_id}}]
-                        }
-                    },
-                    "_source": ["cv_text", "skills", "experience_years", "job_titles", "user_id",
-                               "databases", "programming_languages", "companies", "certifications", "chunk_index"]
-                }
-
-                # Execute both searches
-                vector_response = self.client.search(index=self.cv_index, body=vector_search)
-                bm25_response = self.client.search(index=self.cv_index, body=bm25_search)
-
-                # Step 3: Merge results with weighted scoring (70% Vector + 30% BM25)
-                vector_results = {}
-                bm25_results = {}
-
-                # Normalize vector scores
-                max_vector_score = max([hit['_score'] for hit in vector_response['hits']['hits']], default=1.0)
-                for hit in vector_response['hits']['hits']:
-                    doc_id = hit['_id']
-                    normalized_score = hit['_score'] / max_vector_score if max_vector_score > 0 else 0
-                    vector_results[doc_id] = {
-                        'score': normalized_score,
-                        'doc': hit
-                    }
-
-                # Normalize BM25 scores
-                max_bm25_score = max([hit['_score'] for hit in bm25_response['hits']['hits']], default=1.0)
-                for hit in bm25_response['hits']['hits']:
-                    doc_id = hit['_id']
-                    normalized_score = hit['_score'] / max_bm25_score if max_bm25_score > 0 else 0
-                    bm25_results[doc_id] = {
-                        'score': normalized_score,
-                        'doc': hit
-                    }
-
-                # Combine with weights: 70% Vector + 30% BM25
-                VECTOR_WEIGHT = 0.7
-                BM25_WEIGHT = 0.3
-
-                combined_results = {}
-                all_doc_ids = set(vector_results.keys()) | set(bm25_results.keys())
-
-                for doc_id in all_doc_ids:
-                    vector_score = vector_results.get(doc_id, {}).get('score', 0.0)
-                    bm25_score = bm25_results.get(doc_id, {}).get('score', 0.0)
-
-                    combined_score = (VECTOR_WEIGHT * vector_score) + (BM25_WEIGHT * bm25_score)
-
-                    # Get the document (prefer vector result if both exist)
-                    doc = vector_results.get(doc_id, bm25_results.get(doc_id))['doc']
-
-                    combined_results[doc_id] = {
-                        'score': combined_score,
-                        'vector_score': vector_score,
-                        'bm25_score': bm25_score,
-                        'doc': doc
-                    }
-
-                # Sort by combined score and take top candidates for re-ranking
-                # Get more candidates (top_k * 3) for re-ranking stage
-                rerank_candidates = min(top_k * 3, 15)  # Max 15 candidates for re-ranking
-                sorted_results = sorted(
-                    combined_results.values(),
-                    key=lambda x: x['score'],
-                    reverse=True
-                )[:rerank_candidates]
-
-                logger.info(f"📊 Hybrid Search: Vector={len(vector_results)}, BM25={len(bm25_results)}, Pre-Rerank={len(sorted_results)}")
-                logger.info(f"💡 Weights: {VECTOR_WEIGHT*100}% Vector + {BM25_WEIGHT*100}% BM25")
+                if mode == "rrf":
+                    # Single round-trip: BM25 + kNN fused server-side with RRF
+                    logger.info(f"🔍 Running hybrid search as one RRF request...")
+                    rrf_response = await self._timed(
+                        self.client.search(index=self.cv_index, body={
+                            "size": candidates_k,
+                            "query": self._hybrid_bm25_query(expanded_query, user_id),
+                            "knn": self._hybrid_knn(query_embedding, user_id, candidates_k),
+                            "rank": {"rrf": {}},
+                            "_source": self.HYBRID_SOURCE_FIELDS
+                        }),
+                        timings, "rrf_ms"
+                    )
+                    sorted_results = self._rrf_candidates(rrf_response['hits']['hits'])
+                else:
+                    # OPTIMIZED HYBRID: 70% Vector + 30% BM25 (BM25 leg already in flight)
+                    logger.info(f"🔍 Running Vector Search (70% weight)...")
+                    vector_response = await self._timed(
+                        self.client.search(index=self.cv_index, body={
+                            "size": candidates_k,
+                            "knn": self._hybrid_knn(query_embedding, user_id, candidates_k),
+                            "_source": self.HYBRID_SOURCE_FIELDS
+                        }),
+                        timings, "knn_ms"
+                    )
+                    bm25_response = await bm25_task
+                    sorted_results = self._merge_weighted(
+                        vector_response['hits']['hits'], bm25_response['hits']['hits']
+                    )
+
+                # Take top candidates for re-ranking (max 15)
+                rerank_candidates = min(top_k * 3, 15)
+                sorted_results = sorted_results[:rerank_candidates]
 
                 # Stage 2: Re-ranking with query-specific relevance scoring
                 if len(sorted_results) > top_k:
@@ -1386,6 +1588,8 @@ class ElasticsearchService:
 
                 logger.info(f"✅ Final results after re-ranking: {len(reranked_results)}")
 
+            timings["total_ms"] = round((time.perf_counter() - total_start) * 1000, 2)
+
             # Parse results
             results = []
             for hit in response["hits"]["hits"]:
@@ -1406,16 +1610,27 @@ class ElasticsearchService:
                         "programming_languages": source.get("programming_languages", []),
                         "companies": source.get("companies", []),
                         "certifications": source.get("certifications", []),
-                        "chunk_index": source.get("chunk_index", 0)
+                        "chunk_index": source.get("chunk_index", 0),
+                        "search_mode": mode,
+                        "timings_ms": timings
                     }
                 })
 
-            logger.info(f"Hybrid search returned {len(results)} results for query: {query}")
+            logger.info(f"Hybrid search returned {len(results)} results for query: {query} ({timings})")
             return results
 
         except Exception as e:
             logger.error(f"Error in hybrid search: {e}", exc_info=True)
             return []
+        finally:
+            # Never leave a leg running (e.g. BM25 after an embedding fallback or kNN error)
+            for task in (embed_task, bm25_task):
+                if task is None:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # Mark a failed, unused leg as retrieved
 
     async def delete_user_cv_data(self, user_id: str):
         """
@@ -1438,7 +1653,7 @@ class ElasticsearchService:
                 }
             }
 
-            response = self.client.delete_by_query(
+            response = await self.client.delete_by_query(
                 index=self.cv_index,
                 body=delete_query
             )
@@ -1451,9 +1666,5 @@ class ElasticsearchService:
             raise
 
     def close(self):
-        """Close Elasticsearch connection."""
-        try:
-            self.client.close()
-            logger.info("Elasticsearch connection closed")
-        except Exception as e:
-            logger.error(f"Error closing Elasticsearch connection: {e}")
+        """No-op: the shared client is closed on application shutdown (close_es_client)."""
+        pass
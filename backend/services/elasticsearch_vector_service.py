@@ -9,7 +9,8 @@ from sqlalchemy import select, delete, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models.document import Document, DocumentType
-from backend.services.vector_service import VectorService
+from backend.models.document_chunk import DocumentChunk
+from backend.services.vector_service import vector_service
 
 
 class ElasticsearchVectorService:
@@ -24,12 +25,12 @@ class ElasticsearchVectorService:
     """
 
     def __init__(self):
-        """Initialize with pgvector embedding service."""
-        self.vector_service = VectorService()
+        """Initialize with the shared pgvector embedding service."""
+        self.vector_service = vector_service
 
-    def is_available(self) -> bool:
-        """Check if embedding model is available."""
-        return self.vector_service.model is not None
+    async def is_available(self) -> bool:
+        """Check if embedding model is available (loads it off the event loop on first call)."""
+        return await self.vector_service.aget_model() is not None
 
     async def add_documents(
         self,
@@ -52,51 +53,33 @@ class ElasticsearchVectorService:
         Returns:
             Number of chunks added
         """
-        if not self.is_available():
+        if not await self.is_available():
             return 0
 
-        total_chunks = 0
-
+        # One parent row per CV document; its chunks go to document_chunks
+        parents = []
         for doc in documents:
-            doc_id = doc["id"]
-            content = doc["content"]
-            metadata = doc.get("metadata", {})
-
-            # Split content into chunks (word-based)
-            chunks = self.vector_service.chunk_text(
-                content,
-                chunk_size=chunk_size,
-                overlap=50
+            parent = Document(
+                id=uuid4(),
+                user_id=user_id,
+                project_id=project_id,
+                type=DocumentType.CV_SHOWCASE,  # Use enum instead of string
+                filename=doc["id"],
+                content=doc["content"],
+                doc_metadata={
+                    **doc.get("metadata", {}),
+                    "original_doc_id": doc["id"],
+                }
             )
-
-            # Add each chunk as a separate Document in pgvector
-            for idx, (chunk_text, start_pos) in enumerate(chunks):
-                # Generate embedding
-                embedding = self.vector_service.generate_embedding(chunk_text)
-
-                if not embedding:
-                    continue
-
-                # Create Document record
-                chunk_doc = Document(
-                    id=uuid4(),
-                    user_id=user_id,
-                    project_id=project_id,
-                    type=DocumentType.CV_SHOWCASE,  # Use enum instead of string
-                    filename=f"{doc_id}_chunk_{idx}",
-                    content=chunk_text,
-                    embedding=embedding,
-                    doc_metadata={
-                        **metadata,
-                        "original_doc_id": doc_id,
-                        "chunk_index": idx,
-                        "total_chunks": len(chunks),
-                        "start_position": start_pos,
-                    }
-                )
-
-                session.add(chunk_doc)
-                total_chunks += 1
+            session.add(parent)
+            parents.append(parent)
+
+        total_chunks = await self.vector_service.embed_document_chunks(
+            session, parents, chunk_size=chunk_size, overlap=50
+        )
+        if not total_chunks:
+            await session.rollback()
+            return 0
 
         await session.commit()
         return total_chunks
@@ -122,44 +105,61 @@ class ElasticsearchVectorService:
         Returns:
             List of dicts with 'content', 'metadata', 'distance'
         """
-        if not self.is_available():
+        if not await self.is_available():
             return []
 
         try:
             # Generate query embedding
-            query_embedding = self.vector_service.generate_embedding(query_text)
+            query_embedding = await self.vector_service.agenerate_embedding(query_text)
 
             if not query_embedding:
                 return []
 
-            # Cosine similarity search with pgvector
+            # Cosine similarity search on the chunk table only
             # 1 - (embedding <=> query_embedding) = cosine similarity
             stmt = (
                 select(
-                    Document.content,
-                    Document.doc_metadata,
-                    (1 - Document.embedding.cosine_distance(query_embedding)).label("similarity")
+                    DocumentChunk.document_id,
+                    DocumentChunk.content,
+                    DocumentChunk.ordinal,
+                    DocumentChunk.start_offset,
+                    (1 - DocumentChunk.embedding.cosine_distance(query_embedding)).label("similarity")
                 )
                 .where(
                     and_(
-                        Document.user_id == user_id,
-                        Document.type == DocumentType.CV_SHOWCASE,  # Use enum instead of string
-                        Document.project_id.is_(None) if project_id is None else Document.project_id == project_id
+                        DocumentChunk.user_id == user_id,
+                        DocumentChunk.document_type == DocumentType.CV_SHOWCASE,  # Use enum instead of string
+                        DocumentChunk.project_id.is_(None) if project_id is None else DocumentChunk.project_id == project_id
                     )
                 )
-                .order_by(Document.embedding.cosine_distance(query_embedding))
+                .order_by(DocumentChunk.embedding.cosine_distance(query_embedding))
                 .limit(n_results)
             )
 
             result = await session.execute(stmt)
             rows = result.all()
 
+            # Parent metadata for the returned chunks only
+            parent_metadata = {}
+            if rows:
+                parents = await session.execute(
+                    select(Document.id, Document.doc_metadata)
+                    .where(Document.id.in_({row.document_id for row in rows}))
+                )
+                parent_metadata = {doc_id: metadata or {} for doc_id, metadata in parents.all()}
+
             # Format results to match ChromaDB API
             context_chunks = []
-            for content, metadata, similarity in rows:
+            for document_id, content, ordinal, start_offset, similarity in rows:
+                metadata = parent_metadata.get(document_id, {})
                 context_chunks.append({
                     "content": content,
-                    "metadata": metadata or {},
+                    "metadata": {
+                        **metadata,
+                        "chunk_index": ordinal,
+                        "total_chunks": metadata.get("chunk_count"),
+                        "start_position": start_offset,
+                    },
                     "distance": 1 - similarity,  # Convert similarity to distance
                 })
 
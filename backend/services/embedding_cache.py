@@ -0,0 +1,281 @@
+"""Embedding Cache - shared cache for text embeddings.
+
+Keyed by SHA-256 of the normalized text plus the embedding model id, so the
+same chunk, query or document is only ever embedded once per model.
+
+Two tiers:
+- In-process LRU bounded by total vector bytes
+- Postgres table ``embedding_cache`` (float32 bytes) shared by all workers
+
+Database errors never fail an embedding - the cache degrades to a miss.
+"""
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prune the Postgres tier after this many written rows
+PRUNE_EVERY_N_ROWS = 1000
+
+
+class EmbeddingCache:
+    """Two-tier (memory + Postgres) cache for embedding vectors."""
+
+    def __init__(
+        self,
+        max_bytes: int = settings.EMBEDDING_CACHE_MAX_BYTES,
+        db_enabled: bool = settings.EMBEDDING_CACHE_DB_ENABLED,
+        db_max_rows: int = settings.EMBEDDING_CACHE_DB_MAX_ROWS,
+    ):
+        self.max_bytes = max_bytes
+        self.db_enabled = db_enabled
+        self.db_max_rows = db_max_rows
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._rows_since_prune = 0
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "db_errors": 0,
+        }
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so trivially different copies share a cache entry."""
+        text = unicodedata.normalize("NFC", text or "")
+        return re.sub(r"\s+", " ", text).strip()
+
+    @classmethod
+    def make_key(cls, text: str, model: str) -> str:
+        """SHA-256 of model id + normalized text."""
+        payload = f"{model}\x00{cls.normalize(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _memory_get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+            return vector
+
+    def _memory_set(self, key: str, vector: np.ndarray) -> None:
+        vector = np.ascontiguousarray(vector, dtype=np.float32)
+        vector.flags.writeable = False  # Shared between callers
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous.nbytes
+            self._memory[key] = vector
+            self._memory_bytes += vector.nbytes
+            while self._memory_bytes > self.max_bytes and self._memory:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.nbytes
+                self._stats["evictions"] += 1
+
+    def _count(self, stat: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[stat] += n
+
+    # ------------------------------------------------------------------
+    # Postgres tier (statements shared by sync and async sessions)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _select_stmt(keys: Sequence[str]):
+        """UPDATE ... RETURNING so hits and their LRU bookkeeping cost one round-trip."""
+        from sqlalchemy import update
+        from backend.models.embedding_cache import EmbeddingCacheEntry
+
+        return (
+            update(EmbeddingCacheEntry)
+            .where(EmbeddingCacheEntry.cache_key.in_(list(keys)))
+            .values(last_accessed_at=datetime.utcnow())
+            .returning(EmbeddingCacheEntry.cache_key, EmbeddingCacheEntry.vector)
+        )
+
+    @staticmethod
+    def _insert_stmt(rows: Dict[str, np.ndarray], model: str):
+        from sqlalchemy.dialects.postgresql import insert
+        from backend.models.embedding_cache import EmbeddingCacheEntry
+
+        now = datetime.utcnow()
+        return insert(EmbeddingCacheEntry).values([
+            {
+                "cache_key": key,
+                "model": model,
+                "dimensions": int(vector.shape[0]),
+                "vector": np.asarray(vector, dtype="<f4").tobytes(),
+                "created_at": now,
+                "last_accessed_at": now,
+            }
+            for key, vector in rows.items()
+        ]).on_conflict_do_nothing(index_elements=[EmbeddingCacheEntry.cache_key])
+
+    def _prune_stmt(self):
+        """Trim the table to db_max_rows (least recently used first)."""
+        from sqlalchemy import text
+
+        return text("""
+            DELETE FROM embedding_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM embedding_cache
+                ORDER BY last_accessed_at DESC
+                OFFSET :max_rows
+            )
+        """).bindparams(max_rows=self.db_max_rows)
+
+    def _should_prune(self, written: int) -> bool:
+        with self._lock:
+            self._rows_since_prune += written
+            if self._rows_since_prune >= PRUNE_EVERY_N_ROWS:
+                self._rows_since_prune = 0
+                return True
+            return False
+
+    # ------------------------------------------------------------------
+    # Lookup helpers
+    # ------------------------------------------------------------------
+
+    def _lookup_memory(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        results = [self._memory_get(key) for key in keys]
+        self._count("memory_hits", sum(1 for r in results if r is not None))
+        return results
+
+    def _apply_db_rows(self, keys: List[str], results: List[Optional[np.ndarray]], rows) -> None:
+        found = {key: np.frombuffer(data, dtype="<f4") for key, data in rows}
+        for idx, key in enumerate(keys):
+            if results[idx] is None and key in found:
+                self._memory_set(key, found[key])
+                results[idx] = found[key]
+        self._count("db_hits", len(found))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_many(self, texts: Sequence[str], model: str) -> List[Optional[np.ndarray]]:
+        """Look up cached vectors (blocking). Returns None for misses."""
+        keys = [self.make_key(text, model) for text in texts]
+        results = self._lookup_memory(keys)
+
+        missing = list({key for key, r in zip(keys, results) if r is None})
+        if missing and self.db_enabled:
+            try:
+                from backend.database import SessionLocal
+
+                with SessionLocal() as session:
+                    rows = session.execute(self._select_stmt(missing)).all()
+                    session.commit()
+                self._apply_db_rows(keys, results, rows)
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"Embedding cache DB lookup failed: {e}")
+
+        self._count("misses", sum(1 for r in results if r is None))
+        return results
+
+    async def aget_many(self, texts: Sequence[str], model: str) -> List[Optional[np.ndarray]]:
+        """Look up cached vectors without blocking the event loop. Returns None for misses."""
+        keys = [self.make_key(text, model) for text in texts]
+        results = self._lookup_memory(keys)
+
+        missing = list({key for key, r in zip(keys, results) if r is None})
+        if missing and self.db_enabled:
+            try:
+                from backend.database import async_session_maker
+
+                async with async_session_maker() as session:
+                    rows = (await session.execute(self._select_stmt(missing))).all()
+                    await session.commit()
+                self._apply_db_rows(keys, results, rows)
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"Embedding cache DB lookup failed: {e}")
+
+        self._count("misses", sum(1 for r in results if r is None))
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray], model: str) -> None:
+        """Store vectors (blocking)."""
+        rows = {self.make_key(text, model): np.asarray(vector, dtype=np.float32) for text, vector in zip(texts, vectors)}
+        if not rows:
+            return
+        for key, vector in rows.items():
+            self._memory_set(key, vector)
+        self._count("writes", len(rows))
+
+        if self.db_enabled:
+            try:
+                from backend.database import SessionLocal
+
+                with SessionLocal() as session:
+                    session.execute(self._insert_stmt(rows, model))
+                    if self._should_prune(len(rows)):
+                        session.execute(self._prune_stmt())
+                    session.commit()
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"Embedding cache DB write failed: {e}")
+
+    async def aput_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray], model: str) -> None:
+        """Store vectors without blocking the event loop."""
+        rows = {self.make_key(text, model): np.asarray(vector, dtype=np.float32) for text, vector in zip(texts, vectors)}
+        if not rows:
+            return
+        for key, vector in rows.items():
+            self._memory_set(key, vector)
+        self._count("writes", len(rows))
+
+        if self.db_enabled:
+            try:
+                from backend.database import async_session_maker
+
+                async with async_session_maker() as session:
+                    await session.execute(self._insert_stmt(rows, model))
+                    if self._should_prune(len(rows)):
+                        await session.execute(self._prune_stmt())
+                    await session.commit()
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"Embedding cache DB write failed: {e}")
+
+    def clear_memory(self) -> None:
+        """Drop the in-process tier (the Postgres tier is left untouched)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        """Hit/miss counters and tier sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+        stats["max_bytes"] = self.max_bytes
+        stats["db_enabled"] = self.db_enabled
+        return stats
+
+
+# Global instance
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,130 @@
+"""Embedding Client - encoder handle backed by the shared embedding sidecar.
+
+With ``EMBEDDING_SERVER_URL`` set, the embedding registry hands out
+``RemoteEmbeddingEncoder`` instead of loading a model, so every uvicorn
+worker shares the one model owned by ``embedding_server``. The handle has the
+same ``encode``/``dimensions`` surface as a local ``EmbeddingEncoder`` plus
+``aencode`` for async callers (no encoder thread needed - the wait is I/O).
+
+Vectors travel as raw little-endian float32 bytes, not JSON.
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from backend.config import settings
+
+DIMENSIONS_HEADER = "X-Embedding-Dimensions"
+
+
+def parse_server_url(url: str) -> Tuple[str, Optional[str]]:
+    """
+    Split ``EMBEDDING_SERVER_URL`` into (base_url, unix socket path).
+
+    ``unix:///run/embedding.sock`` -> ("http://embedding-server", "/run/embedding.sock")
+    ``http://127.0.0.1:8765``      -> ("http://127.0.0.1:8765", None)
+    """
+    if url.startswith("unix://"):
+        return "http://embedding-server", url[len("unix://"):]
+    return url.rstrip("/"), None
+
+
+def decode_vectors(response: httpx.Response) -> np.ndarray:
+    dimensions = int(response.headers[DIMENSIONS_HEADER])
+    return np.frombuffer(response.content, dtype="<f4").reshape(-1, dimensions).astype(np.float32)
+
+
+class RemoteEmbeddingEncoder:
+    """Shared handle for one model served by the embedding sidecar."""
+
+    _sync_clients: Dict[str, httpx.Client] = {}
+    _async_clients: Dict[str, httpx.AsyncClient] = {}
+    _clients_lock = threading.Lock()
+
+    def __init__(self, name: str, url: Optional[str] = None):
+        self.name = name
+        self.url = url or settings.EMBEDDING_SERVER_URL
+        self._dimensions: Optional[int] = None
+
+    def _client_args(self) -> dict:
+        base_url, _ = parse_server_url(self.url)
+        return {
+            "base_url": base_url,
+            "timeout": httpx.Timeout(settings.EMBEDDING_SERVER_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT),
+        }
+
+    def _sync_client(self) -> httpx.Client:
+        with self._clients_lock:
+            client = self._sync_clients.get(self.url)
+            if client is None:
+                _, uds = parse_server_url(self.url)
+                client = httpx.Client(transport=httpx.HTTPTransport(uds=uds), **self._client_args())
+                RemoteEmbeddingEncoder._sync_clients[self.url] = client
+            return client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        # Created per URL on first use; one per process (all requests share the pool)
+        client = self._async_clients.get(self.url)
+        if client is None:
+            _, uds = parse_server_url(self.url)
+            client = httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(uds=uds), **self._client_args())
+            RemoteEmbeddingEncoder._async_clients[self.url] = client
+        return client
+
+    def _payload(self, texts: List[str], normalize: bool) -> dict:
+        return {"model": self.name, "texts": list(texts), "normalize": normalize}
+
+    @property
+    def dimensions(self) -> int:
+        """Model dimensions (asks the server once; this also loads the model there)."""
+        if self._dimensions is None:
+            response = self._sync_client().get(f"/v1/models/{self.name}")
+            response.raise_for_status()
+            self._dimensions = int(response.json()["dimensions"])
+        return self._dimensions
+
+    def encode(self, texts: List[str], batch_size: Optional[int] = None, normalize: bool = True) -> np.ndarray:
+        """
+        Encode texts on the sidecar (blocking).
+
+        ``batch_size`` is ignored - the server micro-batches across all workers.
+
+        Returns:
+            Contiguous float32 matrix of shape (len(texts), dimensions)
+        """
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        response = self._sync_client().post("/v1/embed", json=self._payload(texts, normalize))
+        response.raise_for_status()
+        vectors = decode_vectors(response)
+        self._dimensions = vectors.shape[1]
+        return vectors
+
+    async def aencode(self, texts: List[str], batch_size: Optional[int] = None, normalize: bool = True) -> np.ndarray:
+        """Async ``encode`` - awaits the sidecar without occupying a thread."""
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        response = await self._async_client().post("/v1/embed", json=self._payload(texts, normalize))
+        response.raise_for_status()
+        vectors = decode_vectors(response)
+        self._dimensions = vectors.shape[1]
+        return vectors
+
+    def parameter_bytes(self) -> Optional[int]:
+        return None  # Weights live in the sidecar process
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimensions
+
+    @classmethod
+    async def aclose(cls):
+        """Close pooled connections (app shutdown)."""
+        for client in cls._async_clients.values():
+            await client.aclose()
+        cls._async_clients.clear()
+        with cls._clients_lock:
+            for client in cls._sync_clients.values():
+                client.close()
+            cls._sync_clients.clear()
@@ -0,0 +1,229 @@
+"""Embedding Model Registry - one copy of each embedding model per process.
+
+``VectorService`` instances are created per request in several endpoints, and
+every instance used to lazy-load its own ``SentenceTransformer``; ChromaDB
+collections loaded yet another copy of MiniLM through Chroma's default
+embedding function. The registry loads each model once (thread-safe, even when
+several requests hit a cold model at the same time) and hands out the same
+``EmbeddingEncoder`` to every caller.
+
+Load time, parameter memory and the process RSS growth during the load are
+recorded per model (see ``get_stats``).
+
+``EMBEDDING_BACKEND`` picks the runtime: ``torch`` (sentence-transformers) or
+``onnx`` (int8 ONNX export, see ``onnx_embedding``). If the ONNX backend is
+unavailable the registry falls back to torch.
+
+With ``EMBEDDING_SERVER_URL`` set, ``get`` returns a ``RemoteEmbeddingEncoder``
+instead and no model is loaded in this process: all uvicorn workers share the
+copy owned by the embedding sidecar (``embedding_server``).
+
+Usage:
+    encoder = embedding_registry.get("all-MiniLM-L6-v2")  # None if unavailable
+    encoder = await embedding_registry.aget("all-MiniLM-L6-v2")  # From async code
+    vectors = encoder.encode(["text"])
+    collection = client.get_or_create_collection(
+        name, embedding_function=embedding_registry.chroma_embedding_function("all-MiniLM-L6-v2")
+    )
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux /proc, psutil elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+class EmbeddingEncoder:
+    """Shared handle around one loaded model (safe to use from several threads)."""
+
+    def __init__(self, name: str, model):
+        self.name = name
+        self.model = model
+        self.dimensions = model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], batch_size: Optional[int] = None, normalize: bool = True) -> np.ndarray:
+        """
+        Encode texts on the calling thread.
+
+        Returns:
+            Contiguous float32 matrix of shape (len(texts), dimensions)
+        """
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size or settings.EMBEDDING_BATCH_SIZE,
+            normalize_embeddings=normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    def parameter_bytes(self) -> Optional[int]:
+        """Memory held by the model weights."""
+        if hasattr(self.model, "parameter_bytes"):
+            return self.model.parameter_bytes()
+        try:
+            return int(sum(p.numel() * p.element_size() for p in self.model.parameters()))
+        except Exception:
+            return None
+
+    # sentence-transformers compatibility for code that expects the model object
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimensions
+
+
+class _ChromaEmbeddingFunction:
+    """ChromaDB embedding function backed by a registry model (no second model copy)."""
+
+    def __init__(self, registry: "EmbeddingModelRegistry", name: str):
+        self._registry = registry
+        self._name = name
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        encoder = self._registry.get(self._name)
+        if encoder is None:
+            raise RuntimeError(f"Embedding model {self._name} is not available")
+        return encoder.encode(list(input)).tolist()
+
+
+class EmbeddingModelRegistry:
+    """Process-wide, thread-safe cache of loaded embedding models."""
+
+    def __init__(self):
+        self._encoders: Dict[str, Optional[EmbeddingEncoder]] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._model_locks: Dict[str, threading.Lock] = {}
+        self._remote: Dict[str, Any] = {}
+        self.serve_locally = False  # Set by the embedding sidecar, which must own the model itself
+
+    def _model_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            return self._model_locks.setdefault(name, threading.Lock())
+
+    def _load_torch(self, name: str):
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(name)
+
+    def _load_onnx(self, name: str):
+        from backend.services.onnx_embedding import OnnxSentenceEncoder
+        return OnnxSentenceEncoder(name)
+
+    def _load(self, name: str) -> Optional[EmbeddingEncoder]:
+        backend = settings.EMBEDDING_BACKEND.lower()
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+
+        encoder = None
+        if backend == "onnx":
+            try:
+                encoder = EmbeddingEncoder(name, self._load_onnx(name))
+            except Exception as e:
+                logger.warning(f"⚠️ ONNX backend unavailable for {name} ({e}) - falling back to torch")
+                backend = "torch"
+
+        if encoder is None:
+            try:
+                encoder = EmbeddingEncoder(name, self._load_torch(name))
+            except ImportError:
+                logger.warning("sentence-transformers not installed - embeddings disabled")
+                self._stats[name] = {"loaded": False, "error": "sentence-transformers not installed"}
+                return None
+            except Exception as e:
+                logger.error(f"⚠️ Failed to load embedding model {name}: {e}")
+                self._stats[name] = {"loaded": False, "error": str(e)}
+                return None
+
+        seconds = round(time.perf_counter() - start, 3)
+        rss_after = current_rss_bytes()
+        self._stats[name] = {
+            "loaded": True,
+            "backend": backend,
+            "dimensions": encoder.dimensions,
+            "load_seconds": seconds,
+            "parameter_bytes": encoder.parameter_bytes(),
+            "rss_delta_bytes": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+        }
+        logger.info(f"✅ Embedding model loaded: {name} ({backend}, {encoder.dimensions} dims, {seconds}s)")
+        return encoder
+
+    def get(self, name: str) -> Optional[EmbeddingEncoder]:
+        """
+        Shared encoder for ``name``, loading it on first use.
+
+        Failed loads are remembered (the model is not retried on every request).
+
+        Returns:
+            EmbeddingEncoder (RemoteEmbeddingEncoder when EMBEDDING_SERVER_URL
+            is set), or None if the model cannot be loaded
+        """
+        if settings.EMBEDDING_SERVER_URL and not self.serve_locally:
+            return self._get_remote(name)
+        return self.get_local(name)
+
+    async def aget(self, name: str) -> Optional[EmbeddingEncoder]:
+        """``get`` for async code: a cold model is loaded in a worker thread, not on the event loop."""
+        if name in self._encoders or (settings.EMBEDDING_SERVER_URL and not self.serve_locally):
+            return self.get(name)
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, name)
+
+    def _get_remote(self, name: str):
+        encoder = self._remote.get(name)
+        if encoder is None:
+            from backend.services.embedding_client import RemoteEmbeddingEncoder
+            with self._lock:
+                encoder = self._remote.setdefault(name, RemoteEmbeddingEncoder(name))
+        return encoder
+
+    def get_local(self, name: str) -> Optional[EmbeddingEncoder]:
+        """Encoder with the model loaded in this process (ignores EMBEDDING_SERVER_URL)."""
+        if name not in self._encoders:
+            with self._model_lock(name):
+                if name not in self._encoders:
+                    self._encoders[name] = self._load(name)
+        return self._encoders[name]
+
+    def chroma_embedding_function(self, name: str) -> _ChromaEmbeddingFunction:
+        """Embedding function for ChromaDB collections (model loads on first call)."""
+        return _ChromaEmbeddingFunction(self, name)
+
+    def is_loaded(self, name: str) -> bool:
+        return self._encoders.get(name) is not None or name in self._remote
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Loaded models with load time and memory, plus current process RSS."""
+        with self._lock:
+            models = {name: dict(stats) for name, stats in self._stats.items()}
+        return {
+            "models": models,
+            "loaded_models": sum(1 for stats in models.values() if stats.get("loaded")),
+            "parameter_bytes": sum(stats.get("parameter_bytes") or 0 for stats in models.values()),
+            "process_rss_bytes": current_rss_bytes(),
+            "embedding_server": None if self.serve_locally else settings.EMBEDDING_SERVER_URL or None,
+        }
+
+
+# Global instance
+embedding_registry = EmbeddingModelRegistry()
@@ -0,0 +1,219 @@
+"""Embedding Server - one embedding model shared by all uvicorn workers.
+
+Every API worker process would otherwise load its own copy of the embedding
+model (and Chroma's). This sidecar owns the model; workers with
+``EMBEDDING_SERVER_URL`` set talk to it through ``RemoteEmbeddingEncoder``.
+
+Requests from all workers are micro-batched: the first waiting request opens a
+window of ``EMBEDDING_SERVER_BATCH_WINDOW_MS`` (or until
+``EMBEDDING_SERVER_MAX_BATCH`` texts are queued) and everything that arrived
+runs as one forward pass. Requests keep queueing while a batch is encoding, so
+under load batches fill up on their own.
+
+Run (patch_and_start.py starts it automatically when EMBEDDING_SERVER_URL is set):
+    EMBEDDING_SERVER_URL=unix:///tmp/embedding.sock python -m backend.services.embedding_server
+
+Endpoints:
+    POST /v1/embed            {"model", "texts", "normalize"} -> float32 bytes
+    GET  /v1/models/{model}   {"dimensions"} (loads the model)
+    GET  /health, GET /stats
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel
+
+from backend.config import settings
+from backend.services.embedding_client import DIMENSIONS_HEADER, parse_server_url
+from backend.services.embedding_registry import embedding_registry
+
+logger = logging.getLogger(__name__)
+
+# The sidecar must load the model itself, never forward to EMBEDDING_SERVER_URL
+embedding_registry.serve_locally = True
+
+
+class EmbedRequest(BaseModel):
+    model: str
+    texts: List[str]
+    normalize: bool = True
+
+
+@dataclass
+class _Pending:
+    texts: List[str]
+    normalize: bool
+    future: asyncio.Future = field(repr=False)
+
+
+class MicroBatcher:
+    """Collects concurrent encode calls for one model into shared forward passes."""
+
+    def __init__(self, model: str, window_ms: float, max_batch: int, executor: ThreadPoolExecutor):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._executor = executor
+        self._queue: "asyncio.Queue[_Pending]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.texts = 0
+
+    async def encode(self, texts: List[str], normalize: bool) -> np.ndarray:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_Pending(texts, normalize, future))
+        return await future
+
+    async def _collect(self) -> List[_Pending]:
+        batch = [await self._queue.get()]
+        size = len(batch[0].texts)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while size < self.max_batch:
+            remaining = deadline - loop.time()
+            try:
+                item = self._queue.get_nowait() if remaining <= 0 else await asyncio.wait_for(self._queue.get(), remaining)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            batch.append(item)
+            size += len(item.texts)
+        return batch
+
+    def _encode(self, texts: List[str], normalize: bool) -> np.ndarray:
+        encoder = embedding_registry.get(self.model)
+        if encoder is None:
+            raise RuntimeError(f"Embedding model {self.model} is not available")
+        return encoder.encode(texts, normalize=normalize)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Normalisation is per request; group so one flag never leaks into another request
+            for normalize in {item.normalize for item in batch}:
+                group = [item for item in batch if item.normalize == normalize]
+                texts = [text for item in group for text in item.texts]
+                try:
+                    vectors = await loop.run_in_executor(self._executor, self._encode, texts, normalize)
+                except Exception as e:
+                    for item in group:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                    continue
+
+                self.batches += 1
+                self.texts += len(texts)
+                offset = 0
+                for item in group:
+                    if not item.future.done():
+                        item.future.set_result(vectors[offset:offset + len(item.texts)])
+                    offset += len(item.texts)
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-server")
+_batchers: Dict[str, MicroBatcher] = {}
+
+
+def _batcher(model: str) -> MicroBatcher:
+    batcher = _batchers.get(model)
+    if batcher is None:
+        batcher = _batchers[model] = MicroBatcher(
+            model,
+            settings.EMBEDDING_SERVER_BATCH_WINDOW_MS,
+            settings.EMBEDDING_SERVER_MAX_BATCH,
+            _executor,
+        )
+    return batcher
+
+
+async def _load(model: str):
+    if embedding_registry.is_loaded(model):
+        encoder = embedding_registry.get(model)
+    else:
+        encoder = await asyncio.get_running_loop().run_in_executor(_executor, embedding_registry.get, model)
+    if encoder is None:
+        raise HTTPException(status_code=503, detail=f"Embedding model {model} is not available")
+    return encoder
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from backend.services.vector_service import VectorService
+    await _load(VectorService.MODEL_NAME)  # Warm before workers start sending traffic
+    yield
+    _executor.shutdown(wait=False)
+
+
+app = FastAPI(title="Embedding Server", lifespan=lifespan)
+
+
+@app.post("/v1/embed")
+async def embed(request: EmbedRequest):
+    await _load(request.model)
+    try:
+        vectors = await _batcher(request.model).encode(request.texts, request.normalize)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return Response(
+        content=np.ascontiguousarray(vectors, dtype="<f4").tobytes(),
+        media_type="application/octet-stream",
+        headers={DIMENSIONS_HEADER: str(vectors.shape[1])},
+    )
+
+
+@app.get("/v1/models/{model:path}")
+async def model_info(model: str):
+    encoder = await _load(model)
+    return {"model": model, "dimensions": encoder.dimensions}
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        **embedding_registry.get_stats(),
+        "batching": {
+            model: {
+                "batches": batcher.batches,
+                "texts": batcher.texts,
+                "avg_batch_size": round(batcher.texts / batcher.batches, 1) if batcher.batches else 0,
+            }
+            for model, batcher in _batchers.items()
+        },
+    }
+
+
+def main():
+    import uvicorn
+
+    if not settings.EMBEDDING_SERVER_URL:
+        raise SystemExit("EMBEDDING_SERVER_URL is not set")
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    base_url, uds = parse_server_url(settings.EMBEDDING_SERVER_URL)
+    if uds:
+        if os.path.exists(uds):
+            os.remove(uds)  # Stale socket from a previous run
+        uvicorn.run(app, uds=uds, log_level=settings.LOG_LEVEL.lower())
+    else:
+        from urllib.parse import urlparse
+        parsed = urlparse(base_url)
+        uvicorn.run(app, host=parsed.hostname or "127.0.0.1", port=parsed.port or 8765,
+                    log_level=settings.LOG_LEVEL.lower())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""Extraction Cache - content-addressed cache for text extracted from uploads.
+
+The same CV, invoice or menu is uploaded again and again. Keyed by SHA-256 of
+the file bytes plus the extractor id, ``PARSER_VERSION`` and every setting that
+changes the output (OCR engine, language detection, PDF/OCR knobs), so a
+re-upload returns the stored text and metadata without parsing or OCR.
+
+Two tiers:
+- In-process LRU bounded by total text bytes
+- Postgres table ``extraction_cache`` shared by all workers, trimmed to a
+  maximum row count (least recently used rows are evicted first)
+
+Only successful extractions are stored. Extractors report failure explicitly
+by raising ``ExtractionFailed`` (OCR error, missing tool, timeout, a PDF page
+whose OCR failed); its placeholder or partial text is returned to the caller
+but never cached, so a re-upload of the same file gets another attempt.
+
+Hits, misses, bytes and extraction seconds saved are counted per endpoint.
+Database errors never fail an upload - the cache simply degrades to a miss.
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when a parser change alters extracted text, to invalidate old entries
+PARSER_VERSION = "1"
+
+# Prune the Postgres tier after this many writes
+PRUNE_EVERY_N_WRITES = 100
+
+ExtractResult = Tuple[str, Optional[Dict[str, Any]]]
+
+
+class ExtractionFailed(Exception):
+    """
+    Extraction did not (fully) succeed - the result must not be cached.
+
+    Attributes:
+        text: What the caller gets instead (error placeholder or partial text)
+        metadata: Extraction metadata, if any
+    """
+
+    def __init__(self, text: str, metadata: Optional[Dict[str, Any]] = None):
+        super().__init__(text)
+        self.text = text
+        self.metadata = metadata
+
+
+def pdf_result(result: Dict[str, Any]) -> ExtractResult:
+    """
+    (text, metadata) of a ``PdfExtractionEngine.extract`` result.
+
+    Raises:
+        ExtractionFailed: A page needed OCR and the OCR failed (text is partial)
+    """
+    text = result.pop("text")
+    if result.get("ocr_failed_pages"):
+        raise ExtractionFailed(text, result)
+    return text, result
+
+
+def ocr_settings() -> Dict[str, Any]:
+    """Settings that change OCR/PDF output - part of every OCR-backed cache key."""
+    return {
+        "language_detection": settings.OCR_LANGUAGE_DETECTION,
+        "osd_min_confidence": settings.OCR_OSD_MIN_CONFIDENCE,
+        "pdf_dpi": settings.OCR_PDF_DPI,
+        "pdf_min_text_chars": settings.PDF_MIN_TEXT_CHARS,
+        "pdf_target_pixels": settings.PDF_OCR_TARGET_PIXELS,
+        "pdf_dpi_range": [settings.PDF_OCR_MIN_DPI, settings.PDF_OCR_MAX_DPI],
+    }
+
+
+def file_sha256(source: Union[bytes, str]) -> Tuple[str, int]:
+    """SHA-256 hex digest and size of file bytes or a file on disk (blocking)."""
+    if isinstance(source, (bytes, bytearray)):
+        return hashlib.sha256(source).hexdigest(), len(source)
+
+    digest = hashlib.sha256()
+    size = 0
+    with open(source, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+
+class ExtractionCache:
+    """Two-tier (memory + Postgres) cache for extracted document text."""
+
+    def __init__(
+        self,
+        enabled: bool = settings.EXTRACTION_CACHE_ENABLED,
+        max_bytes: int = settings.EXTRACTION_CACHE_MAX_BYTES,
+        db_enabled: bool = settings.EXTRACTION_CACHE_DB_ENABLED,
+        db_max_rows: int = settings.EXTRACTION_CACHE_DB_MAX_ROWS,
+    ):
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.db_enabled = db_enabled
+        self.db_max_rows = db_max_rows
+
+        # key -> (text, metadata, size_bytes of the source file, extraction seconds)
+        self._memory: "OrderedDict[str, Tuple[str, Optional[Dict[str, Any]], int, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "failures": 0,
+            "db_errors": 0,
+        }
+        self._endpoint_stats: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def make_key(file_hash: str, extractor: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a content-addressed cache key.
+
+        Args:
+            file_hash: SHA-256 of the file bytes
+            extractor: Extractor id (e.g. ``pdf_extraction``, ``document_parser:tesseract``)
+            params: Any setting that changes the extracted text
+
+        Returns:
+            SHA-256 hex digest of the canonical request
+        """
+        payload = {
+            "file": file_hash,
+            "extractor": extractor,
+            "parser_version": PARSER_VERSION,
+            "params": params or {},
+        }
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_cacheable(text: Optional[str]) -> bool:
+        """Never cache empty results (failures are reported via ``ExtractionFailed``)."""
+        return bool(text and text.strip())
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _entry_bytes(text: str) -> int:
+        return len(text.encode("utf-8"))
+
+    def _memory_get(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            self._memory.move_to_end(key)
+            text, metadata, size_bytes, seconds = entry
+            return text, copy.deepcopy(metadata), size_bytes, seconds
+
+    def _memory_set(self, key: str, text: str, metadata: Optional[Dict[str, Any]], size_bytes: int, seconds: float) -> None:
+        entry_bytes = self._entry_bytes(text)
+        if entry_bytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= self._entry_bytes(previous[0])
+            self._memory[key] = (text, copy.deepcopy(metadata), size_bytes, seconds)
+            self._memory_bytes += entry_bytes
+            while self._memory_bytes > self.max_bytes and self._memory:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= self._entry_bytes(evicted[0])
+                self._stats["evictions"] += 1
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _count_endpoint(self, endpoint: str, hit: bool, size_bytes: int, seconds: float) -> None:
+        with self._lock:
+            stats = self._endpoint_stats.setdefault(endpoint, {
+                "hits": 0,
+                "misses": 0,
+                "bytes_saved": 0,
+                "seconds_saved": 0.0,
+            })
+            if hit:
+                stats["hits"] += 1
+                stats["bytes_saved"] += size_bytes
+                stats["seconds_saved"] += seconds
+            else:
+                stats["misses"] += 1
+
+    # ------------------------------------------------------------------
+    # Postgres tier
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _select_stmt(key: str):
+        """UPDATE ... RETURNING so a hit and its LRU bookkeeping cost one round-trip."""
+        from sqlalchemy import update
+        from backend.models.extraction_cache import ExtractionCacheEntry
+
+        return (
+            update(ExtractionCacheEntry)
+            .where(ExtractionCacheEntry.cache_key == key)
+            .values(
+                hit_count=ExtractionCacheEntry.hit_count + 1,
+                last_accessed_at=datetime.utcnow(),
+            )
+            .returning(
+                ExtractionCacheEntry.text,
+                ExtractionCacheEntry.extraction_metadata,
+                ExtractionCacheEntry.size_bytes,
+                ExtractionCacheEntry.extraction_seconds,
+            )
+        )
+
+    @staticmethod
+    def _upsert_stmt(
+        key: str,
+        file_hash: str,
+        extractor: str,
+        text: str,
+        metadata: Optional[Dict[str, Any]],
+        size_bytes: int,
+        seconds: float,
+    ):
+        from sqlalchemy.dialects.postgresql import insert
+        from backend.models.extraction_cache import ExtractionCacheEntry
+
+        now = datetime.utcnow()
+        stmt = insert(ExtractionCacheEntry).values(
+            cache_key=key,
+            file_sha256=file_hash,
+            extractor=extractor[:255],
+            size_bytes=size_bytes,
+            text=text,
+            extraction_metadata=metadata,
+            extraction_seconds=seconds,
+            hit_count=0,
+            created_at=now,
+            last_accessed_at=now,
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[ExtractionCacheEntry.cache_key],
+            set_={
+                "text": stmt.excluded.text,
+                "extraction_metadata": stmt.excluded.extraction_metadata,
+                "extraction_seconds": stmt.excluded.extraction_seconds,
+                "last_accessed_at": now,
+            },
+        )
+
+    def _prune_stmt(self):
+        """Trim the table to db_max_rows (least recently used first)."""
+        from sqlalchemy import text
+
+        return text("""
+            DELETE FROM extraction_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM extraction_cache
+                ORDER BY last_accessed_at DESC
+                OFFSET :max_rows
+            )
+        """).bindparams(max_rows=self.db_max_rows)
+
+    def _should_prune(self) -> bool:
+        with self._lock:
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= PRUNE_EVERY_N_WRITES:
+                self._writes_since_prune = 0
+                return True
+            return False
+
+    async def _aget(self, key: str):
+        entry = self._memory_get(key)
+        if entry is not None:
+            self._count("memory_hits")
+            return entry
+
+        if self.db_enabled:
+            try:
+                from backend.database import async_session_maker
+
+                async with async_session_maker() as session:
+                    row = (await session.execute(self._select_stmt(key))).first()
+                    await session.commit()
+                if row is not None:
+                    self._count("db_hits")
+                    text, metadata, size_bytes, seconds = row
+                    self._memory_set(key, text, metadata, size_bytes, seconds)
+                    return text, copy.deepcopy(metadata), size_bytes, seconds
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"Extraction cache DB lookup failed: {e}")
+
+        self._count("misses")
+        return None
+
+    async def _aset(self, key: str, file_hash: str, extractor: str, text: str,
+                    metadata: Optional[Dict[str, Any]], size_bytes: int, seconds: float) -> None:
+        self._memory_set(key, text, metadata, size_bytes, seconds)
+        self._count("writes")
+
+        if self.db_enabled:
+            try:
+                from backend.database import async_session_maker
+
+                async with async_session_maker() as session:
+                    await session.execute(self._upsert_stmt(key, file_hash, extractor, text, metadata, size_bytes, seconds))
+                    if self._should_prune():
+                        await session.execute(self._prune_stmt())
+                    await session.commit()
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"Extraction cache DB write failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get_or_extract(
+        self,
+        source: Union[bytes, str],
+        extractor: str,
+        extract: Callable[[], Awaitable[ExtractResult]],
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, Optional[Dict[str, Any]], bool]:
+        """
+        Return cached text for ``source`` or run ``extract`` and cache its result.
+
+        Args:
+            source: File bytes or path of the uploaded file
+            extractor: Extractor id (part of the key)
+            extract: Coroutine factory returning (text, metadata); raises
+                ``ExtractionFailed`` if the result must not be cached
+            endpoint: Endpoint name for per-endpoint statistics
+            params: Settings that change the output (part of the key)
+
+        Returns:
+            (text, metadata, cache_hit) - for a failed extraction the
+            placeholder/partial text and metadata of ``ExtractionFailed``
+        """
+        if not self.enabled:
+            try:
+                text, metadata = await extract()
+            except ExtractionFailed as e:
+                return e.text, e.metadata, False
+            return text, metadata, False
+
+        file_hash, size_bytes = await asyncio.to_thread(file_sha256, source)
+        key = self.make_key(file_hash, extractor, params)
+
+        entry = await self._aget(key)
+        if entry is not None:
+            text, metadata, _, seconds = entry
+            self._count_endpoint(endpoint, True, size_bytes, seconds)
+            logger.info(f"📦 Extraction cache hit ({endpoint}, {extractor}, {size_bytes} bytes)")
+            return text, metadata, True
+
+        start = time.perf_counter()
+        try:
+            text, metadata = await extract()
+        except ExtractionFailed as e:
+            self._count_endpoint(endpoint, False, size_bytes, 0.0)
+            self._count("failures")
+            logger.info(f"Extraction failed ({endpoint}, {extractor}) - not cached")
+            return e.text, e.metadata, False
+        seconds = round(time.perf_counter() - start, 3)
+        self._count_endpoint(endpoint, False, size_bytes, seconds)
+
+        if self.is_cacheable(text):
+            await self._aset(key, file_hash, extractor, text, metadata, size_bytes, seconds)
+        return text, metadata, False
+
+    def clear_memory(self) -> None:
+        """Drop the in-process tier (the Postgres tier is left untouched)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, tier sizes and per-endpoint savings."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+            endpoints = {name: dict(values) for name, values in self._endpoint_stats.items()}
+
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+        for values in endpoints.values():
+            total = values["hits"] + values["misses"]
+            values["hit_rate"] = round(values["hits"] / total, 4) if total else 0.0
+            values["seconds_saved"] = round(values["seconds_saved"], 3)
+        stats["endpoints"] = endpoints
+        stats["bytes_saved"] = sum(v["bytes_saved"] for v in endpoints.values())
+        stats["seconds_saved"] = round(sum(v["seconds_saved"] for v in endpoints.values()), 3)
+        stats["enabled"] = self.enabled
+        stats["max_bytes"] = self.max_bytes
+        stats["db_enabled"] = self.db_enabled
+        stats["parser_version"] = PARSER_VERSION
+        return stats
+
+
+# Global instance
+extraction_cache = ExtractionCache()
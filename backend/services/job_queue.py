@@ -0,0 +1,407 @@
+"""Background Job Queue - long-running work outside the HTTP request.
+
+Jobs are rows in the Postgres table ``background_jobs``. They survive
+restarts, and several backend processes can share one queue (jobs are claimed
+with ``FOR UPDATE SKIP LOCKED``). Each process runs ``JOB_WORKERS`` worker
+tasks on its event loop, so concurrency is bounded per process.
+
+- Handlers are registered per job kind with ``@job_queue.handler("kind")``
+- ``enqueue`` returns immediately; endpoints answer ``202 Accepted`` with the job id
+- Progress, a small checkpoint dict (resume point for retries) and a heartbeat
+  are written while the job runs; ``GET /jobs/{id}`` reads them
+- Failures are retried with exponential backoff up to ``max_attempts``
+  (``PermanentJobError`` fails immediately)
+- Idempotency keys: the same key for the same kind and user returns the existing job
+- Jobs whose process died (no heartbeat for ``JOB_STALE_SECONDS``) are requeued
+"""
+import asyncio
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[["JobContext", Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class PermanentJobError(Exception):
+    """Job failure that retrying cannot fix (e.g. the target record was deleted)."""
+
+
+class JobContext:
+    """Handed to job handlers: attempt number, checkpoint and progress reporting."""
+
+    def __init__(self, queue: "JobQueue", job_id: str, kind: str, attempt: int, checkpoint: Optional[Dict[str, Any]]):
+        self.queue = queue
+        self.job_id = job_id
+        self.kind = kind
+        self.attempt = attempt
+        # Mutable state saved with every progress update and restored on retry
+        self.checkpoint: Dict[str, Any] = checkpoint or {}
+
+    async def progress(self, fraction: float, message: Optional[str] = None) -> None:
+        """Report progress (0.0 - 1.0) and persist the checkpoint."""
+        fraction = min(1.0, max(0.0, fraction))
+        await self.queue._update(
+            self.job_id,
+            progress=fraction,
+            progress_message=(message or "")[:500] or None,
+            checkpoint=self.checkpoint,
+        )
+
+
+class JobQueue:
+    """Postgres-persisted job queue with in-process worker tasks."""
+
+    def __init__(
+        self,
+        workers: int = settings.JOB_WORKERS,
+        poll_interval: float = settings.JOB_POLL_INTERVAL,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        timeout: float = settings.JOB_TIMEOUT_SECONDS,
+    ):
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._running_jobs: Dict[str, str] = {}  # job id -> kind (this process)
+        self._stats = {
+            "enqueued": 0,
+            "deduplicated": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retried": 0,
+            "requeued_stale": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def handler(self, kind: str) -> Callable[[JobHandler], JobHandler]:
+        """Decorator registering the coroutine that processes jobs of ``kind``."""
+        def register(fn: JobHandler) -> JobHandler:
+            self._handlers[kind] = fn
+            return fn
+        return register
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _public(job) -> Dict[str, Any]:
+        def iso(value: Optional[datetime]) -> Optional[str]:
+            return value.isoformat() if value else None
+
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "progress": round(job.progress or 0.0, 4),
+            "progress_message": job.progress_message,
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts,
+            "result": job.result,
+            "error": job.error,
+            "created_at": iso(job.created_at),
+            "started_at": iso(job.started_at),
+            "finished_at": iso(job.finished_at),
+            "next_attempt_at": iso(job.run_after) if job.status == "queued" and job.attempts else None,
+            "status_url": f"/jobs/{job.id}",
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Persist a job and wake a worker.
+
+        Args:
+            kind: Registered job kind
+            payload: JSON-serializable job arguments
+            user_id: Owner (scopes the idempotency key)
+            idempotency_key: Client-supplied key - repeated requests return the existing job
+            max_attempts: Attempts before the job fails (default: JOB_MAX_ATTEMPTS)
+
+        Returns:
+            Public job dict (existing job if the idempotency key was seen before)
+        """
+        from sqlalchemy import select
+        from sqlalchemy.dialects.postgresql import insert
+        from backend.database import async_session_maker
+        from backend.models.job import BackgroundJob
+
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        now = datetime.utcnow()
+        job_id = str(uuid.uuid4())
+        user_id = str(user_id) if user_id is not None else None
+
+        async with async_session_maker() as session:
+            stmt = insert(BackgroundJob).values(
+                id=job_id,
+                kind=kind,
+                status="queued",
+                user_id=user_id,
+                idempotency_key=idempotency_key,
+                payload=payload,
+                progress=0.0,
+                attempts=0,
+                max_attempts=max_attempts or self.max_attempts,
+                run_after=now,
+                created_at=now,
+                updated_at=now,
+            )
+            if idempotency_key:
+                stmt = stmt.on_conflict_do_nothing(index_elements=["kind", "user_id", "idempotency_key"])
+            inserted = (await session.execute(stmt.returning(BackgroundJob.id))).first()
+            await session.commit()
+
+            if inserted is None:
+                # Idempotency key already used - hand back the original job
+                existing = (await session.execute(
+                    select(BackgroundJob).where(
+                        BackgroundJob.kind == kind,
+                        BackgroundJob.user_id == user_id,
+                        BackgroundJob.idempotency_key == idempotency_key,
+                    )
+                )).scalars().first()
+                self._stats["deduplicated"] += 1
+                logger.info(f"🔁 Job {existing.id} ({kind}) reused for idempotency key {idempotency_key!r}")
+                return self._public(existing)
+
+            job = await session.get(BackgroundJob, job_id)
+            public = self._public(job)
+
+        self._stats["enqueued"] += 1
+        logger.info(f"📥 Job {job_id} ({kind}) queued")
+        if self._wake is not None:
+            self._wake.set()
+        return public
+
+    async def get(self, job_id: str, include_owner: bool = False) -> Optional[Dict[str, Any]]:
+        """Current state of a job (None if unknown); ``include_owner`` adds its ``user_id``."""
+        from backend.database import async_session_maker
+        from backend.models.job import BackgroundJob
+
+        async with async_session_maker() as session:
+            job = await session.get(BackgroundJob, job_id)
+            if job is None:
+                return None
+            public = self._public(job)
+            if include_owner:
+                public["user_id"] = job.user_id
+            return public
+
+    def start(self) -> None:
+        """Start the worker tasks (call from the app lifespan)."""
+        if self._tasks:
+            return
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        logger.info(f"✅ Job queue started: {self.workers} worker(s), kinds: {sorted(self._handlers)}")
+
+    async def shutdown(self) -> None:
+        """Stop the workers. Interrupted jobs go back to the queue without using up an attempt."""
+        interrupted = list(self._running_jobs)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        for job_id in interrupted:
+            try:
+                await self._update(job_id, status="queued", run_after=datetime.utcnow(), attempts_delta=-1)
+            except Exception as e:
+                logger.warning(f"Could not requeue job {job_id} on shutdown: {e}")
+        self._running_jobs.clear()
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Job counts per status plus this process' counters."""
+        from sqlalchemy import text
+        from backend.database import async_session_maker
+
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["workers"] = self.workers
+        stats["running_here"] = dict(self._running_jobs)
+        stats["kinds"] = sorted(self._handlers)
+        try:
+            async with async_session_maker() as session:
+                rows = await session.execute(text(
+                    "SELECT kind, status, count(*) FROM background_jobs GROUP BY kind, status"
+                ))
+                by_kind: Dict[str, Dict[str, int]] = {}
+                for kind, status, count in rows:
+                    by_kind.setdefault(kind, {s: 0 for s in JOB_STATUSES})[status] = count
+            stats["jobs"] = by_kind
+        except Exception as e:
+            stats["jobs"] = {"error": str(e)}
+        return stats
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    async def _update(self, job_id: str, attempts_delta: int = 0, **values: Any) -> None:
+        from sqlalchemy import update
+        from backend.database import async_session_maker
+        from backend.models.job import BackgroundJob
+
+        values["updated_at"] = datetime.utcnow()
+        if attempts_delta:
+            values["attempts"] = BackgroundJob.attempts + attempts_delta
+        async with async_session_maker() as session:
+            await session.execute(update(BackgroundJob).where(BackgroundJob.id == job_id).values(**values))
+            await session.commit()
+
+    async def _claim(self):
+        """Atomically move the next due job of a known kind to ``running``."""
+        from sqlalchemy import text
+        from backend.database import async_session_maker
+
+        now = datetime.utcnow()
+        async with async_session_maker() as session:
+            row = (await session.execute(text("""
+                UPDATE background_jobs
+                SET status = 'running', attempts = attempts + 1,
+                    started_at = :now, updated_at = :now, error = NULL
+                WHERE id = (
+                    SELECT id FROM background_jobs
+                    WHERE status = 'queued' AND run_after <= :now AND kind = ANY(:kinds)
+                    ORDER BY run_after, created_at
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING id, kind, payload, checkpoint, attempts, max_attempts
+            """), {"now": now, "kinds": list(self._handlers)})).first()
+            await session.commit()
+        return row
+
+    async def _requeue_stale(self) -> None:
+        """Requeue running jobs whose process stopped sending heartbeats."""
+        from sqlalchemy import text
+        from backend.database import async_session_maker
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+        async with async_session_maker() as session:
+            result = await session.execute(text("""
+                UPDATE background_jobs
+                SET status = 'queued', run_after = :now, updated_at = :now
+                WHERE status = 'running' AND updated_at < :cutoff
+                RETURNING id
+            """), {"now": datetime.utcnow(), "cutoff": cutoff})
+            requeued = [row[0] for row in result]
+            await session.commit()
+        if requeued:
+            self._stats["requeued_stale"] += len(requeued)
+            logger.warning(f"⚠️ Requeued {len(requeued)} stale job(s): {requeued}")
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        delay = min(settings.JOB_RETRY_MAX_SECONDS, settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+        return delay * (1.0 + random.uniform(0.0, 0.25))
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                await self._update(job_id)
+            except Exception as e:
+                logger.warning(f"Job {job_id} heartbeat failed: {e}")
+
+    async def _execute(self, row) -> None:
+        job_id, kind, payload, checkpoint, attempt, max_attempts = row
+        context = JobContext(self, job_id, kind, attempt, checkpoint)
+        self._running_jobs[job_id] = kind
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        start = time.perf_counter()
+        logger.info(f"▶️ Job {job_id} ({kind}) attempt {attempt}/{max_attempts}")
+
+        try:
+            result = await asyncio.wait_for(self._handlers[kind](context, payload), timeout=self.timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}" if not isinstance(e, asyncio.TimeoutError) else \
+                f"Timed out after {self.timeout:g}s"
+            permanent = isinstance(e, PermanentJobError)
+            if permanent or attempt >= max_attempts:
+                self._stats["failed"] += 1
+                logger.error(f"❌ Job {job_id} ({kind}) failed after {attempt} attempt(s): {error}")
+                await self._update(job_id, status="failed", error=error, finished_at=datetime.utcnow(),
+                                   checkpoint=context.checkpoint)
+            else:
+                delay = self._backoff(attempt)
+                self._stats["retried"] += 1
+                logger.warning(f"⚠️ Job {job_id} ({kind}) attempt {attempt} failed, retrying in {delay:.0f}s: {error}")
+                await self._update(job_id, status="queued", error=error, checkpoint=context.checkpoint,
+                                   run_after=datetime.utcnow() + timedelta(seconds=delay))
+        else:
+            self._stats["succeeded"] += 1
+            logger.info(f"✅ Job {job_id} ({kind}) succeeded in {time.perf_counter() - start:.1f}s")
+            await self._update(job_id, status="succeeded", result=result, progress=1.0,
+                               finished_at=datetime.utcnow(), checkpoint=context.checkpoint)
+        finally:
+            heartbeat.cancel()
+            self._running_jobs.pop(job_id, None)
+
+    async def _worker(self, number: int) -> None:
+        idle_polls = 0
+        while True:
+            self._wake.clear()
+            try:
+                if number == 0 and idle_polls % 12 == 0:
+                    await self._requeue_stale()
+                row = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Database unavailable - keep the worker alive and try again later
+                logger.warning(f"Job worker {number}: queue poll failed: {e}")
+                row = None
+
+            if row is None:
+                idle_polls += 1
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            idle_polls = 0
+            try:
+                await self._execute(row)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {number}: could not record result of job {row[0]}: {e}")
+
+
+# Global instance
+job_queue = JobQueue()
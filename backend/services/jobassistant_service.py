@@ -95,7 +95,7 @@ Extract the following as valid JSON only (no markdown, no explanations):
 
 Return ONLY valid JSON, nothing else."""
 
-        result = self.llm.generate(
+        result = await self.llm.agenerate(
             prompt=prompt,
             provider=provider,
             model=model,
@@ -227,7 +227,7 @@ Return JSON with this structure:
 Return ONLY the JSON, no other text."""
 
         try:
-            response = await self.llm.generate(
+            result = await self.llm.agenerate(
                 prompt=prompt,
                 provider=provider,
                 temperature=0.3,
@@ -235,6 +235,7 @@ Return ONLY the JSON, no other text."""
             )
 
             # Parse LLM response
+            response = result.get("response", "")
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if not json_match:
                 raise ValueError("No JSON found in LLM response")
@@ -793,7 +794,7 @@ STRUCTURE:
 
 Return ONLY the cover letter text, no explanations or metadata."""
 
-        result = self.llm.generate(
+        result = await self.llm.agenerate(
             prompt=prompt,
             provider=provider,
             model=model,
@@ -879,7 +880,7 @@ OUTPUT FORMAT (valid JSON only):
 
 Return ONLY valid JSON, nothing else."""
 
-        result = self.llm.generate(
+        result = await self.llm.agenerate(
             prompt=prompt,
             provider=provider,
             model=model,
@@ -1000,13 +1001,14 @@ Return JSON:
 Return ONLY JSON."""
 
         try:
-            response = await self.llm.generate(
+            result = await self.llm.agenerate(
                 prompt=prompt,
                 provider=provider,
                 temperature=0.3,
                 max_tokens=2000
             )
 
+            response = result.get("response", "")
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if not json_match:
                 raise ValueError("No JSON in LLM response")
@@ -1179,7 +1181,7 @@ STRUCTURE:
 
 Return ONLY the cover letter text, no explanations or metadata."""
 
-        result = self.llm.generate(
+        result = await self.llm.agenerate(
             prompt=prompt,
             provider=provider,
             model=model,
@@ -150,7 +150,7 @@ Buchkapitel:"""
         # Process with selected LLM provider
         try:
             if provider == "grok":
-                result = llm_gateway.generate(
+                result = await llm_gateway.agenerate(
                     prompt=prompt,
                     provider="grok",
                     model="grok-4-1-fast",
@@ -158,7 +158,7 @@ Buchkapitel:"""
                     max_tokens=300
                 )
             elif provider == "anthropic":
-                result = llm_gateway.generate(
+                result = await llm_gateway.agenerate(
                     prompt=prompt,
                     provider="anthropic",
                     model="claude-sonnet-3-5-20241022",
@@ -166,7 +166,7 @@ Buchkapitel:"""
                     max_tokens=300
                 )
             else:  # ollama (default)
-                result = llm_gateway.generate(
+                result = await llm_gateway.agenerate(
                     prompt=prompt,
                     provider="ollama",
                     model="qwen2.5:3b",  # Ollama model (pulled on startup)
@@ -1,16 +1,88 @@
 """LifeChronicle Service with PostgreSQL database backend."""
-from typing import List, Optional
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import date
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models.lifechronicle import LifeChronicleEntry
+from backend.services.blob_store import blob_store
 from backend.schemas.lifechronicle import (
     LifeChronicleEntryCreate,
     LifeChronicleEntryUpdate,
 )
 
+logger = logging.getLogger(__name__)
+
+PHOTO_NAMESPACE = "lifechronicle"
+
+
+def externalize_photos(
+    photo_urls: Optional[List[str]],
+    entry_metadata: Optional[Dict[str, Any]],
+    put: Callable[[bytes, str, Optional[str]], Dict[str, Any]],
+) -> Tuple[List[str], Dict[str, Any], int]:
+    """
+    Move inline base64 photos of an entry into the blob store.
+
+    Older entries keep every photo as a data URL in ``photo_urls`` and again in
+    ``entry_metadata["photos_base64"]``. The inline copies are the source of
+    truth when present (``photo_urls`` may hold dead ``/uploads`` file paths).
+
+    Args:
+        photo_urls: Current photo URLs of the entry
+        entry_metadata: Current entry metadata
+        put: Blob writer (data, content_type, filename) -> blob dict with url
+
+    Returns:
+        (photo_urls, entry_metadata, number of photos moved)
+    """
+    from backend.services.blob_store import parse_data_url
+
+    metadata = dict(entry_metadata or {})
+    inline = metadata.pop("photos_base64", None) or []
+    if inline:
+        sources = [(p.get("data_url"), p.get("filename")) for p in inline]
+    else:
+        sources = [(url, None) for url in photo_urls or []]
+
+    urls: List[str] = []
+    photos: List[Dict[str, Any]] = []
+    for url, filename in sources:
+        decoded = parse_data_url(url)
+        if decoded is None:
+            if not inline:
+                urls.append(url)
+            continue
+        data, content_type = decoded
+        blob = put(data, content_type, filename)
+        urls.append(blob["url"])
+        photos.append({"filename": filename, "url": blob["url"], "size_bytes": blob["size_bytes"]})
+
+    if photos and not metadata.get("photos"):
+        metadata["photos"] = photos
+    return urls, metadata, len(photos)
+
+
+def photo_blob_urls(entry: LifeChronicleEntry) -> set:
+    """Photo URLs of an entry (photo_urls and metadata copies)."""
+    urls = set(entry.photo_urls or [])
+    for photo in (entry.entry_metadata or {}).get("photos") or []:
+        if photo.get("url"):
+            urls.add(photo["url"])
+    return urls
+
+
+async def release_photos(urls) -> None:
+    """Delete photo blobs no other entry uses (after the referencing rows are committed)."""
+    for url in urls:
+        try:
+            await blob_store.adelete_unreferenced(url)
+        except Exception as e:
+            # The entry change is already committed - an orphaned blob is not worth failing it
+            logger.warning(f"Could not delete photo blob {url}: {e}")
+
 
 class LifeChronicleDBService:
     """Database service for LifeChronicle entries."""
@@ -112,7 +184,7 @@ class LifeChronicleDBService:
         entry_data: LifeChronicleEntryUpdate
     ) -> Optional[LifeChronicleEntry]:
         """
-        Update an existing entry.
+        Update an existing entry (photos it no longer references are deleted from the blob store).
 
         Args:
             db: Database session
@@ -127,6 +199,8 @@ class LifeChronicleDBService:
         if not entry:
             return None
 
+        previous_photos = photo_blob_urls(entry)
+
         # Update only provided fields
         update_dict = entry_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
@@ -134,6 +208,7 @@ class LifeChronicleDBService:
 
         await db.commit()
         await db.refresh(entry)
+        await release_photos(previous_photos - photo_blob_urls(entry))
         return entry
 
     async def delete_entry(
@@ -143,7 +218,7 @@ class LifeChronicleDBService:
         user_id: UUID
     ) -> bool:
         """
-        Delete an entry.
+        Delete an entry and the photo blobs no other entry uses.
 
         Args:
             db: Database session
@@ -157,8 +232,10 @@ class LifeChronicleDBService:
         if not entry:
             return False
 
+        photos = photo_blob_urls(entry)
         await db.delete(entry)
         await db.commit()
+        await release_photos(photos)
         return True
 
     async def mark_as_refined(
@@ -0,0 +1,307 @@
+"""LLM Response Cache - content-addressed cache for LLM generations.
+
+Two tiers:
+- In-process LRU (bounded by entry count) for repeated prompts within a worker
+- Postgres table ``llm_response_cache`` shared by all workers and restarts
+
+Both tiers honour a TTL. The Postgres tier is trimmed to a maximum row count
+(least recently used rows are evicted first). Database errors never fail a
+generation - the cache simply degrades to a miss.
+"""
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prune the Postgres tier after this many writes
+PRUNE_EVERY_N_WRITES = 100
+
+
+class LLMResponseCache:
+    """Two-tier (memory + Postgres) cache for LLM responses."""
+
+    def __init__(
+        self,
+        max_entries: int = settings.LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = settings.LLM_CACHE_TTL_SECONDS,
+        db_enabled: bool = settings.LLM_CACHE_DB_ENABLED,
+        db_max_rows: int = settings.LLM_CACHE_DB_MAX_ROWS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_enabled = db_enabled
+        self.db_max_rows = db_max_rows
+
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "db_errors": 0,
+        }
+
+    @staticmethod
+    def make_key(
+        prompt: str,
+        provider: str,
+        model: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        seed: Optional[int] = None,
+        **extra: Any,
+    ) -> str:
+        """
+        Build a content-addressed cache key.
+
+        Args:
+            prompt: Prompt text
+            provider: LLM provider
+            model: Resolved model name
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            seed: Sampling seed (if any)
+            **extra: Any other parameter that changes the output (e.g. response format)
+
+        Returns:
+            SHA-256 hex digest of the canonical request
+        """
+        payload = {
+            "prompt": prompt,
+            "provider": provider,
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "seed": seed,
+            **extra,
+        }
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._memory.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return copy.deepcopy(value)
+
+    def _memory_set(self, key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
+        with self._lock:
+            self._memory[key] = (time.time() + ttl_seconds, copy.deepcopy(value))
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    # ------------------------------------------------------------------
+    # Postgres tier (statements shared by sync and async sessions)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _select_stmt(key: str):
+        """UPDATE ... RETURNING so a hit and its bookkeeping cost one round-trip."""
+        from sqlalchemy import update
+        from backend.models.llm_cache import LLMResponseCacheEntry
+
+        now = datetime.utcnow()
+        return (
+            update(LLMResponseCacheEntry)
+            .where(
+                LLMResponseCacheEntry.cache_key == key,
+                LLMResponseCacheEntry.expires_at > now,
+            )
+            .values(
+                hit_count=LLMResponseCacheEntry.hit_count + 1,
+                last_accessed_at=now,
+            )
+            .returning(LLMResponseCacheEntry.response)
+        )
+
+    @staticmethod
+    def _upsert_stmt(key: str, value: Dict[str, Any], ttl_seconds: int):
+        from sqlalchemy.dialects.postgresql import insert
+        from backend.models.llm_cache import LLMResponseCacheEntry
+
+        now = datetime.utcnow()
+        stmt = insert(LLMResponseCacheEntry).values(
+            cache_key=key,
+            provider=value.get("provider", ""),
+            model=value.get("model"),
+            response=value,
+            hit_count=0,
+            created_at=now,
+            last_accessed_at=now,
+            expires_at=now + timedelta(seconds=ttl_seconds),
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[LLMResponseCacheEntry.cache_key],
+            set_={
+                "response": stmt.excluded.response,
+                "last_accessed_at": now,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+
+    def _prune_stmts(self):
+        """Delete expired rows, then trim to db_max_rows (least recently used first)."""
+        from sqlalchemy import text
+
+        return [
+            text("DELETE FROM llm_response_cache WHERE expires_at <= now() AT TIME ZONE 'utc'"),
+            text("""
+                DELETE FROM llm_response_cache
+                WHERE cache_key IN (
+                    SELECT cache_key FROM llm_response_cache
+                    ORDER BY last_accessed_at DESC
+                    OFFSET :max_rows
+                )
+            """).bindparams(max_rows=self.db_max_rows),
+        ]
+
+    def _should_prune(self) -> bool:
+        with self._lock:
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= PRUNE_EVERY_N_WRITES:
+                self._writes_since_prune = 0
+                return True
+            return False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response (blocking)."""
+        value = self._memory_get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.db_enabled:
+            try:
+                from backend.database import SessionLocal
+
+                with SessionLocal() as session:
+                    row = session.execute(self._select_stmt(key)).first()
+                    session.commit()
+                if row is not None:
+                    self._count("db_hits")
+                    self._memory_set(key, row[0], self.ttl_seconds)
+                    return copy.deepcopy(row[0])
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"LLM cache DB lookup failed: {e}")
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: Dict[str, Any], ttl_seconds: Optional[int] = None) -> None:
+        """Store a response (blocking)."""
+        ttl_seconds = ttl_seconds or self.ttl_seconds
+        self._memory_set(key, value, ttl_seconds)
+        self._count("writes")
+
+        if self.db_enabled:
+            try:
+                from backend.database import SessionLocal
+
+                with SessionLocal() as session:
+                    session.execute(self._upsert_stmt(key, value, ttl_seconds))
+                    if self._should_prune():
+                        for stmt in self._prune_stmts():
+                            session.execute(stmt)
+                    session.commit()
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"LLM cache DB write failed: {e}")
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response without blocking the event loop."""
+        value = self._memory_get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.db_enabled:
+            try:
+                from backend.database import async_session_maker
+
+                async with async_session_maker() as session:
+                    row = (await session.execute(self._select_stmt(key))).first()
+                    await session.commit()
+                if row is not None:
+                    self._count("db_hits")
+                    self._memory_set(key, row[0], self.ttl_seconds)
+                    return copy.deepcopy(row[0])
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"LLM cache DB lookup failed: {e}")
+
+        self._count("misses")
+        return None
+
+    async def aset(self, key: str, value: Dict[str, Any], ttl_seconds: Optional[int] = None) -> None:
+        """Store a response without blocking the event loop."""
+        ttl_seconds = ttl_seconds or self.ttl_seconds
+        self._memory_set(key, value, ttl_seconds)
+        self._count("writes")
+
+        if self.db_enabled:
+            try:
+                from backend.database import async_session_maker
+
+                async with async_session_maker() as session:
+                    await session.execute(self._upsert_stmt(key, value, ttl_seconds))
+                    if self._should_prune():
+                        for stmt in self._prune_stmts():
+                            await session.execute(stmt)
+                    await session.commit()
+            except Exception as e:
+                self._count("db_errors")
+                logger.warning(f"LLM cache DB write failed: {e}")
+
+    def clear_memory(self) -> None:
+        """Drop the in-process tier (the Postgres tier is left untouched)."""
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["db_enabled"] = self.db_enabled
+        return stats
+
+
+# Global instance
+llm_response_cache = LLMResponseCache()
@@ -1,16 +1,36 @@
 """LLM Gateway Service - Multi-provider LLM integration."""
+import asyncio
 import requests
 import json
 import re
-from typing import Dict, List, Optional, Any
-from openai import OpenAI
-from anthropic import Anthropic
+import httpx
+from typing import AsyncIterator, Dict, List, Optional, Any
+from openai import OpenAI, AsyncOpenAI
+from anthropic import Anthropic, AsyncAnthropic
 
 from backend.config import settings
+from backend.services.llm_cache import llm_response_cache
+from backend.services.embedding_cache import embedding_cache
+
+
+GROK_BASE_URL = "https://api.x.ai/v1"
 
 
 class LLMGateway:
-    """Gateway for multiple LLM providers (Ollama, GROK, Anthropic)."""
+    """Gateway for multiple LLM providers (Ollama, GROK, Anthropic).
+
+    The async API (``agenerate``, ``aembed``, ``agenerate_with_image``) is the
+    primary interface for request handlers: it runs on one shared keep-alive
+    ``httpx.AsyncClient`` per provider and limits concurrent calls per provider,
+    so a slow Ollama generation never blocks the event loop. The sync methods
+    are thin wrappers kept for scripts and sync code paths.
+    """
+
+    # Process-wide connection pools, shared by every LLMGateway instance
+    _http_clients: Dict[str, httpx.AsyncClient] = {}
+    _semaphores: Dict[str, asyncio.Semaphore] = {}
+    _async_sdk_clients: Dict[str, Any] = {}
+    _sync_session: Optional[requests.Session] = None
 
     def __init__(self):
         """Initialize LLM Gateway with API clients."""
@@ -22,13 +42,80 @@ class LLMGateway:
         self._grok_client = None
         self._anthropic_client = None
 
+    # ------------------------------------------------------------------
+    # Connection pools
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _provider_limit(pool: str) -> int:
+        """Maximum number of concurrent requests for a provider pool."""
+        return {
+            "ollama": settings.LLM_OLLAMA_MAX_CONCURRENCY,
+            "ollama_embed": settings.LLM_OLLAMA_EMBED_MAX_CONCURRENCY,
+            "grok": settings.LLM_GROK_MAX_CONCURRENCY,
+            "anthropic": settings.LLM_ANTHROPIC_MAX_CONCURRENCY,
+        }[pool]
+
+    @staticmethod
+    def _provider_timeout(provider: str) -> int:
+        """Default request timeout (seconds) for a provider."""
+        return {
+            "ollama": settings.LLM_OLLAMA_TIMEOUT,
+            "grok": settings.LLM_GROK_TIMEOUT,
+            "anthropic": settings.LLM_ANTHROPIC_TIMEOUT,
+        }[provider]
+
+    def _http_client(self, provider: str) -> httpx.AsyncClient:
+        """Get the shared keep-alive AsyncClient for a provider (created on first use)."""
+        client = self._http_clients.get(provider)
+        if client is None or client.is_closed:
+            limit = self._provider_limit(provider)
+            if provider == "ollama":
+                # Generation and embedding requests share the Ollama pool
+                limit += settings.LLM_OLLAMA_EMBED_MAX_CONCURRENCY
+            client = httpx.AsyncClient(
+                base_url=self.ollama_base_url if provider == "ollama" else "",
+                timeout=httpx.Timeout(self._provider_timeout(provider), connect=settings.LLM_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=limit,
+                    max_keepalive_connections=limit,
+                    keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+                ),
+            )
+            LLMGateway._http_clients[provider] = client
+        return client
+
+    def _semaphore(self, pool: str) -> asyncio.Semaphore:
+        """Get the concurrency limiter for a provider pool."""
+        semaphore = self._semaphores.get(pool)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._provider_limit(pool))
+            LLMGateway._semaphores[pool] = semaphore
+        return semaphore
+
+    @property
+    def sync_session(self) -> requests.Session:
+        """Shared keep-alive session for the sync Ollama wrappers."""
+        if LLMGateway._sync_session is None:
+            LLMGateway._sync_session = requests.Session()
+        return LLMGateway._sync_session
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close all shared async connection pools (called on app shutdown)."""
+        for client in cls._http_clients.values():
+            await client.aclose()
+        cls._http_clients.clear()
+        cls._async_sdk_clients.clear()
+        cls._semaphores.clear()
+
     @property
     def grok_client(self) -> OpenAI:
         """Lazy-load GROK client."""
         if self._grok_client is None and self.grok_api_key:
             self._grok_client = OpenAI(
                 api_key=self.grok_api_key,
-                base_url="https://api.x.ai/v1"
+                base_url=GROK_BASE_URL
             )
         return self._grok_client
 
@@ -39,17 +126,179 @@ class LLMGateway:
             self._anthropic_client = Anthropic(api_key=self.anthropic_api_key)
         return self._anthropic_client
 
-    def generate(
+    @property
+    def async_grok_client(self) -> AsyncOpenAI:
+        """Lazy-load async GROK client on the shared GROK connection pool."""
+        if "grok" not in self._async_sdk_clients and self.grok_api_key:
+            LLMGateway._async_sdk_clients["grok"] = AsyncOpenAI(
+                api_key=self.grok_api_key,
+                base_url=GROK_BASE_URL,
+                http_client=self._http_client("grok"),
+            )
+        return self._async_sdk_clients.get("grok")
+
+    @property
+    def async_anthropic_client(self) -> AsyncAnthropic:
+        """Lazy-load async Anthropic client on the shared Anthropic connection pool."""
+        if "anthropic" not in self._async_sdk_clients and self.anthropic_api_key:
+            LLMGateway._async_sdk_clients["anthropic"] = AsyncAnthropic(
+                api_key=self.anthropic_api_key,
+                http_client=self._http_client("anthropic"),
+            )
+        return self._async_sdk_clients.get("anthropic")
+
+    def _check_grok(self) -> None:
+        """Raise a helpful error if GROK is not configured."""
+        if not self.grok_api_key or self.grok_api_key.strip() == "":
+            raise ValueError("GROK API key not configured. Please set GROK_API_KEY environment variable or use 'ollama' provider for local LLM.")
+
+    def _check_anthropic(self) -> None:
+        """Raise a helpful error if Anthropic is not configured."""
+        if not self.anthropic_api_key or self.anthropic_api_key.strip() == "":
+            raise ValueError("Anthropic API key not configured. Please set ANTHROPIC_API_KEY environment variable or use 'ollama' provider for local LLM.")
+
+    @staticmethod
+    def _default_model(provider: str) -> str:
+        """Default text model for a provider."""
+        return {
+            "ollama": settings.OLLAMA_MODEL,  # Use configured model (llama3.2:3b on Railway)
+            "grok": "grok-4-1-fast",  # Fast model for cost reduction (was grok-3, grok-beta, grok-2-latest)
+            "anthropic": "claude-3-5-sonnet-20241022",
+        }[provider]
+
+    @staticmethod
+    def _cache_key(
+        prompt: str,
+        provider: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        seed: Optional[int],
+        cache: Optional[bool],
+    ) -> Optional[str]:
+        """
+        Response cache key for a generate call, or None if the call is not cached.
+
+        ``cache=None`` caches deterministic calls only (temperature 0 or fixed seed);
+        ``cache=True``/``False`` forces caching on or off for this call.
+        """
+        if not settings.LLM_CACHE_ENABLED:
+            return None
+        if cache is None:
+            cache = temperature == 0 or seed is not None
+        if not cache:
+            return None
+        return llm_response_cache.make_key(prompt, provider, model, temperature, max_tokens, seed)
+
+    # ------------------------------------------------------------------
+    # Request / response mapping (shared by sync and async paths)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _ollama_payload(
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        images: Optional[List[str]] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Build an Ollama /api/generate request body."""
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens
+            }
+        }
+        if images:
+            payload["images"] = images
+        if seed is not None:
+            payload["options"]["seed"] = seed
+        return payload
+
+    @staticmethod
+    def _ollama_result(response_json: Dict[str, Any], model: str, text_key: str = "response") -> Dict[str, Any]:
+        """Map an Ollama /api/generate response to the gateway result format."""
+        text = response_json.get("response", response_json.get("text", str(response_json)))
+        return {
+            text_key: text,
+            "provider": "ollama",
+            "model": model,
+            "usage": {
+                "prompt_tokens": response_json.get("prompt_eval_count", 0),
+                "completion_tokens": response_json.get("eval_count", 0),
+                "total_tokens": response_json.get("prompt_eval_count", 0) + response_json.get("eval_count", 0),
+            }
+        }
+
+    @staticmethod
+    def _openai_result(completion: Any, provider: str, model: str, text_key: str = "response") -> Dict[str, Any]:
+        """Map an OpenAI-compatible completion (GROK) to the gateway result format."""
+        return {
+            text_key: completion.choices[0].message.content,
+            "provider": provider,
+            "model": model,
+            "usage": {
+                "prompt_tokens": completion.usage.prompt_tokens,
+                "completion_tokens": completion.usage.completion_tokens,
+                "total_tokens": completion.usage.total_tokens,
+            }
+        }
+
+    @staticmethod
+    def _anthropic_result(message: Any, model: str) -> Dict[str, Any]:
+        """Map an Anthropic message to the gateway result format."""
+        return {
+            "response": message.content[0].text,
+            "provider": "anthropic",
+            "model": model,
+            "usage": {
+                "prompt_tokens": message.usage.input_tokens,
+                "completion_tokens": message.usage.output_tokens,
+                "total_tokens": message.usage.input_tokens + message.usage.output_tokens,
+            }
+        }
+
+    @staticmethod
+    def _vision_image_b64(image_data: str) -> str:
+        """Extract base64 payload from a data URI."""
+        if image_data.startswith('data:'):
+            return image_data.split(',')[1]
+        return image_data
+
+    @staticmethod
+    def _vision_messages(prompt: str, image_data: str) -> List[Dict[str, Any]]:
+        """Build an OpenAI-compatible vision message list."""
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {"type": "image_url", "image_url": {"url": image_data}}
+                ]
+            }
+        ]
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+
+    async def agenerate(
         self,
         prompt: str,
         provider: str = "ollama",
         model: Optional[str] = None,
         temperature: float = 0.3,
         max_tokens: int = 2000,
-        timeout: int = 120,
+        timeout: Optional[int] = None,
+        seed: Optional[int] = None,
+        cache: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
-        Generate text using specified LLM provider.
+        Generate text using specified LLM provider without blocking the event loop.
 
         Args:
             prompt: Text prompt for the LLM
@@ -57,135 +306,387 @@ class LLMGateway:
             model: Model name (provider-specific)
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens to generate
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds (default: provider timeout from settings)
+            seed: Optional sampling seed (Ollama, GROK)
+            cache: Force (True) or skip (False) the response cache;
+                None caches deterministic calls (temperature 0 or fixed seed)
 
         Returns:
             Dict with response, model, provider, usage info
         """
         provider = provider.lower()
+        if provider not in ("ollama", "grok", "anthropic"):
+            raise ValueError(f"Unsupported provider: {provider}")
+        model = model or self._default_model(provider)
+        timeout = timeout or self._provider_timeout(provider)
+
+        cache_key = self._cache_key(prompt, provider, model, temperature, max_tokens, seed, cache)
+        if cache_key:
+            cached = await llm_response_cache.aget(cache_key)
+            if cached is not None:
+                return cached
+
+        async with self._semaphore(provider):
+            if provider == "ollama":
+                response = await self._http_client("ollama").post(
+                    "/api/generate",
+                    json=self._ollama_payload(prompt, model, temperature, max_tokens, seed=seed),
+                    timeout=httpx.Timeout(timeout, connect=settings.LLM_CONNECT_TIMEOUT),
+                )
+                if response.status_code != 200:
+                    raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+                result = self._ollama_result(response.json(), model)
+
+            elif provider == "grok":
+                self._check_grok()
+                completion = await self.async_grok_client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=timeout,
+                    **({"seed": seed} if seed is not None else {}),
+                )
+                result = self._openai_result(completion, "grok", model)
+
+            else:
+                self._check_anthropic()
+                message = await self.async_anthropic_client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    messages=[{"role": "user", "content": prompt}],
+                    timeout=timeout,
+                )
+                result = self._anthropic_result(message, model)
+
+        if cache_key:
+            await llm_response_cache.aset(cache_key, result)
+        return result
+
+    async def astream(
+        self,
+        prompt: Optional[str] = None,
+        provider: str = "ollama",
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        timeout: Optional[int] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text token by token.
 
-        if provider == "ollama":
-            return self._generate_ollama(prompt, model, temperature, max_tokens, timeout)
-        elif provider == "grok":
-            return self._generate_grok(prompt, model, temperature, max_tokens, timeout)
-        elif provider == "anthropic":
-            return self._generate_anthropic(prompt, model, temperature, max_tokens, timeout)
-        else:
+        Args:
+            prompt: Text prompt for the LLM (ignored if messages is given)
+            provider: "ollama", "grok", or "anthropic"
+            model: Model name (provider-specific)
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            timeout: Read timeout in seconds between chunks (default: provider timeout from settings)
+            messages: Chat messages ({"role", "content"}), may include a system message
+
+        Yields:
+            Text deltas as they arrive from the provider
+        """
+        provider = provider.lower()
+        if provider not in ("ollama", "grok", "anthropic"):
             raise ValueError(f"Unsupported provider: {provider}")
+        timeout = timeout or self._provider_timeout(provider)
+        model = model or self._default_model(provider)
+        messages = messages or [{"role": "user", "content": prompt}]
+
+        async with self._semaphore(provider):
+            if provider == "ollama":
+                async with self._http_client("ollama").stream(
+                    "POST",
+                    "/api/chat",
+                    json={
+                        "model": model,
+                        "messages": messages,
+                        "stream": True,
+                        "options": {
+                            "temperature": temperature,
+                            "num_predict": max_tokens
+                        }
+                    },
+                    timeout=httpx.Timeout(timeout, connect=settings.LLM_CONNECT_TIMEOUT),
+                ) as response:
+                    if response.status_code != 200:
+                        body = await response.aread()
+                        raise Exception(f"Ollama API error: {response.status_code} - {body.decode(errors='replace')}")
+                    # Ollama streams newline-delimited JSON objects
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        if chunk.get("error"):
+                            raise Exception(f"Ollama API error: {chunk['error']}")
+                        text = chunk.get("message", {}).get("content", "")
+                        if text:
+                            yield text
+                        if chunk.get("done"):
+                            break
+                return
+
+            if provider == "grok":
+                self._check_grok()
+                stream = await self.async_grok_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=timeout,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+                return
+
+            self._check_anthropic()
+            # Anthropic takes the system prompt as a separate parameter
+            system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+            kwargs = {"system": system} if system else {}
+            stream = await self.async_anthropic_client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[m for m in messages if m["role"] != "system"],
+                timeout=timeout,
+                stream=True,
+                **kwargs,
+            )
+            async for event in stream:
+                if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                    yield event.delta.text
 
-    def _generate_ollama(
+    async def agenerate_with_image(
         self,
         prompt: str,
-        model: Optional[str],
-        temperature: float,
-        max_tokens: int,
-        timeout: int,
+        image_data: str,
+        provider: str = "ollama",
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        timeout: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """Generate text using Ollama."""
-        model = model or settings.OLLAMA_MODEL  # Use configured model (llama3.2:3b on Railway)
+        """
+        Generate text using image input (OCR/Vision) without blocking the event loop.
 
-        response = requests.post(
-            f"{self.ollama_base_url}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
-            },
-            timeout=timeout
-        )
+        Args:
+            prompt: Text prompt for the LLM
+            image_data: Base64 encoded image data URI (data:image/jpeg;base64,...)
+            provider: "ollama" or "grok"
+            model: Model name (provider-specific)
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            timeout: Request timeout in seconds (default: provider timeout from settings)
 
-        if response.status_code != 200:
-            raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+        Returns:
+            Dict with "text", "model", "provider", "usage" info
+        """
+        provider = provider.lower()
+        if provider not in ("ollama", "grok"):
+            raise ValueError(f"Unsupported provider for vision: {provider}")
+        timeout = timeout or self._provider_timeout(provider)
+
+        async with self._semaphore(provider):
+            if provider == "ollama":
+                model = model or "llama3.2-vision"
+                response = await self._http_client("ollama").post(
+                    "/api/generate",
+                    json=self._ollama_payload(
+                        prompt, model, temperature, max_tokens,
+                        images=[self._vision_image_b64(image_data)],
+                    ),
+                    timeout=httpx.Timeout(timeout, connect=settings.LLM_CONNECT_TIMEOUT),
+                )
+                if response.status_code != 200:
+                    raise Exception(f"Ollama Vision API error: {response.status_code} - {response.text}")
+                return self._ollama_result(response.json(), model, text_key="text")
+
+            self._check_grok()
+            model = model or "grok-vision-beta"
+            completion = await self.async_grok_client.chat.completions.create(
+                model=model,
+                messages=self._vision_messages(prompt, image_data),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout,
+            )
+            return self._openai_result(completion, "grok", model, text_key="text")
 
-        response_json = response.json()
-        text = response_json.get("response", response_json.get("text", str(response_json)))
+    async def aembed(self, text: str, model: Optional[str] = None) -> List[float]:
+        """
+        Generate embeddings for text (using Ollama) without blocking the event loop.
 
-        return {
-            "response": text,
-            "provider": "ollama",
-            "model": model,
-            "usage": {
-                "prompt_tokens": response_json.get("prompt_eval_count", 0),
-                "completion_tokens": response_json.get("eval_count", 0),
-                "total_tokens": response_json.get("prompt_eval_count", 0) + response_json.get("eval_count", 0),
-            }
-        }
+        Args:
+            text: Text to embed
+            model: Embedding model name (default: nomic-embed-text)
 
-    def _generate_grok(
-        self,
-        prompt: str,
-        model: Optional[str],
-        temperature: float,
-        max_tokens: int,
-        timeout: int,
-    ) -> Dict[str, Any]:
-        """Generate text using GROK."""
-        if not self.grok_api_key or self.grok_api_key.strip() == "":
-            raise ValueError("GROK API key not configured. Please set GROK_API_KEY environment variable or use 'ollama' provider for local LLM.")
+        Returns:
+            List of floats representing the embedding
+        """
+        model = model or "nomic-embed-text"
 
-        if not self.grok_client:
-            raise ValueError("GROK client failed to initialize. Please check your GROK_API_KEY.")
+        if settings.EMBEDDING_CACHE_ENABLED:
+            cached = (await embedding_cache.aget_many([text], model))[0]
+            if cached is not None:
+                return cached.tolist()
 
-        model = model or "grok-4-1-fast"  # Fast model for cost reduction (was grok-3, grok-beta, grok-2-latest)
+        async with self._semaphore("ollama_embed"):
+            response = await self._http_client("ollama").post(
+                "/api/embeddings",
+                json={"model": model, "prompt": text},
+                timeout=httpx.Timeout(30, connect=settings.LLM_CONNECT_TIMEOUT),
+            )
 
-        completion = self.grok_client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=temperature,
-            max_tokens=max_tokens,
-            timeout=timeout,
-        )
+        if response.status_code != 200:
+            raise Exception(f"Ollama embeddings error: {response.status_code} - {response.text}")
 
-        return {
-            "response": completion.choices[0].message.content,
-            "provider": "grok",
-            "model": model,
-            "usage": {
-                "prompt_tokens": completion.usage.prompt_tokens,
-                "completion_tokens": completion.usage.completion_tokens,
-                "total_tokens": completion.usage.total_tokens,
-            }
-        }
+        embedding = response.json().get("embedding", [])
+        if embedding and settings.EMBEDDING_CACHE_ENABLED:
+            await embedding_cache.aput_many([text], [embedding], model)
+        return embedding
+
+    async def aembed_many(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        """
+        Embed many texts with Ollama's batched ``/api/embed`` endpoint.
+
+        Cached texts are skipped; the rest is sent EMBEDDING_BATCH_SIZE texts
+        per request instead of one request per text. ``/api/embed`` returns
+        L2-normalised vectors and ``/api/embeddings`` (``aembed``) does not, so
+        the two are cached under different keys.
 
-    def _generate_anthropic(
+        Args:
+            texts: Texts to embed
+            model: Embedding model name (default: nomic-embed-text)
+
+        Returns:
+            One embedding per input text, in order
+        """
+        model = model or "nomic-embed-text"
+        if not texts:
+            return []
+        cache_model = f"{model}@/api/embed"
+
+        cached = [None] * len(texts)
+        if settings.EMBEDDING_CACHE_ENABLED:
+            cached = await embedding_cache.aget_many(texts, cache_model)
+        missing = list(dict.fromkeys(texts[idx] for idx, vector in enumerate(cached) if vector is None))
+
+        encoded: Dict[str, List[float]] = {}
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            async with self._semaphore("ollama_embed"):
+                response = await self._http_client("ollama").post(
+                    "/api/embed",
+                    json={"model": model, "input": batch},
+                    timeout=httpx.Timeout(120, connect=settings.LLM_CONNECT_TIMEOUT),
+                )
+            if response.status_code != 200:
+                raise Exception(f"Ollama embed error: {response.status_code} - {response.text}")
+
+            embeddings = response.json().get("embeddings", [])
+            if len(embeddings) != len(batch):
+                raise Exception(f"Ollama embed returned {len(embeddings)} vectors for {len(batch)} texts")
+            encoded.update(zip(batch, embeddings))
+            if settings.EMBEDDING_CACHE_ENABLED:
+                await embedding_cache.aput_many(batch, embeddings, cache_model)
+
+        return [
+            cached[idx].tolist() if cached[idx] is not None else encoded[text]
+            for idx, text in enumerate(texts)
+        ]
+
+    # ------------------------------------------------------------------
+    # Sync API (thin wrappers for scripts and sync code paths)
+    # ------------------------------------------------------------------
+
+    def generate(
         self,
         prompt: str,
-        model: Optional[str],
-        temperature: float,
-        max_tokens: int,
-        timeout: int,
+        provider: str = "ollama",
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        timeout: Optional[int] = None,
+        seed: Optional[int] = None,
+        cache: Optional[bool] = None,
     ) -> Dict[str, Any]:
-        """Generate text using Anthropic Claude."""
-        if not self.anthropic_api_key or self.anthropic_api_key.strip() == "":
-            raise ValueError("Anthropic API key not configured. Please set ANTHROPIC_API_KEY environment variable or use 'ollama' provider for local LLM.")
+        """
+        Generate text using specified LLM provider (blocking).
 
-        if not self.anthropic_client:
-            raise ValueError("Anthropic client failed to initialize. Please check your ANTHROPIC_API_KEY.")
+        Prefer ``agenerate`` inside ``async def`` code.
 
-        model = model or "claude-3-5-sonnet-20241022"
+        Args:
+            prompt: Text prompt for the LLM
+            provider: "ollama", "grok", or "anthropic"
+            model: Model name (provider-specific)
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            timeout: Request timeout in seconds (default: provider timeout from settings)
+            seed: Optional sampling seed (Ollama, GROK)
+            cache: Force (True) or skip (False) the response cache;
+                None caches deterministic calls (temperature 0 or fixed seed)
 
-        message = self.anthropic_client.messages.create(
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            messages=[{"role": "user", "content": prompt}],
-            timeout=timeout,
-        )
+        Returns:
+            Dict with response, model, provider, usage info
+        """
+        provider = provider.lower()
+        if provider not in ("ollama", "grok", "anthropic"):
+            raise ValueError(f"Unsupported provider: {provider}")
+        model = model or self._default_model(provider)
+        timeout = timeout or self._provider_timeout(provider)
 
-        return {
-            "response": message.content[0].text,
-            "provider": "anthropic",
-            "model": model,
-            "usage": {
-                "prompt_tokens": message.usage.input_tokens,
-                "completion_tokens": message.usage.output_tokens,
-                "total_tokens": message.usage.input_tokens + message.usage.output_tokens,
-            }
-        }
+        cache_key = self._cache_key(prompt, provider, model, temperature, max_tokens, seed, cache)
+        if cache_key:
+            cached = llm_response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if provider == "ollama":
+            response = self.sync_session.post(
+                f"{self.ollama_base_url}/api/generate",
+                json=self._ollama_payload(prompt, model, temperature, max_tokens, seed=seed),
+                timeout=timeout,
+            )
+            if response.status_code != 200:
+                raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+            result = self._ollama_result(response.json(), model)
+
+        elif provider == "grok":
+            self._check_grok()
+            if not self.grok_client:
+                raise ValueError("GROK client failed to initialize. Please check your GROK_API_KEY.")
+            completion = self.grok_client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout,
+                **({"seed": seed} if seed is not None else {}),
+            )
+            result = self._openai_result(completion, "grok", model)
+
+        else:
+            self._check_anthropic()
+            if not self.anthropic_client:
+                raise ValueError("Anthropic client failed to initialize. Please check your ANTHROPIC_API_KEY.")
+            message = self.anthropic_client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=timeout,
+            )
+            result = self._anthropic_result(message, model)
+
+        if cache_key:
+            llm_response_cache.set(cache_key, result)
+        return result
 
     def list_models(self, provider: Optional[str] = None) -> List[Dict[str, str]]:
         """
@@ -253,6 +754,7 @@ class LLMGateway:
 
         return models
 
+
     def generate_with_image(
         self,
         prompt: str,
@@ -261,10 +763,12 @@ class LLMGateway:
         model: Optional[str] = None,
         temperature: float = 0.3,
         max_tokens: int = 2000,
-        timeout: int = 120,
+        timeout: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
-        Generate text using image input (OCR/Vision).
+        Generate text using image input (OCR/Vision), blocking.
+
+        Prefer ``agenerate_with_image`` inside ``async def`` code.
 
         Args:
             prompt: Text prompt for the LLM
@@ -273,7 +777,7 @@ class LLMGateway:
             model: Model name (provider-specific)
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens to generate
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds (default: provider timeout from settings)
 
         Returns:
             Dict with "text", "model", "provider", "usage" info
@@ -281,112 +785,44 @@ class LLMGateway:
         provider = provider.lower()
 
         if provider == "ollama":
-            return self._generate_ollama_vision(prompt, image_data, model, temperature, max_tokens, timeout)
+            # Use llama3.2-vision or similar vision-capable model
+            model = model or "llama3.2-vision"
+            response = self.sync_session.post(
+                f"{self.ollama_base_url}/api/generate",
+                json=self._ollama_payload(
+                    prompt, model, temperature, max_tokens,
+                    images=[self._vision_image_b64(image_data)],
+                ),
+                timeout=timeout or settings.LLM_OLLAMA_TIMEOUT,
+            )
+            if response.status_code != 200:
+                raise Exception(f"Ollama Vision API error: {response.status_code} - {response.text}")
+            return self._ollama_result(response.json(), model, text_key="text")
+
         elif provider == "grok":
-            return self._generate_grok_vision(prompt, image_data, model, temperature, max_tokens, timeout)
-        else:
-            raise ValueError(f"Unsupported provider for vision: {provider}")
+            if not self.grok_api_key or self.grok_api_key.strip() == "":
+                raise ValueError("GROK API key not configured.")
+            if not self.grok_client:
+                raise ValueError("GROK client failed to initialize.")
+            model = model or "grok-vision-beta"
+            # GROK uses OpenAI-compatible vision API
+            completion = self.grok_client.chat.completions.create(
+                model=model,
+                messages=self._vision_messages(prompt, image_data),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout or settings.LLM_GROK_TIMEOUT,
+            )
+            return self._openai_result(completion, "grok", model, text_key="text")
 
-    def _generate_ollama_vision(
-        self,
-        prompt: str,
-        image_data: str,
-        model: Optional[str],
-        temperature: float,
-        max_tokens: int,
-        timeout: int,
-    ) -> Dict[str, Any]:
-        """Generate text from image using Ollama vision model."""
-        # Extract base64 from data URI
-        if image_data.startswith('data:'):
-            image_b64 = image_data.split(',')[1]
         else:
-            image_b64 = image_data
-
-        # Use llama3.2-vision or similar vision-capable model
-        model = model or "llama3.2-vision"
-
-        response = requests.post(
-            f"{self.ollama_base_url}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "images": [image_b64],
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
-            },
-            timeout=timeout
-        )
-
-        if response.status_code != 200:
-            raise Exception(f"Ollama Vision API error: {response.status_code} - {response.text}")
-
-        response_json = response.json()
-        text = response_json.get("response", response_json.get("text", str(response_json)))
-
-        return {
-            "text": text,
-            "provider": "ollama",
-            "model": model,
-            "usage": {
-                "prompt_tokens": response_json.get("prompt_eval_count", 0),
-                "completion_tokens": response_json.get("eval_count", 0),
-                "total_tokens": response_json.get("prompt_eval_count", 0) + response_json.get("eval_count", 0),
-            }
-        }
-
-    def _generate_grok_vision(
-        self,
-        prompt: str,
-        image_data: str,
-        model: Optional[str],
-        temperature: float,
-        max_tokens: int,
-        timeout: int,
-    ) -> Dict[str, Any]:
-        """Generate text from image using GROK vision model."""
-        if not self.grok_api_key or self.grok_api_key.strip() == "":
-            raise ValueError("GROK API key not configured.")
-
-        if not self.grok_client:
-            raise ValueError("GROK client failed to initialize.")
-
-        model = model or "grok-vision-beta"
-
-        # GROK uses OpenAI-compatible vision API
-        completion = self.grok_client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {"type": "image_url", "image_url": {"url": image_data}}
-                    ]
-                }
-            ],
-            temperature=temperature,
-            max_tokens=max_tokens,
-            timeout=timeout,
-        )
-
-        return {
-            "text": completion.choices[0].message.content,
-            "provider": "grok",
-            "model": model,
-            "usage": {
-                "prompt_tokens": completion.usage.prompt_tokens,
-                "completion_tokens": completion.usage.completion_tokens,
-                "total_tokens": completion.usage.total_tokens,
-            }
-        }
+            raise ValueError(f"Unsupported provider for vision: {provider}")
 
     def embed(self, text: str, model: Optional[str] = None) -> List[float]:
         """
-        Generate embeddings for text (using Ollama).
+        Generate embeddings for text (using Ollama), blocking.
+
+        Prefer ``aembed`` inside ``async def`` code.
 
         Args:
             text: Text to embed
@@ -397,7 +833,12 @@ class LLMGateway:
         """
         model = model or "nomic-embed-text"
 
-        response = requests.post(
+        if settings.EMBEDDING_CACHE_ENABLED:
+            cached = embedding_cache.get_many([text], model)[0]
+            if cached is not None:
+                return cached.tolist()
+
+        response = self.sync_session.post(
             f"{self.ollama_base_url}/api/embeddings",
             json={
                 "model": model,
@@ -409,7 +850,10 @@ class LLMGateway:
         if response.status_code != 200:
             raise Exception(f"Ollama embeddings error: {response.status_code} - {response.text}")
 
-        return response.json().get("embedding", [])
+        embedding = response.json().get("embedding", [])
+        if embedding and settings.EMBEDDING_CACHE_ENABLED:
+            embedding_cache.put_many([text], [embedding], model)
+        return embedding
 
     @staticmethod
     def parse_json_response(text: str) -> dict:
@@ -6,7 +6,9 @@ import httpx
 import json
 import os
 from typing import Dict, Optional
+from backend.config import settings as app_settings
 from backend.models.bar import BarSettings
+from backend.services.llm_cache import llm_response_cache
 from sqlalchemy.orm import Session
 
 
@@ -69,6 +71,17 @@ Important:
 - Maintain the essence and style of the dish name
 - Return ONLY the JSON object, no explanations"""
 
+        # Same dish names are translated over and over - cache by prompt + model
+        model = 'grok-4-1-fast' if llm_provider == 'grok' else (settings.ollama_model or 'llama3.2:3b')
+        cache_key = None
+        if app_settings.LLM_CACHE_ENABLED:
+            cache_key = llm_response_cache.make_key(
+                prompt, llm_provider, model, temperature=None, max_tokens=None, response_format='json'
+            )
+            cached = await llm_response_cache.aget(cache_key)
+            if cached is not None:
+                return cached['translations']
+
         try:
             if llm_provider == 'grok':
                 # Use environment variable GROK_API_KEY or fall back to database setting
@@ -80,9 +93,15 @@ Important:
             else:
                 translations = await LLMTranslationService._translate_with_ollama(
                     prompt,
-                    settings.ollama_model or 'llama3.2:3b'
+                    model
                 )
 
+            if cache_key is not None:
+                await llm_response_cache.aset(cache_key, {
+                    'provider': llm_provider,
+                    'model': model,
+                    'translations': translations
+                })
             return translations
 
         except Exception as e:
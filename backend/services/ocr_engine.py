@@ -0,0 +1,361 @@
+"""OCR Engine - Tesseract in a dedicated process pool.
+
+Tesseract, OpenCV rotation correction and pdf2image rasterisation are CPU-bound
+and block for seconds per page, so they never run on the event loop. Jobs are
+executed by a ``ProcessPoolExecutor`` sized to the CPU cores:
+
+- at most ``max_workers`` jobs are handed to the pool at a time; further jobs
+  wait in a bounded queue and are rejected with ``OcrQueueFullError`` once
+  ``OCR_MAX_QUEUE`` are waiting
+- each job has a timeout (``OCR_JOB_TIMEOUT``); a caller that times out or is
+  cancelled stops waiting immediately, its worker slot is reused as soon as the
+  process is actually free again
+- multi-page PDFs are rasterised and OCR'd page by page in parallel, each
+  worker rasterising only its own page
+
+Job functions are module-level so they can be pickled into worker processes.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_LANGS = "deu+eng+spa+fra+ita"
+
+
+class OcrQueueFullError(RuntimeError):
+    """Raised when the OCR queue is full (back-pressure for upload endpoints)."""
+
+
+class OcrTimeoutError(TimeoutError):
+    """Raised when an OCR job exceeds its timeout."""
+
+
+# ----------------------------------------------------------------------
+# Worker-side jobs (run inside pool processes)
+# ----------------------------------------------------------------------
+
+def _tesseract_job(file_data: bytes, file_path: Optional[str], correct_rotation: bool) -> Tuple[str, Dict[str, Any]]:
+    """Full Tesseract OCR of one image, optionally with rotation correction -> (text, info)."""
+    from backend.services.application_service import ocr_image_tesseract_with_info
+
+    if not correct_rotation:
+        return ocr_image_tesseract_with_info(file_data, None)
+    if file_path:
+        return ocr_image_tesseract_with_info(file_data, file_path)
+
+    # Rotation correction reads from disk (cv2.imread)
+    with tempfile.NamedTemporaryFile(suffix=".img") as tmp:
+        tmp.write(file_data)
+        tmp.flush()
+        return ocr_image_tesseract_with_info(file_data, tmp.name)
+
+
+def _correct_image_job(image_path: str, corrected_path: str, preview_lang: str) -> Dict[str, Any]:
+    """Rotation/deskew correction, corrected image written to disk, short OCR preview."""
+    import cv2
+    from backend.services.application_service import correct_orientation
+
+    corrected, original_quality, processed_quality, orientation = correct_orientation(image_path)
+    cv2.imwrite(corrected_path, corrected)
+    _, buffer = cv2.imencode(".jpg", corrected)
+
+    preview = ""
+    try:
+        import pytesseract
+        from PIL import Image
+
+        pil_img = Image.fromarray(cv2.cvtColor(corrected, cv2.COLOR_BGR2RGB))
+        preview = pytesseract.image_to_string(pil_img, lang=preview_lang, config="--psm 1") or ""
+    except Exception as e:
+        logger.warning(f"OCR preview failed for {image_path}: {e}")
+
+    return {
+        "jpeg": buffer.tobytes(),
+        "original_quality": original_quality,
+        "processed_quality": processed_quality,
+        "ocr_preview": preview[:200].strip(),
+        "orientation": orientation,
+    }
+
+
+def _rasterise_page(pdf_path: str, page_number: int, dpi: int):
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number)
+    return images[0] if images else None
+
+
+def _pdf_page_ocr_job(pdf_path: str, page_number: int, dpi: int, lang: Optional[str]) -> Dict[str, Any]:
+    """
+    Rasterise and OCR a single PDF page; without ``lang`` the language pre-pass
+    picks the packs (all European languages if detection is off or unsure).
+    """
+    from backend.config import settings
+    from backend.services.application_service import EUROPEAN_LANGS
+    from backend.services.ocr_language import detect_page_languages, image_to_string
+
+    start = time.perf_counter()
+    image = _rasterise_page(pdf_path, page_number, dpi)
+    if image is None:
+        return {"text": "", "languages": None, "seconds": round(time.perf_counter() - start, 3)}
+
+    if lang is None:
+        detected = None
+        if settings.OCR_LANGUAGE_DETECTION:
+            detected, _ = detect_page_languages(image)
+        lang = detected or EUROPEAN_LANGS
+
+    text = image_to_string(image, lang=lang)
+    return {"text": text, "languages": lang, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def _pdf_page_preview_job(
+    pdf_path: str,
+    page_number: int,
+    dpi: int,
+    page_path: str,
+    corrected_path: Optional[str],
+    preview_lang: str,
+) -> Dict[str, Any]:
+    """Rasterise a single PDF page to ``page_path`` and (optionally) rotation-correct it."""
+    image = _rasterise_page(pdf_path, page_number, dpi)
+    if image is None:
+        raise ValueError(f"Page {page_number} could not be rasterised")
+    image.save(page_path, "JPEG", quality=95)
+
+    if corrected_path is None:
+        return {}
+    return _correct_image_job(page_path, corrected_path, preview_lang)
+
+
+# ----------------------------------------------------------------------
+# Engine (event-loop side)
+# ----------------------------------------------------------------------
+
+class OcrEngine:
+    """Bounded, timeout-aware front end for the OCR process pool."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        job_timeout: Optional[float] = None,
+    ):
+        self.max_workers = max_workers or settings.OCR_WORKERS or os.cpu_count() or 1
+        self.max_queue = max_queue if max_queue is not None else settings.OCR_MAX_QUEUE
+        self.job_timeout = job_timeout or settings.OCR_JOB_TIMEOUT
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # One slot per worker process: jobs only reach the pool when a process is free,
+        # so everything waiting is in our queue and can be dropped on cancellation
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._queued = 0
+        self._running = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "rejected": 0,
+            "busy_seconds": 0.0,
+        }
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Lazy-create the worker pool (spawn: the server process holds threads and sockets)."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"OCR worker pool started ({self.max_workers} processes)")
+        return self._pool
+
+    def _reset_pool(self) -> None:
+        """Discard a broken pool (a worker died); the next job starts a fresh one."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        logger.error("OCR worker pool broken - restarting on next job")
+
+    def _job_finished(self, loop: asyncio.AbstractEventLoop, started: float) -> None:
+        """Runs when the worker is really done (also after a timeout) - frees its slot."""
+        def release():
+            self._running -= 1
+            self._stats["busy_seconds"] += time.perf_counter() - started
+            self._slots.release()
+
+        try:
+            loop.call_soon_threadsafe(release)
+        except RuntimeError:
+            # Event loop already closed (shutdown)
+            pass
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run a picklable job in the OCR pool.
+
+        Args:
+            fn: Module-level job function
+            *args: Picklable arguments
+            timeout: Seconds the job may run (default: OCR_JOB_TIMEOUT)
+
+        Raises:
+            OcrQueueFullError: Too many jobs already waiting
+            OcrTimeoutError: Job did not finish in time
+        """
+        if self._slots.locked() and self._queued >= self.max_queue:
+            self._stats["rejected"] += 1
+            raise OcrQueueFullError(f"OCR queue full ({self._queued} jobs waiting)")
+
+        self._queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._reset_pool()
+            raise
+        except BaseException:
+            self._slots.release()
+            raise
+
+        self._running += 1
+        self._stats["submitted"] += 1
+        future.add_done_callback(lambda _: self._job_finished(loop, started))
+
+        timeout = timeout or self.job_timeout
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # A running process cannot be interrupted; it finishes in the background
+            # and the result is discarded
+            future.cancel()
+            self._stats["timed_out"] += 1
+            raise OcrTimeoutError(f"OCR job {fn.__name__} exceeded {timeout:g}s")
+        except asyncio.CancelledError:
+            future.cancel()
+            self._stats["cancelled"] += 1
+            raise
+        except BrokenProcessPool:
+            self._stats["failed"] += 1
+            self._reset_pool()
+            raise
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+
+        self._stats["completed"] += 1
+        return result
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    async def ocr_image(self, file_data: bytes, file_path: Optional[str] = None,
+                        correct_rotation: bool = True) -> str:
+        """Tesseract OCR of one image (same output format as DocumentParser._parse_image_tesseract)."""
+        text, _ = await self.ocr_image_with_info(file_data, file_path, correct_rotation)
+        return text
+
+    async def ocr_image_with_info(self, file_data: bytes, file_path: Optional[str] = None,
+                                  correct_rotation: bool = True) -> Tuple[str, Dict[str, Any]]:
+        """Like ocr_image, plus OCR metadata (languages, orientation, timings)."""
+        return await self.run(_tesseract_job, file_data, file_path, correct_rotation)
+
+    async def correct_image(self, image_path: str, corrected_path: str,
+                            preview_lang: str = PREVIEW_LANGS) -> Dict[str, Any]:
+        """
+        Rotation/deskew correction for upload previews.
+
+        Returns:
+            Dict with jpeg (corrected image bytes), original_quality,
+            processed_quality, ocr_preview (first 200 chars) and orientation
+            (detection path taken and its cost)
+        """
+        return await self.run(_correct_image_job, image_path, corrected_path, preview_lang)
+
+    @staticmethod
+    async def pdf_page_count(pdf_path: str) -> int:
+        from pdf2image import pdfinfo_from_path
+
+        info = await asyncio.to_thread(pdfinfo_from_path, pdf_path)
+        return int(info.get("Pages", 0))
+
+    async def ocr_pdf_page(self, pdf_path: str, page_number: int, dpi: Optional[int] = None,
+                           lang: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Rasterise and OCR one PDF page (1-based).
+
+        Returns:
+            Dict with text, languages used and seconds spent in the worker
+        """
+        return await self.run(_pdf_page_ocr_job, pdf_path, page_number, dpi or settings.OCR_PDF_DPI, lang)
+
+    async def preview_pdf_pages(
+        self,
+        pdf_path: str,
+        page_paths: List[str],
+        corrected_paths: Optional[List[str]] = None,
+        dpi: Optional[int] = None,
+        preview_lang: str = PREVIEW_LANGS,
+    ) -> List[Any]:
+        """
+        Rasterise PDF pages (and rotation-correct them) in parallel.
+
+        Args:
+            pdf_path: Source PDF
+            page_paths: Output JPEG path per page (page i+1 -> page_paths[i])
+            corrected_paths: Corrected image path per page, or None to only rasterise
+            dpi: Rasterisation DPI (default: OCR_PDF_DPI)
+
+        Returns:
+            Per page: result dict of correct_image (empty if not corrected) or the exception
+        """
+        dpi = dpi or settings.OCR_PDF_DPI
+        corrected_paths = corrected_paths or [None] * len(page_paths)
+        return await asyncio.gather(
+            *(
+                self.run(_pdf_page_preview_job, pdf_path, page, dpi, page_path, corrected_path, preview_lang)
+                for page, (page_path, corrected_path) in enumerate(zip(page_paths, corrected_paths), start=1)
+            ),
+            return_exceptions=True,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["busy_seconds"] = round(stats["busy_seconds"], 2)
+        stats.update(
+            workers=self.max_workers,
+            running=self._running,
+            queued=self._queued,
+            max_queue=self.max_queue,
+            pool_started=self._pool is not None,
+        )
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (pending jobs are cancelled)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global instance
+ocr_engine = OcrEngine()
@@ -0,0 +1,182 @@
+"""OCR Language Detection - pick the Tesseract language pack per document.
+
+Tesseract cost grows roughly linearly with the number of loaded languages, so
+instead of always loading all 20 European packs a page is first read cheaply:
+
+1. OSD (--psm 0) on a low-resolution copy gives the script (Latin/Greek/Cyrillic)
+2. For Latin script, a low-resolution ``eng`` pass gives enough words to score
+   function/invoice words per language
+3. The full-resolution pass then runs with only the 1-3 detected languages
+
+When ``tesserocr`` is installed, each OCR worker process keeps one loaded
+``PyTessBaseAPI`` per language set, so traineddata is read once per worker
+instead of once per call (pytesseract starts a fresh tesseract process per call).
+"""
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pytesseract
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+
+# Frequent function words plus common invoice vocabulary (lowercase, ASCII-folded
+# where the cheap eng pass loses diacritics)
+LANGUAGE_WORDS: Dict[str, set] = {
+    'deu': {'der', 'die', 'das', 'und', 'nicht', 'mit', 'von', 'fur', 'für', 'ist', 'auf', 'den', 'dem', 'ein', 'eine',
+            'rechnung', 'betrag', 'summe', 'datum', 'steuer', 'gesamt', 'netto', 'brutto', 'mwst', 'zahlbar'},
+    'eng': {'the', 'and', 'of', 'to', 'for', 'with', 'is', 'on', 'this', 'from', 'by', 'you', 'your',
+            'invoice', 'amount', 'total', 'date', 'tax', 'due', 'payment', 'bill', 'subtotal'},
+    'spa': {'el', 'la', 'los', 'las', 'y', 'del', 'que', 'por', 'con', 'para', 'una', 'es', 'se',
+            'factura', 'importe', 'fecha', 'iva', 'pago', 'cliente', 'total'},
+    'fra': {'le', 'la', 'les', 'et', 'des', 'du', 'une', 'est', 'pour', 'avec', 'dans', 'sur', 'pas',
+            'facture', 'montant', 'date', 'tva', 'paiement', 'ttc', 'ht'},
+    'ita': {'il', 'lo', 'la', 'gli', 'le', 'di', 'che', 'per', 'con', 'del', 'della', 'una', 'sono',
+            'fattura', 'importo', 'data', 'iva', 'pagamento', 'totale'},
+    'pol': {'i', 'w', 'na', 'nie', 'do', 'sie', 'się', 'jest', 'za', 'od', 'oraz', 'dla',
+            'faktura', 'kwota', 'data', 'netto', 'brutto', 'vat', 'razem', 'zaplata', 'zapłata'},
+    'ces': {'a', 'je', 'se', 'na', 've', 'ze', 'to', 'pro', 'jako', 'ktery', 'který',
+            'faktura', 'castka', 'částka', 'datum', 'dph', 'celkem', 'splatnosti'},
+    'slk': {'a', 'je', 'sa', 'na', 'vo', 'pre', 'ako', 'ktory', 'ktorý', 'faktura', 'faktúra', 'suma', 'dph', 'spolu'},
+    'nld': {'de', 'het', 'een', 'en', 'van', 'is', 'op', 'voor', 'met', 'niet', 'zijn',
+            'factuur', 'bedrag', 'datum', 'btw', 'totaal', 'betaling'},
+    'por': {'o', 'os', 'as', 'e', 'do', 'da', 'dos', 'que', 'para', 'com', 'uma', 'nao', 'não',
+            'fatura', 'valor', 'data', 'pagamento', 'total'},
+    'ron': {'si', 'și', 'în', 'in', 'de', 'la', 'cu', 'pe', 'este', 'care', 'pentru',
+            'factura', 'factură', 'suma', 'data', 'tva', 'total', 'plata'},
+    'hun': {'a', 'az', 'és', 'es', 'hogy', 'nem', 'egy', 'van', 'is', 'meg',
+            'számla', 'szamla', 'összeg', 'osszeg', 'dátum', 'datum', 'áfa', 'afa', 'fizetendő'},
+    'slv': {'in', 'je', 'na', 'za', 'se', 'da', 'so', 'pri', 'ki', 'racun', 'račun', 'znesek', 'datum', 'ddv', 'skupaj'},
+    'hrv': {'i', 'je', 'na', 'za', 'se', 'da', 'su', 'od', 'koji', 'racun', 'račun', 'iznos', 'datum', 'pdv', 'ukupno'},
+    'swe': {'och', 'att', 'det', 'som', 'en', 'på', 'pa', 'är', 'ar', 'för', 'med', 'inte',
+            'faktura', 'belopp', 'datum', 'moms', 'summa', 'betala'},
+    'dan': {'og', 'at', 'det', 'er', 'en', 'til', 'på', 'pa', 'med', 'ikke', 'af', 'for',
+            'faktura', 'beløb', 'belob', 'dato', 'moms', 'ialt'},
+    'nor': {'og', 'at', 'det', 'er', 'en', 'til', 'på', 'pa', 'med', 'ikke', 'av', 'for',
+            'faktura', 'beløp', 'belop', 'dato', 'mva', 'totalt'},
+    'fin': {'ja', 'on', 'ei', 'se', 'että', 'etta', 'tai', 'kun', 'mutta',
+            'lasku', 'summa', 'päivämäärä', 'paivamaara', 'alv', 'yhteensä', 'yhteensa', 'eräpäivä'},
+}
+
+# Scripts reported by Tesseract OSD that map directly to a language pack
+SCRIPT_LANGUAGES = {
+    'Greek': ['ell'],
+    'Cyrillic': ['bul'],
+}
+
+# Low-resolution pre-pass: longest image side in pixels
+PREPASS_MAX_SIDE = 1200
+MIN_WORDS_FOR_DETECTION = 15
+
+_WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+def identify_languages(text: str, max_languages: int = 3, min_share: float = 0.25) -> Optional[List[str]]:
+    """
+    Score Latin-script text against per-language word lists.
+
+    Args:
+        text: Text from the cheap pre-pass
+        max_languages: Upper bound on returned languages
+        min_share: Keep languages scoring at least this share of the best score
+
+    Returns:
+        Tesseract language codes (best first), or None if the text is too short
+        or no language stands out
+    """
+    words = [w.lower() for w in _WORD_RE.findall(text or '')]
+    if len(words) < MIN_WORDS_FOR_DETECTION:
+        return None
+
+    scores = {lang: sum(1 for w in words if w in vocabulary) for lang, vocabulary in LANGUAGE_WORDS.items()}
+    best = max(scores.values())
+    if best < 3:
+        return None
+
+    ranked = sorted((lang for lang in scores if scores[lang] >= best * min_share), key=lambda lang: -scores[lang])
+    return ranked[:max_languages]
+
+
+# ----------------------------------------------------------------------
+# Tesseract calls (tesserocr with cached models when available)
+# ----------------------------------------------------------------------
+
+# One loaded API per language set, per (worker) process
+_tess_apis: Dict[str, "tesserocr.PyTessBaseAPI"] = {}
+_tess_lock = threading.Lock()
+
+
+def _tesserocr_api(lang: str):
+    with _tess_lock:
+        api = _tess_apis.get(lang)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=lang)
+            _tess_apis[lang] = api
+        return api
+
+
+def image_to_string(image, lang: str) -> str:
+    """OCR a PIL image - reuses loaded traineddata via tesserocr when installed."""
+    if TESSEROCR_AVAILABLE:
+        try:
+            api = _tesserocr_api(lang)
+            with _tess_lock:
+                api.SetImage(image)
+                return api.GetUTF8Text()
+        except Exception:
+            # Missing language pack etc. - pytesseract reports the same error clearly
+            pass
+    return pytesseract.image_to_string(image, lang=lang)
+
+
+def _downscale(image, max_side: int):
+    width, height = image.size
+    scale = max_side / max(width, height)
+    if scale >= 1.0:
+        return image
+    return image.resize((int(width * scale), int(height * scale)))
+
+
+def detect_page_languages(image) -> Tuple[Optional[str], Dict]:
+    """
+    Cheap language pre-pass on a PIL image.
+
+    Returns:
+        (Tesseract lang string such as 'deu+eng', or None to use the full list,
+        info dict with script, detected languages and timings)
+    """
+    start = time.perf_counter()
+    info: Dict = {"script": None, "detected_languages": None}
+    if not TESSERACT_AVAILABLE:
+        return None, info
+
+    small = _downscale(image.convert('L'), PREPASS_MAX_SIDE)
+
+    try:
+        osd = pytesseract.image_to_osd(small, config='--psm 0', output_type=pytesseract.Output.DICT)
+        info["script"] = osd.get('script')
+    except Exception:
+        # Too little text for OSD or osd.traineddata missing - assume Latin
+        pass
+
+    languages = SCRIPT_LANGUAGES.get(info["script"])
+    if languages is None:
+        try:
+            text = image_to_string(small, lang='eng')
+            languages = identify_languages(text)
+        except Exception:
+            languages = None
+
+    info["detected_languages"] = languages
+    info["prepass_seconds"] = round(time.perf_counter() - start, 3)
+    return ('+'.join(languages) if languages else None), info
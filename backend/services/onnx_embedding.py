@@ -0,0 +1,189 @@
+"""ONNX Embedding Backend - int8-quantized sentence encoder without PyTorch.
+
+``EMBEDDING_BACKEND=onnx`` makes the embedding registry load this encoder
+instead of ``SentenceTransformer``. It runs a dynamically quantized (int8)
+ONNX export of the transformer through onnxruntime, with the HuggingFace fast
+tokenizer and the same mean pooling + L2 normalisation as sentence-transformers,
+so vectors stay compatible with the existing ``Vector(384)`` columns (cosine
+>= 0.98 against the torch model, checked by ``tests/test_onnx_embedding.py``
+and ``benchmark_embeddings.py``).
+
+Neither torch nor sentence-transformers is imported at runtime, which keeps
+several hundred MB of RSS and seconds of cold start off CPU-only containers.
+
+The export needs torch once (build machine or locally):
+    python -m backend.services.onnx_embedding export all-MiniLM-L6-v2 ./models/onnx
+
+Layout of an exported model directory:
+    <EMBEDDING_ONNX_DIR>/<model name>/model.int8.onnx
+    <EMBEDDING_ONNX_DIR>/<model name>/tokenizer.json
+    <EMBEDDING_ONNX_DIR>/<model name>/embedding_config.json
+"""
+import json
+import logging
+import os
+import sys
+from typing import List, Optional
+
+import numpy as np
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "model.int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+CONFIG_FILE = "embedding_config.json"
+
+
+def model_directory(name: str, base_dir: Optional[str] = None) -> str:
+    """Directory holding the ONNX export of ``name``."""
+    return os.path.join(base_dir or settings.EMBEDDING_ONNX_DIR, name.replace("/", "__"))
+
+
+class OnnxSentenceEncoder:
+    """
+    Drop-in for the parts of ``SentenceTransformer`` the registry uses
+    (``encode`` and ``get_sentence_embedding_dimension``).
+
+    One onnxruntime session is shared by all threads (``InferenceSession.run``
+    is thread-safe); the tokenizer is only used to build padded batches.
+    """
+
+    def __init__(self, name: str, directory: Optional[str] = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.name = name
+        self.directory = directory or model_directory(name)
+        self.model_path = os.path.join(self.directory, MODEL_FILE)
+
+        with open(os.path.join(self.directory, CONFIG_FILE)) as f:
+            config = json.load(f)
+        self.dimensions = int(config["dimensions"])
+        self.max_seq_length = int(config.get("max_seq_length", 256))
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(self.directory, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=int(config.get("pad_token_id", 0)))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.EMBEDDING_ONNX_THREADS > 0:
+            options.intra_op_num_threads = settings.EMBEDDING_ONNX_THREADS
+        self.session = ort.InferenceSession(
+            self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {node.name for node in self.session.get_inputs()}
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens (sentence-transformers' default for MiniLM)
+        mask = attention_mask[..., np.newaxis].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        """Encode texts (same keyword arguments as ``SentenceTransformer.encode``)."""
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+
+        # Sort by length so each batch pads to similar lengths, then restore order
+        order = sorted(range(len(texts)), key=lambda idx: len(texts[idx]))
+        embeddings = np.empty((len(texts), self.dimensions), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            embeddings[batch] = self._encode_batch([texts[idx] for idx in batch])
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.clip(norms, 1e-12, None)
+        return embeddings
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimensions
+
+    def parameter_bytes(self) -> Optional[int]:
+        """Size of the quantized weights on disk (what the session keeps resident)."""
+        try:
+            return os.path.getsize(self.model_path)
+        except OSError:
+            return None
+
+
+def export_model(name: str, base_dir: Optional[str] = None) -> str:
+    """
+    Export ``name`` to ONNX and quantize the weights to int8.
+
+    Requires torch, sentence-transformers and onnxruntime (only here, not at
+    serving time).
+
+    Returns:
+        Directory of the exported model
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    directory = model_directory(name, base_dir)
+    os.makedirs(directory, exist_ok=True)
+
+    model = SentenceTransformer(name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    tokenizer.save_pretrained(directory)  # fast tokenizers write tokenizer.json
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [key for key in ("input_ids", "attention_mask", "token_type_ids") if key in sample]
+    dynamic_axes = {key: {0: "batch", 1: "sequence"} for key in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = os.path.join(directory, "model.fp32.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[key] for key in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    quantize_dynamic(fp32_path, os.path.join(directory, MODEL_FILE), weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+
+    with open(os.path.join(directory, CONFIG_FILE), "w") as f:
+        json.dump({
+            "model": name,
+            "dimensions": model.get_sentence_embedding_dimension(),
+            "max_seq_length": model.max_seq_length,
+            "pad_token_id": tokenizer.pad_token_id or 0,
+            "pooling": "mean",
+        }, f, indent=2)
+
+    logger.info(f"✅ Exported {name} to {directory}")
+    return directory
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "export":
+        print(__doc__)
+        sys.exit(2)
+    print(export_model(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None))
@@ -0,0 +1,216 @@
+"""PDF Extraction - one text-layer-first engine for every PDF upload path.
+
+Each page is checked for a usable text layer (PyPDF2). Only pages without one
+are rasterised (pdf2image) and OCR'd in the OCR worker pool, at a DPI derived
+from the page size so small receipts and large scans both end up at roughly
+``PDF_OCR_TARGET_PIXELS`` on the long side.
+
+Pages are produced lazily and in order: text-layer pages are yielded as soon as
+they are read, OCR pages are started immediately and awaited only when it is
+their turn, so OCR of later pages overlaps with consuming earlier ones. At most
+``PDF_OCR_WINDOW`` pages per PDF are in flight; further pages are only read
+once the consumer has taken the earliest ones, so a long scan never floods the
+OCR queue (``OCR_MAX_QUEUE``) and has pages rejected.
+"""
+import asyncio
+import io
+import logging
+import os
+import tempfile
+import time
+from collections import deque
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Union
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+PdfSource = Union[bytes, str, BinaryIO]
+
+
+def _has_text_layer(text: Optional[str]) -> bool:
+    return sum(1 for c in (text or "") if c.isalnum()) >= settings.PDF_MIN_TEXT_CHARS
+
+
+def ocr_dpi(page) -> int:
+    """DPI that rasterises ``page`` to about PDF_OCR_TARGET_PIXELS on its long side."""
+    try:
+        box = page.mediabox
+        long_side_inches = max(float(box.width), float(box.height)) / 72.0
+        dpi = settings.PDF_OCR_TARGET_PIXELS / long_side_inches
+    except Exception:
+        return settings.OCR_PDF_DPI
+    return int(min(settings.PDF_OCR_MAX_DPI, max(settings.PDF_OCR_MIN_DPI, dpi)))
+
+
+class PdfExtractionEngine:
+    """Text-layer-first PDF extraction with OCR fallback per page."""
+
+    @staticmethod
+    def _reader(source: PdfSource):
+        from PyPDF2 import PdfReader
+
+        if isinstance(source, (bytes, bytearray)):
+            return PdfReader(io.BytesIO(source))
+        return PdfReader(source)
+
+    @staticmethod
+    def _source_bytes(source: PdfSource) -> bytes:
+        if isinstance(source, (bytes, bytearray)):
+            return bytes(source)
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                return f.read()
+        source.seek(0)
+        return source.read()
+
+    def iter_text_layer(self, source: PdfSource) -> Iterator[str]:
+        """Blocking, text-layer-only page iterator (no OCR) for sync callers."""
+        for page in self._reader(source).pages:
+            yield page.extract_text() or ""
+
+    async def iter_pages(
+        self,
+        source: PdfSource,
+        ocr: bool = True,
+        lang: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield pages in order as they become available.
+
+        Args:
+            source: PDF bytes, file path or binary file object
+            ocr: OCR pages without a usable text layer
+            lang: Tesseract languages for OCR (default: per-page language pre-pass)
+
+        Yields:
+            Dict with page (1-based), text, method (text_layer/ocr/empty), dpi,
+            languages and seconds
+        """
+        from backend.services.ocr_engine import ocr_engine
+
+        reader = await asyncio.to_thread(self._reader, source)
+        pending: deque = deque()
+        in_flight = 0  # OCR tasks in ``pending``
+        window = settings.PDF_OCR_WINDOW or 2 * ocr_engine.max_workers
+        pdf_path = source if isinstance(source, str) else None
+        temp_path = None
+
+        async def ocr_page(page_number: int, text_layer: str, dpi: int, started: float) -> Dict[str, Any]:
+            try:
+                result = await ocr_engine.ocr_pdf_page(pdf_path, page_number, dpi, lang)
+            except Exception as e:
+                # Queue full, timeout or rasterisation error - keep whatever the text layer had
+                logger.warning(f"OCR failed for PDF page {page_number}: {e}")
+                return {
+                    "page": page_number,
+                    "text": text_layer or "",
+                    "method": "ocr_failed",
+                    "dpi": dpi,
+                    "error": str(e),
+                    "seconds": round(time.perf_counter() - started, 3),
+                }
+            return {
+                "page": page_number,
+                "text": result["text"],
+                "method": "ocr",
+                "dpi": dpi,
+                "languages": result["languages"],
+                "seconds": round(time.perf_counter() - started, 3),
+            }
+
+        async def finish(entry) -> Dict[str, Any]:
+            nonlocal in_flight
+            if isinstance(entry, asyncio.Task):
+                in_flight -= 1
+                return await entry
+            return entry
+
+        try:
+            for page_number, page in enumerate(reader.pages, start=1):
+                started = time.perf_counter()
+                text = await asyncio.to_thread(page.extract_text)
+
+                if _has_text_layer(text) or not ocr:
+                    pending.append({
+                        "page": page_number,
+                        "text": text or "",
+                        "method": "text_layer" if text else "empty",
+                        "seconds": round(time.perf_counter() - started, 3),
+                    })
+                else:
+                    if pdf_path is None:
+                        # Workers rasterise from disk - spill the upload once
+                        data = await asyncio.to_thread(self._source_bytes, source)
+                        fd, temp_path = tempfile.mkstemp(suffix=".pdf")
+                        with os.fdopen(fd, "wb") as f:
+                            f.write(data)
+                        pdf_path = temp_path
+                    # Window full: hand out earlier pages before starting another OCR job
+                    while in_flight >= window:
+                        yield await finish(pending.popleft())
+                    pending.append(asyncio.create_task(ocr_page(page_number, text, ocr_dpi(page), started)))
+                    in_flight += 1
+
+                # Hand out everything that is ready, in page order
+                while pending and not (isinstance(pending[0], asyncio.Task) and not pending[0].done()):
+                    yield await finish(pending.popleft())
+
+            while pending:
+                yield await finish(pending.popleft())
+        finally:
+            for entry in pending:
+                if isinstance(entry, asyncio.Task):
+                    entry.cancel()
+            if temp_path:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    async def extract(
+        self,
+        source: PdfSource,
+        ocr: bool = True,
+        lang: Optional[str] = None,
+        separator: str = "\n",
+    ) -> Dict[str, Any]:
+        """
+        Extract a whole PDF.
+
+        Returns:
+            Dict with text, page_count, ocr_pages, ocr_failed_pages, seconds
+            and pages (per-page method/dpi/languages/seconds/chars, without text)
+        """
+        start = time.perf_counter()
+        texts: List[str] = []
+        pages: List[Dict[str, Any]] = []
+
+        async for page in self.iter_pages(source, ocr=ocr, lang=lang):
+            text = page.pop("text")
+            page["chars"] = len(text)
+            if text:
+                texts.append(text)
+            pages.append(page)
+
+        ocr_pages = sum(1 for p in pages if p["method"] == "ocr")
+        ocr_failed_pages = sum(1 for p in pages if p["method"] == "ocr_failed")
+        seconds = round(time.perf_counter() - start, 3)
+        if ocr_pages:
+            logger.info(f"PDF extracted: {len(pages)} page(s), {ocr_pages} via OCR, {seconds}s")
+
+        return {
+            "text": separator.join(texts).strip(),
+            "page_count": len(pages),
+            "ocr_pages": ocr_pages,
+            "ocr_failed_pages": ocr_failed_pages,
+            "seconds": seconds,
+            "pages": pages,
+        }
+
+    async def extract_text(self, source: PdfSource, **kwargs) -> str:
+        return (await self.extract(source, **kwargs))["text"]
+
+
+# Global instance
+pdf_extraction_engine = PdfExtractionEngine()
@@ -1,4 +1,5 @@
 """Photo metadata extraction service using Pillow (PIL)."""
+import io
 from PIL import Image
 from PIL.ExifTags import TAGS, GPSTAGS
 from pathlib import Path
@@ -23,9 +24,31 @@ def extract_photo_metadata(file_path: Path) -> Dict[str, Any]:
         "filename": file_path.name,
         "size_bytes": file_path.stat().st_size if file_path.exists() else 0,
     }
+    return _add_image_metadata(file_path, metadata)
 
+
+def extract_photo_metadata_from_bytes(data: bytes, filename: str) -> Dict[str, Any]:
+    """
+    Extract EXIF metadata from photo bytes (e.g. an upload that is not on disk).
+
+    Args:
+        data: Photo file bytes
+        filename: Original filename
+
+    Returns:
+        Same dictionary as extract_photo_metadata
+    """
+    metadata = {
+        "filename": filename,
+        "size_bytes": len(data),
+    }
+    return _add_image_metadata(io.BytesIO(data), metadata)
+
+
+def _add_image_metadata(source, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Add dimensions, EXIF and GPS data of an image file or file object to metadata."""
     try:
-        with Image.open(file_path) as image:
+        with Image.open(source) as image:
             # Basic image info
             metadata["width"] = image.width
             metadata["height"] = image.height
@@ -104,7 +127,7 @@ def extract_photo_metadata(file_path: Path) -> Dict[str, Any]:
                                 pass
 
     except Exception as e:
-        logger.error(f"Failed to extract metadata from {file_path}: {e}")
+        logger.error(f"Failed to extract metadata from {metadata['filename']}: {e}")
         metadata["error"] = str(e)
 
     return metadata
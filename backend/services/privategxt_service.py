@@ -3,7 +3,7 @@ import os
 import uuid
 import hashlib
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from io import BytesIO
 
 # Heavy imports are deferred to first use to reduce startup memory and time
@@ -30,13 +30,16 @@ class PrivateGxTService:
         if self._collection is None:
             import chromadb
             from chromadb.config import Settings
+            from backend.services.embedding_registry import embedding_registry
+            from backend.services.vector_service import VectorService
             self._chroma_client = chromadb.PersistentClient(
                 path="./chroma_data/privategxt",
                 settings=Settings(anonymized_telemetry=False)
             )
             self._collection = self._chroma_client.get_or_create_collection(
                 name="privategxt_demo",
-                metadata={"description": "PrivateGxT Demo Collection"}
+                metadata={"description": "PrivateGxT Demo Collection"},
+                embedding_function=embedding_registry.chroma_embedding_function(VectorService.MODEL_NAME),
             )
         return self._collection
 
@@ -49,15 +52,21 @@ class PrivateGxTService:
         self._get_collection()
         return self._chroma_client
 
-    def extract_text_from_pdf(self, file_bytes: bytes) -> str:
-        """Extract text from PDF file."""
+    async def extract_text_from_pdf(self, file_bytes: bytes) -> str:
+        """Extract text from PDF file (text layer first, OCR for image-only pages, cached by file hash)."""
         try:
-            from PyPDF2 import PdfReader
-            pdf_reader = PdfReader(BytesIO(file_bytes))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            from backend.services.extraction_cache import extraction_cache, ocr_settings, pdf_result
+            from backend.services.pdf_extraction import pdf_extraction_engine
+
+            async def extract_pdf():
+                result = await pdf_extraction_engine.extract(file_bytes)
+                return pdf_result(result)
+
+            text, _, _ = await extraction_cache.get_or_extract(
+                file_bytes, "pdf_extraction", extract_pdf,
+                endpoint="privategxt.upload", params=ocr_settings(),
+            )
+            return text
         except Exception as e:
             raise ValueError(f"Failed to extract text from PDF: {str(e)}")
 
@@ -82,12 +91,12 @@ class PrivateGxTService:
             except Exception as e:
                 raise ValueError(f"Failed to decode text file: {str(e)}")
 
-    def extract_text(self, file_bytes: bytes, filename: str) -> str:
+    async def extract_text(self, file_bytes: bytes, filename: str) -> str:
         """Extract text based on file extension."""
         ext = filename.lower().split('.')[-1]
 
         if ext == 'pdf':
-            return self.extract_text_from_pdf(file_bytes)
+            return await self.extract_text_from_pdf(file_bytes)
         elif ext == 'docx':
             return self.extract_text_from_docx(file_bytes)
         elif ext == 'txt':
@@ -135,7 +144,7 @@ class PrivateGxTService:
             Document metadata
         """
         # Extract text
-        text = self.extract_text(file_bytes, filename)
+        text = await self.extract_text(file_bytes, filename)
 
         if not text or len(text) < 10:
             raise ValueError("Document appears to be empty or too short")
@@ -238,27 +247,8 @@ class PrivateGxTService:
             "messages_cleared": messages_cleared
         }
 
-    async def chat(
-        self,
-        message: str,
-        provider: str = "ollama",
-        model: Optional[str] = None,
-        temperature: float = 0.7,
-        n_results: int = 5
-    ) -> Dict[str, Any]:
-        """
-        Chat with RAG context.
-
-        Args:
-            message: User message
-            provider: LLM provider (ollama, anthropic, grok)
-            model: Optional model override
-            temperature: Sampling temperature
-            n_results: Number of chunks to retrieve
-
-        Returns:
-            Response with sources
-        """
+    def _build_chat_prompt(self, message: str, n_results: int) -> Tuple[str, List[Dict[str, Any]]]:
+        """Retrieve relevant chunks and build the RAG prompt. Returns (prompt, sources)."""
         # Query ChromaDB for relevant chunks
         results = self.collection.query(
             query_texts=[message],
@@ -302,8 +292,33 @@ Instructions:
 - Politely inform them that no documents have been uploaded
 - Suggest they upload documents to get contextual answers"""
 
+        return prompt, sources
+
+    async def chat(
+        self,
+        message: str,
+        provider: str = "ollama",
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        n_results: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Chat with RAG context.
+
+        Args:
+            message: User message
+            provider: LLM provider (ollama, anthropic, grok)
+            model: Optional model override
+            temperature: Sampling temperature
+            n_results: Number of chunks to retrieve
+
+        Returns:
+            Response with sources
+        """
+        prompt, sources = self._build_chat_prompt(message, n_results)
+
         # Generate response using LLM Gateway
-        llm_response = llm_gateway.generate(
+        llm_response = await llm_gateway.agenerate(
             prompt=prompt,
             provider=provider,
             model=model,
@@ -333,6 +348,50 @@ Instructions:
             "usage": llm_response['usage']
         }
 
+    async def chat_stream(
+        self,
+        message: str,
+        provider: str = "ollama",
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        n_results: int = 5
+    ) -> Tuple[List[Dict[str, Any]], AsyncIterator[str]]:
+        """
+        Chat with RAG context, streaming the answer.
+
+        Retrieval runs eagerly so the sources are known before the first token.
+
+        Returns:
+            Tuple of (sources, async iterator of text deltas). The chat history
+            entry is stored once the stream has been fully consumed.
+        """
+        prompt, sources = self._build_chat_prompt(message, n_results)
+
+        async def tokens() -> AsyncIterator[str]:
+            parts = []
+            async for token in llm_gateway.astream(
+                prompt=prompt,
+                provider=provider,
+                model=model,
+                temperature=temperature,
+                max_tokens=1000
+            ):
+                parts.append(token)
+                yield token
+
+            self.chat_history.append({
+                "id": str(uuid.uuid4()),
+                "timestamp": datetime.utcnow().isoformat(),
+                "message": message,
+                "response": "".join(parts),
+                "provider": provider,
+                "model": model,
+                "sources": sources,
+                "usage": None
+            })
+
+        return sources, tokens()
+
     def get_chat_history(self) -> List[Dict[str, Any]]:
         """Get chat history."""
         return self.chat_history
@@ -8,7 +8,7 @@ It captures query performance, scores, and retrieval metrics from both pgvector
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from backend.services.elasticsearch_service import ElasticsearchService
+from backend.services.elasticsearch_client import get_es_client
 
 logger = logging.getLogger(__name__)
 
@@ -18,14 +18,16 @@ class RAGMetricsLogger:
 
     def __init__(self):
         """Initialize RAG metrics logger"""
-        self.es_service = ElasticsearchService()
+        self.client = get_es_client()  # Shared AsyncElasticsearch (see elasticsearch_client)
         self.index_name = "cv_rag_logs"
-        self._ensure_index_exists()
+        self._index_ready = False
 
-    def _ensure_index_exists(self):
+    async def _ensure_index_exists(self):
         """Create the cv_rag_logs index with proper mapping if it doesn't exist"""
+        if self._index_ready:
+            return
         try:
-            if not self.es_service.client.indices.exists(index=self.index_name):
+            if not await self.client.indices.exists(index=self.index_name):
                 logger.info(f"Creating Elasticsearch index: {self.index_name}")
 
                 # Define mapping for RAG metrics
@@ -77,13 +79,14 @@ class RAGMetricsLogger:
                     }
                 }
 
-                self.es_service.client.indices.create(index=self.index_name, body=mapping)
+                await self.client.indices.create(index=self.index_name, body=mapping)
                 logger.info(f"✅ Created index '{self.index_name}' for RAG metrics logging")
+            self._index_ready = True
 
         except Exception as e:
             logger.error(f"Failed to create RAG metrics index: {e}")
 
-    def log_comparison(
+    async def log_comparison(
         self,
         query_text: str,
         pgvector_result: Dict[str, Any],
@@ -107,6 +110,8 @@ class RAGMetricsLogger:
             True if logging succeeded, False otherwise
         """
         try:
+            await self._ensure_index_exists()
+
             # Extract chunk scores for both systems
             pgvector_chunks = pgvector_result.get('chunks', [])
             es_chunks = elasticsearch_result.get('chunks', [])
@@ -153,7 +158,7 @@ class RAGMetricsLogger:
             }
 
             # Index document to Elasticsearch
-            self.es_service.client.index(
+            await self.client.index(
                 index=self.index_name,
                 body=log_doc
             )
@@ -165,7 +170,7 @@ class RAGMetricsLogger:
             logger.error(f"Failed to log RAG comparison: {e}")
             return False
 
-    def get_aggregations(self) -> Dict[str, Any]:
+    async def get_aggregations(self) -> Dict[str, Any]:
         """
         Get aggregated statistics for Kibana dashboards.
 
@@ -174,7 +179,7 @@ class RAGMetricsLogger:
         """
         try:
             # Refresh index to get latest data
-            self.es_service.client.indices.refresh(index=self.index_name)
+            await self.client.indices.refresh(index=self.index_name)
 
             # Build aggregation query
             aggs_query = {
@@ -212,7 +217,7 @@ class RAGMetricsLogger:
                 }
             }
 
-            result = self.es_service.client.search(
+            result = await self.client.search(
                 index=self.index_name,
                 body=aggs_query
             )
@@ -0,0 +1,26 @@
+"""Rank fusion helpers for hybrid (keyword + vector) retrieval."""
+from typing import Dict, Hashable, List, Sequence
+
+# Standard RRF constant (Cormack et al. 2009) - dampens the weight of top ranks
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], k: int = RRF_K) -> List[tuple]:
+    """
+    Fuse ranked id lists with Reciprocal Rank Fusion.
+
+    score(d) = sum over rankings of 1 / (k + rank(d)), rank starting at 1.
+    Scores are rank-based, so BM25 and cosine scales never need normalizing.
+
+    Args:
+        rankings: Ranked id lists (best first), e.g. [es_ids, vector_ids]
+        k: RRF constant
+
+    Returns:
+        List of (id, score) tuples, best first
+    """
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,288 @@
+"""Upload Ingestion - streaming multipart parsing for bulk file uploads.
+
+``List[UploadFile]`` endpoints only run after Starlette has received the whole
+request body, and then typically ``read()`` every file into memory. For large
+directory uploads this pipeline instead reads the request body as it arrives:
+
+1. Each file part is spooled to its own temp file chunk by chunk, and
+   ``MAX_UPLOAD_SIZE`` is enforced per file while bytes stream in
+2. Completed files go onto a bounded queue consumed by ``UPLOAD_INGEST_WORKERS``
+   parse workers - when the workers fall behind, reading the request pauses
+3. Parsed results (text only, temp file already deleted) are handed to the
+   caller as soon as they are ready, so it can write them incrementally
+
+Peak memory is O(workers x file size) instead of O(upload size).
+
+Usage:
+    async with UploadIngestion(request, parser.parse_file) as ingestion:
+        async for parsed in ingestion:
+            ...
+        ingestion.fields  # Non-file form fields (complete after iteration)
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from backend.config import settings
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:
+    # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+# Non-file form fields are kept in memory - cap them like Starlette does
+MAX_FIELD_SIZE = 1024 * 1024
+
+_DONE = object()
+
+
+class UploadError(Exception):
+    """Malformed multipart request."""
+
+
+class UploadTooLargeError(UploadError):
+    """A file exceeded the per-file size limit while streaming."""
+
+    def __init__(self, filename: str, limit: int):
+        self.filename = filename
+        self.limit = limit
+        super().__init__(f"{filename} exceeds the maximum upload size of {limit} bytes")
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class UploadIngestion:
+    """Stream a multipart request, spool files to disk and parse them in a bounded worker pool."""
+
+    def __init__(
+        self,
+        request,
+        parse: Callable[[str, bytes], Awaitable[str]],
+        workers: Optional[int] = None,
+        max_file_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            request: Starlette/FastAPI request with a multipart/form-data body
+            parse: Coroutine (display filename, file bytes) -> extracted text
+            workers: Concurrent parse workers (default: UPLOAD_INGEST_WORKERS)
+            max_file_size: Per-file limit in bytes (default: MAX_UPLOAD_SIZE)
+        """
+        self.request = request
+        self.parse = parse
+        self.workers = max(1, workers or settings.UPLOAD_INGEST_WORKERS)
+        self.max_file_size = max_file_size or settings.MAX_UPLOAD_SIZE
+
+        self.fields: Dict[str, str] = {}
+        self.stats = {"files": 0, "bytes": 0, "skipped": 0}
+
+        self._temp_files: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._parsed: Optional[asyncio.Queue] = None
+        self._error: Optional[BaseException] = None
+
+    # ------------------------------------------------------------------
+    # Producer: request body -> spooled temp files
+    # ------------------------------------------------------------------
+
+    def _boundary(self) -> bytes:
+        content_type, params = parse_options_header(self.request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise UploadError("Expected a multipart/form-data request")
+        return params[b"boundary"]
+
+    async def _produce(self, spooled: asyncio.Queue) -> None:
+        events: List[tuple] = []
+        header_field = bytearray()
+        header_value = bytearray()
+
+        def on_part_begin():
+            events.append(("begin", None))
+
+        def on_part_data(data: bytes, start: int, end: int):
+            events.append(("data", data[start:end]))
+
+        def on_part_end():
+            events.append(("end", None))
+
+        def on_header_field(data: bytes, start: int, end: int):
+            header_field.extend(data[start:end])
+
+        def on_header_value(data: bytes, start: int, end: int):
+            header_value.extend(data[start:end])
+
+        def on_header_end():
+            events.append(("header", (bytes(header_field).lower(), bytes(header_value))))
+            header_field.clear()
+            header_value.clear()
+
+        parser = MultipartParser(self._boundary(), {
+            "on_part_begin": on_part_begin,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+        })
+
+        part: Dict[str, Any] = {}
+
+        async def handle(kind: str, value) -> None:
+            nonlocal part
+            if kind == "begin":
+                part = {"headers": {}, "name": None, "filename": None, "size": 0,
+                        "file": None, "path": None, "value": bytearray()}
+            elif kind == "header":
+                part["headers"][value[0]] = value[1]
+                if value[0] == b"content-disposition":
+                    _, options = parse_options_header(value[1])
+                    part["name"] = options.get(b"name", b"").decode("utf-8", "replace")
+                    if b"filename" in options:
+                        part["filename"] = options[b"filename"].decode("utf-8", "replace")
+            elif kind == "data":
+                if part["filename"] is None:
+                    part["value"].extend(value)
+                    if len(part["value"]) > MAX_FIELD_SIZE:
+                        raise UploadError(f"Form field '{part['name']}' is too large")
+                    return
+                part["size"] += len(value)
+                if part["size"] > self.max_file_size:
+                    raise UploadTooLargeError(part["filename"], self.max_file_size)
+                if part["file"] is None:
+                    fd, part["path"] = tempfile.mkstemp(prefix="upload_", suffix=os.path.splitext(part["filename"])[1])
+                    self._temp_files.add(part["path"])
+                    part["file"] = os.fdopen(fd, "wb")
+                await asyncio.to_thread(part["file"].write, value)
+            elif kind == "end":
+                if part["filename"] is None:
+                    self.fields[part["name"]] = part["value"].decode("utf-8", "replace")
+                    return
+                if part["file"] is not None:
+                    await asyncio.to_thread(part["file"].close)
+                filename = part["filename"]
+                if not filename or filename.endswith('/') or part["size"] == 0:
+                    # Directory markers and empty files
+                    self.stats["skipped"] += 1
+                    if part["path"]:
+                        self._discard(part["path"])
+                    return
+                self.stats["files"] += 1
+                self.stats["bytes"] += part["size"]
+                # Blocks (and stops reading the request) while all workers are busy
+                await spooled.put({
+                    "filename": filename,
+                    "display_filename": filename.split('/')[-1],
+                    "content_type": part["headers"].get(b"content-type", b"").decode("latin-1"),
+                    "size": part["size"],
+                    "path": part["path"],
+                })
+
+        try:
+            async for chunk in self.request.stream():
+                parser.write(chunk)
+                for kind, value in events:
+                    await handle(kind, value)
+                events.clear()
+            parser.finalize()
+            for kind, value in events:
+                await handle(kind, value)
+        finally:
+            if part.get("file") is not None and not part["file"].closed:
+                part["file"].close()
+                self._discard(part["path"])
+
+    # ------------------------------------------------------------------
+    # Workers: spooled temp files -> parsed text
+    # ------------------------------------------------------------------
+
+    def _discard(self, path: str) -> None:
+        self._temp_files.discard(path)
+        _remove(path)
+
+    async def _work(self, spooled: asyncio.Queue, parsed: asyncio.Queue) -> None:
+        while True:
+            upload = await spooled.get()
+            if upload is None:
+                return
+
+            path = upload.pop("path")
+            result = dict(upload)
+            try:
+                data = await asyncio.to_thread(_read_file, path)
+                result["text"] = await self.parse(upload["display_filename"], data)
+                del data
+            except Exception as e:
+                logger.error(f"Failed to parse {upload['filename']}: {e}")
+                result["text"] = None
+                result["error"] = str(e)
+            finally:
+                await asyncio.to_thread(self._discard, path)
+
+            await parsed.put(result)
+
+    async def _run(self, spooled: asyncio.Queue, parsed: asyncio.Queue, workers: List[asyncio.Task]) -> None:
+        try:
+            await self._produce(spooled)
+            for _ in workers:
+                await spooled.put(None)
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            self._error = e
+            for worker in workers:
+                worker.cancel()
+        await parsed.put(_DONE)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def __aenter__(self) -> "UploadIngestion":
+        spooled: asyncio.Queue = asyncio.Queue(maxsize=self.workers)
+        self._parsed = asyncio.Queue(maxsize=self.workers)
+        workers = [asyncio.create_task(self._work(spooled, self._parsed)) for _ in range(self.workers)]
+        self._tasks = workers + [asyncio.create_task(self._run(spooled, self._parsed, workers))]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for path in list(self._temp_files):
+            self._discard(path)
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield parsed files in completion order.
+
+        Yields:
+            Dict with filename (full relative path), display_filename, content_type,
+            size, text and - if parsing failed - error
+
+        Raises:
+            UploadTooLargeError: A file exceeded max_file_size
+            UploadError: The request is not valid multipart/form-data
+        """
+        while True:
+            result = await self._parsed.get()
+            if result is _DONE:
+                break
+            yield result
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,436 @@
+"""Vector Index Service - ANN index management for pgvector embedding columns.
+
+Builds HNSW or IVFFlat cosine indexes (``vector_cosine_ops``) on the
+``embedding`` columns, applies per-query search parameters
+(``hnsw.ef_search`` / ``ivfflat.probes``), reports build progress from
+``pg_stat_progress_create_index`` and measures recall against an exact scan.
+
+The indexes span all tenants while every query filters by user, and the
+filter is applied to the candidates the index returns. With a plain scan a
+small tenant can get fewer than ``limit`` rows (or none) although matching
+rows exist. On pgvector >= 0.8 the search parameters enable iterative index
+scans (the scan continues until enough rows pass the filter); on older
+versions ``ef_search`` is raised to ``VECTOR_HNSW_EF_SEARCH_FILTERED`` instead.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tables with a Vector(384) ``embedding`` column that get an ANN index
+INDEXED_TABLES = ("document_chunks", "application_documents")
+INDEX_METHODS = ("hnsw", "ivfflat")
+
+# FROM clause and owning user column per table - recall is measured per tenant, like real queries
+TENANT_SCOPES = {
+    "document_chunks": ("document_chunks", "document_chunks.user_id"),
+    "application_documents": (
+        "application_documents JOIN applications ON applications.id = application_documents.application_id",
+        "applications.user_id",
+    ),
+}
+
+
+def _vector_literal(embedding) -> str:
+    """Format an embedding as a pgvector text literal."""
+    return "[" + ",".join(f"{float(x):.7g}" for x in embedding) + "]"
+
+
+def _supports_iterative_scan(extversion: Optional[str]) -> bool:
+    """hnsw/ivfflat.iterative_scan exist from pgvector 0.8.0 on."""
+    try:
+        major, minor = (int(part) for part in (extversion or "").split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (0, 8)
+
+
+class VectorIndexService:
+    """Create, inspect and tune pgvector ANN indexes."""
+
+    def __init__(self):
+        # Background builds started from this process, keyed by index name
+        self._builds: Dict[str, Dict[str, Any]] = {}
+        self._iterative_scan: Optional[bool] = None  # pgvector >= 0.8, checked once per process
+
+    @staticmethod
+    def index_name(table: str, method: str) -> str:
+        return f"ix_{table}_embedding_{method}"
+
+    @staticmethod
+    def _validate_table(table: str) -> None:
+        if table not in INDEXED_TABLES:
+            raise ValueError(f"Unsupported table: {table} (expected one of {', '.join(INDEXED_TABLES)})")
+
+    @classmethod
+    def _validate(cls, table: str, method: str) -> None:
+        cls._validate_table(table)
+        if method not in INDEX_METHODS:
+            raise ValueError(f"Unsupported index method: {method} (expected hnsw or ivfflat)")
+
+    # ------------------------------------------------------------------
+    # Query-time tuning
+    # ------------------------------------------------------------------
+
+    _EXTVERSION_SQL = text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+
+    async def apply_search_params(
+        self,
+        session: AsyncSession,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> None:
+        """
+        Set ANN search parameters for the current transaction (SET LOCAL).
+
+        Args:
+            session: Database session (parameters reset at commit/rollback)
+            ef_search: HNSW candidate list size (default: VECTOR_HNSW_EF_SEARCH)
+            probes: IVFFlat lists to scan (default: VECTOR_IVFFLAT_PROBES)
+        """
+        if self._iterative_scan is None:
+            result = await session.execute(self._EXTVERSION_SQL)
+            self._iterative_scan = _supports_iterative_scan(result.scalar())
+        for stmt in self._search_param_stmts(ef_search, probes):
+            await session.execute(stmt)
+
+    def apply_search_params_sync(
+        self,
+        session: Session,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> None:
+        """Blocking variant of ``apply_search_params`` for sync sessions."""
+        if self._iterative_scan is None:
+            self._iterative_scan = _supports_iterative_scan(session.execute(self._EXTVERSION_SQL).scalar())
+        for stmt in self._search_param_stmts(ef_search, probes):
+            session.execute(stmt)
+
+    def _search_param_stmts(self, ef_search: Optional[int], probes: Optional[int]):
+        mode = settings.VECTOR_ITERATIVE_SCAN
+        iterative = self._iterative_scan and mode != "off"
+        if mode not in ("off", "strict_order", "relaxed_order"):
+            raise ValueError(f"Unsupported VECTOR_ITERATIVE_SCAN: {mode}")
+
+        if not ef_search:
+            ef_search = settings.VECTOR_HNSW_EF_SEARCH
+            if not iterative:
+                # Every query filters by tenant after the index scan - widen the candidate list instead
+                ef_search = max(ef_search, settings.VECTOR_HNSW_EF_SEARCH_FILTERED)
+        ef_search = int(ef_search)
+        probes = int(probes or settings.VECTOR_IVFFLAT_PROBES)
+
+        # SET does not accept bind parameters; values are validated ints / modes
+        stmts = [
+            text(f"SET LOCAL hnsw.ef_search = {ef_search}"),
+            text(f"SET LOCAL ivfflat.probes = {probes}"),
+        ]
+        if iterative:
+            stmts.append(text(f"SET LOCAL hnsw.iterative_scan = {mode}"))
+            if mode == "relaxed_order":  # IVFFlat has no strict_order mode
+                stmts.append(text("SET LOCAL ivfflat.iterative_scan = relaxed_order"))
+        return stmts
+
+    # ------------------------------------------------------------------
+    # Index lifecycle
+    # ------------------------------------------------------------------
+
+    async def list_indexes(self) -> List[Dict[str, Any]]:
+        """List ANN indexes on the embedding columns with size and validity."""
+        from backend.database import async_session_maker
+
+        async with async_session_maker() as session:
+            result = await session.execute(text("""
+                SELECT t.relname AS table_name,
+                       i.relname AS index_name,
+                       am.amname AS method,
+                       ix.indisvalid AS is_valid,
+                       pg_relation_size(i.oid) AS size_bytes,
+                       pg_get_indexdef(i.oid) AS definition
+                FROM pg_index ix
+                JOIN pg_class i ON i.oid = ix.indexrelid
+                JOIN pg_class t ON t.oid = ix.indrelid
+                JOIN pg_am am ON am.oid = i.relam
+                WHERE am.amname IN ('hnsw', 'ivfflat')
+                  AND t.relname = ANY(:tables)
+                ORDER BY t.relname, i.relname
+            """), {"tables": list(INDEXED_TABLES)})
+            return [dict(row._mapping) for row in result]
+
+    async def _index_state(self, conn, name: str) -> Optional[bool]:
+        """None if the index does not exist, otherwise its indisvalid flag."""
+        result = await conn.execute(text("""
+            SELECT ix.indisvalid
+            FROM pg_index ix JOIN pg_class i ON i.oid = ix.indexrelid
+            WHERE i.relname = :name
+        """), {"name": name})
+        row = result.first()
+        return None if row is None else bool(row[0])
+
+    def _create_sql(self, table: str, method: str, name: str, m: int, ef_construction: int, lists: int) -> str:
+        if method == "hnsw":
+            options = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+        else:
+            options = f"lists = {int(lists)}"
+        return (
+            f"CREATE INDEX CONCURRENTLY {name} ON {table} "
+            f"USING {method} (embedding vector_cosine_ops) WITH ({options})"
+        )
+
+    async def _run_build(self, table: str, method: str, name: str, sql: str, rebuild: bool) -> None:
+        from backend.database import engine
+
+        build = self._builds[name]
+        try:
+            async with engine.connect() as conn:
+                # CONCURRENTLY cannot run inside a transaction
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+                state = await self._index_state(conn, name)
+                if state is not None and (rebuild or state is False):
+                    # Drop existing (or invalid leftovers of a failed concurrent build)
+                    await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                elif state is True:
+                    build.update(status="exists", finished_at=datetime.utcnow().isoformat())
+                    return
+
+                await conn.execute(
+                    text("SELECT set_config('maintenance_work_mem', :mem, false)"),
+                    {"mem": settings.VECTOR_INDEX_MAINTENANCE_WORK_MEM},
+                )
+                try:
+                    await conn.execute(text(sql))
+                finally:
+                    await conn.execute(text("RESET maintenance_work_mem"))
+
+            build.update(
+                status="completed",
+                finished_at=datetime.utcnow().isoformat(),
+                duration_seconds=round(time.perf_counter() - build["_started"], 2),
+            )
+            logger.info(f"Vector index {name} built on {table} ({method})")
+        except Exception as e:
+            build.update(status="failed", error=str(e), finished_at=datetime.utcnow().isoformat())
+            logger.error(f"Vector index build {name} failed: {e}")
+
+    def start_build(
+        self,
+        table: str,
+        method: Optional[str] = None,
+        m: Optional[int] = None,
+        ef_construction: Optional[int] = None,
+        lists: Optional[int] = None,
+        rebuild: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Start a background CREATE INDEX CONCURRENTLY (writes are not blocked).
+
+        Args:
+            table: document_chunks or application_documents
+            method: hnsw or ivfflat (default: VECTOR_INDEX_METHOD)
+            m: HNSW max connections per layer
+            ef_construction: HNSW build-time candidate list size
+            lists: IVFFlat list count (build after the table has data)
+            rebuild: Drop and rebuild an existing index
+
+        Returns:
+            Build status dict
+        """
+        method = method or settings.VECTOR_INDEX_METHOD
+        self._validate(table, method)
+        name = self.index_name(table, method)
+
+        running = self._builds.get(name)
+        if running and running["status"] == "building":
+            return self._public(running)
+
+        sql = self._create_sql(
+            table, method, name,
+            m or settings.VECTOR_HNSW_M,
+            ef_construction or settings.VECTOR_HNSW_EF_CONSTRUCTION,
+            lists or settings.VECTOR_IVFFLAT_LISTS,
+        )
+        self._builds[name] = {
+            "index_name": name,
+            "table": table,
+            "method": method,
+            "status": "building",
+            "started_at": datetime.utcnow().isoformat(),
+            "_started": time.perf_counter(),
+        }
+        self._builds[name]["_task"] = asyncio.create_task(self._run_build(table, method, name, sql, rebuild))
+        return self._public(self._builds[name])
+
+    async def drop_index(self, table: str, method: str) -> bool:
+        """Drop an ANN index (CONCURRENTLY). Returns False if it did not exist."""
+        from backend.database import engine
+
+        self._validate(table, method)
+        name = self.index_name(table, method)
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            if await self._index_state(conn, name) is None:
+                return False
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        self._builds.pop(name, None)
+        return True
+
+    @staticmethod
+    def _public(build: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in build.items() if not k.startswith("_")}
+
+    async def get_build_progress(self) -> Dict[str, Any]:
+        """
+        Progress of running index builds (pg_stat_progress_create_index),
+        merged with the status of builds started from this process.
+        """
+        from backend.database import async_session_maker
+
+        async with async_session_maker() as session:
+            result = await session.execute(text("""
+                SELECT relid::regclass::text AS table_name,
+                       index_relid::regclass::text AS index_name,
+                       phase,
+                       blocks_done, blocks_total,
+                       tuples_done, tuples_total
+                FROM pg_stat_progress_create_index
+                WHERE relid::regclass::text = ANY(:tables)
+            """), {"tables": list(INDEXED_TABLES)})
+            running = [dict(row._mapping) for row in result]
+
+        for row in running:
+            if row["tuples_total"]:
+                row["percent"] = round(100.0 * row["tuples_done"] / row["tuples_total"], 1)
+            elif row["blocks_total"]:
+                row["percent"] = round(100.0 * row["blocks_done"] / row["blocks_total"], 1)
+            else:
+                row["percent"] = None
+
+        return {
+            "running": running,
+            "builds": [self._public(build) for build in self._builds.values()],
+        }
+
+    # ------------------------------------------------------------------
+    # Recall measurement
+    # ------------------------------------------------------------------
+
+    async def _top_k(self, query_vector: str, table: str, user_id: Optional[str], k: int, exact: bool,
+                     ef_search: Optional[int], probes: Optional[int]) -> List[str]:
+        from backend.database import async_session_maker
+
+        scope, user_column = TENANT_SCOPES[table]
+        tenant_filter = f"AND {user_column} = CAST(:user_id AS uuid)" if user_id else ""
+        async with async_session_maker() as session:
+            if exact:
+                # Force a sequential scan for the ground truth
+                await session.execute(text("SET LOCAL enable_indexscan = off"))
+            else:
+                await self.apply_search_params(session, ef_search, probes)
+            result = await session.execute(
+                text(f"""
+                    SELECT {table}.id FROM {scope}
+                    WHERE {table}.embedding IS NOT NULL {tenant_filter}
+                    ORDER BY {table}.embedding <=> CAST(:q AS vector)
+                    LIMIT :k
+                """),
+                {"q": query_vector, "k": k, "user_id": user_id},
+            )
+            ids = [str(row[0]) for row in result]
+            await session.rollback()
+        return ids
+
+    async def measure_recall(
+        self,
+        table: str = "document_chunks",
+        k: int = 10,
+        sample_size: int = 20,
+        queries: Optional[List[str]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compare ANN top-k with an exact sequential scan.
+
+        Both scans filter by the owning user, like the application queries do:
+        sampled embeddings are searched within their owner's rows, query texts
+        within ``user_id``'s rows (all rows if no user is given).
+
+        Args:
+            table: document_chunks or application_documents
+            k: Neighbours per query
+            sample_size: Stored embeddings to use as queries (if no texts given)
+            queries: Optional query texts (embedded with VectorService)
+            ef_search: HNSW candidate list size to evaluate
+            probes: IVFFlat probes to evaluate
+            user_id: Restrict queries (and sampled embeddings) to this user
+
+        Returns:
+            Mean recall@k and mean latency of both scans
+        """
+        self._validate_table(table)
+        scope, user_column = TENANT_SCOPES[table]
+        user_id = str(user_id) if user_id else None
+
+        if queries:
+            from backend.services.vector_service import VectorService
+
+            embeddings = await VectorService().generate_embeddings(queries)
+            if embeddings is None:
+                raise ValueError("Embedding model not available")
+            query_vectors = [(_vector_literal(e), user_id) for e in embeddings]
+        else:
+            from backend.database import async_session_maker
+
+            tenant_filter = f"AND {user_column} = CAST(:user_id AS uuid)" if user_id else ""
+            async with async_session_maker() as session:
+                result = await session.execute(text(f"""
+                    SELECT {table}.embedding::text, {user_column}::text FROM {scope}
+                    WHERE {table}.embedding IS NOT NULL {tenant_filter}
+                    ORDER BY random()
+                    LIMIT :n
+                """), {"n": sample_size, "user_id": user_id})
+                query_vectors = [(row[0], row[1]) for row in result]
+
+        if not query_vectors:
+            return {"table": table, "k": k, "queries": 0, "recall": None}
+
+        recalls, ann_ms, exact_ms = [], [], []
+        for query_vector, owner_id in query_vectors:
+            start = time.perf_counter()
+            ann = await self._top_k(query_vector, table, owner_id, k, False, ef_search, probes)
+            ann_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            exact = await self._top_k(query_vector, table, owner_id, k, True, None, None)
+            exact_ms.append((time.perf_counter() - start) * 1000)
+
+            if exact:
+                recalls.append(len(set(ann) & set(exact)) / len(exact))
+
+        return {
+            "table": table,
+            "k": k,
+            "queries": len(query_vectors),
+            "user_id": user_id,
+            "iterative_scan": settings.VECTOR_ITERATIVE_SCAN if self._iterative_scan else "unsupported",
+            "ef_search": ef_search or settings.VECTOR_HNSW_EF_SEARCH,
+            "probes": probes or settings.VECTOR_IVFFLAT_PROBES,
+            "recall": round(sum(recalls) / len(recalls), 4) if recalls else None,
+            "ann_latency_ms": round(sum(ann_ms) / len(ann_ms), 2),
+            "exact_latency_ms": round(sum(exact_ms) / len(exact_ms), 2),
+        }
+
+
+# Global instance
+vector_index_service = VectorIndexService()
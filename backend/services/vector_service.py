@@ -1,41 +1,62 @@
 """Vector Service using pgvector (PostgreSQL native)."""
 from typing import List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy import select, func
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select, func, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+import asyncio
 import re
 
+import numpy as np
+
+from backend.config import settings
 from backend.models.document import Document
+from backend.models.document_chunk import DocumentChunk
+from backend.services.embedding_cache import embedding_cache
+from backend.services.embedding_registry import embedding_registry
+from backend.services.vector_index_service import vector_index_service
+
+
+# Dedicated encoder pool - model inference never runs on the event loop.
+# Threads (not processes) so the loaded model is shared; torch releases the GIL
+# during the forward pass, so request handling keeps running meanwhile.
+_embedding_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_embedding_executor() -> ThreadPoolExecutor:
+    """Lazy-create the process-wide embedding thread pool."""
+    global _embedding_executor
+    if _embedding_executor is None:
+        _embedding_executor = ThreadPoolExecutor(
+            max_workers=settings.EMBEDDING_WORKERS,
+            thread_name_prefix="embedding",
+        )
+    return _embedding_executor
 
 
 class VectorService:
     """Vector service for document embeddings using pgvector."""
 
-    def __init__(self):
-        """Defer model loading to first use to reduce startup time/memory."""
-        self._model = None
-        self._model_loaded = False
+    MODEL_NAME = "all-MiniLM-L6-v2"
+
+    def __init__(self, model_name: Optional[str] = None):
+        """Cheap to create - the model itself is shared through the embedding registry."""
+        self.model_name = model_name or self.MODEL_NAME
 
     def _get_model(self):
-        """Lazy-load the SentenceTransformer model on first use."""
-        if not self._model_loaded:
-            self._model_loaded = True
-            try:
-                from sentence_transformers import SentenceTransformer
-                self._model = SentenceTransformer('all-MiniLM-L6-v2')
-                print("✅ Embedding model loaded: all-MiniLM-L6-v2")
-            except ImportError:
-                print("WARNING: sentence-transformers not installed - embeddings disabled")
-                self._model = None
-            except Exception as e:
-                print(f"⚠️ Failed to load embedding model: {e}")
-                self._model = None
-        return self._model
+        """Shared encoder from the process-wide registry (loaded once, on first use)."""
+        return embedding_registry.get(self.model_name)
 
     @property
     def model(self):
+        """Shared encoder (blocking: loads the model on first use - prefer ``aget_model`` in async code)."""
         return self._get_model()
 
+    async def aget_model(self):
+        """Shared encoder; a cold model loads in a worker thread, not on the event loop."""
+        return await embedding_registry.aget(self.model_name)
+
     def chunk_text(
         self,
         text: str,
@@ -82,9 +103,106 @@ class VectorService:
 
         return chunks
 
+    def encode(self, texts: List[str], batch_size: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Encode texts in batches on the calling thread.
+
+        Args:
+            texts: Input texts
+            batch_size: Texts per forward pass (default: EMBEDDING_BATCH_SIZE)
+
+        Returns:
+            Contiguous float32 matrix of shape (len(texts), 384),
+            or None if model unavailable
+        """
+        encoder = self.model
+        if not encoder:
+            return None
+        return encoder.encode(texts, batch_size=batch_size)
+
+    async def _aencode(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Encode off the event loop: awaited directly on the embedding sidecar, else in the encoder pool."""
+        encoder = await self.aget_model()
+        if hasattr(encoder, "aencode"):
+            return await encoder.aencode(texts, batch_size=batch_size)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_embedding_executor(), self.encode, texts, batch_size
+        )
+
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Generate embeddings for many texts in the dedicated encoder pool.
+
+        One model forward pass per batch instead of one per text, and the
+        event loop stays free while the model runs.
+
+        Args:
+            texts: Input texts
+            batch_size: Texts per forward pass (default: EMBEDDING_BATCH_SIZE)
+
+        Returns:
+            Contiguous float32 matrix of shape (len(texts), 384),
+            or None if model unavailable or encoding failed
+        """
+        if not await self.aget_model():
+            return None
+
+        try:
+            if not settings.EMBEDDING_CACHE_ENABLED:
+                return await self._aencode(texts, batch_size)
+
+            # Only encode texts that are not in the embedding cache
+            cached = await embedding_cache.aget_many(texts, self.model_name)
+            missing = list({texts[idx] for idx, vector in enumerate(cached) if vector is None})
+
+            encoded = {}
+            if missing:
+                vectors = await self._aencode(missing, batch_size)
+                await embedding_cache.aput_many(missing, vectors, self.model_name)
+                encoded = dict(zip(missing, vectors))
+
+            return self._assemble(texts, cached, encoded)
+        except Exception as e:
+            print(f"Error generating embeddings: {e}")
+            return None
+
+    def _assemble(self, texts: List[str], cached: List[Optional[np.ndarray]], encoded: dict) -> np.ndarray:
+        """Stack cached and freshly encoded vectors into one contiguous matrix."""
+        # Take the width from a vector we already have (a remote encoder would ask the sidecar)
+        sample = next((vector for vector in cached if vector is not None), None)
+        if sample is None:
+            sample = next(iter(encoded.values()), None)
+        dimensions = len(sample) if sample is not None else self.model.dimensions
+        matrix = np.empty((len(texts), dimensions), dtype=np.float32)
+        for idx, text in enumerate(texts):
+            matrix[idx] = cached[idx] if cached[idx] is not None else encoded[text]
+        return matrix
+
+    async def agenerate_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Generate embedding vector for a single text in the encoder pool.
+
+        Args:
+            text: Input text
+
+        Returns:
+            List of floats (384 dimensions) or None if model unavailable
+        """
+        embeddings = await self.generate_embeddings([text])
+        if embeddings is None:
+            return None
+        return embeddings[0].tolist()
+
     def generate_embedding(self, text: str) -> Optional[List[float]]:
         """
-        Generate embedding vector for text.
+        Generate embedding vector for text (blocking).
+
+        Prefer ``agenerate_embedding``/``generate_embeddings`` in async code.
 
         Args:
             text: Input text
@@ -96,13 +214,88 @@ class VectorService:
             return None
 
         try:
-            # Generate embedding
-            embedding = self.model.encode(text, normalize_embeddings=True)
-            return embedding.tolist()
+            if settings.EMBEDDING_CACHE_ENABLED:
+                cached = embedding_cache.get_many([text], self.model_name)[0]
+                if cached is not None:
+                    return cached.tolist()
+
+            embeddings = self.encode([text])
+            if settings.EMBEDDING_CACHE_ENABLED:
+                embedding_cache.put_many([text], embeddings, self.model_name)
+            return embeddings[0].tolist()
         except Exception as e:
             print(f"Error generating embedding: {e}")
             return None
 
+    async def embed_document_chunks(
+        self,
+        session: AsyncSession,
+        documents: List[Document],
+        chunk_size: int = 500,
+        overlap: int = 50
+    ) -> Optional[int]:
+        """
+        Split documents into chunks, embed them and store them in document_chunks.
+
+        Existing chunks of these documents are replaced; the parent rows keep
+        their full content. Does not commit.
+
+        Args:
+            session: Database session
+            documents: Parent documents (flushed to the DB or about to be)
+            chunk_size: Target chunk size in words
+            overlap: Number of overlapping words between chunks
+
+        Returns:
+            Number of chunks stored, or None if embedding failed
+        """
+        pending = []
+        for document in documents:
+            if not (document.content or "").strip():
+                continue
+            for ordinal, (chunk_text, start_pos) in enumerate(self.chunk_text(document.content, chunk_size, overlap)):
+                pending.append((document, ordinal, chunk_text, start_pos))
+
+        # Embed all chunks in batches (one forward pass per batch)
+        embeddings = await self.generate_embeddings([chunk_text for _, _, chunk_text, _ in pending]) if pending else []
+        if embeddings is None:
+            return None
+
+        await session.flush()  # Parent rows must exist for the foreign key
+        await session.execute(
+            delete(DocumentChunk).where(DocumentChunk.document_id.in_([document.id for document in documents]))
+        )
+
+        rows = []
+        chunk_counts = {}
+        for (document, ordinal, chunk_text, start_pos), embedding in zip(pending, embeddings):
+            token_count = len(chunk_text.split())
+            rows.append({
+                "document_id": document.id,
+                "user_id": document.user_id,
+                "project_id": document.project_id,
+                "document_type": document.type,
+                "ordinal": ordinal,
+                "start_offset": start_pos,
+                "end_offset": start_pos + token_count,
+                "token_count": token_count,
+                "content": chunk_text,
+                "embedding": embedding.tolist(),
+            })
+            chunk_counts[document.id] = ordinal + 1
+        if rows:
+            # ORM bulk INSERT (executemany) - vector and enum values go through their bind processors
+            await session.execute(insert(DocumentChunk), rows)
+
+        for document in documents:
+            # Reassign (not update in place) so the JSONB change is persisted
+            document.doc_metadata = {
+                **(document.doc_metadata or {}),
+                'chunk_count': chunk_counts.get(document.id, 0),
+                'chunk_size': chunk_size,
+            }
+        return len(rows)
+
     async def add_document_embedding(
         self,
         session: AsyncSession,
@@ -112,15 +305,15 @@ class VectorService:
         overlap: int = 50
     ) -> bool:
         """
-        Generate and add embedding to document.
+        Generate and store chunk embeddings for a document.
 
-        For large documents (>500 words), splits into overlapping chunks
-        and creates separate document records for each chunk to improve
-        RAG search quality.
+        Large documents (>500 words) are split into overlapping chunks to
+        improve RAG search quality. Chunks go to document_chunks; the document
+        row itself keeps its full content.
 
         Args:
             session: Database session
-            document: Document instance (will be updated with first chunk or whole doc)
+            document: Document instance
             use_chunking: Whether to split large documents into chunks
             chunk_size: Target chunk size in words
             overlap: Number of overlapping words between chunks
@@ -128,102 +321,45 @@ class VectorService:
         Returns:
             True if successful, False otherwise
         """
-        if not self.model:
+        if not await self.aget_model():
             print("⚠️ Embedding model not available - skipping")
             return False
 
         try:
             word_count = len(document.content.split())
+            if not use_chunking:
+                chunk_size = max(word_count, 1)  # Whole document as a single chunk
+
+            chunk_count = await self.embed_document_chunks(session, [document], chunk_size, overlap)
+            if chunk_count is None:
+                return False
 
-            # Use chunking for large documents
-            if use_chunking and word_count > chunk_size:
-                chunks = self.chunk_text(document.content, chunk_size, overlap)
-                print(f"📄 Document has {word_count} words - splitting into {len(chunks)} chunks")
-
-                # Update original document with first chunk
-                first_chunk_text, _ = chunks[0]
-                embedding = self.generate_embedding(first_chunk_text)
-
-                if not embedding:
-                    return False
-
-                document.content = first_chunk_text
-                document.embedding = embedding
-                document.doc_metadata = document.doc_metadata or {}
-                document.doc_metadata.update({
-                    'is_chunk': True,
-                    'chunk_index': 0,
-                    'total_chunks': len(chunks),
-                    'chunk_size': chunk_size,
-                    'original_word_count': word_count
-                })
-
-                # Create additional document records for remaining chunks
-                for idx, (chunk_text, start_pos) in enumerate(chunks[1:], 1):
-                    chunk_embedding = self.generate_embedding(chunk_text)
-
-                    if not chunk_embedding:
-                        continue
-
-                    from uuid import uuid4
-                    chunk_doc = Document(
-                        id=uuid4(),
-                        user_id=document.user_id,
-                        project_id=document.project_id,
-                        type=document.type,
-                        filename=document.filename,
-                        url=document.url,
-                        content=chunk_text,
-                        embedding=chunk_embedding,
-                        doc_metadata={
-                            'is_chunk': True,
-                            'chunk_index': idx,
-                            'total_chunks': len(chunks),
-                            'chunk_size': chunk_size,
-                            'parent_id': str(document.id),
-                            'start_position': start_pos,
-                            'original_word_count': word_count
-                        }
-                    )
-                    session.add(chunk_doc)
-
-                await session.commit()
-                print(f"✅ Added {len(chunks)} chunk embeddings for document {document.id}")
-                return True
-
-            else:
-                # Small document - single embedding
-                embedding = self.generate_embedding(document.content)
-
-                if not embedding:
-                    return False
-
-                document.embedding = embedding
-                document.doc_metadata = document.doc_metadata or {}
-                document.doc_metadata.update({
-                    'is_chunk': False,
-                    'word_count': word_count
-                })
-
-                await session.commit()
-                print(f"✅ Added embedding to document {document.id} (no chunking needed)")
-                return True
+            document.doc_metadata = {**document.doc_metadata, 'word_count': word_count}
+            await session.commit()
+            print(f"✅ Added {chunk_count} chunk embedding(s) for document {document.id} ({word_count} words)")
+            return True
 
         except Exception as e:
             print(f"❌ Error adding embedding: {e}")
             return False
 
-    async def search_similar_documents(
+    async def search_similar_chunks(
         self,
         session: AsyncSession,
         query_text: str,
         user_id: UUID,
         project_id: Optional[UUID] = None,
         limit: int = 5,
-        distance_threshold: float = 1.0
-    ) -> List[tuple[Document, float]]:
+        distance_threshold: float = 1.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
+    ) -> List[Tuple[DocumentChunk, float]]:
         """
-        Search for similar documents using vector similarity.
+        Search for similar chunks using vector similarity.
+
+        Only the narrow document_chunks table is scanned (served by its
+        HNSW/IVFFlat cosine index, see vector_index_service); parent documents
+        are loaded afterwards for the returned chunks only (``chunk.document``).
 
         Args:
             session: Database session
@@ -232,51 +368,96 @@ class VectorService:
             project_id: Optional project ID for filtering
             limit: Maximum number of results
             distance_threshold: Maximum cosine distance (0-2, lower is more similar)
+            ef_search: HNSW candidate list size (higher = better recall, slower)
+            probes: IVFFlat lists to scan (higher = better recall, slower)
 
         Returns:
-            List of (Document, distance) tuples, ordered by similarity
+            List of (DocumentChunk, distance) tuples, ordered by similarity
         """
-        if not self.model:
+        if not await self.aget_model():
             print("⚠️ Embedding model not available - returning empty results")
             return []
 
         try:
             # Generate query embedding
-            query_embedding = self.generate_embedding(query_text)
+            query_embedding = await self.agenerate_embedding(query_text)
             if not query_embedding:
                 return []
 
-            # Build query with vector similarity using <=> operator (cosine distance)
+            # Cosine distance (<=> operator)
+            distance = DocumentChunk.embedding.cosine_distance(query_embedding)
             query = (
-                select(
-                    Document,
-                    Document.embedding.cosine_distance(query_embedding).label('distance')
-                )
-                .where(Document.user_id == user_id)
-                .where(Document.embedding.isnot(None))
+                select(DocumentChunk, distance.label('distance'))
+                .where(DocumentChunk.user_id == user_id)
+                .where(DocumentChunk.embedding.isnot(None))
             )
 
             # Filter by project if specified
             if project_id:
-                query = query.where(Document.project_id == project_id)
+                query = query.where(DocumentChunk.project_id == project_id)
 
             # Order by similarity and limit results
             query = (
                 query
-                .where(Document.embedding.cosine_distance(query_embedding) < distance_threshold)
-                .order_by(Document.embedding.cosine_distance(query_embedding))
+                .where(distance < distance_threshold)
+                .order_by(distance)
                 .limit(limit)
+                .options(selectinload(DocumentChunk.document))
             )
 
+            await vector_index_service.apply_search_params(session, ef_search, probes)
             result = await session.execute(query)
-            documents_with_distance = result.all()
 
-            return [(doc, float(dist)) for doc, dist in documents_with_distance]
+            return [(chunk, float(dist)) for chunk, dist in result.all()]
 
         except Exception as e:
-            print(f"❌ Error searching documents: {e}")
+            print(f"❌ Error searching document chunks: {e}")
             return []
 
+    async def search_similar_documents(
+        self,
+        session: AsyncSession,
+        query_text: str,
+        user_id: UUID,
+        project_id: Optional[UUID] = None,
+        limit: int = 5,
+        distance_threshold: float = 1.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
+    ) -> List[tuple[Document, float]]:
+        """
+        Search for similar documents using vector similarity.
+
+        Ranks chunks (see ``search_similar_chunks``) and returns each parent
+        document once, scored by its best chunk.
+
+        Args:
+            session: Database session
+            query_text: Search query
+            user_id: User ID for filtering
+            project_id: Optional project ID for filtering
+            limit: Maximum number of results
+            distance_threshold: Maximum cosine distance (0-2, lower is more similar)
+            ef_search: HNSW candidate list size (higher = better recall, slower)
+            probes: IVFFlat lists to scan (higher = better recall, slower)
+
+        Returns:
+            List of (Document, distance) tuples, ordered by similarity
+        """
+        # Over-fetch: several of the top chunks may belong to the same document
+        chunks = await self.search_similar_chunks(
+            session, query_text, user_id, project_id, limit * 3, distance_threshold, ef_search, probes
+        )
+
+        documents_with_distance = []
+        seen = set()
+        for chunk, distance in chunks:
+            if chunk.document_id in seen:
+                continue
+            seen.add(chunk.document_id)
+            documents_with_distance.append((chunk.document, distance))
+        return documents_with_distance[:limit]
+
     async def get_document_context(
         self,
         session: AsyncSession,
@@ -293,12 +474,12 @@ class VectorService:
             query_text: Search query
             user_id: User ID
             project_id: Optional project ID
-            limit: Number of documents to retrieve
+            limit: Number of chunks to retrieve
 
         Returns:
             Formatted context string with relevant document excerpts
         """
-        similar_docs = await self.search_similar_documents(
+        similar_chunks = await self.search_similar_chunks(
             session=session,
             query_text=query_text,
             user_id=user_id,
@@ -306,23 +487,22 @@ class VectorService:
             limit=limit
         )
 
-        if not similar_docs:
+        if not similar_chunks:
             return ""
 
         # Format context
         context_parts = []
-        for doc, distance in similar_docs:
-            # Truncate long content
-            content_preview = doc.content[:500] + "..." if len(doc.content) > 500 else doc.content
-            source = doc.filename or doc.url or "text document"
+        for chunk, distance in similar_chunks:
+            # Chunks are already bounded by the chunker - send them whole
+            source = chunk.document.filename or chunk.document.url or "text document"
 
             context_parts.append(
-                f"[Source: {source}, Relevance: {(1-distance/2)*100:.1f}%]\n{content_preview}"
+                f"[Source: {source}, Relevance: {(1-distance/2)*100:.1f}%]\n{chunk.content}"
             )
 
         return "\n\n---\n\n".join(context_parts)
 
-    def search_in_memory_documents(
+    async def search_in_memory_documents(
         self,
         query_text: str,
         documents: List[dict],
@@ -342,39 +522,25 @@ class VectorService:
         Returns:
             List of (document, distance) tuples, ordered by similarity
         """
-        if not self.model:
+        if not await self.aget_model():
             print("⚠️ Embedding model not available - returning all documents")
             # Fallback: return all documents with neutral score
             return [(doc, 0.5) for doc in documents[:limit]]
 
         try:
-            # Generate query embedding
-            query_embedding = self.generate_embedding(query_text)
-            if not query_embedding:
-                return [(doc, 0.5) for doc in documents[:limit]]
-
-            # Generate embeddings for all documents and calculate distances
-            results = []
-            for doc in documents:
-                content = doc.get('content', '')
-                if not content:
-                    continue
+            docs_with_content = [doc for doc in documents if doc.get('content', '')]
 
-                # Generate document embedding
-                doc_embedding = self.generate_embedding(content)
-                if not doc_embedding:
-                    continue
-
-                # Calculate cosine distance
-                import numpy as np
-                query_vec = np.array(query_embedding)
-                doc_vec = np.array(doc_embedding)
+            # Query and all documents in one batched encode
+            embeddings = await self.generate_embeddings(
+                [query_text] + [doc['content'] for doc in docs_with_content]
+            )
+            if embeddings is None:
+                return [(doc, 0.5) for doc in documents[:limit]]
 
-                # Cosine distance = 1 - cosine_similarity
-                cosine_sim = np.dot(query_vec, doc_vec) / (np.linalg.norm(query_vec) * np.linalg.norm(doc_vec))
-                distance = 1.0 - cosine_sim
+            # Embeddings are L2-normalized: cosine distance = 1 - dot product
+            distances = 1.0 - embeddings[1:] @ embeddings[0]
 
-                results.append((doc, float(distance)))
+            results = [(doc, float(distance)) for doc, distance in zip(docs_with_content, distances)]
 
             # Sort by distance (lower is better) and limit
             results.sort(key=lambda x: x[1])
@@ -386,5 +552,5 @@ class VectorService:
             return [(doc, 0.5) for doc in documents[:limit]]
 
 
-# Global instance - lazy initialized (model loads on first use, not at import time)
+# Global instance - model loads on first use (via embedding_registry), not at import time
 vector_service = VectorService()
@@ -61,13 +61,18 @@ class VectorStore:
         if not CHROMADB_AVAILABLE or not self.client:
             raise RuntimeError("ChromaDB not available")
 
+        from backend.services.embedding_registry import embedding_registry
+        from backend.services.vector_service import VectorService
+
         collection_name = self._get_collection_name(user_id, project_id)
         return self.client.get_or_create_collection(
             name=collection_name,
             metadata={
                 "user_id": str(user_id),
                 "project_id": str(project_id) if project_id else None
-            }
+            },
+            # Same MiniLM instance as VectorService instead of Chroma's own copy
+            embedding_function=embedding_registry.chroma_embedding_function(VectorService.MODEL_NAME),
         )
 
     def add_documents(
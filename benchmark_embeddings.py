@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ONNX (int8) embedding backend against sentence-transformers/torch.
+
+Usage:
+    python benchmark_embeddings.py [corpus.txt] [--model all-MiniLM-L6-v2] [--min-cosine 0.98]
+
+The corpus file holds one text per line (a built-in sample is used otherwise).
+Each backend runs in its own process so load time and RSS are not skewed by the
+other one. Reports cold start, RSS, single-text latency and batch throughput,
+then compares the vectors: exits non-zero if any pair falls below --min-cosine
+(the ONNX vectors go into the same ``Vector(384)`` columns as the torch ones).
+
+The ONNX model must be exported first:
+    python -m backend.services.onnx_embedding export all-MiniLM-L6-v2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SAMPLE_TEXTS = [
+    "Senior Python developer with five years of FastAPI and PostgreSQL experience.",
+    "Rechnung Nr. 2024-117 über Beratungsleistungen im März, zahlbar innerhalb von 14 Tagen.",
+    "Factura de compra de mercancías, IVA 21%, entregada en Alicante.",
+    "Cover letter: I am applying for the data engineer role advertised on your website.",
+    "Kubernetes, Terraform and AWS infrastructure automation for high-traffic services.",
+    "The quarterly report shows a 12% increase in recurring revenue.",
+    "Foto vom Sommerurlaub 1998 am Gardasee mit der ganzen Familie.",
+    "Short.",
+]
+
+LATENCY_RUNS = 50
+
+
+def run_backend(backend: str, model: str, corpus_path: str, vectors_path: str) -> dict:
+    """Runs inside the child process (EMBEDDING_BACKEND is set before backend.config is imported)."""
+    from backend.services.embedding_registry import current_rss_bytes, embedding_registry
+
+    with open(corpus_path, encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()]
+
+    rss_start = current_rss_bytes()
+    start = time.perf_counter()
+    encoder = embedding_registry.get(model)
+    load_seconds = time.perf_counter() - start
+    if encoder is None:
+        return {"error": embedding_registry.get_stats()["models"].get(model, {}).get("error", "load failed")}
+    loaded_backend = embedding_registry.get_stats()["models"][model]["backend"]
+    if loaded_backend != backend:
+        return {"error": f"registry fell back to {loaded_backend}"}
+
+    encoder.encode(texts[:8])  # warm-up
+
+    latencies = []
+    for idx in range(LATENCY_RUNS):
+        start = time.perf_counter()
+        encoder.encode([texts[idx % len(texts)]])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    vectors = encoder.encode(texts)
+    batch_seconds = time.perf_counter() - start
+    np.save(vectors_path, vectors)
+
+    latencies.sort()
+    return {
+        "load_seconds": load_seconds,
+        "rss_mb": current_rss_bytes() / 1e6,
+        "rss_growth_mb": (current_rss_bytes() - rss_start) / 1e6,
+        "latency_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "latency_p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "texts_per_second": len(texts) / batch_seconds,
+    }
+
+
+def spawn(backend: str, model: str, corpus_path: str, vectors_path: str) -> dict:
+    env = dict(os.environ, EMBEDDING_BACKEND=backend)
+    result = subprocess.run(
+        [sys.executable, __file__, "--worker", backend, "--model", model, corpus_path, "--vectors", vectors_path],
+        env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "worker failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(args) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_path = args.corpus
+        if not corpus_path:
+            corpus_path = os.path.join(tmp, "corpus.txt")
+            with open(corpus_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(SAMPLE_TEXTS * 32))
+
+        results = {}
+        for backend in ("torch", "onnx"):
+            vectors_path = os.path.join(tmp, f"{backend}.npy")
+            results[backend] = spawn(backend, args.model, corpus_path, vectors_path)
+            if "error" in results[backend]:
+                print(f"❌ {backend}: {results[backend]['error']}")
+                return 1
+
+        print(f"{'':6} {'load s':>8} {'RSS MB':>8} {'+RSS MB':>8} {'p50 ms':>8} {'p95 ms':>8} {'texts/s':>9}")
+        for backend, r in results.items():
+            print(f"{backend:6} {r['load_seconds']:8.2f} {r['rss_mb']:8.0f} {r['rss_growth_mb']:8.0f} "
+                  f"{r['latency_p50_ms']:8.2f} {r['latency_p95_ms']:8.2f} {r['texts_per_second']:9.1f}")
+
+        torch_vectors = np.load(os.path.join(tmp, "torch.npy"))
+        onnx_vectors = np.load(os.path.join(tmp, "onnx.npy"))
+
+    # Both backends return L2-normalised vectors, so the row-wise dot product is the cosine
+    cosines = (torch_vectors * onnx_vectors).sum(axis=1)
+    print()
+    print(f"Cosine torch vs onnx: min {cosines.min():.4f}, mean {cosines.mean():.4f} "
+          f"(tolerance {args.min_cosine})")
+    print(f"Throughput: {results['onnx']['texts_per_second'] / results['torch']['texts_per_second']:.1f}x, "
+          f"RSS: {results['torch']['rss_mb'] - results['onnx']['rss_mb']:.0f} MB less")
+    return 0 if cosines.min() >= args.min_cosine else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark torch vs ONNX embedding backends")
+    parser.add_argument("corpus", nargs="?", help="Text file, one text per line")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--vectors", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args.model, args.corpus, args.vectors)))
+        sys.exit(0)
+    sys.exit(main(args))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark page-orientation detection against the exhaustive 4-rotation OCR search.
+
+Usage:
+    python benchmark_orientation.py [fixture_dir] [--min-speedup 5]
+
+Every image in the fixture directory is checked with both detectors. If a file
+name contains ``_rot<angle>`` (e.g. ``invoice_rot90.jpg``) that clockwise
+correction is the expected answer, otherwise the exhaustive search is taken as
+ground truth.
+
+Without a fixture directory the sample pages in tests/fixtures/orientation
+(several languages, each rotated by 0/90/180/270°) are rendered into a
+temporary directory and used instead.
+
+Exits with 1 if OSD + fallback gets fewer pages right than the exhaustive
+search, or is slower than ``--min-speedup``.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import cv2
+import numpy as np
+
+from backend.services.application_service import _search_rotations, detect_orientation, rotate_quadrant
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tiff', '.bmp')
+FIXTURE_SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests', 'fixtures', 'orientation', 'samples.json')
+ANGLES = (0, 90, 180, 270)
+
+# Rendered page: A4 at ~150 DPI, body text at a typical 11pt letter size
+PAGE_SIZE = (1240, 1754)
+MARGIN = 120
+FONT_CANDIDATES = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/Library/Fonts/Arial Unicode.ttf',
+)
+
+
+def _font(size: int):
+    from PIL import ImageFont
+
+    for path in FONT_CANDIDATES:
+        if os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size=size)
+
+
+def _render_page(title: str, text: str) -> np.ndarray:
+    """Upright grayscale page with a title line and word-wrapped body text."""
+    from PIL import Image, ImageDraw
+
+    page = Image.new('L', PAGE_SIZE, 255)
+    draw = ImageDraw.Draw(page)
+    title_font, body_font = _font(34), _font(26)
+    width = PAGE_SIZE[0] - 2 * MARGIN
+
+    y = MARGIN
+    draw.text((MARGIN, y), title, font=title_font, fill=0)
+    y += 90
+
+    line = ''
+    for word in text.split():
+        candidate = f'{line} {word}'.strip()
+        if draw.textlength(candidate, font=body_font) > width and line:
+            draw.text((MARGIN, y), line, font=body_font, fill=0)
+            y += 40
+            line = word
+        else:
+            line = candidate
+    if line:
+        draw.text((MARGIN, y), line, font=body_font, fill=0)
+
+    return np.array(page)
+
+
+def generate_fixtures(out_dir: str, samples_path: str = FIXTURE_SAMPLES) -> List[str]:
+    """
+    Render the sample pages in every orientation.
+
+    File names carry the clockwise correction that makes the page upright
+    again (``<name>_rot<angle>.png``).
+
+    Returns:
+        Paths of the written images
+    """
+    with open(samples_path, encoding='utf-8') as f:
+        samples = json.load(f)
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for sample in samples:
+        page = _render_page(sample['title'], sample['text'])
+        for angle in ANGLES:
+            # Turn the page counter-clockwise so that `angle` clockwise undoes it
+            path = os.path.join(out_dir, f"{sample['name']}_rot{angle}.png")
+            cv2.imwrite(path, rotate_quadrant(page, (360 - angle) % 360))
+            paths.append(path)
+    return paths
+
+
+def run_benchmark(fixture_dir: str, verbose: bool = True) -> Dict[str, Any]:
+    """
+    Run both detectors on every image in ``fixture_dir``.
+
+    Returns:
+        Dict with pages, correct answers and total seconds per detector,
+        OSD/search method counts and per-page results
+    """
+    files = sorted(f for f in os.listdir(fixture_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
+
+    summary = {
+        'pages': 0,
+        'baseline_correct': 0,
+        'fast_correct': 0,
+        'baseline_seconds': 0.0,
+        'fast_seconds': 0.0,
+        'methods': {},
+        'results': [],
+    }
+
+    for filename in files:
+        gray = cv2.imread(os.path.join(fixture_dir, filename), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            print(f"⚠️  Skipping unreadable {filename}")
+            continue
+        gray = cv2.medianBlur(gray, 3)
+
+        start = time.perf_counter()
+        baseline_angle, _ = _search_rotations(gray, list(ANGLES))
+        baseline_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        info = detect_orientation(gray)
+        fast_seconds = time.perf_counter() - start
+
+        match = re.search(r'_rot(\d+)', filename)
+        expected = int(match.group(1)) % 360 if match else baseline_angle
+
+        summary['pages'] += 1
+        summary['baseline_seconds'] += baseline_seconds
+        summary['fast_seconds'] += fast_seconds
+        summary['baseline_correct'] += baseline_angle == expected
+        summary['fast_correct'] += info['angle'] == expected
+        summary['methods'][info['method']] = summary['methods'].get(info['method'], 0) + 1
+        summary['results'].append({
+            'file': filename,
+            'expected': expected,
+            'baseline': baseline_angle,
+            'fast': info['angle'],
+            'method': info['method'],
+        })
+
+        if verbose:
+            print(f"{filename}: expected {expected}°, search {baseline_angle}° ({baseline_seconds:.2f}s), "
+                  f"{info['method']} {info['angle']}° ({fast_seconds:.2f}s)")
+
+    return summary
+
+
+def main(fixture_dir: str = None, min_speedup: float = 0.0):
+    with tempfile.TemporaryDirectory() as tmp:
+        if fixture_dir is None:
+            fixture_dir = tmp
+            generate_fixtures(fixture_dir)
+
+        summary = run_benchmark(fixture_dir)
+
+    n = summary['pages']
+    if not n:
+        print(f"No images in {fixture_dir}")
+        return 1
+
+    speedup = summary['baseline_seconds'] / summary['fast_seconds'] if summary['fast_seconds'] > 0 else None
+    print()
+    print(f"Exhaustive search: {summary['baseline_correct']}/{n} correct, {summary['baseline_seconds']:.1f}s")
+    print(f"OSD + fallback:    {summary['fast_correct']}/{n} correct, {summary['fast_seconds']:.1f}s ({summary['methods']})")
+    if speedup is not None:
+        print(f"Speedup: {speedup:.1f}x")
+
+    if summary['fast_correct'] < summary['baseline_correct']:
+        print("❌ OSD + fallback is less accurate than the exhaustive search")
+        return 1
+    if min_speedup and (speedup is None or speedup < min_speedup):
+        print(f"❌ Speedup below {min_speedup}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('fixture_dir', nargs='?', help='Images to check (default: rendered sample pages)')
+    parser.add_argument('--min-speedup', type=float, default=0.0, help='Fail below this speedup (e.g. 5)')
+    args = parser.parse_args()
+    sys.exit(main(args.fixture_dir, args.min_speedup))
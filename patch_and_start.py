@@ -109,6 +109,22 @@ def run_alembic_migrations(max_attempts: int = 5, delay: int = 5) -> bool:
     return False
 
 
+def start_embedding_server():
+    """Start the shared embedding sidecar when EMBEDDING_SERVER_URL is set.
+
+    All uvicorn workers then use this one model copy instead of loading their own.
+    Set EMBEDDING_SERVER_SPAWN=false if the sidecar runs as a separate service.
+    """
+    import os
+    import subprocess
+
+    if not os.getenv("EMBEDDING_SERVER_URL") or os.getenv("EMBEDDING_SERVER_SPAWN", "true").lower() == "false":
+        return None
+
+    print(f"🧠 Starting embedding server on {os.getenv('EMBEDDING_SERVER_URL')}...", file=sys.stderr, flush=True)
+    return subprocess.Popen([sys.executable, "-m", "backend.services.embedding_server"])
+
+
 # Run Alembic migrations before starting server
 if __name__ == "__main__":
     import os
@@ -130,12 +146,21 @@ if __name__ == "__main__":
     else:
         print("⚠️  No DATABASE_URL set - skipping DB wait and migrations", file=sys.stderr, flush=True)
 
-    # Step 3: Start uvicorn (always, regardless of DB state)
+    # Step 3: Shared embedding model (optional) - lets several workers share one copy
+    embedding_server = start_embedding_server()
+
+    # Step 4: Start uvicorn (always, regardless of DB state)
     import uvicorn
     port = int(os.getenv("PORT", "8080"))
-    print(f"🚀 Starting server on port {port}...", file=sys.stderr, flush=True)
-    uvicorn.run(
-        "backend.main:app",
-        host="0.0.0.0",
-        port=port,
-    )
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    print(f"🚀 Starting server on port {port} ({workers} worker(s))...", file=sys.stderr, flush=True)
+    try:
+        uvicorn.run(
+            "backend.main:app",
+            host="0.0.0.0",
+            port=port,
+            workers=workers,
+        )
+    finally:
+        if embedding_server is not None:
+            embedding_server.terminate()
@@ -0,0 +1,186 @@
+"""Blob paths, Range parsing and the /uploads mount (206/416/304) on the local backend."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("bcrypt")  # backend/__init__.py patches it on import
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("starlette")
+pytest.importorskip("anyio")
+
+from starlette.datastructures import Headers  # noqa: E402
+from starlette.exceptions import HTTPException  # noqa: E402
+
+from backend.services.blob_store import (  # noqa: E402
+    _UNSATISFIABLE, BlobStaticFiles, LocalBlobStore, parse_blob_path, parse_data_url, requested_range,
+)
+
+DATA = b"0123456789abcdef"
+ETAG = '"etag"'
+LAST_MODIFIED = "Mon, 16 Feb 2026 10:00:00 GMT"
+
+
+def _range(value, size=len(DATA), **headers):
+    headers = {"range": value, **{key.replace("_", "-"): v for key, v in headers.items()}}
+    return requested_range(Headers(headers), size, ETAG, LAST_MODIFIED)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("bytes=0-3", (0, 3)),
+    ("bytes=4-", (4, 15)),
+    ("bytes=-4", (12, 15)),
+    ("bytes=-100", (0, 15)),
+    ("bytes=10-100", (10, 15)),
+    ("bytes=15-15", (15, 15)),
+])
+def test_satisfiable_ranges(value, expected):
+    assert _range(value) == expected
+
+
+@pytest.mark.parametrize("value", ["bytes=16-", "bytes=5-2", "bytes=-0"])
+def test_unsatisfiable_ranges(value):
+    assert _range(value) is _UNSATISFIABLE
+
+
+@pytest.mark.parametrize("value", ["", "items=0-3", "bytes=0-1,4-5", "bytes=a-b"])
+def test_ignored_ranges_send_the_whole_file(value):
+    assert _range(value) is None
+
+
+def test_if_range_must_match_etag_or_last_modified():
+    assert _range("bytes=0-3", if_range=ETAG) == (0, 3)
+    assert _range("bytes=0-3", if_range=LAST_MODIFIED) == (0, 3)
+    assert _range("bytes=0-3", if_range='"stale"') is None
+
+
+def test_blob_path_round_trip(tmp_path):
+    blob = LocalBlobStore(tmp_path).put(DATA, "lifechronicle", "image/png", "photo.PNG")
+    parsed = parse_blob_path(blob["url"])
+
+    assert parsed == {"namespace": "lifechronicle", "sha256": blob["sha256"], "ext": ".png"}
+    assert blob["url"] == f"/uploads/lifechronicle/{blob['sha256'][:2]}/{blob['sha256']}.png"
+    assert parse_blob_path("/uploads/lifechronicle/zz/" + blob["sha256"] + ".png") is None
+    assert parse_blob_path("/uploads/old-upload.jpg") is None
+
+
+def test_local_store_is_content_addressed(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    first = store.put(DATA, "lifechronicle", "image/jpeg")
+    second = store.put(DATA, "lifechronicle", "image/jpeg", "other-name.jpeg")
+
+    assert first["url"] == second["url"]
+    assert store.read(first["url"]) == DATA
+    assert store.read("/uploads/lifechronicle/00/" + "0" * 64 + ".jpg") is None
+
+
+def test_parse_data_url():
+    assert parse_data_url("data:image/PNG;base64,MDEy") == (b"012", "image/png")
+    assert parse_data_url("/uploads/x.png") is None
+
+
+# ----------------------------------------------------------------------
+# /uploads mount, called as a plain ASGI app
+# ----------------------------------------------------------------------
+
+def _get(app, path, method="GET", **headers):
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(key.replace("_", "-").encode(), value.encode()) for key, value in headers.items()],
+        "http_version": "1.1",
+        "scheme": "http",
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def run():
+        requested = False
+        never = asyncio.Event()
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await never.wait()
+
+        async def send(message):
+            messages.append(message)
+
+        await app(scope, receive, send)
+
+    asyncio.run(run())
+    start = messages[0]
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], Headers(raw=start["headers"]), body
+
+
+@pytest.fixture
+def mount(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    blob = store.put(DATA, "lifechronicle", "image/png")
+    path = blob["url"][len("/uploads"):]
+    return BlobStaticFiles(directory=str(tmp_path), store=store), path, blob["sha256"]
+
+
+def test_full_response_has_content_hash_etag(mount):
+    app, path, sha256 = mount
+    status, headers, body = _get(app, path)
+
+    assert status == 200
+    assert body == DATA
+    assert headers["etag"] == f'"{sha256}"'
+    assert headers["accept-ranges"] == "bytes"
+    assert "immutable" in headers["cache-control"]
+
+
+def test_range_request_returns_206(mount):
+    app, path, _ = mount
+    status, headers, body = _get(app, path, range="bytes=2-5")
+
+    assert status == 206
+    assert body == DATA[2:6]
+    assert headers["content-range"] == f"bytes 2-5/{len(DATA)}"
+    assert headers["content-length"] == "4"
+
+
+def test_suffix_range(mount):
+    app, path, _ = mount
+    status, _, body = _get(app, path, range="bytes=-3")
+    assert status == 206
+    assert body == DATA[-3:]
+
+
+def test_unsatisfiable_range_returns_416(mount):
+    app, path, _ = mount
+    status, headers, _ = _get(app, path, range="bytes=100-")
+    assert status == 416
+    assert headers["content-range"] == f"bytes */{len(DATA)}"
+
+
+def test_stale_if_range_returns_the_whole_file(mount):
+    app, path, _ = mount
+    status, _, body = _get(app, path, range="bytes=2-5", if_range='"stale"')
+    assert status == 200
+    assert body == DATA
+
+
+def test_matching_etag_returns_304(mount):
+    app, path, sha256 = mount
+    status, _, body = _get(app, path, if_none_match=f'"{sha256}"')
+    assert status == 304
+    assert body == b""
+
+
+def test_private_namespaces_are_not_served(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    blob = store.put(DATA, "taxcases", "application/pdf")
+    app = BlobStaticFiles(directory=str(tmp_path), store=store)
+
+    with pytest.raises(HTTPException) as error:
+        _get(app, blob["url"][len("/uploads"):])
+    assert error.value.status_code == 404
@@ -0,0 +1,117 @@
+"""Row normalisation, bind-parameter chunking and the asyncpg COPY path of bulk_insert."""
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("bcrypt")  # backend/__init__.py patches it on import
+pytest.importorskip("pydantic_settings")
+sa = pytest.importorskip("sqlalchemy")
+
+from backend.services.bulk_insert import MAX_BIND_PARAMS, _chunks, _copy_records, prepare_rows  # noqa: E402
+
+_ids = itertools.count(1)
+
+items = sa.Table(
+    "items", sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, default=lambda: next(_ids)),
+    sa.Column("name", sa.String),
+    sa.Column("note", sa.String),
+    sa.Column("active", sa.Boolean, default=False),
+    sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+    sa.Column("updated_at", sa.DateTime, default=sa.func.now()),
+)
+
+
+def test_rows_get_the_union_of_keys_and_python_defaults():
+    rows = prepare_rows(items, [{"name": "a"}, {"name": "b", "note": "x", "active": True}])
+
+    assert [set(row) for row in rows] == [{"id", "name", "note", "active"}] * 2
+    assert rows[0]["note"] is None
+    assert rows[0]["active"] is False and rows[1]["active"] is True
+    # Callable defaults run once per row
+    assert rows[0]["id"] != rows[1]["id"]
+
+
+def test_server_and_sql_defaults_are_left_to_postgres():
+    row = prepare_rows(items, [{"name": "a"}])[0]
+    assert "created_at" not in row
+    assert "updated_at" not in row
+
+
+def test_explicit_values_are_kept():
+    row = prepare_rows(items, [{"id": 7, "name": "a", "active": True}])[0]
+    # Columns nobody set and without a Python default are omitted entirely
+    assert row == {"id": 7, "name": "a", "active": True}
+
+
+def test_input_rows_are_not_modified():
+    source = {"name": "a"}
+    prepare_rows(items, [source])
+    assert source == {"name": "a"}
+
+
+def test_orm_models_are_accepted():
+    model = SimpleNamespace(__table__=items)
+    assert prepare_rows(model, [{"name": "a"}])[0]["name"] == "a"
+
+
+def test_unknown_columns_raise():
+    with pytest.raises(ValueError, match="nope"):
+        prepare_rows(items, [{"name": "a", "nope": 1}])
+
+
+def test_no_rows():
+    assert prepare_rows(items, []) == []
+    assert list(_chunks([], 100)) == []
+
+
+def test_chunks_stay_below_the_bind_parameter_cap():
+    rows = [{"a": i, "b": i, "c": i} for i in range(20000)]
+    chunks = list(_chunks(rows, 100000))
+
+    assert [len(chunk) for chunk in chunks] == [MAX_BIND_PARAMS // 3, 20000 - MAX_BIND_PARAMS // 3]
+    assert all(len(chunk) * 3 <= MAX_BIND_PARAMS for chunk in chunks)
+    assert [row["a"] for chunk in chunks for row in chunk] == list(range(20000))
+
+
+def test_chunk_size_applies_below_the_cap():
+    rows = [{"a": i} for i in range(10)]
+    assert [len(chunk) for chunk in _chunks(rows, 4)] == [4, 4, 2]
+
+
+class _FakeSession:
+    """AsyncSession stand-in exposing a raw driver connection."""
+
+    def __init__(self, driver_connection):
+        raw = SimpleNamespace(driver_connection=driver_connection)
+
+        async def get_raw_connection():
+            return raw
+
+        self._connection = SimpleNamespace(get_raw_connection=get_raw_connection)
+
+    async def connection(self):
+        return self._connection
+
+
+class _FakeAsyncpg:
+    def __init__(self):
+        self.calls = []
+
+    async def copy_records_to_table(self, table_name, records, columns, schema_name):
+        self.calls.append((table_name, records, columns, schema_name))
+
+
+def test_copy_sends_records_in_column_order():
+    driver = _FakeAsyncpg()
+    rows = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+    assert asyncio.run(_copy_records(_FakeSession(driver), items, rows)) is True
+    assert driver.calls == [("items", [(1, "a"), (2, "b")], ["id", "name"], None)]
+
+
+def test_copy_is_skipped_without_asyncpg():
+    session = _FakeSession(SimpleNamespace())
+    assert asyncio.run(_copy_records(session, items, [{"id": 1}])) is False
@@ -0,0 +1,46 @@
+"""ONNX (int8) embedding backend vs. the sentence-transformers/torch model on a fixed sentence set."""
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tokenizers")
+pytest.importorskip("sentence_transformers")
+
+from backend.services.onnx_embedding import MODEL_FILE, OnnxSentenceEncoder, model_directory  # noqa: E402
+from benchmark_embeddings import SAMPLE_TEXTS  # noqa: E402
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+# Same tolerance as benchmark_embeddings.py --min-cosine; the mean has to be clearly higher
+MIN_COSINE = 0.98
+MIN_MEAN_COSINE = 0.99
+
+if not os.path.exists(os.path.join(model_directory(MODEL_NAME), MODEL_FILE)):
+    pytest.skip(f"ONNX export of {MODEL_NAME} not found (python -m backend.services.onnx_embedding export)",
+                allow_module_level=True)
+
+
+@pytest.fixture(scope="module")
+def cosines():
+    from sentence_transformers import SentenceTransformer
+
+    try:
+        torch_model = SentenceTransformer(MODEL_NAME)
+    except OSError as e:
+        pytest.skip(f"torch model {MODEL_NAME} not available: {e}")
+
+    torch_vectors = torch_model.encode(SAMPLE_TEXTS, normalize_embeddings=True)
+    onnx_vectors = OnnxSentenceEncoder(MODEL_NAME).encode(SAMPLE_TEXTS, normalize_embeddings=True)
+    assert onnx_vectors.shape == torch_vectors.shape
+    # Both are L2-normalised, so the row-wise dot product is the cosine
+    return (torch_vectors * onnx_vectors).sum(axis=1)
+
+
+def test_onnx_matches_torch_on_every_sentence(cosines):
+    worst = int(cosines.argmin())
+    assert cosines.min() >= MIN_COSINE, (SAMPLE_TEXTS[worst], float(cosines[worst]))
+
+
+def test_onnx_mean_cosine(cosines):
+    assert cosines.mean() >= MIN_MEAN_COSINE, cosines.tolist()
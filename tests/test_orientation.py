@@ -0,0 +1,40 @@
+"""OSD orientation pre-pass vs. the exhaustive 4-rotation OCR search on rendered sample pages."""
+import json
+import shutil
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("PIL")
+pytest.importorskip("pytesseract")
+pytest.importorskip("backend.services.application_service")
+
+if shutil.which("tesseract") is None:
+    pytest.skip("tesseract binary not installed", allow_module_level=True)
+
+from benchmark_orientation import ANGLES, FIXTURE_SAMPLES, generate_fixtures, run_benchmark  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def summary(tmp_path_factory):
+    fixture_dir = tmp_path_factory.mktemp("orientation")
+    generate_fixtures(str(fixture_dir))
+    return run_benchmark(str(fixture_dir), verbose=False)
+
+
+def test_fixtures_cover_every_language_and_rotation(summary):
+    with open(FIXTURE_SAMPLES, encoding="utf-8") as f:
+        samples = json.load(f)
+    assert len({sample["lang"] for sample in samples}) >= 5
+    assert summary["pages"] == len(samples) * len(ANGLES)
+
+
+def test_osd_is_at_least_as_accurate_as_exhaustive_search(summary):
+    wrong = [result for result in summary["results"] if result["fast"] != result["expected"]]
+    assert summary["fast_correct"] >= summary["baseline_correct"], wrong
+    assert summary["fast_correct"] / summary["pages"] >= 0.95, wrong
+
+
+def test_osd_is_faster_than_exhaustive_search(summary):
+    assert summary["methods"].get("osd", 0) >= summary["pages"] // 2
+    assert summary["fast_seconds"] < summary["baseline_seconds"]
@@ -0,0 +1,41 @@
+"""Reciprocal Rank Fusion ordering and scores."""
+import pytest
+
+pytest.importorskip("bcrypt")  # backend/__init__.py patches it on import
+
+from backend.services.rank_fusion import RRF_K, reciprocal_rank_fusion  # noqa: E402
+
+
+def test_single_ranking_keeps_order_and_rank_scores():
+    fused = reciprocal_rank_fusion([["a", "b", "c"]])
+    assert [doc_id for doc_id, _ in fused] == ["a", "b", "c"]
+    assert [score for _, score in fused] == pytest.approx([1 / (RRF_K + 1), 1 / (RRF_K + 2), 1 / (RRF_K + 3)])
+
+
+def test_documents_ranked_well_in_both_lists_win():
+    # b is 2nd and 1st; a is 1st and 3rd; c is 3rd and 2nd
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "a"]])
+    assert [doc_id for doc_id, _ in fused] == ["b", "a", "c"]
+    assert dict(fused)["b"] == pytest.approx(1 / (RRF_K + 2) + 1 / (RRF_K + 1))
+
+
+def test_document_in_one_list_only_ranks_below_shared_ones():
+    fused = reciprocal_rank_fusion([["x", "shared"], ["shared", "y"]])
+    assert fused[0][0] == "shared"
+    assert {doc_id for doc_id, _ in fused} == {"x", "shared", "y"}
+
+
+def test_ties_keep_first_seen_order():
+    fused = reciprocal_rank_fusion([["a"], ["b"]])
+    assert [doc_id for doc_id, _ in fused] == ["a", "b"]
+    assert fused[0][1] == fused[1][1]
+
+
+def test_smaller_k_weights_top_ranks_more():
+    rankings = [["a", "b"], ["b", "c"], ["c", "a"]]
+    assert dict(reciprocal_rank_fusion(rankings, k=1))["a"] == pytest.approx(1 / 2 + 1 / 3)
+
+
+def test_empty_rankings():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], []]) == []